@@ -4,6 +4,7 @@ import os
 import shutil
 import base64
 import redis
+import uuid
 
 from datetime import datetime
 from pathlib import Path
@@ -34,7 +35,7 @@ from open_webui.env import (
     log,
 )
 from open_webui.internal.db import Base, get_db
-from open_webui.utils.redis import get_redis_connection
+from open_webui.utils.redis import get_redis_connection, start_invalidation_listener
 
 
 class EndpointFilter(logging.Filter):
@@ -223,6 +224,13 @@ class PersistentConfig(Generic[T]):
 
 
 class AppConfig:
+    """
+    Config values are served from local memory. With Redis, every write is
+    stored under `{prefix}:config:{key}`, stamped with a global version and
+    announced on the `{prefix}:config:invalidate` channel; replicas re-read
+    a key from Redis only after an invalidation for it arrives.
+    """
+
     _redis: Union[redis.Redis, redis.cluster.RedisCluster] = None
     _redis_key_prefix: str
 
@@ -235,6 +243,13 @@ class AppConfig:
         redis_cluster: Optional[bool] = False,
         redis_key_prefix: str = "open-webui",
     ):
+        super().__setattr__("_state", {})
+
+        # Keys whose local value is known to match Redis
+        super().__setattr__("_synced", set())
+        super().__setattr__("_version", 0)
+        super().__setattr__("_instance_id", str(uuid.uuid4()))
+
         if redis_url:
             super().__setattr__("_redis_key_prefix", redis_key_prefix)
             super().__setattr__(
@@ -247,7 +262,63 @@ class AppConfig:
                 ),
             )
 
-        super().__setattr__("_state", {})
+            start_invalidation_listener(
+                self._redis,
+                self._invalidation_channel,
+                on_message=self._handle_invalidation,
+                # Invalidations published while unsubscribed were missed
+                on_subscribe=self._synced.clear,
+                name="config-invalidation-listener",
+            )
+
+    @property
+    def version(self) -> int:
+        """Bumped on every config write, on this replica or another one"""
+        return self._version
+
+    @property
+    def _invalidation_channel(self) -> str:
+        return f"{self._redis_key_prefix}:config:invalidate"
+
+    def _handle_invalidation(self, data: str):
+        try:
+            invalidation = json.loads(data)
+        except json.JSONDecodeError:
+            log.error(f"Invalid config invalidation message: {data}")
+            return
+
+        version = invalidation.get("version") or 0
+        if self._version and version > self._version + 1:
+            # Gap in the version stamps, some invalidations were lost
+            self._synced.clear()
+        super().__setattr__("_version", max(self._version, version))
+
+        if invalidation.get("instance_id") != self._instance_id:
+            self._synced.discard(invalidation.get("key"))
+
+    def _sync_from_redis(self, key):
+        # Mark first, so an invalidation racing with the GET is not lost
+        self._synced.add(key)
+
+        redis_key = f"{self._redis_key_prefix}:config:{key}"
+        try:
+            redis_value = self._redis.get(redis_key)
+        except Exception as e:
+            self._synced.discard(key)
+            log.error(f"Failed to read {key} from Redis: {e}")
+            return
+
+        if redis_value is not None:
+            try:
+                decoded_value = json.loads(redis_value)
+
+                # Update the in-memory value if different
+                if self._state[key].value != decoded_value:
+                    self._state[key].value = decoded_value
+                    log.info(f"Updated {key} from Redis: {decoded_value}")
+
+            except json.JSONDecodeError:
+                log.error(f"Invalid JSON format in Redis for {key}: {redis_value}")
 
     def __setattr__(self, key, value):
         if isinstance(value, PersistentConfig):
@@ -259,27 +330,30 @@ class AppConfig:
             if self._redis:
                 redis_key = f"{self._redis_key_prefix}:config:{key}"
                 self._redis.set(redis_key, json.dumps(self._state[key].value))
+                self._synced.add(key)
+
+                version = self._redis.incr(f"{self._redis_key_prefix}:config:version")
+                super().__setattr__("_version", max(self._version, version))
+                self._redis.publish(
+                    self._invalidation_channel,
+                    json.dumps(
+                        {
+                            "key": key,
+                            "version": version,
+                            "instance_id": self._instance_id,
+                        }
+                    ),
+                )
+            else:
+                super().__setattr__("_version", self._version + 1)
 
     def __getattr__(self, key):
         if key not in self._state:
             raise AttributeError(f"Config key '{key}' not found")
 
-        # If Redis is available, check for an updated value
-        if self._redis:
-            redis_key = f"{self._redis_key_prefix}:config:{key}"
-            redis_value = self._redis.get(redis_key)
-
-            if redis_value is not None:
-                try:
-                    decoded_value = json.loads(redis_value)
-
-                    # Update the in-memory value if different
-                    if self._state[key].value != decoded_value:
-                        self._state[key].value = decoded_value
-                        log.info(f"Updated {key} from Redis: {decoded_value}")
-
-                except json.JSONDecodeError:
-                    log.error(f"Invalid JSON format in Redis for {key}: {redis_value}")
+        # If Redis is available, refresh values that were invalidated
+        if self._redis and key not in self._synced:
+            self._sync_from_redis(key)
 
         return self._state[key].value
 
@@ -2342,6 +2416,17 @@ else:
     except Exception:
         PGVECTOR_IVFFLAT_LISTS = 100
 
+# Rows per multi-row INSERT statement when writing document chunks
+PGVECTOR_INSERT_BATCH_SIZE = os.environ.get("PGVECTOR_INSERT_BATCH_SIZE", 500)
+
+if PGVECTOR_INSERT_BATCH_SIZE == "":
+    PGVECTOR_INSERT_BATCH_SIZE = 500
+else:
+    try:
+        PGVECTOR_INSERT_BATCH_SIZE = max(int(PGVECTOR_INSERT_BATCH_SIZE), 1)
+    except Exception:
+        PGVECTOR_INSERT_BATCH_SIZE = 500
+
 # Pinecone
 PINECONE_API_KEY = os.environ.get("PINECONE_API_KEY", None)
 PINECONE_ENVIRONMENT = os.environ.get("PINECONE_ENVIRONMENT", None)
@@ -2654,6 +2739,72 @@ ENABLE_RAG_HYBRID_SEARCH_ENRICHED_TEXTS = PersistentConfig(
     == "true",
 )
 
+# Must be shared storage (supporting flock) when running several replicas,
+# every writer appends to the same per-collection files
+RAG_BM25_INDEX_DIR = os.environ.get("RAG_BM25_INDEX_DIR", f"{CACHE_DIR}/bm25")
+
+RAG_BM25_INDEX_CACHE_SIZE = int(os.environ.get("RAG_BM25_INDEX_CACHE_SIZE", "32"))
+
+ENABLE_EXTRACTION_CACHE = (
+    os.environ.get("ENABLE_EXTRACTION_CACHE", "True").lower() == "true"
+)
+
+# Total size of cached extraction results in MB
+EXTRACTION_CACHE_MAX_SIZE = int(os.environ.get("EXTRACTION_CACHE_MAX_SIZE", "1024"))
+
+ENABLE_EMBEDDING_CACHE = (
+    os.environ.get("ENABLE_EMBEDDING_CACHE", "True").lower() == "true"
+)
+
+# Shared tier of the embedding cache: sqlite, redis or memory (in-process only)
+EMBEDDING_CACHE_BACKEND = os.environ.get("EMBEDDING_CACHE_BACKEND", "sqlite").lower()
+
+# Number of embeddings kept in memory per process
+EMBEDDING_CACHE_SIZE = int(os.environ.get("EMBEDDING_CACHE_SIZE", "10000"))
+
+EMBEDDING_CACHE_SQLITE_PATH = os.environ.get(
+    "EMBEDDING_CACHE_SQLITE_PATH", f"{CACHE_DIR}/embedding_cache.db"
+)
+
+# Lifetime of embeddings in the shared tier in seconds, 0 keeps them forever
+EMBEDDING_CACHE_TTL = int(os.environ.get("EMBEDDING_CACHE_TTL", "0"))
+
+# Workers of the load and split stages of the ingestion pipeline
+INGESTION_PIPELINE_LOAD_WORKERS = int(
+    os.environ.get("INGESTION_PIPELINE_LOAD_WORKERS", "2")
+)
+
+# Files embedded concurrently by the ingestion pipeline
+INGESTION_PIPELINE_EMBED_WORKERS = int(
+    os.environ.get("INGESTION_PIPELINE_EMBED_WORKERS", "2")
+)
+
+# Files waiting between two stages of the ingestion pipeline
+INGESTION_PIPELINE_QUEUE_SIZE = int(
+    os.environ.get("INGESTION_PIPELINE_QUEUE_SIZE", "8")
+)
+
+# Chunks written to the vector DB in one upsert, across files
+INGESTION_PIPELINE_UPSERT_BATCH_SIZE = int(
+    os.environ.get("INGESTION_PIPELINE_UPSERT_BATCH_SIZE", "1000")
+)
+
+# Files of a knowledge reindex job processed concurrently
+KNOWLEDGE_REINDEX_WORKERS = int(os.environ.get("KNOWLEDGE_REINDEX_WORKERS", "4"))
+
+# (query, document) pairs scored in one reranker call, across concurrent requests
+RAG_RERANKING_BATCH_SIZE = int(os.environ.get("RAG_RERANKING_BATCH_SIZE", "64"))
+
+# Milliseconds a reranking batch waits for concurrent requests to join it
+RAG_RERANKING_BATCH_WINDOW_MS = int(
+    os.environ.get("RAG_RERANKING_BATCH_WINDOW_MS", "10")
+)
+
+# Queued reranking requests above which a backlog warning is logged, 0 disables
+RAG_RERANKING_QUEUE_WARN_DEPTH = int(
+    os.environ.get("RAG_RERANKING_QUEUE_WARN_DEPTH", "32")
+)
+
 RAG_FULL_CONTEXT = PersistentConfig(
     "RAG_FULL_CONTEXT",
     "rag.full_context",
@@ -2754,6 +2905,19 @@ ENABLE_ASYNC_EMBEDDING = PersistentConfig(
     os.environ.get("ENABLE_ASYNC_EMBEDDING", "True").lower() == "true",
 )
 
+# Maximum number of embedding batches in flight per process, across all requests
+RAG_EMBEDDING_CONCURRENT_REQUESTS = int(
+    os.environ.get("RAG_EMBEDDING_CONCURRENT_REQUESTS", "8")
+)
+
+# Retries of an embedding batch on 429, 5xx and connection errors
+RAG_EMBEDDING_MAX_RETRIES = int(os.environ.get("RAG_EMBEDDING_MAX_RETRIES", "5"))
+
+# Base delay in seconds of the exponential backoff between retries
+RAG_EMBEDDING_RETRY_BACKOFF = float(
+    os.environ.get("RAG_EMBEDDING_RETRY_BACKOFF", "1.0")
+)
+
 RAG_EMBEDDING_QUERY_PREFIX = os.environ.get("RAG_EMBEDDING_QUERY_PREFIX", None)
 
 RAG_EMBEDDING_CONTENT_PREFIX = os.environ.get("RAG_EMBEDDING_CONTENT_PREFIX", None)
@@ -3608,6 +3772,19 @@ WHISPER_VAD_FILTER = PersistentConfig(
 
 WHISPER_LANGUAGE = os.getenv("WHISPER_LANGUAGE", "").lower() or None
 
+# Worker processes transcribing long recordings, each loads its own model
+WHISPER_WORKER_POOL_SIZE = int(os.getenv("WHISPER_WORKER_POOL_SIZE", "2"))
+
+# Long recordings are split at silences into chunks of at most this length
+WHISPER_CHUNK_MAX_SECONDS = int(os.getenv("WHISPER_CHUNK_MAX_SECONDS", "300"))
+
+# Recordings transcribed at the same time, further ones wait in the queue
+WHISPER_MAX_CONCURRENT_JOBS = int(os.getenv("WHISPER_MAX_CONCURRENT_JOBS", "2"))
+
+# Seconds a worker may spend on one chunk before it is replaced, this includes
+# loading the model when the worker has just started
+WHISPER_CHUNK_TIMEOUT = int(os.getenv("WHISPER_CHUNK_TIMEOUT", "1800"))
+
 # Add Deepgram configuration
 DEEPGRAM_API_KEY = PersistentConfig(
     "DEEPGRAM_API_KEY",
@@ -203,6 +203,13 @@ for version in soup.find_all("h2"):
 CHANGELOG = changelog_json
 #### deepseek-ocr
 OCR_SERVER_URL = os.environ.get("OCR_SERVER_URL")
+ENABLE_OCR_STREAMING = os.environ.get("ENABLE_OCR_STREAMING", "True").lower() == "true"
+OCR_MAX_CONCURRENT_REQUESTS = int(os.environ.get("OCR_MAX_CONCURRENT_REQUESTS", "4"))
+OCR_PAGE_RANGE_SIZE = int(os.environ.get("OCR_PAGE_RANGE_SIZE", "4"))
+OCR_PAGE_MAX_RETRIES = int(os.environ.get("OCR_PAGE_MAX_RETRIES", "2"))
+#### hwp/hwpx
+HWP_WORKER_POOL_SIZE = int(os.environ.get("HWP_WORKER_POOL_SIZE", "2"))
+HWP_WORKER_TIMEOUT = int(os.environ.get("HWP_WORKER_TIMEOUT", "120"))
 NEWS_API_URL = os.environ.get("NEWS_API_URL", "http://220.124.155.35:5002/news")
 ####################################
 # SAFE_MODE
@@ -374,6 +381,19 @@ ENABLE_REALTIME_CHAT_SAVE = (
     os.environ.get("ENABLE_REALTIME_CHAT_SAVE", "False").lower() == "true"
 )
 
+# Buffered chat message writes are flushed after this many seconds or pending updates
+CHAT_SAVE_FLUSH_INTERVAL = os.environ.get("CHAT_SAVE_FLUSH_INTERVAL", "1.0")
+try:
+    CHAT_SAVE_FLUSH_INTERVAL = float(CHAT_SAVE_FLUSH_INTERVAL)
+except Exception:
+    CHAT_SAVE_FLUSH_INTERVAL = 1.0
+
+CHAT_SAVE_FLUSH_MAX_UPDATES = os.environ.get("CHAT_SAVE_FLUSH_MAX_UPDATES", "100")
+try:
+    CHAT_SAVE_FLUSH_MAX_UPDATES = int(CHAT_SAVE_FLUSH_MAX_UPDATES)
+except Exception:
+    CHAT_SAVE_FLUSH_MAX_UPDATES = 100
+
 ENABLE_QUERIES_CACHE = os.environ.get("ENABLE_QUERIES_CACHE", "False").lower() == "true"
 
 ####################################
@@ -558,6 +578,33 @@ else:
         MODELS_CACHE_TTL = 1
 
 
+####################################
+# PRINCIPAL CACHE
+####################################
+
+# Seconds a resolved user row and group id set are reused across requests
+PRINCIPAL_CACHE_TTL = os.environ.get("PRINCIPAL_CACHE_TTL", "5")
+if PRINCIPAL_CACHE_TTL == "":
+    PRINCIPAL_CACHE_TTL = 0
+else:
+    try:
+        PRINCIPAL_CACHE_TTL = float(PRINCIPAL_CACHE_TTL)
+    except Exception:
+        PRINCIPAL_CACHE_TTL = 5
+
+
+# Seconds a user's filtered /api/models response is served from cache. Model,
+# function, group and config changes invalidate it earlier; 0 disables it.
+MODEL_LIST_CACHE_TTL = os.environ.get("MODEL_LIST_CACHE_TTL", "60")
+if MODEL_LIST_CACHE_TTL == "":
+    MODEL_LIST_CACHE_TTL = 0
+else:
+    try:
+        MODEL_LIST_CACHE_TTL = float(MODEL_LIST_CACHE_TTL)
+    except Exception:
+        MODEL_LIST_CACHE_TTL = 60
+
+
 ####################################
 # CHAT
 ####################################
@@ -664,6 +711,20 @@ try:
 except ValueError:
     WEBSOCKET_SERVER_PING_INTERVAL = 25
 
+# Collaborative documents fold their update log into a snapshot once it holds
+# this many updates or bytes
+YDOC_COMPACTION_UPDATE_COUNT = os.environ.get("YDOC_COMPACTION_UPDATE_COUNT", "100")
+try:
+    YDOC_COMPACTION_UPDATE_COUNT = int(YDOC_COMPACTION_UPDATE_COUNT)
+except ValueError:
+    YDOC_COMPACTION_UPDATE_COUNT = 100
+
+YDOC_COMPACTION_SIZE = os.environ.get("YDOC_COMPACTION_SIZE", "262144")
+try:
+    YDOC_COMPACTION_SIZE = int(YDOC_COMPACTION_SIZE)
+except ValueError:
+    YDOC_COMPACTION_SIZE = 262144
+
 
 AIOHTTP_CLIENT_TIMEOUT = os.environ.get("AIOHTTP_CLIENT_TIMEOUT", "")
 
@@ -713,6 +774,107 @@ AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL = (
     os.environ.get("AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL", "True").lower() == "true"
 )
 
+# Connection pool shared by the OpenAI and Ollama routers, one per upstream host
+AIOHTTP_CLIENT_UPSTREAM_POOL_SIZE = os.environ.get(
+    "AIOHTTP_CLIENT_UPSTREAM_POOL_SIZE", "100"
+)
+
+try:
+    AIOHTTP_CLIENT_UPSTREAM_POOL_SIZE = int(AIOHTTP_CLIENT_UPSTREAM_POOL_SIZE)
+except Exception:
+    AIOHTTP_CLIENT_UPSTREAM_POOL_SIZE = 100
+
+AIOHTTP_CLIENT_UPSTREAM_KEEPALIVE_TIMEOUT = os.environ.get(
+    "AIOHTTP_CLIENT_UPSTREAM_KEEPALIVE_TIMEOUT", "15"
+)
+
+try:
+    AIOHTTP_CLIENT_UPSTREAM_KEEPALIVE_TIMEOUT = float(
+        AIOHTTP_CLIENT_UPSTREAM_KEEPALIVE_TIMEOUT
+    )
+except Exception:
+    AIOHTTP_CLIENT_UPSTREAM_KEEPALIVE_TIMEOUT = 15.0
+
+AIOHTTP_CLIENT_UPSTREAM_CONNECT_TIMEOUT = os.environ.get(
+    "AIOHTTP_CLIENT_UPSTREAM_CONNECT_TIMEOUT", ""
+)
+
+if AIOHTTP_CLIENT_UPSTREAM_CONNECT_TIMEOUT == "":
+    AIOHTTP_CLIENT_UPSTREAM_CONNECT_TIMEOUT = None
+else:
+    try:
+        AIOHTTP_CLIENT_UPSTREAM_CONNECT_TIMEOUT = int(
+            AIOHTTP_CLIENT_UPSTREAM_CONNECT_TIMEOUT
+        )
+    except Exception:
+        AIOHTTP_CLIENT_UPSTREAM_CONNECT_TIMEOUT = None
+
+
+# Pooled MCP client sessions, reused across chat requests
+MCP_CLIENT_IDLE_TIMEOUT = os.environ.get("MCP_CLIENT_IDLE_TIMEOUT", "300")
+
+try:
+    MCP_CLIENT_IDLE_TIMEOUT = int(MCP_CLIENT_IDLE_TIMEOUT)
+except Exception:
+    MCP_CLIENT_IDLE_TIMEOUT = 300
+
+MCP_CLIENT_HEALTH_CHECK_INTERVAL = os.environ.get(
+    "MCP_CLIENT_HEALTH_CHECK_INTERVAL", "30"
+)
+
+try:
+    MCP_CLIENT_HEALTH_CHECK_INTERVAL = int(MCP_CLIENT_HEALTH_CHECK_INTERVAL)
+except Exception:
+    MCP_CLIENT_HEALTH_CHECK_INTERVAL = 30
+
+MCP_TOOL_SPECS_CACHE_TTL = os.environ.get("MCP_TOOL_SPECS_CACHE_TTL", "300")
+
+try:
+    MCP_TOOL_SPECS_CACHE_TTL = int(MCP_TOOL_SPECS_CACHE_TTL)
+except Exception:
+    MCP_TOOL_SPECS_CACHE_TTL = 300
+
+# Webhook notifications are queued and posted by a pool of background workers
+WEBHOOK_DISPATCH_WORKERS = os.environ.get("WEBHOOK_DISPATCH_WORKERS", "10")
+
+try:
+    WEBHOOK_DISPATCH_WORKERS = int(WEBHOOK_DISPATCH_WORKERS)
+except Exception:
+    WEBHOOK_DISPATCH_WORKERS = 10
+
+WEBHOOK_DISPATCH_QUEUE_SIZE = os.environ.get("WEBHOOK_DISPATCH_QUEUE_SIZE", "10000")
+
+try:
+    WEBHOOK_DISPATCH_QUEUE_SIZE = int(WEBHOOK_DISPATCH_QUEUE_SIZE)
+except Exception:
+    WEBHOOK_DISPATCH_QUEUE_SIZE = 10000
+
+WEBHOOK_DISPATCH_MAX_RETRIES = os.environ.get("WEBHOOK_DISPATCH_MAX_RETRIES", "3")
+
+try:
+    WEBHOOK_DISPATCH_MAX_RETRIES = int(WEBHOOK_DISPATCH_MAX_RETRIES)
+except Exception:
+    WEBHOOK_DISPATCH_MAX_RETRIES = 3
+
+# Consecutive failures after which an endpoint is skipped for the cooldown
+WEBHOOK_CIRCUIT_BREAKER_THRESHOLD = os.environ.get(
+    "WEBHOOK_CIRCUIT_BREAKER_THRESHOLD", "5"
+)
+
+try:
+    WEBHOOK_CIRCUIT_BREAKER_THRESHOLD = int(WEBHOOK_CIRCUIT_BREAKER_THRESHOLD)
+except Exception:
+    WEBHOOK_CIRCUIT_BREAKER_THRESHOLD = 5
+
+WEBHOOK_CIRCUIT_BREAKER_COOLDOWN = os.environ.get(
+    "WEBHOOK_CIRCUIT_BREAKER_COOLDOWN", "60"
+)
+
+try:
+    WEBHOOK_CIRCUIT_BREAKER_COOLDOWN = int(WEBHOOK_CIRCUIT_BREAKER_COOLDOWN)
+except Exception:
+    WEBHOOK_CIRCUIT_BREAKER_COOLDOWN = 60
+
 
 ####################################
 # SENTENCE TRANSFORMERS
@@ -37,6 +37,7 @@ from fastapi import (
     applications,
     BackgroundTasks,
 )
+from fastapi.encoders import jsonable_encoder
 from fastapi.openapi.docs import get_swagger_ui_html
 
 from fastapi.middleware.cors import CORSMiddleware
@@ -472,6 +473,7 @@ from open_webui.env import (
     EXTERNAL_PWA_MANIFEST_URL,
     AIOHTTP_CLIENT_SESSION_SSL,
     ENABLE_STAR_SESSIONS_MIDDLEWARE,
+    ENABLE_FORWARD_USER_INFO_HEADERS,
 )
 
 
@@ -480,7 +482,13 @@ from open_webui.utils.models import (
     get_all_base_models,
     check_model_access,
     get_filtered_models,
+    is_model_access_filtered,
 )
+from open_webui.utils.model_list_cache import (
+    MODEL_LIST_CACHE,
+    get_model_list_cache_key,
+)
+from open_webui.utils.principal_cache import get_user_group_ids
 from open_webui.utils.chat import (
     generate_chat_completion as chat_completion_handler,
     chat_completed as chat_completed_handler,
@@ -488,6 +496,13 @@ from open_webui.utils.chat import (
 )
 from open_webui.utils.embeddings import generate_embeddings
 from open_webui.utils.middleware import process_chat_payload, process_chat_response
+from open_webui.utils.chat_buffer import CHAT_WRITE_BUFFER
+from open_webui.retrieval.embedding_client import EMBEDDING_CLIENT
+from open_webui.utils.http_client import UPSTREAM_SESSIONS
+from open_webui.utils.mcp.client import MCP_CLIENT_POOL
+from open_webui.utils.plugin_registry import PLUGIN_MODULES
+from open_webui.utils.webhook import WEBHOOK_DISPATCHER
+from open_webui.utils.knowledge_reindex import periodic_knowledge_reindex_resume
 from open_webui.utils.access_control import has_access
 
 from open_webui.utils.auth import (
@@ -599,6 +614,26 @@ async def lifespan(app: FastAPI):
         limiter.total_tokens = THREAD_POOL_SIZE
 
     asyncio.create_task(periodic_usage_pool_cleanup())
+    asyncio.create_task(periodic_knowledge_reindex_resume(app))
+
+    PLUGIN_MODULES.start_listener()
+    MODEL_LIST_CACHE.start_listener()
+
+    UPSTREAM_SESSIONS.configure(app.state.config)
+    UPSTREAM_SESSIONS.warm(
+        [
+            *(
+                app.state.config.OPENAI_API_BASE_URLS
+                if app.state.config.ENABLE_OPENAI_API
+                else []
+            ),
+            *(
+                app.state.config.OLLAMA_BASE_URLS
+                if app.state.config.ENABLE_OLLAMA_API
+                else []
+            ),
+        ]
+    )
 
     if app.state.config.ENABLE_BASE_MODELS_CACHE:
         await get_all_models(
@@ -623,6 +658,12 @@ async def lifespan(app: FastAPI):
 
     yield
 
+    await CHAT_WRITE_BUFFER.flush_all()
+    await EMBEDDING_CLIENT.close()
+    await UPSTREAM_SESSIONS.close()
+    await MCP_CLIENT_POOL.close()
+    await WEBHOOK_DISPATCHER.close()
+
     if hasattr(app.state, "redis_task_command_listener"):
         app.state.redis_task_command_listener.cancel()
 
@@ -820,10 +861,7 @@ app.state.AIOHTTP_CLIENT_SESSION_SSL = AIOHTTP_CLIENT_SESSION_SSL
 app.state.USER_COUNT = None
 
 app.state.TOOLS = {}
-app.state.TOOL_CONTENTS = {}
-
 app.state.FUNCTIONS = {}
-app.state.FUNCTION_CONTENTS = {}
 
 ########################################
 #
@@ -1427,11 +1465,8 @@ if audit_level != AuditLevel.NONE:
 ##################################
 
 
-@app.get("/api/models")
-@app.get("/api/v1/models")  # Experimental: Compatibility with OpenAI API
-async def get_models(
-    request: Request, refresh: bool = False, user=Depends(get_verified_user)
-):
+async def get_ordered_models(request: Request, refresh: bool = False, user=None):
+    """Models as listed by /api/models, before access filtering"""
     all_models = await get_all_models(request, refresh=refresh, user=user)
 
     models = []
@@ -1471,12 +1506,66 @@ async def get_models(
             )
         )
 
-    models = get_filtered_models(models, user)
+    return models
+
 
-    log.debug(
-        f"/api/models returned filtered models accessible to the user: {json.dumps([model.get('id') for model in models])}"
+@app.get("/api/models")
+@app.get("/api/v1/models")  # Experimental: Compatibility with OpenAI API
+async def get_models(
+    request: Request, refresh: bool = False, user=Depends(get_verified_user)
+):
+    list_version = MODEL_LIST_CACHE.get_version()
+    cache_version = (list_version, request.app.state.config.version)
+
+    filtered = is_model_access_filtered(user)
+    cache_key = get_model_list_cache_key(
+        user,
+        get_user_group_ids(user.id) if filtered else set(),
+        filtered,
+        per_user=ENABLE_FORWARD_USER_INFO_HEADERS,
     )
-    return {"data": models}
+
+    cached_response = None
+    if list_version is not None and not refresh:
+        cached_response = MODEL_LIST_CACHE.get_response(cache_key, cache_version)
+
+    if cached_response:
+        body, etag = cached_response
+    else:
+        # Upstreams may list different models per user when user info is forwarded
+        share_models = list_version is not None and not ENABLE_FORWARD_USER_INFO_HEADERS
+
+        models = None
+        if share_models and not refresh:
+            models = MODEL_LIST_CACHE.get_models(cache_version)
+
+        if models is None:
+            models = await get_ordered_models(request, refresh=refresh, user=user)
+            if share_models:
+                MODEL_LIST_CACHE.set_models(cache_version, models)
+
+        models = get_filtered_models(models, user)
+
+        log.debug(
+            f"/api/models returned filtered models accessible to the user: {json.dumps([model.get('id') for model in models])}"
+        )
+
+        body = JSONResponse(content=jsonable_encoder({"data": models})).body
+        if list_version is None:
+            return Response(content=body, media_type="application/json")
+
+        etag = MODEL_LIST_CACHE.set_response(cache_key, cache_version, body)
+
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (
+        if_none_match.strip() == "*"
+        or etag in [tag.strip() for tag in if_none_match.split(",")]
+    ):
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @app.get("/api/models/base")
@@ -1632,7 +1721,7 @@ async def chat_completion(
             if metadata.get("chat_id") and metadata.get("message_id"):
                 try:
                     if not metadata["chat_id"].startswith("local:"):
-                        Chats.upsert_message_to_chat_by_id_and_message_id(
+                        Chats.upsert_chat_message_by_id_and_message_id(
                             metadata["chat_id"],
                             metadata["message_id"],
                             {
@@ -1665,7 +1754,7 @@ async def chat_completion(
                 # Update the chat message with the error
                 try:
                     if not metadata["chat_id"].startswith("local:"):
-                        Chats.upsert_message_to_chat_by_id_and_message_id(
+                        Chats.upsert_chat_message_by_id_and_message_id(
                             metadata["chat_id"],
                             metadata["message_id"],
                             {
@@ -1691,11 +1780,18 @@ async def chat_completion(
             try:
                 if mcp_clients := metadata.get("mcp_clients"):
                     for client in reversed(mcp_clients.values()):
-                        await client.disconnect()
+                        await MCP_CLIENT_POOL.release(client)
             except Exception as e:
                 log.debug(f"Error cleaning up: {e}")
                 pass
 
+            try:
+                # Persist any message updates still buffered for this response
+                if metadata.get("chat_id"):
+                    await CHAT_WRITE_BUFFER.flush(metadata["chat_id"])
+            except Exception as e:
+                log.debug(f"Error flushing chat writes: {e}")
+
     if (
         metadata.get("session_id")
         and metadata.get("chat_id")
@@ -2024,7 +2120,7 @@ async def get_current_usage(user=Depends(get_verified_user)):
     """
     try:
         return {
-            "model_ids": get_models_in_use(),
+            "model_ids": await get_models_in_use(),
             "user_count": Users.get_active_user_count(),
         }
     except Exception as e:
@@ -0,0 +1,62 @@
+"""Add collection_alias and knowledge_reindex tables
+
+Revision ID: 4b3c1e9a7d52
+Revises: eb7582f2df02
+Create Date: 2025-12-12 10:21:34.902117
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "4b3c1e9a7d52"
+down_revision: Union[str, None] = "eb7582f2df02"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "collection_alias",
+        sa.Column("name", sa.Text(), primary_key=True, unique=True),
+        sa.Column("target", sa.Text(), nullable=True),
+        sa.Column("updated_at", sa.BigInteger(), nullable=True),
+    )
+
+    op.create_table(
+        "knowledge_reindex_job",
+        sa.Column("id", sa.Text(), primary_key=True, unique=True),
+        sa.Column("user_id", sa.Text(), nullable=True),
+        sa.Column("status", sa.Text(), nullable=True),
+        sa.Column("data", sa.JSON(), nullable=True),
+        sa.Column("owner", sa.Text(), nullable=True),
+        sa.Column("heartbeat_at", sa.BigInteger(), nullable=True),
+        sa.Column("created_at", sa.BigInteger(), nullable=True),
+        sa.Column("updated_at", sa.BigInteger(), nullable=True),
+        sa.Column("completed_at", sa.BigInteger(), nullable=True),
+    )
+
+    op.create_table(
+        "knowledge_reindex_item",
+        sa.Column(
+            "job_id",
+            sa.Text(),
+            sa.ForeignKey("knowledge_reindex_job.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("knowledge_id", sa.Text(), primary_key=True),
+        sa.Column("file_id", sa.Text(), primary_key=True),
+        sa.Column("status", sa.Text(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("updated_at", sa.BigInteger(), nullable=True),
+        sa.Index("ix_knowledge_reindex_item_status", "status"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("knowledge_reindex_item")
+    op.drop_table("knowledge_reindex_job")
+    op.drop_table("collection_alias")
@@ -0,0 +1,164 @@
+"""Add chat_message table
+
+Revision ID: 89e814ed937e
+Revises: 3e0e00844bb0
+Create Date: 2025-12-10 09:12:41.218053
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+import time
+import json
+
+# revision identifiers, used by Alembic.
+revision: str = "89e814ed937e"
+down_revision: Union[str, None] = "3e0e00844bb0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 100
+
+
+def upgrade() -> None:
+    op.create_table(
+        "chat_message",
+        sa.Column(
+            "chat_id",
+            sa.Text(),
+            sa.ForeignKey("chat.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("id", sa.Text(), primary_key=True),
+        sa.Column("data", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.BigInteger(), nullable=True),
+        sa.Column("updated_at", sa.BigInteger(), nullable=True),
+    )
+
+    connection = op.get_bind()
+
+    chat_table = sa.Table(
+        "chat",
+        sa.MetaData(),
+        sa.Column("id", sa.Text()),
+        sa.Column("chat", sa.JSON()),  # JSON stored as text in SQLite + PG
+    )
+
+    chat_message_table = sa.Table(
+        "chat_message",
+        sa.MetaData(),
+        sa.Column("chat_id", sa.Text()),
+        sa.Column("id", sa.Text()),
+        sa.Column("data", sa.JSON()),
+        sa.Column("created_at", sa.BigInteger()),
+        sa.Column("updated_at", sa.BigInteger()),
+    )
+
+    # Backfill message rows from history.messages, a batch of chats at a time
+    chat_ids = [
+        chat_id
+        for (chat_id,) in connection.execute(sa.select(chat_table.c.id)).fetchall()
+    ]
+
+    now = int(time.time())
+    for i in range(0, len(chat_ids), BATCH_SIZE):
+        results = connection.execute(
+            sa.select(chat_table.c.id, chat_table.c.chat).where(
+                chat_table.c.id.in_(chat_ids[i : i + BATCH_SIZE])
+            )
+        ).fetchall()
+
+        rows = []
+        for chat_id, chat in results:
+            if isinstance(chat, str):
+                try:
+                    chat = json.loads(chat)
+                except Exception:
+                    continue  # skip invalid JSON
+
+            if not isinstance(chat, dict):
+                continue
+
+            messages = (chat.get("history") or {}).get("messages") or {}
+            if not isinstance(messages, dict):
+                continue
+
+            for message_id, message in messages.items():
+                if not isinstance(message, dict):
+                    continue
+
+                rows.append(
+                    {
+                        "chat_id": chat_id,
+                        "id": message_id,
+                        "data": message,
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+                )
+
+        if rows:
+            connection.execute(chat_message_table.insert(), rows)
+
+
+def downgrade() -> None:
+    connection = op.get_bind()
+
+    chat_table = sa.Table(
+        "chat",
+        sa.MetaData(),
+        sa.Column("id", sa.Text()),
+        sa.Column("chat", sa.JSON()),
+    )
+
+    chat_message_table = sa.Table(
+        "chat_message",
+        sa.MetaData(),
+        sa.Column("chat_id", sa.Text()),
+        sa.Column("id", sa.Text()),
+        sa.Column("data", sa.JSON()),
+    )
+
+    # Fold message rows written since the last full save back into the chat JSON
+    chat_ids = [
+        chat_id
+        for (chat_id,) in connection.execute(
+            sa.select(chat_message_table.c.chat_id).distinct()
+        ).fetchall()
+    ]
+
+    for chat_id in chat_ids:
+        chat = connection.execute(
+            sa.select(chat_table.c.chat).where(chat_table.c.id == chat_id)
+        ).scalar()
+
+        if isinstance(chat, str):
+            try:
+                chat = json.loads(chat)
+            except Exception:
+                continue
+
+        if not isinstance(chat, dict):
+            continue
+
+        messages = connection.execute(
+            sa.select(chat_message_table.c.id, chat_message_table.c.data).where(
+                chat_message_table.c.chat_id == chat_id
+            )
+        ).fetchall()
+
+        history = chat.get("history") or {}
+        history["messages"] = {
+            **(history.get("messages") or {}),
+            **{message_id: data for message_id, data in messages},
+        }
+        chat["history"] = history
+
+        connection.execute(
+            chat_table.update().where(chat_table.c.id == chat_id).values(chat=chat)
+        )
+
+    op.drop_table("chat_message")
@@ -0,0 +1,163 @@
+"""Add chat_search table and full-text index
+
+Revision ID: 9c2f4e7a1b38
+Revises: 4b3c1e9a7d52
+Create Date: 2025-12-13 11:04:52.317640
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from open_webui.utils.chat_search import get_search_terms
+
+# revision identifiers, used by Alembic.
+revision: str = "9c2f4e7a1b38"
+down_revision: Union[str, None] = "4b3c1e9a7d52"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 100
+
+
+def upgrade() -> None:
+    op.create_table(
+        "chat_search",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column(
+            "chat_id",
+            sa.Text(),
+            sa.ForeignKey("chat.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("message_id", sa.Text(), nullable=False),
+        sa.Column("terms", sa.Text(), nullable=True),
+        sa.UniqueConstraint("chat_id", "message_id", name="uq_chat_search_message"),
+    )
+
+    connection = op.get_bind()
+
+    chat_table = sa.Table(
+        "chat",
+        sa.MetaData(),
+        sa.Column("id", sa.Text()),
+        sa.Column("user_id", sa.Text()),
+        sa.Column("title", sa.Text()),
+    )
+
+    chat_message_table = sa.Table(
+        "chat_message",
+        sa.MetaData(),
+        sa.Column("chat_id", sa.Text()),
+        sa.Column("id", sa.Text()),
+        sa.Column("data", sa.JSON()),
+    )
+
+    chat_search_table = sa.Table(
+        "chat_search",
+        sa.MetaData(),
+        sa.Column("chat_id", sa.Text()),
+        sa.Column("message_id", sa.Text()),
+        sa.Column("terms", sa.Text()),
+    )
+
+    # Backfill the title and message terms, a batch of chats at a time.
+    # Shared chat snapshots are never searched and are left out.
+    chat_ids = [
+        chat_id
+        for (chat_id,) in connection.execute(
+            sa.select(chat_table.c.id).where(
+                sa.not_(chat_table.c.user_id.like("shared-%"))
+            )
+        ).fetchall()
+    ]
+
+    for i in range(0, len(chat_ids), BATCH_SIZE):
+        batch_ids = chat_ids[i : i + BATCH_SIZE]
+
+        rows = [
+            {
+                "chat_id": chat_id,
+                "message_id": "",
+                "terms": " ".join(get_search_terms(title)),
+            }
+            for chat_id, title in connection.execute(
+                sa.select(chat_table.c.id, chat_table.c.title).where(
+                    chat_table.c.id.in_(batch_ids)
+                )
+            ).fetchall()
+        ]
+
+        for chat_id, message_id, data in connection.execute(
+            sa.select(
+                chat_message_table.c.chat_id,
+                chat_message_table.c.id,
+                chat_message_table.c.data,
+            ).where(chat_message_table.c.chat_id.in_(batch_ids))
+        ).fetchall():
+            content = data.get("content") if isinstance(data, dict) else None
+            if not isinstance(content, str):
+                continue
+
+            terms = " ".join(get_search_terms(content))
+            if terms:
+                rows.append(
+                    {"chat_id": chat_id, "message_id": message_id, "terms": terms}
+                )
+
+        if rows:
+            connection.execute(chat_search_table.insert(), rows)
+
+    if connection.dialect.name == "sqlite":
+        # External content FTS5 table over chat_search, kept in sync by triggers
+        op.execute(
+            "CREATE VIRTUAL TABLE chat_search_fts USING fts5("
+            "terms, content='chat_search', content_rowid='id')"
+        )
+        op.execute("INSERT INTO chat_search_fts(chat_search_fts) VALUES ('rebuild')")
+        op.execute(
+            """
+            CREATE TRIGGER chat_search_ai AFTER INSERT ON chat_search BEGIN
+                INSERT INTO chat_search_fts(rowid, terms) VALUES (new.id, new.terms);
+            END
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER chat_search_ad AFTER DELETE ON chat_search BEGIN
+                INSERT INTO chat_search_fts(chat_search_fts, rowid, terms)
+                VALUES ('delete', old.id, old.terms);
+            END
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER chat_search_au AFTER UPDATE ON chat_search BEGIN
+                INSERT INTO chat_search_fts(chat_search_fts, rowid, terms)
+                VALUES ('delete', old.id, old.terms);
+                INSERT INTO chat_search_fts(rowid, terms) VALUES (new.id, new.terms);
+            END
+            """
+        )
+    elif connection.dialect.name == "postgresql":
+        # The terms are pre-tokenized, so they become lexemes as they are
+        op.execute(
+            "CREATE INDEX chat_search_terms_idx ON chat_search "
+            "USING GIN (array_to_tsvector(string_to_array(terms, ' ')))"
+        )
+
+
+def downgrade() -> None:
+    connection = op.get_bind()
+
+    if connection.dialect.name == "sqlite":
+        op.execute("DROP TRIGGER IF EXISTS chat_search_ai")
+        op.execute("DROP TRIGGER IF EXISTS chat_search_ad")
+        op.execute("DROP TRIGGER IF EXISTS chat_search_au")
+        op.execute("DROP TABLE IF EXISTS chat_search_fts")
+    elif connection.dialect.name == "postgresql":
+        op.execute("DROP INDEX IF EXISTS chat_search_terms_idx")
+
+    op.drop_table("chat_search")
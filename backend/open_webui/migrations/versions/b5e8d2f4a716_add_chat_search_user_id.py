@@ -0,0 +1,33 @@
+"""Add user_id to chat_search
+
+Revision ID: b5e8d2f4a716
+Revises: e1f3a9c27b64
+Create Date: 2026-01-08 14:22:05.911734
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "b5e8d2f4a716"
+down_revision: Union[str, None] = "e1f3a9c27b64"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Searches filter the full-text matches by owner inside the subquery
+    op.add_column("chat_search", sa.Column("user_id", sa.Text(), nullable=True))
+    op.execute(
+        "UPDATE chat_search SET user_id = "
+        "(SELECT chat.user_id FROM chat WHERE chat.id = chat_search.chat_id)"
+    )
+    op.create_index("chat_search_user_id_idx", "chat_search", ["user_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("chat_search_user_id_idx", table_name="chat_search")
+    op.drop_column("chat_search", "user_id")
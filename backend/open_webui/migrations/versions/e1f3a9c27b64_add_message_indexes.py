@@ -0,0 +1,31 @@
+"""Add message thread and reaction indexes
+
+Revision ID: e1f3a9c27b64
+Revises: 9c2f4e7a1b38
+Create Date: 2025-12-20 09:41:17.502846
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "e1f3a9c27b64"
+down_revision: Union[str, None] = "9c2f4e7a1b38"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Thread replies and reactions are looked up by message id
+    op.create_index("message_parent_id_idx", "message", ["parent_id"])
+    op.create_index(
+        "message_reaction_message_id_idx", "message_reaction", ["message_id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("message_reaction_message_id_idx", table_name="message_reaction")
+    op.drop_index("message_parent_id_idx", table_name="message")
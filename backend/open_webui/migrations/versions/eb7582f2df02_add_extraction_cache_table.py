@@ -0,0 +1,34 @@
+"""Add extraction_cache table
+
+Revision ID: eb7582f2df02
+Revises: 89e814ed937e
+Create Date: 2025-12-11 15:40:07.513284
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "eb7582f2df02"
+down_revision: Union[str, None] = "89e814ed937e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "extraction_cache",
+        sa.Column("id", sa.Text(), primary_key=True, unique=True),
+        sa.Column("path", sa.Text(), nullable=True),
+        sa.Column("size", sa.BigInteger(), nullable=True),
+        sa.Column("created_at", sa.BigInteger(), nullable=True),
+        sa.Column("last_accessed_at", sa.BigInteger(), nullable=True),
+        sa.Index("ix_extraction_cache_last_accessed_at", "last_accessed_at"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("extraction_cache")
@@ -5,6 +5,7 @@ from typing import Optional
 
 from open_webui.internal.db import Base, get_db
 from open_webui.models.groups import Groups
+from open_webui.utils.principal_cache import get_user_group_ids
 
 from pydantic import BaseModel, ConfigDict
 from sqlalchemy.dialects.postgresql import JSONB
@@ -340,9 +341,7 @@ class ChannelTable:
 
     def get_channels_by_user_id(self, user_id: str) -> list[ChannelModel]:
         with get_db() as db:
-            user_group_ids = [
-                group.id for group in Groups.get_groups_by_member_id(user_id)
-            ]
+            user_group_ids = list(get_user_group_ids(user_id))
 
             membership_channels = (
                 db.query(Channel)
@@ -566,6 +565,15 @@ class ChannelTable:
                 for membership in memberships
             ]
 
+    def get_member_user_ids_by_channel_id(self, channel_id: str) -> set[str]:
+        with get_db() as db:
+            return {
+                user_id
+                for (user_id,) in db.query(ChannelMember.user_id)
+                .filter(ChannelMember.channel_id == channel_id)
+                .all()
+            }
+
     def pin_channel(self, channel_id: str, user_id: str, is_pinned: bool) -> bool:
         with get_db() as db:
             membership = (
@@ -8,12 +8,23 @@ from open_webui.internal.db import Base, get_db
 from open_webui.models.tags import TagModel, Tag, Tags
 from open_webui.models.folders import Folders
 from open_webui.env import SRC_LOG_LEVELS
+from open_webui.utils.chat_search import get_search_terms, get_search_query_terms
 
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Boolean, Column, String, Text, JSON, Index
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Column,
+    ForeignKey,
+    String,
+    Integer,
+    Text,
+    JSON,
+    Index,
+    UniqueConstraint,
+)
 from sqlalchemy import or_, func, select, and_, text
 from sqlalchemy.sql import exists
-from sqlalchemy.sql.expression import bindparam
 
 ####################
 # Chat DB Schema
@@ -56,6 +67,42 @@ class Chat(Base):
     )
 
 
+class ChatMessage(Base):
+    __tablename__ = "chat_message"
+
+    # Message ids are only unique within a chat (cloned and imported chats
+    # keep them), so rows are keyed by (chat_id, id).
+    chat_id = Column(
+        Text, ForeignKey("chat.id", ondelete="CASCADE"), primary_key=True
+    )
+    id = Column(Text, primary_key=True)
+
+    data = Column(JSON)
+
+    created_at = Column(BigInteger)
+    updated_at = Column(BigInteger)
+
+
+class ChatSearch(Base):
+    __tablename__ = "chat_search"
+
+    # Integer key doubles as the rowid of the SQLite FTS5 index
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    chat_id = Column(Text, ForeignKey("chat.id", ondelete="CASCADE"), nullable=False)
+    # Empty for the chat title, the message id otherwise
+    message_id = Column(Text, nullable=False)
+    # Owner of the chat, lets searches skip other users' rows
+    user_id = Column(Text)
+
+    # Space separated terms from utils.chat_search.get_search_terms
+    terms = Column(Text)
+
+    __table_args__ = (
+        UniqueConstraint("chat_id", "message_id", name="uq_chat_search_message"),
+        Index("chat_search_user_id_idx", "user_id"),
+    )
+
+
 class ChatModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -75,6 +122,17 @@ class ChatModel(BaseModel):
     folder_id: Optional[str] = None
 
 
+class ChatMessageModel(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    chat_id: str
+    id: str
+    data: dict
+
+    created_at: int  # timestamp in epoch
+    updated_at: int  # timestamp in epoch
+
+
 ####################
 # Forms
 ####################
@@ -164,6 +222,290 @@ class ChatTable:
 
         return changed
 
+    ####################
+    # Message rows
+    #
+    # Messages live in the chat_message table, one row per message. The
+    # history.messages map in the chat JSON is only rewritten on full chat
+    # saves; rows written since then are overlaid on read.
+    ####################
+
+    def _get_history_messages(self, chat: dict) -> dict:
+        return ((chat or {}).get("history") or {}).get("messages") or {}
+
+    def _get_message_rows_by_chat_ids(
+        self, db, chat_ids: list[str]
+    ) -> dict[str, dict[str, dict]]:
+        messages_by_chat_id = {}
+
+        # Chunked to stay below the bound parameter limit of SQLite
+        for i in range(0, len(chat_ids), 500):
+            rows = db.query(ChatMessage.chat_id, ChatMessage.id, ChatMessage.data).filter(
+                ChatMessage.chat_id.in_(chat_ids[i : i + 500])
+            )
+            for chat_id, message_id, data in rows:
+                messages_by_chat_id.setdefault(chat_id, {})[message_id] = data
+
+        return messages_by_chat_id
+
+    def _to_chat_model(self, chat_item, messages: Optional[dict] = None) -> ChatModel:
+        chat = ChatModel.model_validate(chat_item)
+        if messages:
+            history = chat.chat.get("history") or {}
+            chat.chat = {
+                **chat.chat,
+                "history": {
+                    **history,
+                    "messages": {**(history.get("messages") or {}), **messages},
+                },
+            }
+        return chat
+
+    def _to_chat_models(self, db, chat_items) -> list[ChatModel]:
+        chat_items = list(chat_items)
+        messages_by_chat_id = self._get_message_rows_by_chat_ids(
+            db, [chat_item.id for chat_item in chat_items]
+        )
+        return [
+            self._to_chat_model(chat_item, messages_by_chat_id.get(chat_item.id))
+            for chat_item in chat_items
+        ]
+
+    def _sync_message_rows(self, db, id: str, messages: dict, timestamp: int):
+        """
+        Make the message rows of a chat match a full messages map, writing
+        only the rows that actually changed.
+        """
+        rows = {
+            row.id: row for row in db.query(ChatMessage).filter_by(chat_id=id).all()
+        }
+
+        for message_id, message in messages.items():
+            if not isinstance(message, dict):
+                continue
+
+            row = rows.pop(message_id, None)
+            if row is None:
+                db.add(
+                    ChatMessage(
+                        chat_id=id,
+                        id=message_id,
+                        data=message,
+                        created_at=timestamp,
+                        updated_at=timestamp,
+                    )
+                )
+            elif row.data != message:
+                row.data = message
+                row.updated_at = timestamp
+
+        if rows:
+            db.query(ChatMessage).filter(
+                ChatMessage.chat_id == id, ChatMessage.id.in_(list(rows.keys()))
+            ).delete(synchronize_session=False)
+
+    ####################
+    # Search rows
+    #
+    # chat_search holds the tokenized title and message contents of every
+    # chat, indexed by FTS5 on SQLite and a GIN tsvector index on Postgres
+    # (see the add_chat_search_table migration). Rows are kept in step with
+    # the chat and message writes below.
+    ####################
+
+    def _get_search_terms(self, message: dict) -> Optional[str]:
+        content = message.get("content") if isinstance(message, dict) else None
+        if not isinstance(content, str):
+            return None
+        return " ".join(get_search_terms(content)) or None
+
+    def _get_search_rows(self, title: str, messages: dict) -> dict[str, str]:
+        rows = {"": " ".join(get_search_terms(title))}
+        for message_id, message in messages.items():
+            terms = self._get_search_terms(message)
+            if terms:
+                rows[message_id] = terms
+        return rows
+
+    def _sync_search_rows(
+        self, db, id: str, user_id: str, title: str, messages: dict
+    ):
+        search_rows = self._get_search_rows(title, messages)
+        rows = {
+            row.message_id: row
+            for row in db.query(ChatSearch).filter_by(chat_id=id).all()
+        }
+
+        for message_id, terms in search_rows.items():
+            row = rows.pop(message_id, None)
+            if row is None:
+                db.add(
+                    ChatSearch(
+                        chat_id=id, message_id=message_id, user_id=user_id, terms=terms
+                    )
+                )
+            elif row.terms != terms:
+                row.terms = terms
+
+        if rows:
+            db.query(ChatSearch).filter(
+                ChatSearch.chat_id == id,
+                ChatSearch.message_id.in_(list(rows.keys())),
+            ).delete(synchronize_session=False)
+
+    def _write_search_row(
+        self, db, id: str, user_id: str, message_id: str, message: dict
+    ):
+        terms = self._get_search_terms(message)
+        row = db.query(ChatSearch).filter_by(chat_id=id, message_id=message_id).first()
+        if row is None:
+            if terms:
+                db.add(
+                    ChatSearch(
+                        chat_id=id, message_id=message_id, user_id=user_id, terms=terms
+                    )
+                )
+        elif not terms:
+            db.delete(row)
+        elif row.terms != terms:
+            row.terms = terms
+
+    def _delete_search_rows(self, db, chat_ids):
+        db.query(ChatSearch).filter(ChatSearch.chat_id.in_(chat_ids)).delete(
+            synchronize_session=False
+        )
+
+    def _touch_chat(self, db, id: str, timestamp: int):
+        # Only bump updated_at, the chat JSON is left untouched
+        db.query(Chat).filter(Chat.id == id, Chat.updated_at < timestamp).update(
+            {"updated_at": timestamp}, synchronize_session=False
+        )
+
+    def _write_message_row(
+        self, db, id: str, message_id: str, message: dict, timestamp: int
+    ) -> ChatMessage:
+        row = db.get(ChatMessage, {"chat_id": id, "id": message_id})
+        if row is None:
+            row = ChatMessage(
+                chat_id=id,
+                id=message_id,
+                data=message,
+                created_at=timestamp,
+                updated_at=timestamp,
+            )
+            db.add(row)
+        else:
+            row.data = message
+            row.updated_at = timestamp
+        return row
+
+    def _get_message_data(self, db, id: str, message_id: str) -> Optional[dict]:
+        row = db.get(ChatMessage, {"chat_id": id, "id": message_id})
+        if row is not None:
+            return row.data
+
+        # Not written as a row yet, fall back to the chat JSON
+        chat = db.query(Chat.chat).filter(Chat.id == id).first()
+        if chat is None:
+            return None
+        return self._get_history_messages(chat[0]).get(message_id)
+
+    def get_chat_message_by_id_and_message_id(
+        self, id: str, message_id: str
+    ) -> Optional[ChatMessageModel]:
+        try:
+            with get_db() as db:
+                row = db.get(ChatMessage, {"chat_id": id, "id": message_id})
+                return ChatMessageModel.model_validate(row) if row else None
+        except Exception:
+            return None
+
+    def upsert_chat_message_by_id_and_message_id(
+        self, id: str, message_id: str, message: dict
+    ) -> Optional[ChatMessageModel]:
+        """
+        Merge `message` into a single message row and make it the current
+        message of the chat, without rewriting the chat JSON.
+        """
+        # Sanitize message content for null characters before upserting
+        if isinstance(message.get("content"), str):
+            message["content"] = message["content"].replace("\x00", "")
+
+        try:
+            with get_db() as db:
+                current = (
+                    db.query(
+                        Chat.chat["history"]["currentId"].as_string(), Chat.user_id
+                    )
+                    .filter(Chat.id == id)
+                    .first()
+                )
+                if current is None:
+                    return None
+
+                timestamp = int(time.time())
+                existing = self._get_message_data(db, id, message_id) or {}
+                row = self._write_message_row(
+                    db,
+                    id,
+                    message_id,
+                    self._clean_null_bytes({**existing, **message}),
+                    timestamp,
+                )
+                if "content" in message:
+                    self._write_search_row(db, id, current[1], message_id, row.data)
+
+                if current[0] != message_id:
+                    # currentId only changes once per new message
+                    chat_item = db.get(Chat, id)
+                    chat = chat_item.chat or {}
+                    chat_item.chat = {
+                        **chat,
+                        "history": {
+                            **(chat.get("history") or {}),
+                            "currentId": message_id,
+                        },
+                    }
+                    chat_item.updated_at = timestamp
+                else:
+                    self._touch_chat(db, id, timestamp)
+
+                db.commit()
+                db.refresh(row)
+                return ChatMessageModel.model_validate(row)
+        except Exception as e:
+            log.exception(f"Error upserting message {message_id} of chat {id}: {e}")
+            return None
+
+    def add_chat_message_status_by_id_and_message_id(
+        self, id: str, message_id: str, status: dict
+    ) -> Optional[ChatMessageModel]:
+        try:
+            with get_db() as db:
+                message = self._get_message_data(db, id, message_id)
+                if message is None:
+                    return None
+
+                timestamp = int(time.time())
+                row = self._write_message_row(
+                    db,
+                    id,
+                    message_id,
+                    {
+                        **message,
+                        "statusHistory": [*message.get("statusHistory", []), status],
+                    },
+                    timestamp,
+                )
+                self._touch_chat(db, id, timestamp)
+
+                db.commit()
+                db.refresh(row)
+                return ChatMessageModel.model_validate(row)
+        except Exception as e:
+            log.exception(f"Error adding status to message {message_id} of chat {id}: {e}")
+            return None
+
     def insert_new_chat(self, user_id: str, form_data: ChatForm) -> Optional[ChatModel]:
         with get_db() as db:
             id = str(uuid.uuid4())
@@ -185,6 +527,12 @@ class ChatTable:
 
             chat_item = Chat(**chat.model_dump())
             db.add(chat_item)
+            self._sync_message_rows(
+                db, id, self._get_history_messages(chat.chat), chat.created_at
+            )
+            self._sync_search_rows(
+                db, id, user_id, chat.title, self._get_history_messages(chat.chat)
+            )
             db.commit()
             db.refresh(chat_item)
             return ChatModel.model_validate(chat_item) if chat_item else None
@@ -224,7 +572,37 @@ class ChatTable:
                 chat = self._chat_import_form_to_chat_model(user_id, form_data)
                 chats.append(Chat(**chat.model_dump()))
 
+                db.add_all(
+                    [
+                        ChatMessage(
+                            chat_id=chat.id,
+                            id=message_id,
+                            data=message,
+                            created_at=chat.updated_at,
+                            updated_at=chat.updated_at,
+                        )
+                        for message_id, message in self._get_history_messages(
+                            chat.chat
+                        ).items()
+                        if isinstance(message, dict)
+                    ]
+                )
+
             db.add_all(chats)
+            db.add_all(
+                [
+                    ChatSearch(
+                        chat_id=chat.id,
+                        message_id=message_id,
+                        user_id=chat.user_id,
+                        terms=terms,
+                    )
+                    for chat in chats
+                    for message_id, terms in self._get_search_rows(
+                        chat.title, self._get_history_messages(chat.chat)
+                    ).items()
+                ]
+            )
             db.commit()
             return [ChatModel.model_validate(chat) for chat in chats]
 
@@ -240,6 +618,19 @@ class ChatTable:
                 )
 
                 chat_item.updated_at = int(time.time())
+                self._sync_message_rows(
+                    db,
+                    id,
+                    self._get_history_messages(chat_item.chat),
+                    chat_item.updated_at,
+                )
+                self._sync_search_rows(
+                    db,
+                    id,
+                    chat_item.user_id,
+                    chat_item.title,
+                    self._get_history_messages(chat_item.chat),
+                )
 
                 db.commit()
                 db.refresh(chat_item)
@@ -286,85 +677,59 @@ class ChatTable:
         return chat.chat.get("title", "New Chat")
 
     def get_messages_map_by_chat_id(self, id: str) -> Optional[dict]:
+        with get_db() as db:
+            messages = self._get_message_rows_by_chat_ids(db, [id]).get(id)
+            if messages:
+                return messages
+
         chat = self.get_chat_by_id(id)
         if chat is None:
             return None
 
-        return chat.chat.get("history", {}).get("messages", {}) or {}
+        return self._get_history_messages(chat.chat)
 
     def get_message_by_id_and_message_id(
         self, id: str, message_id: str
     ) -> Optional[dict]:
+        message = self.get_chat_message_by_id_and_message_id(id, message_id)
+        if message is not None:
+            return message.data
+
         chat = self.get_chat_by_id(id)
         if chat is None:
             return None
 
-        return chat.chat.get("history", {}).get("messages", {}).get(message_id, {})
+        return self._get_history_messages(chat.chat).get(message_id, {})
 
     def upsert_message_to_chat_by_id_and_message_id(
         self, id: str, message_id: str, message: dict
     ) -> Optional[ChatModel]:
-        chat = self.get_chat_by_id(id)
-        if chat is None:
-            return None
-
-        # Sanitize message content for null characters before upserting
-        if isinstance(message.get("content"), str):
-            message["content"] = message["content"].replace("\x00", "")
-
-        chat = chat.chat
-        history = chat.get("history", {})
-
-        if message_id in history.get("messages", {}):
-            history["messages"][message_id] = {
-                **history["messages"][message_id],
-                **message,
-            }
-        else:
-            history["messages"][message_id] = message
-
-        history["currentId"] = message_id
-
-        chat["history"] = history
-        return self.update_chat_by_id(id, chat)
+        if self.upsert_chat_message_by_id_and_message_id(id, message_id, message):
+            return self.get_chat_by_id(id)
+        return None
 
     def add_message_status_to_chat_by_id_and_message_id(
         self, id: str, message_id: str, status: dict
     ) -> Optional[ChatModel]:
-        chat = self.get_chat_by_id(id)
-        if chat is None:
-            return None
-
-        chat = chat.chat
-        history = chat.get("history", {})
-
-        if message_id in history.get("messages", {}):
-            status_history = history["messages"][message_id].get("statusHistory", [])
-            status_history.append(status)
-            history["messages"][message_id]["statusHistory"] = status_history
-
-        chat["history"] = history
-        return self.update_chat_by_id(id, chat)
+        self.add_chat_message_status_by_id_and_message_id(id, message_id, status)
+        return self.get_chat_by_id(id)
 
     def add_message_files_by_id_and_message_id(
         self, id: str, message_id: str, files: list[dict]
     ) -> list[dict]:
-        chat = self.get_chat_by_id(id)
-        if chat is None:
-            return None
-
-        chat = chat.chat
-        history = chat.get("history", {})
-
-        message_files = []
-
-        if message_id in history.get("messages", {}):
-            message_files = history["messages"][message_id].get("files", [])
-            message_files = message_files + files
-            history["messages"][message_id]["files"] = message_files
+        message = self.get_chat_message_by_id_and_message_id(id, message_id)
+        if message is None:
+            # Fall back to the chat JSON for messages without a row
+            message = self.get_message_by_id_and_message_id(id, message_id)
+            if not message:
+                return None if message is None else []
+        else:
+            message = message.data
 
-        chat["history"] = history
-        self.update_chat_by_id(id, chat)
+        message_files = message.get("files", []) + files
+        self.upsert_chat_message_by_id_and_message_id(
+            id, message_id, {"files": message_files}
+        )
         return message_files
 
     def insert_shared_chat_by_chat_id(self, chat_id: str) -> Optional[ChatModel]:
@@ -374,6 +739,8 @@ class ChatTable:
             # Check if the chat is already shared
             if chat.share_id:
                 return self.get_chat_by_id_and_user_id(chat.share_id, "shared")
+            # Snapshot with the message rows applied
+            chat = self._to_chat_models(db, [chat])[0]
             # Create a new chat with the same data, but with a new ID
             shared_chat = ChatModel(
                 **{
@@ -413,6 +780,8 @@ class ChatTable:
                 if shared_chat is None:
                     return self.insert_shared_chat_by_chat_id(chat_id)
 
+                chat = self._to_chat_models(db, [chat])[0]
+
                 shared_chat.title = chat.title
                 shared_chat.chat = chat.chat
                 shared_chat.meta = chat.meta
@@ -454,7 +823,7 @@ class ChatTable:
                 chat.share_id = share_id
                 db.commit()
                 db.refresh(chat)
-                return ChatModel.model_validate(chat)
+                return self._to_chat_models(db, [chat])[0]
         except Exception:
             return None
 
@@ -466,7 +835,7 @@ class ChatTable:
                 chat.updated_at = int(time.time())
                 db.commit()
                 db.refresh(chat)
-                return ChatModel.model_validate(chat)
+                return self._to_chat_models(db, [chat])[0]
         except Exception:
             return None
 
@@ -479,7 +848,7 @@ class ChatTable:
                 chat.updated_at = int(time.time())
                 db.commit()
                 db.refresh(chat)
-                return ChatModel.model_validate(chat)
+                return self._to_chat_models(db, [chat])[0]
         except Exception:
             return None
 
@@ -530,7 +899,7 @@ class ChatTable:
                 query = query.limit(limit)
 
             all_chats = query.all()
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(db, all_chats)
 
     def get_chat_list_by_user_id(
         self,
@@ -569,7 +938,7 @@ class ChatTable:
                 query = query.limit(limit)
 
             all_chats = query.all()
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(db, all_chats)
 
     def get_chat_title_id_list_by_user_id(
         self,
@@ -627,7 +996,7 @@ class ChatTable:
                 .order_by(Chat.updated_at.desc())
                 .all()
             )
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(db, all_chats)
 
     def get_chat_by_id(self, id: str) -> Optional[ChatModel]:
         try:
@@ -640,7 +1009,7 @@ class ChatTable:
                     db.commit()
                     db.refresh(chat_item)
 
-                return ChatModel.model_validate(chat_item)
+                return self._to_chat_models(db, [chat_item])[0]
         except Exception:
             return None
 
@@ -662,7 +1031,7 @@ class ChatTable:
         try:
             with get_db() as db:
                 chat = db.query(Chat).filter_by(id=id, user_id=user_id).first()
-                return ChatModel.model_validate(chat)
+                return self._to_chat_models(db, [chat])[0]
         except Exception:
             return None
 
@@ -673,7 +1042,7 @@ class ChatTable:
                 # .limit(limit).offset(skip)
                 .order_by(Chat.updated_at.desc())
             )
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(db, all_chats)
 
     def get_chats_by_user_id(self, user_id: str) -> list[ChatModel]:
         with get_db() as db:
@@ -682,7 +1051,7 @@ class ChatTable:
                 .filter_by(user_id=user_id)
                 .order_by(Chat.updated_at.desc())
             )
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(db, all_chats)
 
     def get_pinned_chats_by_user_id(self, user_id: str) -> list[ChatModel]:
         with get_db() as db:
@@ -691,7 +1060,7 @@ class ChatTable:
                 .filter_by(user_id=user_id, pinned=True, archived=False)
                 .order_by(Chat.updated_at.desc())
             )
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(db, all_chats)
 
     def get_archived_chats_by_user_id(self, user_id: str) -> list[ChatModel]:
         with get_db() as db:
@@ -700,7 +1069,7 @@ class ChatTable:
                 .filter_by(user_id=user_id, archived=True)
                 .order_by(Chat.updated_at.desc())
             )
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(db, all_chats)
 
     def get_chats_by_user_id_and_search_text(
         self,
@@ -796,21 +1165,33 @@ class ChatTable:
 
             # Check if the database dialect is either 'sqlite' or 'postgresql'
             dialect_name = db.bind.dialect.name
+            search_terms = get_search_query_terms(search_text)
+
             if dialect_name == "sqlite":
-                # SQLite case: using JSON1 extension for JSON searching
-                sqlite_content_sql = (
-                    "EXISTS ("
-                    "    SELECT 1 "
-                    "    FROM json_each(Chat.chat, '$.messages') AS message "
-                    "    WHERE LOWER(message.value->>'content') LIKE '%' || :content_key || '%'"
-                    ")"
-                )
-                sqlite_content_clause = text(sqlite_content_sql)
-                query = query.filter(
-                    or_(
-                        Chat.title.ilike(bindparam("title_key")), sqlite_content_clause
-                    ).params(title_key=f"%{search_text}%", content_key=search_text)
-                )
+                # SQLite case: FTS5 index over the chat_search terms
+                if search_terms:
+                    query = query.filter(
+                        text(
+                            """
+                            chat.id IN (
+                                SELECT chat_search.chat_id
+                                FROM chat_search
+                                JOIN chat_search_fts
+                                    ON chat_search_fts.rowid = chat_search.id
+                                WHERE chat_search.user_id = :search_user_id
+                                    AND chat_search_fts MATCH :search_query
+                            )
+                            """
+                        ).bindparams(
+                            search_user_id=user_id,
+                            search_query=" AND ".join(
+                                f'"{term}"*' if is_prefix else f'"{term}"'
+                                for term, is_prefix in search_terms
+                            )
+                        )
+                    )
+                elif search_text:
+                    query = query.filter(Chat.title.ilike(f"%{search_text}%"))
 
                 # Check if there are any tags to filter, it should have all the tags
                 if "none" in tag_ids:
@@ -843,32 +1224,31 @@ class ChatTable:
                     )
 
             elif dialect_name == "postgresql":
-                # PostgreSQL doesn't allow null bytes in text. We filter those out by checking
-                # the JSON representation for \u0000 before attempting text extraction
-
-                # Safety filter: JSON field must not contain \u0000
-                query = query.filter(text("Chat.chat::text NOT LIKE '%\\\\u0000%'"))
-
-                # Safety filter: title must not contain actual null bytes
-                query = query.filter(text("Chat.title::text NOT LIKE '%\\x00%'"))
-
-                postgres_content_sql = """
-                EXISTS (
-                    SELECT 1
-                    FROM json_array_elements(Chat.chat->'messages') AS message
-                    WHERE json_typeof(message->'content') = 'string'
-                    AND LOWER(message->>'content') LIKE '%' || :content_key || '%'
-                )
-                """
-
-                postgres_content_clause = text(postgres_content_sql)
-
-                query = query.filter(
-                    or_(
-                        Chat.title.ilike(bindparam("title_key")),
-                        postgres_content_clause,
+                # PostgreSQL case: GIN index over the chat_search terms, the
+                # terms are already tokenized so they map to lexemes directly
+                if search_terms:
+                    query = query.filter(
+                        text(
+                            """
+                            chat.id IN (
+                                SELECT chat_search.chat_id
+                                FROM chat_search
+                                WHERE chat_search.user_id = :search_user_id
+                                    AND array_to_tsvector(
+                                        string_to_array(chat_search.terms, ' ')
+                                    ) @@ CAST(:search_query AS tsquery)
+                            )
+                            """
+                        ).bindparams(
+                            search_user_id=user_id,
+                            search_query=" & ".join(
+                                f"'{term}':*" if is_prefix else f"'{term}'"
+                                for term, is_prefix in search_terms
+                            )
+                        )
                     )
-                ).params(title_key=f"%{search_text}%", content_key=search_text.lower())
+                elif search_text:
+                    query = query.filter(Chat.title.ilike(f"%{search_text}%"))
 
                 # Check if there are any tags to filter, it should have all the tags
                 if "none" in tag_ids:
@@ -910,7 +1290,7 @@ class ChatTable:
             log.info(f"The number of chats: {len(all_chats)}")
 
             # Validate and return chats
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(db, all_chats)
 
     def get_chats_by_folder_id_and_user_id(
         self, folder_id: str, user_id: str, skip: int = 0, limit: int = 60
@@ -928,7 +1308,7 @@ class ChatTable:
                 query = query.limit(limit)
 
             all_chats = query.all()
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(db, all_chats)
 
     def get_chats_by_folder_ids_and_user_id(
         self, folder_ids: list[str], user_id: str
@@ -943,7 +1323,7 @@ class ChatTable:
             query = query.order_by(Chat.updated_at.desc())
 
             all_chats = query.all()
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(db, all_chats)
 
     def update_chat_folder_id_by_id_and_user_id(
         self, id: str, user_id: str, folder_id: str
@@ -956,7 +1336,7 @@ class ChatTable:
                 chat.pinned = False
                 db.commit()
                 db.refresh(chat)
-                return ChatModel.model_validate(chat)
+                return self._to_chat_models(db, [chat])[0]
         except Exception:
             return None
 
@@ -995,7 +1375,7 @@ class ChatTable:
 
             all_chats = query.all()
             log.debug(f"all_chats: {all_chats}")
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(db, all_chats)
 
     def add_chat_tag_by_id_and_user_id_and_tag_name(
         self, id: str, user_id: str, tag_name: str
@@ -1016,7 +1396,7 @@ class ChatTable:
 
                 db.commit()
                 db.refresh(chat)
-                return ChatModel.model_validate(chat)
+                return self._to_chat_models(db, [chat])[0]
         except Exception:
             return None
 
@@ -1102,6 +1482,8 @@ class ChatTable:
     def delete_chat_by_id(self, id: str) -> bool:
         try:
             with get_db() as db:
+                db.query(ChatMessage).filter_by(chat_id=id).delete()
+                self._delete_search_rows(db, [id])
                 db.query(Chat).filter_by(id=id).delete()
                 db.commit()
 
@@ -1112,7 +1494,9 @@ class ChatTable:
     def delete_chat_by_id_and_user_id(self, id: str, user_id: str) -> bool:
         try:
             with get_db() as db:
-                db.query(Chat).filter_by(id=id, user_id=user_id).delete()
+                if db.query(Chat).filter_by(id=id, user_id=user_id).delete():
+                    db.query(ChatMessage).filter_by(chat_id=id).delete()
+                    self._delete_search_rows(db, [id])
                 db.commit()
 
                 return True and self.delete_shared_chat_by_chat_id(id)
@@ -1124,6 +1508,14 @@ class ChatTable:
             with get_db() as db:
                 self.delete_shared_chats_by_user_id(user_id)
 
+                db.query(ChatMessage).filter(
+                    ChatMessage.chat_id.in_(
+                        select(Chat.id).where(Chat.user_id == user_id)
+                    )
+                ).delete(synchronize_session=False)
+                self._delete_search_rows(
+                    db, select(Chat.id).where(Chat.user_id == user_id)
+                )
                 db.query(Chat).filter_by(user_id=user_id).delete()
                 db.commit()
 
@@ -1136,6 +1528,19 @@ class ChatTable:
     ) -> bool:
         try:
             with get_db() as db:
+                db.query(ChatMessage).filter(
+                    ChatMessage.chat_id.in_(
+                        select(Chat.id).where(
+                            Chat.user_id == user_id, Chat.folder_id == folder_id
+                        )
+                    )
+                ).delete(synchronize_session=False)
+                self._delete_search_rows(
+                    db,
+                    select(Chat.id).where(
+                        Chat.user_id == user_id, Chat.folder_id == folder_id
+                    ),
+                )
                 db.query(Chat).filter_by(user_id=user_id, folder_id=folder_id).delete()
                 db.commit()
 
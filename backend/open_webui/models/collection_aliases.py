@@ -0,0 +1,70 @@
+import logging
+import time
+from typing import Optional
+
+from open_webui.internal.db import Base, get_db
+from open_webui.env import SRC_LOG_LEVELS
+from sqlalchemy import BigInteger, Column, Text
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MODELS"])
+
+####################
+# Collection Alias DB Schema
+####################
+
+
+class CollectionAlias(Base):
+    __tablename__ = "collection_alias"
+
+    # Collection name used by the app
+    name = Column(Text, primary_key=True, unique=True)
+    target = Column(Text)  # collection that actually holds the vectors
+
+    updated_at = Column(BigInteger)
+
+
+class CollectionAliasTable:
+    def get_aliases(self) -> dict[str, str]:
+        with get_db() as db:
+            return {
+                alias.name: alias.target for alias in db.query(CollectionAlias).all()
+            }
+
+    def get_alias_target(self, name: str) -> Optional[str]:
+        with get_db() as db:
+            alias = db.get(CollectionAlias, name)
+            return alias.target if alias else None
+
+    def set_alias(self, name: str, target: str) -> Optional[str]:
+        """Point `name` at `target`, returns the collection it pointed at before"""
+        with get_db() as db:
+            alias = db.get(CollectionAlias, name)
+            previous = alias.target if alias else name
+
+            db.merge(
+                CollectionAlias(name=name, target=target, updated_at=int(time.time()))
+            )
+            db.commit()
+            return previous
+
+    def delete_alias(self, name: str) -> bool:
+        try:
+            with get_db() as db:
+                db.query(CollectionAlias).filter_by(name=name).delete()
+                db.commit()
+                return True
+        except Exception:
+            return False
+
+    def delete_all_aliases(self) -> bool:
+        try:
+            with get_db() as db:
+                db.query(CollectionAlias).delete()
+                db.commit()
+                return True
+        except Exception:
+            return False
+
+
+CollectionAliases = CollectionAliasTable()
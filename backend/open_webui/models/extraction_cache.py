@@ -0,0 +1,112 @@
+import logging
+import time
+from typing import Optional
+
+from open_webui.internal.db import Base, get_db
+from open_webui.env import SRC_LOG_LEVELS
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import BigInteger, Column, Text, func
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MODELS"])
+
+####################
+# Extraction Cache DB Schema
+####################
+
+
+class ExtractionCacheEntry(Base):
+    __tablename__ = "extraction_cache"
+
+    id = Column(Text, primary_key=True, unique=True)  # cache key
+    path = Column(Text)  # storage provider path of the cached documents
+    size = Column(BigInteger)
+
+    created_at = Column(BigInteger)
+    last_accessed_at = Column(BigInteger, index=True)
+
+
+class ExtractionCacheEntryModel(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    path: str
+    size: int
+
+    created_at: int  # timestamp in epoch
+    last_accessed_at: int  # timestamp in epoch
+
+
+class ExtractionCacheTable:
+    def insert_new_entry(
+        self, id: str, path: str, size: int
+    ) -> Optional[ExtractionCacheEntryModel]:
+        with get_db() as db:
+            now = int(time.time())
+            entry = db.merge(
+                ExtractionCacheEntry(
+                    id=id,
+                    path=path,
+                    size=size,
+                    created_at=now,
+                    last_accessed_at=now,
+                )
+            )
+            db.commit()
+            return ExtractionCacheEntryModel.model_validate(entry)
+
+    def get_entry_by_id(self, id: str) -> Optional[ExtractionCacheEntryModel]:
+        try:
+            with get_db() as db:
+                entry = db.get(ExtractionCacheEntry, id)
+                return ExtractionCacheEntryModel.model_validate(entry) if entry else None
+        except Exception:
+            return None
+
+    def touch_entry_by_id(self, id: str) -> bool:
+        try:
+            with get_db() as db:
+                db.query(ExtractionCacheEntry).filter_by(id=id).update(
+                    {"last_accessed_at": int(time.time())}
+                )
+                db.commit()
+                return True
+        except Exception:
+            return False
+
+    def get_total_size(self) -> int:
+        with get_db() as db:
+            return db.query(func.sum(ExtractionCacheEntry.size)).scalar() or 0
+
+    def get_least_recently_used_entries(
+        self, limit: int = 100
+    ) -> list[ExtractionCacheEntryModel]:
+        with get_db() as db:
+            entries = (
+                db.query(ExtractionCacheEntry)
+                .order_by(ExtractionCacheEntry.last_accessed_at.asc())
+                .limit(limit)
+                .all()
+            )
+            return [ExtractionCacheEntryModel.model_validate(e) for e in entries]
+
+    def delete_entry_by_id(self, id: str) -> bool:
+        try:
+            with get_db() as db:
+                db.query(ExtractionCacheEntry).filter_by(id=id).delete()
+                db.commit()
+                return True
+        except Exception:
+            return False
+
+    def delete_all_entries(self) -> bool:
+        try:
+            with get_db() as db:
+                db.query(ExtractionCacheEntry).delete()
+                db.commit()
+                return True
+        except Exception:
+            return False
+
+
+ExtractionCacheEntries = ExtractionCacheTable()
@@ -5,6 +5,8 @@ from typing import Optional
 from open_webui.internal.db import Base, JSONField, get_db
 from open_webui.models.users import Users, UserModel
 from open_webui.env import SRC_LOG_LEVELS
+from open_webui.utils.model_list_cache import invalidate_model_list_cache
+from open_webui.utils.plugin_registry import PLUGIN_MODULES
 from pydantic import BaseModel, ConfigDict
 from sqlalchemy import BigInteger, Boolean, Column, String, Text, Index
 
@@ -123,6 +125,8 @@ class FunctionsTable:
                 db.add(result)
                 db.commit()
                 db.refresh(result)
+                invalidate_model_list_cache()
+                PLUGIN_MODULES.invalidate("function", result.id)
                 if result:
                     return FunctionModel.model_validate(result)
                 else:
@@ -170,6 +174,8 @@ class FunctionsTable:
                         db.delete(func)
 
                 db.commit()
+                invalidate_model_list_cache()
+                PLUGIN_MODULES.invalidate()
 
                 return [
                     FunctionModel.model_validate(func)
@@ -282,6 +288,8 @@ class FunctionsTable:
                 function.valves = valves
                 function.updated_at = int(time.time())
                 db.commit()
+                invalidate_model_list_cache()
+                PLUGIN_MODULES.invalidate("function", id)
                 db.refresh(function)
                 return self.get_function_by_id(id)
             except Exception:
@@ -303,6 +311,7 @@ class FunctionsTable:
                     function.updated_at = int(time.time())
                     db.commit()
                     db.refresh(function)
+                    invalidate_model_list_cache()
                     return self.get_function_by_id(id)
                 else:
                     return None
@@ -363,6 +372,8 @@ class FunctionsTable:
                     }
                 )
                 db.commit()
+                invalidate_model_list_cache()
+                PLUGIN_MODULES.invalidate("function", id)
                 return self.get_function_by_id(id)
             except Exception:
                 return None
@@ -377,6 +388,7 @@ class FunctionsTable:
                     }
                 )
                 db.commit()
+                invalidate_model_list_cache()
                 return True
             except Exception:
                 return None
@@ -386,6 +398,8 @@ class FunctionsTable:
             try:
                 db.query(Function).filter_by(id=id).delete()
                 db.commit()
+                invalidate_model_list_cache()
+                PLUGIN_MODULES.invalidate("function", id)
 
                 return True
             except Exception:
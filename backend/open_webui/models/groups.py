@@ -8,6 +8,8 @@ from open_webui.internal.db import Base, get_db
 from open_webui.env import SRC_LOG_LEVELS
 
 from open_webui.models.files import FileMetadataResponse
+from open_webui.utils.principal_cache import PRINCIPAL_CACHE
+from open_webui.utils.model_list_cache import invalidate_model_list_cache
 
 
 from pydantic import BaseModel, ConfigDict
@@ -297,6 +299,10 @@ class GroupTable:
             db.add_all(new_members)
             db.commit()
 
+        # Previous members are not known here, drop every cached group set
+        PRINCIPAL_CACHE.invalidate()
+        invalidate_model_list_cache()
+
     def get_group_member_count_by_id(self, id: str) -> int:
         with get_db() as db:
             count = (
@@ -318,6 +324,7 @@ class GroupTable:
                     }
                 )
                 db.commit()
+                invalidate_model_list_cache()
                 return self.get_group_by_id(id=id)
         except Exception as e:
             log.exception(e)
@@ -328,6 +335,8 @@ class GroupTable:
             with get_db() as db:
                 db.query(Group).filter_by(id=id).delete()
                 db.commit()
+                PRINCIPAL_CACHE.invalidate()
+                invalidate_model_list_cache()
                 return True
         except Exception:
             return False
@@ -337,6 +346,8 @@ class GroupTable:
             try:
                 db.query(Group).delete()
                 db.commit()
+                PRINCIPAL_CACHE.invalidate()
+                invalidate_model_list_cache()
 
                 return True
             except Exception:
@@ -364,6 +375,7 @@ class GroupTable:
                     )
 
                 db.commit()
+                PRINCIPAL_CACHE.invalidate(user_id)
                 return True
 
             except Exception:
@@ -455,6 +467,7 @@ class GroupTable:
                     )
 
                 db.commit()
+                PRINCIPAL_CACHE.invalidate(user_id)
                 return True
 
             except Exception as e:
@@ -494,6 +507,10 @@ class GroupTable:
                 db.commit()
                 db.refresh(group)
 
+                for user_id in user_ids or []:
+                    PRINCIPAL_CACHE.invalidate(user_id)
+                invalidate_model_list_cache()
+
                 return GroupModel.model_validate(group)
 
         except Exception as e:
@@ -523,6 +540,10 @@ class GroupTable:
 
                 db.commit()
                 db.refresh(group)
+
+                for user_id in user_ids:
+                    PRINCIPAL_CACHE.invalidate(user_id)
+                invalidate_model_list_cache()
                 return GroupModel.model_validate(group)
 
         except Exception as e:
@@ -8,7 +8,7 @@ from open_webui.internal.db import Base, get_db
 from open_webui.env import SRC_LOG_LEVELS
 
 from open_webui.models.files import File, FileModel, FileMetadataResponse
-from open_webui.models.groups import Groups
+from open_webui.utils.principal_cache import get_user_group_ids
 from open_webui.models.users import Users, UserResponse
 
 
@@ -192,14 +192,14 @@ class KnowledgeTable:
             return False
         if knowledge.user_id == user_id:
             return True
-        user_group_ids = {group.id for group in Groups.get_groups_by_member_id(user_id)}
+        user_group_ids = get_user_group_ids(user_id)
         return has_access(user_id, permission, knowledge.access_control, user_group_ids)
 
     def get_knowledge_bases_by_user_id(
         self, user_id: str, permission: str = "write"
     ) -> list[KnowledgeUserModel]:
         knowledge_bases = self.get_knowledge_bases()
-        user_group_ids = {group.id for group in Groups.get_groups_by_member_id(user_id)}
+        user_group_ids = get_user_group_ids(user_id)
         return [
             knowledge_base
             for knowledge_base in knowledge_bases
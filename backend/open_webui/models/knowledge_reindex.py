@@ -0,0 +1,269 @@
+import logging
+import time
+import uuid
+from typing import Optional
+
+from open_webui.internal.db import Base, get_db
+from open_webui.env import SRC_LOG_LEVELS
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import (
+    JSON,
+    BigInteger,
+    Column,
+    ForeignKey,
+    Text,
+    func,
+    insert,
+    or_,
+)
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MODELS"])
+
+####################
+# Knowledge Reindex DB Schema
+####################
+
+
+class KnowledgeReindexJob(Base):
+    __tablename__ = "knowledge_reindex_job"
+
+    id = Column(Text, primary_key=True, unique=True)
+    user_id = Column(Text)
+    status = Column(Text)  # running, completed, failed
+
+    # Per knowledge base state, see utils/knowledge_reindex.py
+    data = Column(JSON, nullable=True)
+
+    # Instance currently running the job and its last sign of life
+    owner = Column(Text, nullable=True)
+    heartbeat_at = Column(BigInteger, nullable=True)
+
+    created_at = Column(BigInteger)
+    updated_at = Column(BigInteger)
+    completed_at = Column(BigInteger, nullable=True)
+
+
+class KnowledgeReindexItem(Base):
+    __tablename__ = "knowledge_reindex_item"
+
+    job_id = Column(
+        Text,
+        ForeignKey("knowledge_reindex_job.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    knowledge_id = Column(Text, primary_key=True)
+    file_id = Column(Text, primary_key=True)
+
+    status = Column(Text, index=True)  # pending, completed, failed
+    error = Column(Text, nullable=True)
+
+    updated_at = Column(BigInteger)
+
+
+class KnowledgeReindexJobModel(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    user_id: Optional[str] = None
+    status: str
+
+    data: Optional[dict] = None
+
+    owner: Optional[str] = None
+    heartbeat_at: Optional[int] = None
+
+    created_at: int  # timestamp in epoch
+    updated_at: int  # timestamp in epoch
+    completed_at: Optional[int] = None
+
+
+class KnowledgeReindexItemModel(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    job_id: str
+    knowledge_id: str
+    file_id: str
+
+    status: str
+    error: Optional[str] = None
+
+    updated_at: int  # timestamp in epoch
+
+
+class KnowledgeReindexTable:
+    def insert_new_job(
+        self, user_id: str, data: dict, items: list[tuple[str, str]]
+    ) -> Optional[KnowledgeReindexJobModel]:
+        with get_db() as db:
+            now = int(time.time())
+            job = KnowledgeReindexJob(
+                id=str(uuid.uuid4()),
+                user_id=user_id,
+                status="running",
+                data=data,
+                created_at=now,
+                updated_at=now,
+            )
+            db.add(job)
+            db.flush()
+
+            self._insert_items(db, job.id, items, now)
+            db.commit()
+            db.refresh(job)
+            return KnowledgeReindexJobModel.model_validate(job)
+
+    def _insert_items(self, db, job_id: str, items: list[tuple[str, str]], now: int):
+        for i in range(0, len(items), 1000):
+            db.execute(
+                insert(KnowledgeReindexItem),
+                [
+                    {
+                        "job_id": job_id,
+                        "knowledge_id": knowledge_id,
+                        "file_id": file_id,
+                        "status": "pending",
+                        "updated_at": now,
+                    }
+                    for knowledge_id, file_id in items[i : i + 1000]
+                ],
+            )
+
+    def add_items(self, job_id: str, items: list[tuple[str, str]]):
+        with get_db() as db:
+            self._insert_items(db, job_id, items, int(time.time()))
+            db.commit()
+
+    def get_job_by_id(self, id: str) -> Optional[KnowledgeReindexJobModel]:
+        try:
+            with get_db() as db:
+                job = db.get(KnowledgeReindexJob, id)
+                return KnowledgeReindexJobModel.model_validate(job) if job else None
+        except Exception:
+            return None
+
+    def get_latest_job(self) -> Optional[KnowledgeReindexJobModel]:
+        with get_db() as db:
+            job = (
+                db.query(KnowledgeReindexJob)
+                .order_by(KnowledgeReindexJob.created_at.desc())
+                .first()
+            )
+            return KnowledgeReindexJobModel.model_validate(job) if job else None
+
+    def get_running_job(self) -> Optional[KnowledgeReindexJobModel]:
+        with get_db() as db:
+            job = (
+                db.query(KnowledgeReindexJob)
+                .filter_by(status="running")
+                .order_by(KnowledgeReindexJob.created_at.asc())
+                .first()
+            )
+            return KnowledgeReindexJobModel.model_validate(job) if job else None
+
+    def claim_job_by_id(self, id: str, owner: str, stale_after: int) -> bool:
+        """Take over a running job unless another live instance owns it"""
+        with get_db() as db:
+            now = int(time.time())
+            count = (
+                db.query(KnowledgeReindexJob)
+                .filter(
+                    KnowledgeReindexJob.id == id,
+                    KnowledgeReindexJob.status == "running",
+                    or_(
+                        KnowledgeReindexJob.owner.is_(None),
+                        KnowledgeReindexJob.owner == owner,
+                        KnowledgeReindexJob.heartbeat_at < now - stale_after,
+                    ),
+                )
+                .update(
+                    {"owner": owner, "heartbeat_at": now},
+                    synchronize_session=False,
+                )
+            )
+            db.commit()
+            return count == 1
+
+    def heartbeat_job_by_id(self, id: str, owner: str) -> bool:
+        with get_db() as db:
+            count = (
+                db.query(KnowledgeReindexJob)
+                .filter_by(id=id, owner=owner)
+                .update({"heartbeat_at": int(time.time())})
+            )
+            db.commit()
+            return count == 1
+
+    def update_job_by_id(self, id: str, **fields) -> Optional[KnowledgeReindexJobModel]:
+        with get_db() as db:
+            db.query(KnowledgeReindexJob).filter_by(id=id).update(
+                {**fields, "updated_at": int(time.time())}
+            )
+            db.commit()
+            return self.get_job_by_id(id)
+
+    def get_pending_file_ids(self, job_id: str, knowledge_id: str) -> list[str]:
+        with get_db() as db:
+            return [
+                file_id
+                for (file_id,) in db.query(KnowledgeReindexItem.file_id)
+                .filter_by(job_id=job_id, knowledge_id=knowledge_id, status="pending")
+                .all()
+            ]
+
+    def get_file_ids(self, job_id: str, knowledge_id: str) -> list[str]:
+        with get_db() as db:
+            return [
+                file_id
+                for (file_id,) in db.query(KnowledgeReindexItem.file_id)
+                .filter_by(job_id=job_id, knowledge_id=knowledge_id)
+                .all()
+            ]
+
+    def update_item_status(
+        self,
+        job_id: str,
+        knowledge_id: str,
+        file_id: str,
+        status: str,
+        error: Optional[str] = None,
+    ):
+        with get_db() as db:
+            db.query(KnowledgeReindexItem).filter_by(
+                job_id=job_id, knowledge_id=knowledge_id, file_id=file_id
+            ).update({"status": status, "error": error, "updated_at": int(time.time())})
+            db.commit()
+
+    def delete_items(self, job_id: str, knowledge_id: str, file_ids: list[str]):
+        with get_db() as db:
+            db.query(KnowledgeReindexItem).filter(
+                KnowledgeReindexItem.job_id == job_id,
+                KnowledgeReindexItem.knowledge_id == knowledge_id,
+                KnowledgeReindexItem.file_id.in_(file_ids),
+            ).delete(synchronize_session=False)
+            db.commit()
+
+    def get_item_counts(self, job_id: str) -> dict[str, int]:
+        with get_db() as db:
+            return {
+                status: count
+                for status, count in db.query(KnowledgeReindexItem.status, func.count())
+                .filter_by(job_id=job_id)
+                .group_by(KnowledgeReindexItem.status)
+                .all()
+            }
+
+    def get_failed_items(
+        self, job_id: str, limit: int = 100
+    ) -> list[KnowledgeReindexItemModel]:
+        with get_db() as db:
+            items = (
+                db.query(KnowledgeReindexItem)
+                .filter_by(job_id=job_id, status="failed")
+                .limit(limit)
+                .all()
+            )
+            return [KnowledgeReindexItemModel.model_validate(item) for item in items]
+
+
+KnowledgeReindexJobs = KnowledgeReindexTable()
@@ -10,7 +10,7 @@ from open_webui.models.channels import Channels, ChannelMember
 
 
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Boolean, Column, String, Text, JSON
+from sqlalchemy import BigInteger, Boolean, Column, String, Text, JSON, Index
 from sqlalchemy import or_, func, select, and_, text
 from sqlalchemy.sql import exists
 
@@ -27,6 +27,8 @@ class MessageReaction(Base):
     name = Column(Text)
     created_at = Column(BigInteger)
 
+    __table_args__ = (Index("message_reaction_message_id_idx", "message_id"),)
+
 
 class MessageReactionModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -60,6 +62,8 @@ class Message(Base):
     created_at = Column(BigInteger)  # time_ns
     updated_at = Column(BigInteger)  # time_ns
 
+    __table_args__ = (Index("message_parent_id_idx", "parent_id"),)
+
 
 class MessageModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -169,7 +173,7 @@ class MessageTable:
             )
 
             reactions = self.get_reactions_by_message_id(id)
-            thread_replies = self.get_thread_replies_by_message_id(id)
+            reply_stats = self.get_thread_reply_stats_by_message_ids([id]).get(id, {})
 
             user = Users.get_user_by_id(message.user_id)
             return MessageResponse.model_validate(
@@ -179,10 +183,8 @@ class MessageTable:
                     "reply_to_message": (
                         reply_to_message.model_dump() if reply_to_message else None
                     ),
-                    "latest_reply_at": (
-                        thread_replies[0].created_at if thread_replies else None
-                    ),
-                    "reply_count": len(thread_replies),
+                    "latest_reply_at": reply_stats.get("latest_reply_at"),
+                    "reply_count": reply_stats.get("reply_count", 0),
                     "reactions": reactions,
                 }
             )
@@ -196,26 +198,85 @@ class MessageTable:
                 .all()
             )
 
-            messages = []
-            for message in all_messages:
-                reply_to_message = (
-                    self.get_message_by_id(message.reply_to_id)
-                    if message.reply_to_id
-                    else None
+            return self._with_reply_to_messages(db, all_messages)
+
+    def _with_reply_to_messages(
+        self, db, messages: list[Message]
+    ) -> list[MessageReplyToResponse]:
+        # Fetch every replied-to message and its author in one query
+        reply_to_ids = {m.reply_to_id for m in messages if m.reply_to_id}
+        reply_to_messages = {}
+        if reply_to_ids:
+            for message, user in (
+                db.query(Message, User)
+                .outerjoin(User, Message.user_id == User.id)
+                .filter(Message.id.in_(reply_to_ids))
+                .all()
+            ):
+                reply_to_messages[message.id] = MessageUserResponse.model_validate(
+                    {
+                        **MessageModel.model_validate(message).model_dump(),
+                        "user": (
+                            UserNameResponse.model_validate(
+                                user, from_attributes=True
+                            ).model_dump()
+                            if user
+                            else None
+                        ),
+                    }
                 )
-                messages.append(
-                    MessageReplyToResponse.model_validate(
-                        {
-                            **MessageModel.model_validate(message).model_dump(),
-                            "reply_to_message": (
-                                reply_to_message.model_dump()
-                                if reply_to_message
-                                else None
-                            ),
-                        }
-                    )
+
+        return [
+            MessageReplyToResponse.model_validate(
+                {
+                    **MessageModel.model_validate(message).model_dump(),
+                    "reply_to_message": (
+                        reply_to_messages[message.reply_to_id].model_dump()
+                        if message.reply_to_id in reply_to_messages
+                        else None
+                    ),
+                }
+            )
+            for message in messages
+        ]
+
+    def get_thread_reply_stats_by_message_ids(self, ids: list[str]) -> dict[str, dict]:
+        """Reply count and latest reply time of each message's thread"""
+        if not ids:
+            return {}
+
+        with get_db() as db:
+            results = (
+                db.query(
+                    Message.parent_id,
+                    func.count(Message.id),
+                    func.max(Message.created_at),
                 )
-            return messages
+                .filter(Message.parent_id.in_(ids))
+                .group_by(Message.parent_id)
+                .all()
+            )
+            return {
+                parent_id: {"reply_count": count, "latest_reply_at": latest_reply_at}
+                for parent_id, count, latest_reply_at in results
+            }
+
+    def get_users_by_message_ids(self, ids: list[str]) -> dict[str, UserNameResponse]:
+        """Author of each message, messages by deleted users are left out"""
+        if not ids:
+            return {}
+
+        with get_db() as db:
+            results = (
+                db.query(Message.id, User)
+                .join(User, Message.user_id == User.id)
+                .filter(Message.id.in_(ids))
+                .all()
+            )
+            return {
+                message_id: UserNameResponse.model_validate(user, from_attributes=True)
+                for message_id, user in results
+            }
 
     def get_reply_user_ids_by_message_id(self, id: str) -> list[str]:
         with get_db() as db:
@@ -237,26 +298,7 @@ class MessageTable:
                 .all()
             )
 
-            messages = []
-            for message in all_messages:
-                reply_to_message = (
-                    self.get_message_by_id(message.reply_to_id)
-                    if message.reply_to_id
-                    else None
-                )
-                messages.append(
-                    MessageReplyToResponse.model_validate(
-                        {
-                            **MessageModel.model_validate(message).model_dump(),
-                            "reply_to_message": (
-                                reply_to_message.model_dump()
-                                if reply_to_message
-                                else None
-                            ),
-                        }
-                    )
-                )
-            return messages
+            return self._with_reply_to_messages(db, all_messages)
 
     def get_messages_by_parent_id(
         self, channel_id: str, parent_id: str, skip: int = 0, limit: int = 50
@@ -280,26 +322,7 @@ class MessageTable:
             if len(all_messages) < limit:
                 all_messages.append(message)
 
-            messages = []
-            for message in all_messages:
-                reply_to_message = (
-                    self.get_message_by_id(message.reply_to_id)
-                    if message.reply_to_id
-                    else None
-                )
-                messages.append(
-                    MessageReplyToResponse.model_validate(
-                        {
-                            **MessageModel.model_validate(message).model_dump(),
-                            "reply_to_message": (
-                                reply_to_message.model_dump()
-                                if reply_to_message
-                                else None
-                            ),
-                        }
-                    )
-                )
-            return messages
+            return self._with_reply_to_messages(db, all_messages)
 
     def get_last_message_by_channel_id(self, channel_id: str) -> Optional[MessageModel]:
         with get_db() as db:
@@ -397,18 +420,29 @@ class MessageTable:
             return MessageReactionModel.model_validate(result) if result else None
 
     def get_reactions_by_message_id(self, id: str) -> list[Reactions]:
+        return self.get_reactions_by_message_ids([id]).get(id, [])
+
+    def get_reactions_by_message_ids(
+        self, ids: list[str]
+    ) -> dict[str, list[Reactions]]:
+        """Reactions of each message grouped by name"""
+        if not ids:
+            return {}
+
         with get_db() as db:
             # JOIN User so all user info is fetched in one query
             results = (
                 db.query(MessageReaction, User)
                 .join(User, MessageReaction.user_id == User.id)
-                .filter(MessageReaction.message_id == id)
+                .filter(MessageReaction.message_id.in_(ids))
+                .order_by(MessageReaction.created_at)
                 .all()
             )
 
-            reactions = {}
+            reactions_by_message_id = {}
 
             for reaction, user in results:
+                reactions = reactions_by_message_id.setdefault(reaction.message_id, {})
                 if reaction.name not in reactions:
                     reactions[reaction.name] = {
                         "name": reaction.name,
@@ -424,7 +458,10 @@ class MessageTable:
                 )
                 reactions[reaction.name]["count"] += 1
 
-            return [Reactions(**reaction) for reaction in reactions.values()]
+            return {
+                message_id: [Reactions(**reaction) for reaction in reactions.values()]
+                for message_id, reactions in reactions_by_message_id.items()
+            }
 
     def remove_reaction_by_id_and_user_id_and_name(
         self, id: str, user_id: str, name: str
@@ -5,7 +5,8 @@ from typing import Optional
 from open_webui.internal.db import Base, JSONField, get_db
 from open_webui.env import SRC_LOG_LEVELS
 
-from open_webui.models.groups import Groups
+from open_webui.utils.principal_cache import get_user_group_ids
+from open_webui.utils.model_list_cache import invalidate_model_list_cache
 from open_webui.models.users import User, UserModel, Users, UserResponse
 
 
@@ -168,6 +169,7 @@ class ModelsTable:
                 db.add(result)
                 db.commit()
                 db.refresh(result)
+                invalidate_model_list_cache()
 
                 if result:
                     return ModelModel.model_validate(result)
@@ -214,7 +216,7 @@ class ModelsTable:
         self, user_id: str, permission: str = "write"
     ) -> list[ModelUserResponse]:
         models = self.get_models()
-        user_group_ids = {group.id for group in Groups.get_groups_by_member_id(user_id)}
+        user_group_ids = get_user_group_ids(user_id)
         return [
             model
             for model in models
@@ -371,6 +373,7 @@ class ModelsTable:
                     }
                 )
                 db.commit()
+                invalidate_model_list_cache()
 
                 return self.get_model_by_id(id)
             except Exception:
@@ -384,6 +387,7 @@ class ModelsTable:
                 result = db.query(Model).filter_by(id=id).update(data)
 
                 db.commit()
+                invalidate_model_list_cache()
 
                 model = db.get(Model, id)
                 db.refresh(model)
@@ -397,6 +401,7 @@ class ModelsTable:
             with get_db() as db:
                 db.query(Model).filter_by(id=id).delete()
                 db.commit()
+                invalidate_model_list_cache()
 
                 return True
         except Exception:
@@ -407,6 +412,7 @@ class ModelsTable:
             with get_db() as db:
                 db.query(Model).delete()
                 db.commit()
+                invalidate_model_list_cache()
 
                 return True
         except Exception:
@@ -448,6 +454,7 @@ class ModelsTable:
                         db.delete(model)
 
                 db.commit()
+                invalidate_model_list_cache()
 
                 return [
                     ModelModel.model_validate(model) for model in db.query(Model).all()
@@ -4,7 +4,8 @@ from typing import Optional
 
 from open_webui.internal.db import Base, JSONField, get_db
 from open_webui.models.users import Users, UserResponse
-from open_webui.models.groups import Groups
+from open_webui.utils.principal_cache import get_user_group_ids
+from open_webui.utils.plugin_registry import PLUGIN_MODULES
 
 from open_webui.env import SRC_LOG_LEVELS
 from pydantic import BaseModel, ConfigDict
@@ -130,6 +131,7 @@ class ToolsTable:
                 db.add(result)
                 db.commit()
                 db.refresh(result)
+                PLUGIN_MODULES.invalidate("tool", result.id)
                 if result:
                     return ToolModel.model_validate(result)
                 else:
@@ -172,7 +174,7 @@ class ToolsTable:
         self, user_id: str, permission: str = "write"
     ) -> list[ToolUserModel]:
         tools = self.get_tools()
-        user_group_ids = {group.id for group in Groups.get_groups_by_member_id(user_id)}
+        user_group_ids = get_user_group_ids(user_id)
 
         return [
             tool
@@ -197,6 +199,7 @@ class ToolsTable:
                     {"valves": valves, "updated_at": int(time.time())}
                 )
                 db.commit()
+                PLUGIN_MODULES.invalidate("tool", id)
                 return self.get_tool_by_id(id)
         except Exception:
             return None
@@ -253,6 +256,7 @@ class ToolsTable:
                     {**updated, "updated_at": int(time.time())}
                 )
                 db.commit()
+                PLUGIN_MODULES.invalidate("tool", id)
 
                 tool = db.query(Tool).get(id)
                 db.refresh(tool)
@@ -265,6 +269,7 @@ class ToolsTable:
             with get_db() as db:
                 db.query(Tool).filter_by(id=id).delete()
                 db.commit()
+                PLUGIN_MODULES.invalidate("tool", id)
 
                 return True
         except Exception:
@@ -11,6 +11,7 @@ from open_webui.models.channels import ChannelMember
 
 
 from open_webui.utils.misc import throttle
+from open_webui.utils.principal_cache import PRINCIPAL_CACHE
 
 
 from pydantic import BaseModel, ConfigDict
@@ -513,6 +514,7 @@ class UsersTable:
             with get_db() as db:
                 db.query(User).filter_by(id=id).update({"role": role})
                 db.commit()
+                PRINCIPAL_CACHE.invalidate(id)
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
         except Exception:
@@ -527,6 +529,7 @@ class UsersTable:
                     {**form_data.model_dump(exclude_none=True)}
                 )
                 db.commit()
+                PRINCIPAL_CACHE.invalidate(id)
 
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
@@ -542,6 +545,7 @@ class UsersTable:
                     {"profile_image_url": profile_image_url}
                 )
                 db.commit()
+                PRINCIPAL_CACHE.invalidate(id)
 
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
@@ -588,6 +592,7 @@ class UsersTable:
                 # Persist updated JSON
                 db.query(User).filter_by(id=id).update({"oauth": oauth})
                 db.commit()
+                PRINCIPAL_CACHE.invalidate(id)
 
                 return UserModel.model_validate(user)
 
@@ -599,6 +604,7 @@ class UsersTable:
             with get_db() as db:
                 db.query(User).filter_by(id=id).update(updated)
                 db.commit()
+                PRINCIPAL_CACHE.invalidate(id)
 
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
@@ -619,6 +625,7 @@ class UsersTable:
 
                 db.query(User).filter_by(id=id).update({"settings": user_settings})
                 db.commit()
+                PRINCIPAL_CACHE.invalidate(id)
 
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
@@ -637,6 +644,7 @@ class UsersTable:
                     # Delete User
                     db.query(User).filter_by(id=id).delete()
                     db.commit()
+                PRINCIPAL_CACHE.invalidate(id)
 
                 return True
             else:
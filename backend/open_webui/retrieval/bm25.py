@@ -0,0 +1,499 @@
+import hashlib
+import heapq
+import json
+import logging
+import math
+import os
+import threading
+from collections import Counter, OrderedDict, defaultdict
+from contextlib import ExitStack, contextmanager
+from typing import Any, Callable, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows, only threads are serialized
+    fcntl = None
+
+from open_webui.config import RAG_BM25_INDEX_DIR, RAG_BM25_INDEX_CACHE_SIZE
+from open_webui.env import SRC_LOG_LEVELS
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+
+INDEX_VERSION = 1
+
+# Okapi BM25 parameters, same defaults as rank_bm25.BM25Okapi
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+
+def tokenize(text: str) -> list[str]:
+    # Matches the default preprocessing of langchain's BM25Retriever
+    return text.split() if text else []
+
+
+def get_enriched_metadata_text(metadata: dict) -> str:
+    metadata_parts = []
+
+    # Add filename (repeat twice for extra weight in BM25 scoring)
+    if metadata.get("name"):
+        filename = metadata["name"]
+        filename_tokens = (
+            filename.replace("_", " ").replace("-", " ").replace(".", " ")
+        )
+        metadata_parts.append(
+            f"Filename: {filename} {filename_tokens} {filename_tokens}"
+        )
+
+    # Add title if available
+    if metadata.get("title"):
+        metadata_parts.append(f"Title: {metadata['title']}")
+
+    # Add document section headings if available (from markdown splitter)
+    if metadata.get("headings") and isinstance(metadata["headings"], list):
+        headings = " > ".join(str(h) for h in metadata["headings"])
+        metadata_parts.append(f"Section: {headings}")
+
+    # Add source URL/path if available
+    if metadata.get("source"):
+        metadata_parts.append(f"Source: {metadata['source']}")
+
+    # Add snippet for web search results
+    if metadata.get("snippet"):
+        metadata_parts.append(f"Snippet: {metadata['snippet']}")
+
+    return " ".join(metadata_parts)
+
+
+class BM25Index:
+    """
+    Inverted BM25 index over the chunks of a single vector DB collection.
+
+    Term frequencies for the chunk text and for the enriched metadata text
+    are kept separately so the same index can serve both the plain and the
+    enriched hybrid search modes. Postings are updated in place, so adding or
+    removing chunks only touches their own terms; a lock keeps searches from
+    seeing a half applied update.
+    """
+
+    def __init__(self, docs: Optional[dict[str, dict]] = None):
+        self.docs: dict[str, dict] = {}
+        self.postings: dict[str, dict[str, int]] = defaultdict(dict)
+        self.meta_postings: dict[str, dict[str, int]] = defaultdict(dict)
+        self.total_length = 0
+        self.total_meta_length = 0
+        self._lock = threading.RLock()
+
+        self.apply(docs or {}, [])
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def _add_doc(self, doc_id: str, doc: dict):
+        if doc_id in self.docs:
+            self._remove_doc(doc_id)
+
+        self.docs[doc_id] = doc
+        for term, tf in doc["tf"].items():
+            self.postings[term][doc_id] = tf
+        for term, tf in doc["meta_tf"].items():
+            self.meta_postings[term][doc_id] = tf
+        self.total_length += doc["length"]
+        self.total_meta_length += doc["meta_length"]
+
+    def _remove_doc(self, doc_id: str):
+        doc = self.docs.pop(doc_id, None)
+        if doc is None:
+            return
+
+        for postings, tf in (
+            (self.postings, doc["tf"]),
+            (self.meta_postings, doc["meta_tf"]),
+        ):
+            for term in tf:
+                term_postings = postings.get(term)
+                if term_postings is not None:
+                    term_postings.pop(doc_id, None)
+                    if not term_postings:
+                        del postings[term]
+        self.total_length -= doc["length"]
+        self.total_meta_length -= doc["meta_length"]
+
+    def apply(self, added: dict[str, dict], deleted: list[str]):
+        """Apply a delta of prepared docs to add and doc ids to remove"""
+        with self._lock:
+            for doc_id in deleted:
+                self._remove_doc(doc_id)
+            for doc_id, doc in added.items():
+                self._add_doc(doc_id, doc)
+
+    def add(
+        self, ids: list[str], texts: list[str], metadatas: list[dict]
+    ) -> dict[str, dict]:
+        """Index chunks, returns the docs added"""
+        docs = {}
+        for doc_id, text, metadata in zip(ids, texts, metadatas):
+            metadata = metadata or {}
+            tokens = tokenize(text)
+            meta_tokens = tokenize(get_enriched_metadata_text(metadata))
+            docs[str(doc_id)] = {
+                "text": text,
+                "metadata": metadata,
+                "tf": dict(Counter(tokens)),
+                "meta_tf": dict(Counter(meta_tokens)),
+                "length": len(tokens),
+                "meta_length": len(meta_tokens),
+            }
+
+        self.apply(docs, [])
+        return docs
+
+    def delete(
+        self, ids: Optional[list[str]] = None, filter: Optional[dict] = None
+    ) -> list[str]:
+        """Remove chunks by id or metadata filter, returns the ids removed"""
+        with self._lock:
+            if ids is not None:
+                doc_ids = [str(doc_id) for doc_id in ids if str(doc_id) in self.docs]
+            elif filter:
+                doc_ids = [
+                    doc_id
+                    for doc_id, doc in self.docs.items()
+                    if all(doc["metadata"].get(k) == v for k, v in filter.items())
+                ]
+            else:
+                doc_ids = list(self.docs.keys())
+
+            self.apply({}, doc_ids)
+            return doc_ids
+
+    def search(
+        self, query: str, k: int, enriched: bool = False
+    ) -> list[tuple[str, dict, float]]:
+        with self._lock:
+            return self._search(query, k, enriched)
+
+    def _search(
+        self, query: str, k: int, enriched: bool
+    ) -> list[tuple[str, dict, float]]:
+        n = len(self.docs)
+        if n == 0 or k <= 0:
+            return []
+
+        total_length = self.total_length + (self.total_meta_length if enriched else 0)
+        avgdl = (total_length / n) or 1.0
+
+        scores = defaultdict(float)
+        for term in tokenize(query):
+            content = self.postings.get(term, {})
+            meta = self.meta_postings.get(term, {}) if enriched else {}
+            doc_ids = content.keys() | meta.keys()
+            if not doc_ids:
+                continue
+
+            # Non-negative idf variant, so very common terms never subtract
+            df = len(doc_ids)
+            idf = math.log((n - df + 0.5) / (df + 0.5) + 1.0)
+
+            for doc_id in doc_ids:
+                doc = self.docs[doc_id]
+                tf = content.get(doc_id, 0) + meta.get(doc_id, 0)
+                dl = doc["length"] + (doc["meta_length"] if enriched else 0)
+                scores[doc_id] += (
+                    idf
+                    * tf
+                    * (BM25_K1 + 1)
+                    / (tf + BM25_K1 * (1 - BM25_B + BM25_B * dl / avgdl))
+                )
+
+        top = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+        return [(doc_id, self.docs[doc_id], score) for doc_id, score in top]
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {"version": INDEX_VERSION, "docs": dict(self.docs)}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "BM25Index":
+        return cls(data.get("docs", {}))
+
+
+class BM25IndexManager:
+    """
+    Keeps one BM25 index per collection on disk and a bounded set of them
+    loaded in memory. Indexes are updated alongside vector DB writes and
+    loaded lazily at query time.
+
+    On disk an index is a base snapshot (`<hash>.json`) plus a log of the
+    deltas written since (`<hash>.log`, one JSON line per add or delete), so
+    a write costs the size of its own chunks. The log is folded into the
+    base once it outgrows it, which keeps the total rewrite cost linear.
+    Loaded indexes replay only the log lines appended since they were read.
+
+    Writers hold an exclusive lock on `<hash>.lock`, so several processes
+    can share RAG_BM25_INDEX_DIR. Replicas on other hosts must mount the
+    same directory from shared storage that supports `flock`, otherwise
+    their indexes diverge.
+    """
+
+    def __init__(self, index_dir: str, cache_size: int = 32):
+        self.index_dir = index_dir
+        self.cache_size = max(cache_size, 1)
+        # collection -> (base file identity, log offset read, index)
+        self._cache: OrderedDict[str, tuple[tuple, int, BM25Index]] = OrderedDict()
+        self._lock = threading.RLock()
+
+        os.makedirs(self.index_dir, exist_ok=True)
+
+    def _get_path(self, collection_name: str, ext: str = "json") -> str:
+        name = hashlib.sha256(collection_name.encode()).hexdigest()
+        return os.path.join(self.index_dir, f"{name}.{ext}")
+
+    @contextmanager
+    def _write_lock(self, *collection_names: str):
+        """Exclusive across threads and processes sharing the index directory"""
+        with self._lock, ExitStack() as stack:
+            for collection_name in sorted(set(collection_names)):
+                f = stack.enter_context(
+                    open(self._get_path(collection_name, "lock"), "a+")
+                )
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_EX)
+            yield
+
+    def _cache_put(
+        self, collection_name: str, base_id: tuple, offset: int, index: BM25Index
+    ):
+        self._cache[collection_name] = (base_id, offset, index)
+        self._cache.move_to_end(collection_name)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _read_log(
+        self, collection_name: str, index: BM25Index, offset: int
+    ) -> Optional[int]:
+        """Apply log lines past `offset`, returns the new offset"""
+        path = self._get_path(collection_name, "log")
+        try:
+            with open(path, "rb") as f:
+                f.seek(0, os.SEEK_END)
+                if f.tell() < offset:
+                    return None  # Truncated, reload from the base
+                f.seek(offset)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # Still being written
+                    delta = json.loads(line)
+                    index.apply(delta.get("add", {}), delta.get("delete", []))
+                    offset += len(line)
+        except FileNotFoundError:
+            return 0 if offset == 0 else None
+        return offset
+
+    def _load(self, collection_name: str) -> Optional[BM25Index]:
+        path = self._get_path(collection_name)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self._cache.pop(collection_name, None)
+            return None
+        base_id = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+        cached = self._cache.get(collection_name)
+        if cached and cached[0] == base_id:
+            offset = self._read_log(collection_name, cached[2], cached[1])
+            if offset is not None:
+                self._cache_put(collection_name, base_id, offset, cached[2])
+                return cached[2]
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != INDEX_VERSION:
+                log.info(f"Discarding outdated BM25 index for {collection_name}")
+                return None
+            index = BM25Index.from_dict(data)
+            offset = self._read_log(collection_name, index, 0)
+        except Exception as e:
+            log.warning(f"Failed to load BM25 index for {collection_name}: {e}")
+            return None
+
+        self._cache_put(collection_name, base_id, offset or 0, index)
+        return index
+
+    def _save(self, collection_name: str, index: BM25Index):
+        """Write the full index as the new base and drop the log"""
+        path = self._get_path(collection_name)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index.to_dict(), f, ensure_ascii=False, default=str)
+        os.replace(tmp_path, path)
+        # Replaying a leftover log over the new base is harmless, its deltas
+        # are idempotent
+        try:
+            os.remove(self._get_path(collection_name, "log"))
+        except FileNotFoundError:
+            pass
+
+        stat = os.stat(path)
+        self._cache_put(
+            collection_name, (stat.st_ino, stat.st_mtime_ns, stat.st_size), 0, index
+        )
+
+    def _append(
+        self,
+        collection_name: str,
+        index: BM25Index,
+        added: dict[str, dict],
+        deleted: list[str],
+    ):
+        line = json.dumps(
+            {"add": added, "delete": deleted}, ensure_ascii=False, default=str
+        )
+        with open(self._get_path(collection_name, "log"), "ab") as f:
+            f.write(line.encode("utf-8") + b"\n")
+            offset = f.tell()
+
+        base_path = self._get_path(collection_name)
+        stat = os.stat(base_path)
+        if offset > max(stat.st_size, 1024 * 1024):
+            self._save(collection_name, index)
+        else:
+            self._cache_put(
+                collection_name,
+                (stat.st_ino, stat.st_mtime_ns, stat.st_size),
+                offset,
+                index,
+            )
+
+    def has_index(self, collection_name: str) -> bool:
+        return os.path.exists(self._get_path(collection_name))
+
+    def get(self, collection_name: str) -> Optional[BM25Index]:
+        with self._lock:
+            return self._load(collection_name)
+
+    def get_or_build(
+        self, collection_name: str, fetch: Callable[[], Any]
+    ) -> Optional[BM25Index]:
+        """
+        Index of a collection, built from `fetch()` (a vector DB GetResult)
+        when it has none yet. The snapshot is taken under the collection's
+        write lock: adds and deletes skipped while no index existed are all
+        in it, and later ones wait for the saved index. Returns None when the
+        collection does not exist, and an unsaved empty index when it has no
+        items.
+        """
+        index = self.get(collection_name)
+        if index is not None:
+            return index
+
+        with self._write_lock(collection_name):
+            index = self._load(collection_name)
+            if index is not None:
+                return index
+
+            result = fetch()
+            if result is None:
+                return None
+
+            index = BM25Index()
+            if not result.ids or not result.ids[0]:
+                return index
+
+            index.add(result.ids[0], result.documents[0], result.metadatas[0])
+            self._save(collection_name, index)
+        log.info(f"Built BM25 index for {collection_name} with {len(index)} items")
+        return index
+
+    def add(self, collection_name: str, items: list[dict], create: bool = False):
+        """
+        Add vector items to the index of a collection. Unless `create` is set,
+        nothing is written for collections that have no index yet; those are
+        built from the vector DB on their first hybrid query instead, so a
+        partial index is never persisted.
+        """
+        with self._write_lock(collection_name):
+            try:
+                index = self._load(collection_name)
+                if index is None:
+                    if not create:
+                        return
+                    index = BM25Index()
+                    self._save(collection_name, index)
+
+                added = index.add(
+                    [item["id"] for item in items],
+                    [item["text"] for item in items],
+                    [item["metadata"] for item in items],
+                )
+                self._append(collection_name, index, added, [])
+            except Exception as e:
+                # A stale index is worse than none; drop it so it gets rebuilt
+                log.exception(f"Failed to update BM25 index for {collection_name}: {e}")
+                self._remove_files(collection_name)
+
+    def delete(
+        self,
+        collection_name: str,
+        ids: Optional[list[str]] = None,
+        filter: Optional[dict] = None,
+    ):
+        with self._write_lock(collection_name):
+            try:
+                index = self._load(collection_name)
+                if index is None:
+                    return
+
+                deleted = index.delete(ids=ids, filter=filter)
+                if deleted:
+                    self._append(collection_name, index, {}, deleted)
+            except Exception as e:
+                log.exception(f"Failed to update BM25 index for {collection_name}: {e}")
+                self._remove_files(collection_name)
+
+    def _remove_files(self, collection_name: str):
+        self._cache.pop(collection_name, None)
+        for ext in ("json", "log"):
+            try:
+                os.remove(self._get_path(collection_name, ext))
+            except FileNotFoundError:
+                pass
+
+    def delete_collection(self, collection_name: str):
+        with self._write_lock(collection_name):
+            self._remove_files(collection_name)
+
+    def rename_collection(self, collection_name: str, new_collection_name: str):
+        """Move the index of a collection, replacing any index under the new name."""
+        with self._write_lock(collection_name, new_collection_name):
+            self._cache.pop(collection_name, None)
+            self._remove_files(new_collection_name)
+            try:
+                # Log first, so the new name never pairs a base with a stale log
+                if os.path.exists(self._get_path(collection_name, "log")):
+                    os.replace(
+                        self._get_path(collection_name, "log"),
+                        self._get_path(new_collection_name, "log"),
+                    )
+                os.replace(
+                    self._get_path(collection_name),
+                    self._get_path(new_collection_name),
+                )
+            except FileNotFoundError:
+                # Built from the vector DB on the next hybrid query instead
+                self._remove_files(new_collection_name)
+
+    def reset(self):
+        with self._lock:
+            self._cache.clear()
+            for filename in os.listdir(self.index_dir):
+                if filename.endswith((".json", ".log")):
+                    try:
+                        os.remove(os.path.join(self.index_dir, filename))
+                    except FileNotFoundError:
+                        pass
+
+
+BM25_INDEX = BM25IndexManager(RAG_BM25_INDEX_DIR, RAG_BM25_INDEX_CACHE_SIZE)
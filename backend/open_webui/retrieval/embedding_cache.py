@@ -0,0 +1,338 @@
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from open_webui.config import (
+    ENABLE_EMBEDDING_CACHE,
+    EMBEDDING_CACHE_BACKEND,
+    EMBEDDING_CACHE_SIZE,
+    EMBEDDING_CACHE_SQLITE_PATH,
+    EMBEDDING_CACHE_TTL,
+)
+from open_webui.env import REDIS_KEY_PREFIX, SRC_LOG_LEVELS
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+
+def get_embedding_cache_key(
+    engine: str, model: str, prefix: Optional[str], text: str
+) -> str:
+    return hashlib.sha256(
+        json.dumps([engine, model, prefix, text], ensure_ascii=False).encode()
+    ).hexdigest()
+
+
+def pack_embedding(embedding: list[float]) -> bytes:
+    return array("d", embedding).tobytes()
+
+
+def unpack_embedding(data: bytes) -> list[float]:
+    embedding = array("d")
+    embedding.frombytes(data)
+    return embedding.tolist()
+
+
+class SQLiteEmbeddingCacheBackend:
+    """Persistent embedding store in a local SQLite file, shared by the workers of one host."""
+
+    def __init__(self, path: str, ttl: int = 0):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings "
+            "(key TEXT PRIMARY KEY, vector BLOB, created_at INTEGER)"
+        )
+        self._conn.commit()
+
+    def get_many(self, keys: list[str]) -> dict[str, list[float]]:
+        min_created_at = int(time.time()) - self.ttl if self.ttl else 0
+        results = {}
+        with self._lock:
+            for i in range(0, len(keys), 500):
+                batch = keys[i : i + 500]
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE created_at >= ? "
+                    f"AND key IN ({','.join('?' * len(batch))})",
+                    [min_created_at, *batch],
+                ).fetchall()
+                for key, vector in rows:
+                    results[key] = unpack_embedding(vector)
+        return results
+
+    def set_many(self, items: dict[str, list[float]]):
+        now = int(time.time())
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector, created_at) "
+                "VALUES (?, ?, ?)",
+                [(key, pack_embedding(vector), now) for key, vector in items.items()],
+            )
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM embeddings")
+            self._conn.commit()
+
+
+class RedisEmbeddingCacheBackend:
+    """Embedding store in Redis, shared by every instance of a deployment."""
+
+    def __init__(self, redis, prefix: str = REDIS_KEY_PREFIX, ttl: int = 0):
+        self.redis = redis
+        self.prefix = f"{prefix}:embedding"
+        self.ttl = ttl
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}:{key}"
+
+    def get_many(self, keys: list[str]) -> dict[str, list[float]]:
+        results = {}
+        for i in range(0, len(keys), 500):
+            batch = keys[i : i + 500]
+            values = self.redis.mget([self._key(key) for key in batch])
+            for key, value in zip(batch, values):
+                if value is not None:
+                    results[key] = unpack_embedding(base64.b64decode(value))
+        return results
+
+    def set_many(self, items: dict[str, list[float]]):
+        pipe = self.redis.pipeline()
+        for key, vector in items.items():
+            # The shared client decodes responses, so vectors are stored as text
+            pipe.set(
+                self._key(key),
+                base64.b64encode(pack_embedding(vector)).decode(),
+                ex=self.ttl or None,
+            )
+        pipe.execute()
+
+    def clear(self):
+        keys = []
+        for key in self.redis.scan_iter(match=f"{self.prefix}:*", count=1000):
+            keys.append(key)
+            if len(keys) >= 1000:
+                self.redis.delete(*keys)
+                keys = []
+        if keys:
+            self.redis.delete(*keys)
+
+
+class EmbeddingCache:
+    """
+    Two tier cache of embeddings keyed by engine, model, prefix and the hash
+    of the text. Lookups go to an in-process LRU first and then to the
+    optional shared backend, only the misses are sent to the embedding engine.
+
+    Since the keys carry the engine and model, entries of different models
+    live side by side and switching models needs no invalidation.
+
+    The LRU keeps vectors packed, a quarter of the size of float lists, and
+    every lookup unpacks a new list so callers can not alter cached entries.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        size: int = 10000,
+        backend=None,
+    ):
+        self.enabled = enabled
+        self.size = size
+        self.backend = backend
+
+        self._memory: OrderedDict[str, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.memory_hits = 0
+        self.backend_hits = 0
+        self.misses = 0
+
+    def _get_from_memory(self, keys: list[str]) -> dict[str, list[float]]:
+        results = {}
+        with self._lock:
+            for key in keys:
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    results[key] = self._memory[key]
+            self.memory_hits += len(results)
+        return {key: unpack_embedding(data) for key, data in results.items()}
+
+    def _get_from_backend(self, keys: list[str]) -> dict[str, list[float]]:
+        try:
+            found = self.backend.get_many(keys)
+        except Exception as e:
+            log.warning(f"Failed to read from embedding cache: {e}")
+            found = {}
+
+        if found:
+            self._remember(found)
+        with self._lock:
+            self.backend_hits += len(found)
+        return found
+
+    def _set_in_backend(self, items: dict[str, list[float]]):
+        try:
+            self.backend.set_many(items)
+        except Exception as e:
+            log.warning(f"Failed to write to embedding cache: {e}")
+
+    def get_many(self, keys: list[str]) -> dict[str, list[float]]:
+        results = self._get_from_memory(keys)
+
+        missing = [key for key in keys if key not in results]
+        if missing and self.backend:
+            results.update(self._get_from_backend(missing))
+
+        with self._lock:
+            self.misses += len(keys) - len(results)
+        return results
+
+    async def aget_many(self, keys: list[str]) -> dict[str, list[float]]:
+        """get_many with the backend read run off the event loop"""
+        results = self._get_from_memory(keys)
+
+        missing = [key for key in keys if key not in results]
+        if missing and self.backend:
+            results.update(await asyncio.to_thread(self._get_from_backend, missing))
+
+        with self._lock:
+            self.misses += len(keys) - len(results)
+        return results
+
+    def set_many(self, items: dict[str, list[float]]):
+        if not items:
+            return
+
+        self._remember(items)
+        if self.backend:
+            self._set_in_backend(items)
+
+    async def aset_many(self, items: dict[str, list[float]]):
+        """set_many with the backend write run off the event loop"""
+        if not items:
+            return
+
+        self._remember(items)
+        if self.backend:
+            await asyncio.to_thread(self._set_in_backend, items)
+
+    def _remember(self, items: dict[str, list[float]]):
+        packed = {key: pack_embedding(vector) for key, vector in items.items()}
+        with self._lock:
+            for key, data in packed.items():
+                self._memory[key] = data
+                self._memory.move_to_end(key)
+            while len(self._memory) > self.size:
+                self._memory.popitem(last=False)
+
+    def wrap(self, engine: str, model: str, embedding_function: Callable):
+        if not self.enabled:
+            return embedding_function
+
+        async def cached_embedding_function(query, prefix=None, user=None):
+            texts = query if isinstance(query, list) else [query]
+            keys = [get_embedding_cache_key(engine, model, prefix, t) for t in texts]
+
+            cached = await self.aget_many(list(dict.fromkeys(keys)))
+            missing = list(
+                dict.fromkeys(
+                    (key, text) for key, text in zip(keys, texts) if key not in cached
+                )
+            )
+
+            if missing:
+                result = await embedding_function(
+                    [text for _, text in missing], prefix=prefix, user=user
+                )
+                if not isinstance(result, list) or len(result) != len(missing):
+                    # Some batches failed, keep the embedding function's own behaviour
+                    if not cached:
+                        return (
+                            result
+                            if isinstance(query, list)
+                            else (result[0] if result else result)
+                        )
+                    return await embedding_function(query, prefix=prefix, user=user)
+
+                embeddings = {key: vector for (key, _), vector in zip(missing, result)}
+                await self.aset_many(embeddings)
+                cached.update(embeddings)
+
+            embeddings = [cached[key] for key in keys]
+            return embeddings if isinstance(query, list) else embeddings[0]
+
+        return cached_embedding_function
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            hits = self.memory_hits + self.backend_hits
+            total = hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "backend": (
+                    type(self.backend).__name__ if self.backend else "memory"
+                ),
+                "size": len(self._memory),
+                "max_size": self.size,
+                "memory_hits": self.memory_hits,
+                "backend_hits": self.backend_hits,
+                "hits": hits,
+                "misses": self.misses,
+                "hit_rate": hits / total if total else 0.0,
+            }
+
+    def reset(self):
+        with self._lock:
+            self._memory.clear()
+        if self.backend:
+            try:
+                self.backend.clear()
+            except Exception as e:
+                log.warning(f"Failed to clear embedding cache: {e}")
+
+
+def get_embedding_cache_backend(backend: str):
+    if backend == "redis":
+        from open_webui.utils.redis import get_redis_client
+
+        redis = get_redis_client()
+        if redis is not None:
+            return RedisEmbeddingCacheBackend(redis, ttl=EMBEDDING_CACHE_TTL)
+        log.warning("Redis is not available, falling back to the SQLite embedding cache")
+        backend = "sqlite"
+
+    if backend == "sqlite":
+        try:
+            return SQLiteEmbeddingCacheBackend(
+                EMBEDDING_CACHE_SQLITE_PATH, ttl=EMBEDDING_CACHE_TTL
+            )
+        except Exception as e:
+            log.warning(f"Failed to open the SQLite embedding cache: {e}")
+
+    return None
+
+
+EMBEDDING_CACHE = EmbeddingCache(
+    enabled=ENABLE_EMBEDDING_CACHE,
+    size=EMBEDDING_CACHE_SIZE,
+    backend=(
+        get_embedding_cache_backend(EMBEDDING_CACHE_BACKEND)
+        if ENABLE_EMBEDDING_CACHE
+        else None
+    ),
+)
@@ -0,0 +1,145 @@
+import asyncio
+import logging
+import random
+import threading
+from typing import Optional
+
+import aiohttp
+
+from open_webui.config import (
+    RAG_EMBEDDING_CONCURRENT_REQUESTS,
+    RAG_EMBEDDING_MAX_RETRIES,
+    RAG_EMBEDDING_RETRY_BACKOFF,
+)
+from open_webui.env import AIOHTTP_CLIENT_TIMEOUT, SRC_LOG_LEVELS
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+
+def is_retryable_status(status: int) -> bool:
+    return status == 429 or status >= 500
+
+
+class EmbeddingClient:
+    """
+    Long-lived HTTP client shared by every embedding engine.
+
+    Requests run on a dedicated event loop thread that owns a single
+    keep-alive connection pool, so callers on the main loop, in threadpool
+    workers or inside `asyncio.run` all reuse the same connections and the
+    same limit on in-flight batches. Responses with 429 or 5xx status and
+    connection errors are retried with exponential backoff, honouring
+    Retry-After when the server sends it.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        max_retries: int = 5,
+        backoff: float = 1.0,
+        timeout: Optional[int] = AIOHTTP_CLIENT_TIMEOUT,
+    ):
+        self.max_concurrency = max(max_concurrency, 1)
+        self.max_retries = max(max_retries, 0)
+        self.backoff = backoff
+        self.timeout = timeout
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._lock = threading.Lock()
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=loop.run_forever, name="embedding-client", daemon=True
+                )
+                self._thread.start()
+                self._loop = loop
+            return self._loop
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        # Only ever called on the client loop
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.max_concurrency,
+                    keepalive_timeout=60,
+                    ttl_dns_cache=300,
+                ),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                trust_env=True,
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._session
+
+    def _get_retry_delay(self, attempt: int, retry_after: Optional[str]) -> float:
+        if retry_after:
+            try:
+                return max(float(retry_after), 0)
+            except ValueError:
+                pass
+        return self.backoff * (2**attempt) + random.uniform(0, self.backoff)
+
+    async def _post(self, url: str, headers: dict, json: dict) -> dict:
+        session = self._get_session()
+        async with self._semaphore:
+            for attempt in range(self.max_retries + 1):
+                retry_after = None
+                try:
+                    async with session.post(url, headers=headers, json=json) as r:
+                        if (
+                            is_retryable_status(r.status)
+                            and attempt < self.max_retries
+                        ):
+                            retry_after = r.headers.get("Retry-After")
+                            log.warning(
+                                f"Embedding request to {url} returned {r.status}, retrying"
+                            )
+                        else:
+                            r.raise_for_status()
+                            return await r.json()
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                    if attempt >= self.max_retries:
+                        raise
+                    log.warning(f"Embedding request to {url} failed: {e}, retrying")
+
+                await asyncio.sleep(self._get_retry_delay(attempt, retry_after))
+
+    async def post(self, url: str, headers: dict, json: dict) -> dict:
+        future = asyncio.run_coroutine_threadsafe(
+            self._post(url, headers, json), self._get_loop()
+        )
+        return await asyncio.wrap_future(future)
+
+    def post_sync(self, url: str, headers: dict, json: dict) -> dict:
+        future = asyncio.run_coroutine_threadsafe(
+            self._post(url, headers, json), self._get_loop()
+        )
+        return future.result()
+
+    async def _close_session(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def close(self):
+        with self._lock:
+            loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+
+        await asyncio.wrap_future(
+            asyncio.run_coroutine_threadsafe(self._close_session(), loop)
+        )
+
+
+EMBEDDING_CLIENT = EmbeddingClient(
+    max_concurrency=RAG_EMBEDDING_CONCURRENT_REQUESTS,
+    max_retries=RAG_EMBEDDING_MAX_RETRIES,
+    backoff=RAG_EMBEDDING_RETRY_BACKOFF,
+)
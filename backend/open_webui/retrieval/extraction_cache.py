@@ -0,0 +1,161 @@
+import hashlib
+import io
+import json
+import logging
+from typing import Optional
+
+from langchain_core.documents import Document
+
+from open_webui.config import ENABLE_EXTRACTION_CACHE, EXTRACTION_CACHE_MAX_SIZE
+from open_webui.env import SRC_LOG_LEVELS
+from open_webui.models.extraction_cache import ExtractionCacheEntries
+from open_webui.storage.provider import Storage
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+
+# Loader kwargs that never change the extracted content
+IGNORED_LOADER_PARAMS = {"user", "progress_callback"}
+
+
+def calculate_file_sha256(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    sha256 = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def get_loader_params(engine: str, kwargs: dict) -> dict:
+    params = {"engine": engine}
+    for key, value in kwargs.items():
+        if key in IGNORED_LOADER_PARAMS or callable(value):
+            continue
+
+        # Only whether a credential is set affects which loader is used,
+        # rotating it should not invalidate the cache
+        if key.endswith("_KEY"):
+            value = bool(value)
+
+        params[key] = value
+    return params
+
+
+class ExtractionCache:
+    """
+    Content addressed cache of extracted documents. Entries are keyed by the
+    sha256 of the raw file plus the extraction engine and its parameters,
+    stored as JSON on the configured storage provider and evicted least
+    recently used first once their total size exceeds `max_size` bytes.
+    """
+
+    def __init__(self, enabled: bool = True, max_size: int = 1024 * 1024 * 1024):
+        self.enabled = enabled
+        self.max_size = max_size
+
+    def get_key(
+        self,
+        file_path: str,
+        filename: str,
+        file_content_type: Optional[str],
+        engine: str,
+        kwargs: dict,
+    ) -> str:
+        params = {
+            # The loader is picked by extension and content type
+            "ext": filename.split(".")[-1].lower(),
+            "content_type": file_content_type,
+            **get_loader_params(engine, kwargs),
+        }
+        params_hash = hashlib.sha256(
+            json.dumps(params, sort_keys=True, default=str).encode()
+        ).hexdigest()
+
+        return f"{calculate_file_sha256(file_path)}-{params_hash[:16]}"
+
+    def get(self, key: str) -> Optional[list[Document]]:
+        entry = ExtractionCacheEntries.get_entry_by_id(key)
+        if entry is None:
+            return None
+
+        try:
+            with open(Storage.get_file(entry.path), "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception as e:
+            log.warning(f"Dropping unreadable extraction cache entry {key}: {e}")
+            self.delete(key)
+            return None
+
+        ExtractionCacheEntries.touch_entry_by_id(key)
+        log.info(f"Extraction cache hit for {key}")
+        return [
+            Document(page_content=doc["page_content"], metadata=doc["metadata"])
+            for doc in data.get("docs", [])
+        ]
+
+    def set(self, key: str, docs: list[Document]):
+        # Loaders report some failures as documents, those are not cached
+        if not docs or any(doc.metadata.get("error") for doc in docs):
+            return
+
+        contents = json.dumps(
+            {
+                "docs": [
+                    {"page_content": doc.page_content, "metadata": doc.metadata}
+                    for doc in docs
+                ]
+            },
+            ensure_ascii=False,
+            default=str,
+        ).encode("utf-8")
+
+        if len(contents) > self.max_size:
+            return
+
+        try:
+            _, path = Storage.upload_file(
+                io.BytesIO(contents),
+                f"extraction-cache-{key}.json",
+                {"OpenWebUI-Extraction-Cache": key},
+            )
+            ExtractionCacheEntries.insert_new_entry(key, path, len(contents))
+        except Exception as e:
+            log.warning(f"Failed to store extraction cache entry {key}: {e}")
+            return
+
+        self.evict()
+
+    def delete(self, key: str):
+        entry = ExtractionCacheEntries.get_entry_by_id(key)
+        if entry is None:
+            return
+
+        try:
+            Storage.delete_file(entry.path)
+        except Exception as e:
+            log.debug(f"Failed to delete extraction cache file {entry.path}: {e}")
+        ExtractionCacheEntries.delete_entry_by_id(key)
+
+    def evict(self):
+        total_size = ExtractionCacheEntries.get_total_size()
+        while total_size > self.max_size:
+            entries = ExtractionCacheEntries.get_least_recently_used_entries()
+            if not entries:
+                break
+
+            for entry in entries:
+                if total_size <= self.max_size:
+                    break
+                self.delete(entry.id)
+                total_size -= entry.size
+
+    def reset(self):
+        # The files themselves are removed with the rest of the storage
+        ExtractionCacheEntries.delete_all_entries()
+
+
+EXTRACTION_CACHE = ExtractionCache(
+    enabled=ENABLE_EXTRACTION_CACHE,
+    max_size=EXTRACTION_CACHE_MAX_SIZE * 1024 * 1024,
+)
@@ -5,13 +5,19 @@ PDF와 이미지 파일을 모두 처리할 수 있습니다.
 """
 import requests
 import os
-from typing import List, Optional
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, List, Optional
 from langchain_core.documents import Document
 from langchain_community.document_loaders.base import BaseLoader
-from pdf2image import convert_from_path
+from pdf2image import convert_from_path, pdfinfo_from_path
 from PIL import Image
+from requests.adapters import HTTPAdapter
 import io
 
+log = logging.getLogger(__name__)
+
 
 class DeepSeekOCRLoader(BaseLoader):
     """
@@ -31,6 +37,11 @@ class DeepSeekOCRLoader(BaseLoader):
         file_path: str,
         ocr_server_url: str = "http://localhost:8000",
         extract_images: Optional[bool] = None,
+        streaming: bool = False,
+        max_concurrent_requests: int = 4,
+        page_range_size: int = 4,
+        max_retries: int = 2,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
         **kwargs
     ):
         """
@@ -38,11 +49,21 @@ class DeepSeekOCRLoader(BaseLoader):
             file_path: OCR 처리할 PDF 또는 이미지 파일 경로
             ocr_server_url: OCR 서버 URL (기본값: http://localhost:8000)
             extract_images: PyPDFLoader 호환을 위한 옵션 (PDF의 경우 이미지 추출 여부)
+            streaming: PDF 페이지를 작은 범위 단위로 렌더링하며 동시에 OCR 요청 (메모리 절약)
+            max_concurrent_requests: 스트리밍 모드에서 동시에 보낼 OCR 요청 수
+            page_range_size: 스트리밍 모드에서 한 번에 렌더링할 페이지 수
+            max_retries: 페이지별 OCR 요청 재시도 횟수
+            progress_callback: 페이지 처리 진행 상황 콜백 (완료 페이지 수, 전체 페이지 수)
             **kwargs: 추가 옵션
         """
         self.file_path = file_path
         self.ocr_server_url = ocr_server_url.rstrip("/")
         self.extract_images = extract_images
+        self.streaming = streaming
+        self.max_concurrent_requests = max(1, max_concurrent_requests)
+        self.page_range_size = max(1, page_range_size)
+        self.max_retries = max(0, max_retries)
+        self.progress_callback = progress_callback
         self.kwargs = kwargs
     
     def _is_pdf(self, file_path: str) -> bool:
@@ -58,7 +79,13 @@ class DeepSeekOCRLoader(BaseLoader):
         """파일이 HWP/HWPX인지 확인"""
         return file_path.lower().endswith((".hwp", ".hwpx"))
     
-    def _ocr_image(self, image: Image.Image, filename: str, page_num: Optional[int] = None) -> Document:
+    def _ocr_image(
+        self,
+        image: Image.Image,
+        filename: str,
+        page_num: Optional[int] = None,
+        session: Optional[requests.Session] = None,
+    ) -> Document:
         """단일 이미지를 OCR 처리하여 Document 반환"""
         try:
             # 이미지를 바이트로 변환
@@ -68,7 +95,7 @@ class DeepSeekOCRLoader(BaseLoader):
             
             # OCR 서버로 전송
             files = {"file": (filename, img_byte_arr, "image/png")}
-            response = requests.post(
+            response = (session or requests).post(
                 f"{self.ocr_server_url}/ocr",
                 files=files,
                 timeout=300
@@ -100,6 +127,104 @@ class DeepSeekOCRLoader(BaseLoader):
         except Exception as e:
             raise Exception(f"Failed to process image: {str(e)}")
     
+    def _report_progress(self, completed: int, total: int):
+        if self.progress_callback:
+            try:
+                self.progress_callback(completed, total)
+            except Exception as e:
+                log.debug(f"OCR progress callback failed: {e}")
+
+    def _ocr_page(
+        self, session: requests.Session, image: Image.Image, page_num: int
+    ) -> Document:
+        """페이지 단위 OCR (실패 시 지수 백오프로 재시도)"""
+        filename = f"{os.path.basename(self.file_path)}_page_{page_num}.png"
+        for attempt in range(self.max_retries + 1):
+            try:
+                return self._ocr_image(
+                    image, filename, page_num=page_num, session=session
+                )
+            except Exception as e:
+                if attempt >= self.max_retries:
+                    raise Exception(f"Page {page_num}: {str(e)}")
+                log.warning(
+                    f"OCR failed for page {page_num} (attempt {attempt + 1}), retrying: {e}"
+                )
+                time.sleep(2**attempt)
+
+    def _load_pdf_streaming(self) -> List[Document]:
+        """
+        PDF를 page_range_size 페이지씩 렌더링하면서 OCR 서버로 동시에 전송
+        - 동시에 렌더링되어 메모리에 남는 페이지는 최대 (동시 요청 수 + 범위 크기)
+        - 하나의 Session(keep-alive 커넥션 풀)을 재사용
+        - 결과는 페이지 순서대로 반환
+        """
+        total_pages = pdfinfo_from_path(self.file_path)["Pages"]
+        max_in_flight = self.max_concurrent_requests
+
+        results = {}
+        completed = 0
+        self._report_progress(0, total_pages)
+
+        with requests.Session() as session, ThreadPoolExecutor(
+            max_workers=self.max_concurrent_requests
+        ) as executor:
+            adapter = HTTPAdapter(
+                pool_connections=1, pool_maxsize=self.max_concurrent_requests
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+
+            pending = {}
+
+            def collect(return_when):
+                nonlocal completed
+                done, _ = wait(pending.keys(), return_when=return_when)
+                for future in done:
+                    page_num = pending.pop(future)
+                    # 실패한 페이지가 있으면 예외가 그대로 전파됨
+                    results[page_num] = future.result()
+                    completed += 1
+                    self._report_progress(completed, total_pages)
+
+            try:
+                for first_page in range(1, total_pages + 1, self.page_range_size):
+                    last_page = min(first_page + self.page_range_size - 1, total_pages)
+                    images = convert_from_path(
+                        self.file_path, first_page=first_page, last_page=last_page
+                    )
+
+                    for offset, image in enumerate(images):
+                        while len(pending) >= max_in_flight:
+                            collect(FIRST_COMPLETED)
+                        page_num = first_page + offset
+                        future = executor.submit(
+                            self._ocr_page, session, image, page_num
+                        )
+                        pending[future] = page_num
+                    del images
+
+                while pending:
+                    collect(FIRST_COMPLETED)
+            except Exception:
+                for future in pending:
+                    future.cancel()
+                raise
+
+        documents = []
+        for page_num in sorted(results):
+            document = results[page_num]
+            # PyPDFLoader와 동일한 형식으로 metadata 설정
+            document.metadata.update(
+                {
+                    "source": self.file_path,
+                    "page": page_num,
+                    "total_pages": total_pages,
+                }
+            )
+            documents.append(document)
+        return documents
+
     def load(self) -> List[Document]:
         """
         PDF 또는 이미지를 OCR 처리하여 Document 리스트를 반환
@@ -114,8 +239,15 @@ class DeepSeekOCRLoader(BaseLoader):
         
         documents = []
         
+        # PDF 파일 처리 (스트리밍 모드)
+        if self._is_pdf(self.file_path) and self.streaming:
+            try:
+                documents = self._load_pdf_streaming()
+            except Exception as e:
+                raise Exception(f"Failed to process PDF: {str(e)}")
+
         # PDF 파일 처리
-        if self._is_pdf(self.file_path):
+        elif self._is_pdf(self.file_path):
             try:
                 # PDF를 이미지로 변환 (각 페이지별)
                 images = convert_from_path(self.file_path)
@@ -1,121 +1,36 @@
-import jpype
-import jpype.imports
-from jpype.types import JString
-import tempfile
 import os
 import logging
 import threading
 from typing import List
 from langchain_core.documents import Document
-from open_webui.env import SRC_LOG_LEVELS
+from open_webui.env import SRC_LOG_LEVELS, HWP_WORKER_POOL_SIZE, HWP_WORKER_TIMEOUT
+from open_webui.retrieval.loaders.hwp_worker_pool import (
+    HWPExtractionError,
+    HWPWorkerPool,
+)
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["RAG"])
 
+DEFAULT_HWP_JAR_PATH = '/workspace/open-webui/backend/python-hwplib/hwplib-1.1.8.jar'
+DEFAULT_HWPX_JAR_PATH = '/workspace/open-webui/backend/python-hwpxlib/hwpxlib-1.0.5.jar'
 
-class JVMManager:
-    """전역 JVM 관리자 - 스레드 안전한 JVM 생명주기 관리"""
-    _instance = None
-    _lock = threading.Lock()
-    _jvm_started = False
-    _hwp_jar_path = None
-    _hwpx_jar_path = None
-    
-    def __new__(cls):
-        if cls._instance is None:
-            with cls._lock:
-                if cls._instance is None:
-                    cls._instance = super(JVMManager, cls).__new__(cls)
-        return cls._instance
-    
-    def initialize(self, hwp_jar_path, hwpx_jar_path):
-        """JVM 초기화 (한 번만 실행)"""
-        with self._lock:
-            if not self._jvm_started:
-                self._hwp_jar_path = hwp_jar_path
-                self._hwpx_jar_path = hwpx_jar_path
-                
-                if not jpype.isJVMStarted():
-                    try:
-                        jpype.startJVM(
-                            jpype.getDefaultJVMPath(),
-                            f"-Djava.class.path={hwp_jar_path}:{hwpx_jar_path}"
-                        )
-                        self._jvm_started = True
-                        log.info("JVM이 성공적으로 시작되었습니다.")
-                    except Exception as e:
-                        log.error(f"JVM 시작 실패: {str(e)}")
-                        raise
-                else:
-                    self._jvm_started = True
-                    log.info("JVM이 이미 실행 중입니다.")
-    
-    def is_initialized(self):
-        """JVM이 초기화되었는지 확인"""
-        return self._jvm_started and jpype.isJVMStarted()
+_worker_pools = {}
+_worker_pools_lock = threading.Lock()
 
 
-class HWPProcessor:
-    def __init__(self, hwp_jar_path, hwpx_jar_path):
-        self.hwp_jar_path = hwp_jar_path
-        self.hwpx_jar_path = hwpx_jar_path
-        self.jvm_manager = JVMManager()
-    
-    def ensure_jvm(self):
-        """JVM이 실행 중인지 확인하고 필요시 시작"""
-        if not self.jvm_manager.is_initialized():
-            self.jvm_manager.initialize(self.hwp_jar_path, self.hwpx_jar_path)
-    
-    def extract_hwp_text(self, file_path):
-        """HWP 파일에서 텍스트 추출"""
-        try:
-            self.ensure_jvm()
-            
-            from kr.dogfoot.hwplib.reader import HWPReader
-            from kr.dogfoot.hwplib.tool.textextractor import TextExtractor
-            # from kr.dogfoot.hwplib.tool.textextractor.TextExtractMethod import TextExtractMethod
-            from java.io import File
-            
-            ## hwp 파싱 오류 수정
-            TextExtractMethod = jpype.JClass('kr.dogfoot.hwplib.tool.textextractor.TextExtractMethod')
-            
-            java_file = File(file_path)
-            hwp_file = HWPReader.fromFile(java_file)
-            if hwp_file is not None:
-                text = TextExtractor.extract(
-                    hwp_file, 
-                    TextExtractMethod.InsertControlTextBetweenParagraphText
-                )
-                return str(text)
-            return ""
-            
-        except Exception as e:
-            log.error(f"HWP 처리 오류: {str(e)}")
-            return f"HWP 처리 오류: {str(e)}"
-    
-    def extract_hwpx_text(self, file_path):
-        """HWPX 파일에서 텍스트 추출"""
-        try:
-            self.ensure_jvm()
-            
-            from kr.dogfoot.hwpxlib.reader import HWPXReader
-            from kr.dogfoot.hwpxlib.tool.textextractor import TextExtractor as HWPXTextExtractor
-            from java.io import File
-            
-            java_file = File(file_path)
-            hwpx_file = HWPXReader.fromFile(java_file)
-            if hwpx_file is not None:
-                try:
-                    text = HWPXTextExtractor.extract(hwpx_file)
-                except:
-                    text = HWPXTextExtractor.extract(hwpx_file, None, True, None)
-                
-                return str(text)
-            return ""
-            
-        except Exception as e:
-            log.error(f"HWPX 처리 오류: {str(e)}")
-            return f"HWPX 처리 오류: {str(e)}"
+def get_hwp_worker_pool(hwp_jar_path, hwpx_jar_path) -> HWPWorkerPool:
+    """JAR 경로별 전역 워커 풀 (처음 호출 시 생성)"""
+    key = (hwp_jar_path, hwpx_jar_path)
+    with _worker_pools_lock:
+        if key not in _worker_pools:
+            _worker_pools[key] = HWPWorkerPool(
+                hwp_jar_path,
+                hwpx_jar_path,
+                pool_size=HWP_WORKER_POOL_SIZE,
+                timeout=HWP_WORKER_TIMEOUT,
+            )
+        return _worker_pools[key]
 
 
 class HWPLoader:
@@ -123,9 +38,8 @@ class HWPLoader:
     
     def __init__(self, file_path: str, hwp_jar_path: str = None, hwpx_jar_path: str = None):
         self.file_path = file_path
-        self.hwp_jar_path = hwp_jar_path or os.getenv('HWP_JAR_PATH', '/workspace/open-webui/backend/python-hwplib/hwplib-1.1.8.jar')
-        self.hwpx_jar_path = hwpx_jar_path or os.getenv('HWPX_JAR_PATH', '/workspace/open-webui/backend/python-hwpxlib/hwpxlib-1.0.5.jar')
-        self.processor = None
+        self.hwp_jar_path = hwp_jar_path or os.getenv('HWP_JAR_PATH', DEFAULT_HWP_JAR_PATH)
+        self.hwpx_jar_path = hwpx_jar_path or os.getenv('HWPX_JAR_PATH', DEFAULT_HWPX_JAR_PATH)
     
     def load(self) -> List[Document]:
         """HWP/HWPX 파일을 로드하고 Document 객체로 변환"""
@@ -154,20 +68,25 @@ class HWPLoader:
                 }
             )]
         
-        self.processor = HWPProcessor(self.hwp_jar_path, self.hwpx_jar_path)
-        
         try:
-            if file_extension == '.hwp':
-                text_content = self.processor.extract_hwp_text(self.file_path)
-            elif file_extension == '.hwpx':
-                text_content = self.processor.extract_hwpx_text(self.file_path)
-            else:
+            if file_extension not in ('.hwp', '.hwpx'):
                 raise ValueError(f"지원하지 않는 파일 형식: {file_extension}")
-            
-            # 텍스트가 비어있거나 오류 메시지인 경우 처리
-            if not text_content or text_content.startswith("HWP 처리 오류") or text_content.startswith("HWPX 처리 오류"):
-                log.warning(f"텍스트 추출 실패: {text_content}")
+
+            # 추출은 워커 프로세스에서 실행 (유휴 워커가 없으면 대기)
+            pool = get_hwp_worker_pool(self.hwp_jar_path, self.hwpx_jar_path)
+            error = None
+            try:
+                text_content = pool.extract(self.file_path)
+            except HWPExtractionError as e:
+                log.error(f"HWP 처리 오류: {str(e)}")
+                text_content = ""
+                error = str(e)
+
+            # 텍스트가 비어있는 경우 처리
+            if not text_content:
+                log.warning(f"텍스트 추출 실패: {self.file_path}")
                 text_content = "텍스트를 추출할 수 없습니다."
+                error = error or "text_extraction_failed"
             
             # Document 객체 생성
             metadata = {
@@ -175,6 +94,9 @@ class HWPLoader:
                 "file_type": file_extension[1:],  # .hwp -> hwp
                 "processing_engine": "hwp_processor"
             }
+            # 실패 결과는 추출 캐시에 저장되지 않도록 표시
+            if error:
+                metadata["error"] = error
             
             return [Document(page_content=text_content, metadata=metadata)]
             
@@ -193,16 +115,14 @@ class HWPLoader:
 def process_hwp_hwpx_files(file_path, file_extension):
     """HWP/HWPX 파일 처리 메인 함수 (기존 코드와의 호환성을 위해 유지)"""
     
-    processor = HWPProcessor(
-        os.getenv('HWP_JAR_PATH', '/workspace/open-webui/backend/python-hwplib/hwplib-1.1.8.jar'),
-        os.getenv('HWPX_JAR_PATH', '/workspace/open-webui/backend/python-hwpxlib/hwpxlib-1.0.5.jar')
+    pool = get_hwp_worker_pool(
+        os.getenv('HWP_JAR_PATH', DEFAULT_HWP_JAR_PATH),
+        os.getenv('HWPX_JAR_PATH', DEFAULT_HWPX_JAR_PATH)
     )
     
     try:
-        if file_extension.lower() == '.hwp':
-            return processor.extract_hwp_text(file_path)
-        elif file_extension.lower() == '.hwpx':
-            return processor.extract_hwpx_text(file_path)
+        if file_extension.lower() in ('.hwp', '.hwpx'):
+            return pool.extract(file_path)
         else:
             return "지원하지 않는 파일 형식입니다."
     except Exception as e:
@@ -0,0 +1,119 @@
+"""
+HWP/HWPX 텍스트 추출 워커 풀
+
+JVM(hwplib/hwpxlib)을 띄운 장기 실행 프로세스 여러 개를 두고, 요청 스레드는
+대기열에서 유휴 워커를 받아 파일 경로만 넘깁니다. 추출은 워커 프로세스에서
+실행되므로 웹 프로세스의 GIL 과 JVM 을 공유하지 않고 여러 코어로 분산됩니다.
+파일별 제한 시간을 넘기거나 비정상 종료한 워커는 종료 후 새로 띄웁니다.
+
+python-hwplib/hwp_flask.py 에서도 그대로 가져다 쓰므로 표준 라이브러리와
+jpype 외의 의존성을 두지 않습니다.
+"""
+
+import os
+from typing import Optional
+
+try:
+    from open_webui.utils.worker_process_pool import WorkerProcessPool, serve_worker
+except ImportError:
+    # python-hwplib 이미지에서는 같은 디렉터리에 복사된 파일을 사용
+    from worker_process_pool import WorkerProcessPool, serve_worker
+
+
+class HWPExtractionError(Exception):
+    """워커가 파일 처리에 실패한 경우"""
+
+
+class HWPWorkerTimeout(HWPExtractionError):
+    """파일별 제한 시간 초과"""
+
+
+def _extract_text(file_path: str) -> str:
+    import jpype
+    from java.io import File
+
+    if os.path.splitext(file_path)[1].lower() == ".hwpx":
+        from kr.dogfoot.hwpxlib.reader import HWPXReader
+        from kr.dogfoot.hwpxlib.tool.textextractor import (
+            TextExtractor as HWPXTextExtractor,
+        )
+
+        hwpx_file = HWPXReader.fromFile(File(file_path))
+        if hwpx_file is None:
+            return ""
+        try:
+            text = HWPXTextExtractor.extract(hwpx_file)
+        except Exception:
+            text = HWPXTextExtractor.extract(hwpx_file, None, True, None)
+        return str(text)
+
+    from kr.dogfoot.hwplib.reader import HWPReader
+    from kr.dogfoot.hwplib.tool.textextractor import TextExtractor
+
+    ## hwp 파싱 오류 수정
+    TextExtractMethod = jpype.JClass(
+        "kr.dogfoot.hwplib.tool.textextractor.TextExtractMethod"
+    )
+
+    hwp_file = HWPReader.fromFile(File(file_path))
+    if hwp_file is None:
+        return ""
+    return str(
+        TextExtractor.extract(
+            hwp_file, TextExtractMethod.InsertControlTextBetweenParagraphText
+        )
+    )
+
+
+def _start_jvm(hwp_jar_path: str, hwpx_jar_path: str):
+    try:
+        import jpype
+
+        class_path = os.pathsep.join(
+            path for path in (hwp_jar_path, hwpx_jar_path) if path
+        )
+        jpype.startJVM(jpype.getDefaultJVMPath(), f"-Djava.class.path={class_path}")
+    except Exception as e:
+        raise RuntimeError(f"JVM 시작 실패: {e}") from e
+
+
+def _worker_main(conn, hwp_jar_path: str, hwpx_jar_path: str):
+    """워커 프로세스 본체 - JVM 을 한 번 띄우고 파이프로 들어오는 파일을 처리"""
+    serve_worker(
+        conn,
+        lambda: _start_jvm(hwp_jar_path, hwpx_jar_path),
+        lambda _, file_path: _extract_text(file_path),
+    )
+
+
+class HWPWorkerPool(WorkerProcessPool):
+    """
+    JVM 워커 프로세스 풀
+
+    pool_size 개의 슬롯을 대기열로 관리합니다. 워커는 처음 필요할 때 띄우고,
+    시간 초과나 비정상 종료 시 해당 슬롯을 비워 다음 요청에서 새로 띄웁니다.
+    """
+
+    name = "HWP"
+    error_class = HWPExtractionError
+    timeout_class = HWPWorkerTimeout
+
+    def __init__(
+        self,
+        hwp_jar_path: str,
+        hwpx_jar_path: str,
+        pool_size: int = 2,
+        timeout: Optional[float] = 120,
+    ):
+        self.hwp_jar_path = hwp_jar_path
+        self.hwpx_jar_path = hwpx_jar_path
+        super().__init__(
+            _worker_main,
+            (hwp_jar_path, hwpx_jar_path),
+            pool_size=pool_size,
+            timeout=timeout,
+        )
+
+    def extract(self, file_path: str, timeout: Optional[float] = None) -> str:
+        """파일 하나의 텍스트를 워커에서 추출 (유휴 워커가 없으면 대기)"""
+        return self.request(os.path.abspath(file_path), file_path, timeout)
@@ -30,8 +30,17 @@ from open_webui.retrieval.loaders.datalab_marker import DatalabMarkerLoader
 from open_webui.retrieval.loaders.mineru import MinerULoader
 
 
-from open_webui.env import SRC_LOG_LEVELS, GLOBAL_LOG_LEVEL, OCR_SERVER_URL
+from open_webui.env import (
+    SRC_LOG_LEVELS,
+    GLOBAL_LOG_LEVEL,
+    OCR_SERVER_URL,
+    ENABLE_OCR_STREAMING,
+    OCR_MAX_CONCURRENT_REQUESTS,
+    OCR_PAGE_RANGE_SIZE,
+    OCR_PAGE_MAX_RETRIES,
+)
 from open_webui.retrieval.loaders.deepseek_ocr_loader import DeepSeekOCRLoader
+from open_webui.retrieval.extraction_cache import EXTRACTION_CACHE
 
 logging.basicConfig(stream=sys.stdout, level=GLOBAL_LOG_LEVEL)
 log = logging.getLogger(__name__)
@@ -194,16 +203,32 @@ class Loader:
     def load(
         self, filename: str, file_content_type: str, file_path: str
     ) -> list[Document]:
+        cache_key = None
+        if EXTRACTION_CACHE.enabled:
+            try:
+                cache_key = EXTRACTION_CACHE.get_key(
+                    file_path, filename, file_content_type, self.engine, self.kwargs
+                )
+                docs = EXTRACTION_CACHE.get(cache_key)
+                if docs is not None:
+                    return docs
+            except Exception as e:
+                log.warning(f"Extraction cache lookup failed for {filename}: {e}")
+
         loader = self._get_loader(filename, file_content_type, file_path)
         docs = loader.load()
 
-        return [
+        docs = [
             Document(
                 page_content=ftfy.fix_text(doc.page_content), metadata=doc.metadata
             )
             for doc in docs
         ]
 
+        if cache_key:
+            EXTRACTION_CACHE.set(cache_key, docs)
+        return docs
+
     def _is_text_file(self, file_ext: str, file_content_type: str) -> bool:
         return file_ext in known_source_ext or (
             file_content_type
@@ -361,7 +386,12 @@ class Loader:
                 loader = DeepSeekOCRLoader(
                     file_path,
                     extract_images=True,
-                    ocr_server_url=OCR_SERVER_URL
+                    ocr_server_url=OCR_SERVER_URL,
+                    streaming=ENABLE_OCR_STREAMING,
+                    max_concurrent_requests=OCR_MAX_CONCURRENT_REQUESTS,
+                    page_range_size=OCR_PAGE_RANGE_SIZE,
+                    max_retries=OCR_PAGE_MAX_RETRIES,
+                    progress_callback=self.kwargs.get("progress_callback"),
                 )
             elif file_ext == "csv":
                 loader = CSVLoader(file_path, autodetect_encoding=True)
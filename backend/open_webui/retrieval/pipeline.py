@@ -0,0 +1,392 @@
+import asyncio
+import logging
+import threading
+import uuid
+from collections import deque
+from concurrent.futures import Future
+from typing import Awaitable, Callable, Optional
+
+from langchain_core.documents import Document
+
+from open_webui.config import (
+    INGESTION_PIPELINE_EMBED_WORKERS,
+    INGESTION_PIPELINE_LOAD_WORKERS,
+    INGESTION_PIPELINE_QUEUE_SIZE,
+    INGESTION_PIPELINE_UPSERT_BATCH_SIZE,
+)
+from open_webui.constants import ERROR_MESSAGES
+from open_webui.env import SRC_LOG_LEVELS
+from open_webui.retrieval.bm25 import BM25_INDEX
+from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+
+class PreparedDocs:
+    def __init__(self, texts: list[str], metadatas: list[dict], create: bool = False):
+        self.texts = texts
+        self.metadatas = metadatas
+        # Whether the collection is new (or was just overwritten)
+        self.create = create
+
+
+class IngestionJob:
+    """
+    A unit of work for the ingestion pipeline, usually one file.
+
+    `load` returns the documents to index and `prepare` turns them into the
+    texts and metadatas to embed, or None when nothing should be written.
+    Both are blocking and run in a worker thread. `embed` is awaited on the
+    pipeline loop. `on_status` is called with the name of each stage the
+    job enters. `overwrite` marks jobs whose `prepare` may drop the
+    collection.
+    """
+
+    def __init__(
+        self,
+        collection_name: str,
+        load: Callable[[], list[Document]],
+        prepare: Callable[[list[Document]], Optional[PreparedDocs]],
+        embed: Callable[[list[str]], Awaitable[list]],
+        on_status: Optional[Callable[[str], None]] = None,
+        name: Optional[str] = None,
+        overwrite: bool = False,
+    ):
+        self.id = str(uuid.uuid4())
+        self.collection_name = collection_name
+        self.load = load
+        self.prepare = prepare
+        self.embed = embed
+        self.on_status = on_status
+        self.name = name or collection_name
+        self.overwrite = overwrite
+
+        self.status = "queued"
+        self.future: Future = Future()
+
+        self.docs: list[Document] = []
+        self.prepared: Optional[PreparedDocs] = None
+        self.items: list[dict] = []
+
+    def fail(self, e: BaseException):
+        self.status = "failed"
+        if not self.future.done():
+            self.future.set_exception(e)
+
+    def complete(self, result=True):
+        self.status = "completed"
+        if not self.future.done():
+            self.future.set_result(result)
+
+
+class _CollectionState:
+    """Jobs of one collection between loading and their write"""
+
+    def __init__(self):
+        # Loaded jobs waiting for their turn to prepare
+        self.waiting: deque[IngestionJob] = deque()
+        self.runner: Optional[asyncio.Task] = None
+
+        # Prepared jobs whose chunks are not written yet
+        self.pending = 0
+        self.drained = asyncio.Event()
+        self.drained.set()
+        # Content hashes of the pending jobs
+        self.hashes: dict[str, str] = {}
+        # A pending job found the collection missing and will create it
+        self.creating = False
+
+
+class IngestionPipeline:
+    """
+    Staged document ingestion: load -> split -> embed -> upsert.
+
+    Each stage has its own workers and the stages are connected by bounded
+    queues, so while one file is being embedded the next ones are already
+    loading and splitting. The upsert stage drains whatever is ready and
+    writes it to the vector DB in one upsert per collection, batching
+    chunks across files. Runs on a dedicated event loop thread so that both
+    sync route handlers and async callers can submit jobs.
+
+    Jobs of one collection are prepared one at a time by a runner of that
+    collection, so the duplicate and overwrite checks in `prepare` see the
+    jobs before them: the hashes of prepared jobs stay reserved until their
+    chunks are written, and an overwrite waits for those writes. Embedding
+    and writing are not serialized.
+    """
+
+    def __init__(
+        self,
+        load_workers: int = 2,
+        embed_workers: int = 2,
+        queue_size: int = 8,
+        upsert_batch_size: int = 1000,
+    ):
+        self.load_workers = max(load_workers, 1)
+        self.embed_workers = max(embed_workers, 1)
+        self.queue_size = max(queue_size, 1)
+        self.upsert_batch_size = max(upsert_batch_size, 1)
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=loop.run_forever, name="ingestion-pipeline", daemon=True
+                )
+                self._thread.start()
+                asyncio.run_coroutine_threadsafe(self._start(), loop).result()
+                self._loop = loop
+            return self._loop
+
+    async def _start(self):
+        self._load_queue: asyncio.Queue[IngestionJob] = asyncio.Queue(self.queue_size)
+        self._embed_queue: asyncio.Queue[IngestionJob] = asyncio.Queue(self.queue_size)
+        self._upsert_queue: asyncio.Queue[IngestionJob] = asyncio.Queue(self.queue_size)
+
+        # Bounds the loaded jobs waiting in the collection runners
+        self._split_slots = asyncio.Semaphore(self.queue_size)
+        # Bounds the prepare calls running at once
+        self._prepare_slots = asyncio.Semaphore(self.load_workers)
+        self._collections: dict[str, _CollectionState] = {}
+        # job id -> reserved content hash, for jobs counted as pending
+        self._pending: dict[str, Optional[str]] = {}
+
+        self._tasks = [
+            *[
+                asyncio.create_task(self._run_stage(self._load_queue, self._load))
+                for _ in range(self.load_workers)
+            ],
+            *[
+                asyncio.create_task(self._run_stage(self._embed_queue, self._embed))
+                for _ in range(self.embed_workers)
+            ],
+            asyncio.create_task(self._upsert_worker()),
+        ]
+
+    async def _set_status(self, job: IngestionJob, status: str):
+        job.status = status
+        if job.on_status:
+            try:
+                await asyncio.to_thread(job.on_status, status)
+            except Exception as e:
+                log.debug(f"Failed to report status of {job.name}: {e}")
+
+    async def _fail(self, job: IngestionJob, e: BaseException):
+        log.exception(f"Ingestion of {job.name} failed: {e}")
+        await self._set_status(job, "failed")
+        self._release(job)
+        job.fail(e)
+
+    async def _complete(self, job: IngestionJob):
+        await self._set_status(job, "completed")
+        self._release(job)
+        job.complete()
+
+    async def _run_stage(self, queue: asyncio.Queue, stage: Callable):
+        while True:
+            job = await queue.get()
+            try:
+                await stage(job)
+            except Exception as e:
+                await self._fail(job, e)
+            finally:
+                queue.task_done()
+
+    async def _load(self, job: IngestionJob):
+        await self._set_status(job, "loading")
+        job.docs = await asyncio.to_thread(job.load)
+
+        # Hand the job to its collection's runner instead of waiting here, so
+        # a busy collection does not hold up the others
+        await self._split_slots.acquire()
+        state = self._collections.setdefault(job.collection_name, _CollectionState())
+        state.waiting.append(job)
+        if state.runner is None:
+            state.runner = asyncio.create_task(
+                self._run_collection(job.collection_name, state)
+            )
+
+    async def _run_collection(self, collection_name: str, state: _CollectionState):
+        while state.waiting:
+            job = state.waiting.popleft()
+            self._split_slots.release()
+            try:
+                await self._split(job, state)
+            except Exception as e:
+                await self._fail(job, e)
+
+        state.runner = None
+        self._forget(collection_name)
+
+    async def _split(self, job: IngestionJob, state: _CollectionState):
+        await self._set_status(job, "splitting")
+        if job.overwrite:
+            # Chunks still on their way would land in the new collection
+            await state.drained.wait()
+
+        async with self._prepare_slots:
+            job.prepared = await asyncio.to_thread(job.prepare, job.docs)
+        if job.prepared is None:
+            await self._complete(job)
+            return
+
+        content_hash = next(
+            (m["hash"] for m in job.prepared.metadatas if m.get("hash")), None
+        )
+        if content_hash and content_hash in state.hashes:
+            log.info(f"Document with hash {content_hash} is already being saved")
+            raise ValueError(ERROR_MESSAGES.DUPLICATE_CONTENT)
+
+        if job.prepared.create:
+            state.creating = True
+        elif state.creating:
+            # The collection only looked existing because of the jobs ahead
+            job.prepared.create = True
+
+        state.pending += 1
+        state.drained.clear()
+        if content_hash:
+            state.hashes[content_hash] = job.id
+        self._pending[job.id] = content_hash
+
+        await self._embed_queue.put(job)
+
+    def _release(self, job: IngestionJob):
+        """Drop the reservations of a job once it is written or failed"""
+        if job.id not in self._pending:
+            return
+
+        content_hash = self._pending.pop(job.id)
+        state = self._collections[job.collection_name]
+        if content_hash and state.hashes.get(content_hash) == job.id:
+            del state.hashes[content_hash]
+
+        state.pending -= 1
+        if state.pending == 0:
+            state.creating = False
+            state.drained.set()
+            self._forget(job.collection_name)
+
+    def _forget(self, collection_name: str):
+        state = self._collections.get(collection_name)
+        if state and not state.waiting and state.runner is None and not state.pending:
+            del self._collections[collection_name]
+
+    async def _embed(self, job: IngestionJob):
+        await self._set_status(job, "embedding")
+        texts = job.prepared.texts
+        embeddings = await job.embed(texts)
+        if not isinstance(embeddings, list) or len(embeddings) != len(texts):
+            raise ValueError(
+                f"Expected {len(texts)} embeddings, got {len(embeddings or [])}"
+            )
+
+        log.info(f"embeddings generated {len(embeddings)} for {len(texts)} items")
+        job.items = [
+            {
+                "id": str(uuid.uuid4()),
+                "text": text,
+                "vector": embeddings[idx],
+                "metadata": job.prepared.metadatas[idx],
+            }
+            for idx, text in enumerate(texts)
+        ]
+        await self._upsert_queue.put(job)
+
+    async def _upsert_worker(self):
+        while True:
+            jobs = [await self._upsert_queue.get()]
+            count = len(jobs[0].items)
+            while count < self.upsert_batch_size and not self._upsert_queue.empty():
+                job = self._upsert_queue.get_nowait()
+                jobs.append(job)
+                count += len(job.items)
+
+            groups: dict[str, list[IngestionJob]] = {}
+            for job in jobs:
+                groups.setdefault(job.collection_name, []).append(job)
+
+            for job in jobs:
+                await self._set_status(job, "saving")
+            await asyncio.gather(
+                *[
+                    self._upsert(collection_name, group)
+                    for collection_name, group in groups.items()
+                ]
+            )
+
+            for _ in jobs:
+                self._upsert_queue.task_done()
+
+    async def _upsert(self, collection_name: str, jobs: list[IngestionJob]):
+        try:
+            await asyncio.to_thread(self._insert, collection_name, jobs)
+        except Exception as e:
+            if len(jobs) == 1:
+                # Drop whatever part of the file made it in before the error
+                await asyncio.to_thread(self._remove, jobs[0])
+                await self._fail(jobs[0], e)
+                return
+
+            # Retry one job at a time so a bad file only fails itself, the
+            # upsert makes chunks written by the failed batch harmless
+            log.warning(
+                f"Batched write into {collection_name} failed, retrying per file: {e}"
+            )
+            for job in jobs:
+                await self._upsert(collection_name, [job])
+            return
+
+        for job in jobs:
+            await self._complete(job)
+
+    def _insert(self, collection_name: str, jobs: list[IngestionJob]):
+        items = [item for job in jobs for item in job.items]
+        log.info(f"adding {len(items)} items to collection {collection_name}")
+        # An upsert so that writing the same chunks again is harmless
+        VECTOR_DB_CLIENT.upsert(collection_name=collection_name, items=items)
+        BM25_INDEX.add(
+            collection_name,
+            items,
+            create=any(job.prepared.create for job in jobs),
+        )
+
+    def _remove(self, job: IngestionJob):
+        ids = [item["id"] for item in job.items]
+        try:
+            VECTOR_DB_CLIENT.delete(collection_name=job.collection_name, ids=ids)
+            BM25_INDEX.delete(job.collection_name, ids=ids)
+        except Exception as e:
+            log.warning(f"Failed to clean up {job.name}: {e}")
+
+    def submit(self, job: IngestionJob) -> Future:
+        loop = self._get_loop()
+        # Blocks while the load queue is full
+        asyncio.run_coroutine_threadsafe(self._load_queue.put(job), loop).result()
+        return job.future
+
+    def run(self, job: IngestionJob):
+        """Submit a job and wait for it from a sync context"""
+        return self.submit(job).result()
+
+    async def arun(self, job: IngestionJob):
+        """Submit a job and wait for it from an async context"""
+        loop = self._get_loop()
+        await asyncio.wrap_future(
+            asyncio.run_coroutine_threadsafe(self._load_queue.put(job), loop)
+        )
+        return await asyncio.wrap_future(job.future)
+
+
+INGESTION_PIPELINE = IngestionPipeline(
+    load_workers=INGESTION_PIPELINE_LOAD_WORKERS,
+    embed_workers=INGESTION_PIPELINE_EMBED_WORKERS,
+    queue_size=INGESTION_PIPELINE_QUEUE_SIZE,
+    upsert_batch_size=INGESTION_PIPELINE_UPSERT_BATCH_SIZE,
+)
@@ -0,0 +1,195 @@
+import asyncio
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Optional
+
+from open_webui.config import (
+    RAG_RERANKING_BATCH_SIZE,
+    RAG_RERANKING_BATCH_WINDOW_MS,
+    RAG_RERANKING_QUEUE_WARN_DEPTH,
+)
+from open_webui.env import SRC_LOG_LEVELS
+from open_webui.retrieval.models.base_reranker import BaseReranker
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+
+class RerankRequest:
+    def __init__(self, model: Any, pairs: list[tuple[str, str]]):
+        self.model = model
+        self.pairs = pairs
+        self.future: Future = Future()
+        self.enqueued_at = time.monotonic()
+
+
+def is_batchable(model: Any) -> bool:
+    # Cross encoders score every pair on its own, so pairs of different
+    # queries can share a call. ColBERT normalizes scores over the
+    # documents of one query and is scored per request.
+    return not isinstance(model, BaseReranker)
+
+
+class RerankingService:
+    """
+    Runs reranker inference on a dedicated thread, off the event loop.
+    Requests arriving within `batch_window` seconds of each other are
+    combined into one predict call of up to `batch_size` pairs per model,
+    and every caller gets a future for its own slice of the scores.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 64,
+        batch_window: float = 0.01,
+        queue_warn_depth: int = 0,
+    ):
+        self.batch_size = max(batch_size, 1)
+        self.batch_window = max(batch_window, 0)
+        self.queue_warn_depth = queue_warn_depth
+
+        self._queue: queue.Queue[RerankRequest] = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+        self._stats_lock = threading.Lock()
+        self._reset_stats()
+
+    def _reset_stats(self):
+        self.requests = 0
+        self.pairs = 0
+        self.batches = 0
+        self.max_batch_pairs = 0
+        self.max_queue_depth = 0
+        self.wait_time = 0.0
+        self.inference_time = 0.0
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            with self._lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(
+                        target=self._run, name="reranking", daemon=True
+                    )
+                    self._thread.start()
+
+    def submit(self, model: Any, pairs: list[tuple[str, str]]) -> Future:
+        request = RerankRequest(model, pairs)
+        if not pairs:
+            request.future.set_result([])
+            return request.future
+
+        self._ensure_thread()
+        self._queue.put(request)
+
+        depth = self._queue.qsize()
+        with self._stats_lock:
+            self.requests += 1
+            self.pairs += len(pairs)
+            self.max_queue_depth = max(self.max_queue_depth, depth)
+        if self.queue_warn_depth and depth > self.queue_warn_depth:
+            log.warning(f"Reranking queue is backed up: {depth} requests waiting")
+
+        return request.future
+
+    async def score(self, model: Any, pairs: list[tuple[str, str]]) -> list[float]:
+        return await asyncio.wrap_future(self.submit(model, pairs))
+
+    def _collect(self) -> list[RerankRequest]:
+        batch = [self._queue.get()]
+        size = len(batch[0].pairs)
+        deadline = time.monotonic() + self.batch_window
+
+        while size < self.batch_size:
+            timeout = deadline - time.monotonic()
+            try:
+                request = (
+                    self._queue.get(timeout=timeout)
+                    if timeout > 0
+                    else self._queue.get_nowait()
+                )
+            except queue.Empty:
+                break
+            batch.append(request)
+            size += len(request.pairs)
+
+        return batch
+
+    def _predict(self, model: Any, requests: list[RerankRequest]):
+        pairs = [pair for request in requests for pair in request.pairs]
+        start = time.monotonic()
+        try:
+            scores = model.predict(pairs)
+            if scores is None:
+                raise ValueError("Reranker returned no scores")
+            scores = scores.tolist() if hasattr(scores, "tolist") else list(scores)
+        except Exception as e:
+            for request in requests:
+                request.future.set_exception(e)
+            return
+
+        with self._stats_lock:
+            self.batches += 1
+            self.max_batch_pairs = max(self.max_batch_pairs, len(pairs))
+            self.inference_time += time.monotonic() - start
+
+        offset = 0
+        for request in requests:
+            request.future.set_result(scores[offset : offset + len(request.pairs)])
+            offset += len(request.pairs)
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+
+            now = time.monotonic()
+            with self._stats_lock:
+                self.wait_time += sum(now - request.enqueued_at for request in batch)
+
+            # Group by model, the reranker may have been swapped in between
+            groups: dict[int, list[RerankRequest]] = {}
+            for request in batch:
+                if request.future.set_running_or_notify_cancel():
+                    groups.setdefault(id(request.model), []).append(request)
+
+            for requests in groups.values():
+                model = requests[0].model
+                if is_batchable(model):
+                    self._predict(model, requests)
+                else:
+                    for request in requests:
+                        self._predict(model, [request])
+
+    def get_stats(self) -> dict:
+        with self._stats_lock:
+            return {
+                "batch_size": self.batch_size,
+                "batch_window_ms": int(self.batch_window * 1000),
+                "queue_depth": self._queue.qsize(),
+                "max_queue_depth": self.max_queue_depth,
+                "requests": self.requests,
+                "pairs": self.pairs,
+                "batches": self.batches,
+                "avg_batch_pairs": self.pairs / self.batches if self.batches else 0.0,
+                "max_batch_pairs": self.max_batch_pairs,
+                "avg_wait_ms": (
+                    self.wait_time / self.requests * 1000 if self.requests else 0.0
+                ),
+                "avg_inference_ms": (
+                    self.inference_time / self.batches * 1000 if self.batches else 0.0
+                ),
+            }
+
+    def reset_stats(self):
+        with self._stats_lock:
+            self._reset_stats()
+
+
+RERANKING_SERVICE = RerankingService(
+    batch_size=RAG_RERANKING_BATCH_SIZE,
+    batch_window=RAG_RERANKING_BATCH_WINDOW_MS / 1000,
+    queue_warn_depth=RAG_RERANKING_QUEUE_WARN_DEPTH,
+)
@@ -2,18 +2,14 @@ import logging
 import os
 from typing import Awaitable, Optional, Union
 
-import requests
-import aiohttp
 import asyncio
 import hashlib
 from concurrent.futures import ThreadPoolExecutor
-import time
 import re
 
 from urllib.parse import quote
 from huggingface_hub import snapshot_download
 from langchain.retrievers import ContextualCompressionRetriever, EnsembleRetriever
-from langchain_community.retrievers import BM25Retriever
 from langchain_core.documents import Document
 
 from open_webui.config import VECTOR_DB
@@ -27,7 +23,10 @@ from open_webui.models.knowledge import Knowledges
 from open_webui.models.chats import Chats
 from open_webui.models.notes import Notes
 
-from open_webui.retrieval.vector.main import GetResult
+from open_webui.retrieval.embedding_cache import EMBEDDING_CACHE
+from open_webui.retrieval.embedding_client import EMBEDDING_CLIENT
+from open_webui.retrieval.reranking import RERANKING_SERVICE
+from open_webui.retrieval.bm25 import BM25_INDEX, BM25Index
 from open_webui.utils.access_control import has_access
 from open_webui.utils.headers import include_user_info_headers
 from open_webui.utils.misc import get_message_list
@@ -89,6 +88,7 @@ class VectorSearchRetriever(BaseRetriever):
     collection_name: Any
     embedding_function: Any
     top_k: int
+    query_embedding: Optional[list[float]] = None
 
     def _get_relevant_documents(
         self, query: str, *, run_manager: CallbackManagerForRetrieverRun
@@ -110,7 +110,9 @@ class VectorSearchRetriever(BaseRetriever):
         *,
         run_manager: CallbackManagerForRetrieverRun,
     ) -> list[Document]:
-        embedding = await self.embedding_function(query, RAG_EMBEDDING_QUERY_PREFIX)
+        embedding = self.query_embedding or await self.embedding_function(
+            query, RAG_EMBEDDING_QUERY_PREFIX
+        )
         result = VECTOR_DB_CLIENT.search(
             collection_name=self.collection_name,
             vectors=[embedding],
@@ -125,6 +127,7 @@ class VectorSearchRetriever(BaseRetriever):
         for idx in range(len(ids)):
             results.append(
                 Document(
+                    id=ids[idx],
                     metadata=metadatas[idx],
                     page_content=documents[idx],
                 )
@@ -166,47 +169,45 @@ def get_doc(collection_name: str, user: UserModel = None):
         raise e
 
 
-def get_enriched_texts(collection_result: GetResult) -> list[str]:
-    enriched_texts = []
-    for idx, text in enumerate(collection_result.documents[0]):
-        metadata = collection_result.metadatas[0][idx]
-        metadata_parts = [text]
-
-        # Add filename (repeat twice for extra weight in BM25 scoring)
-        if metadata.get("name"):
-            filename = metadata["name"]
-            filename_tokens = (
-                filename.replace("_", " ").replace("-", " ").replace(".", " ")
-            )
-            metadata_parts.append(
-                f"Filename: {filename} {filename_tokens} {filename_tokens}"
-            )
-
-        # Add title if available
-        if metadata.get("title"):
-            metadata_parts.append(f"Title: {metadata['title']}")
+def get_bm25_index(collection_name: str) -> Optional[BM25Index]:
+    def fetch():
+        log.debug(f"get_bm25_index:VECTOR_DB_CLIENT.get:collection {collection_name}")
+        return VECTOR_DB_CLIENT.get(collection_name=collection_name)
 
-        # Add document section headings if available (from markdown splitter)
-        if metadata.get("headings") and isinstance(metadata["headings"], list):
-            headings = " > ".join(str(h) for h in metadata["headings"])
-            metadata_parts.append(f"Section: {headings}")
+    # Collections written before the index existed are indexed once, on first use
+    return BM25_INDEX.get_or_build(collection_name, fetch)
 
-        # Add source URL/path if available
-        if metadata.get("source"):
-            metadata_parts.append(f"Source: {metadata['source']}")
 
-        # Add snippet for web search results
-        if metadata.get("snippet"):
-            metadata_parts.append(f"Snippet: {metadata['snippet']}")
+class BM25IndexRetriever(BaseRetriever):
+    bm25_index: Any
+    top_k: int
+    enable_enriched_texts: bool = False
 
-        enriched_texts.append(" ".join(metadata_parts))
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> list[Document]:
+        results = self.bm25_index.search(
+            query, self.top_k, enriched=self.enable_enriched_texts
+        )
+        return [
+            Document(
+                id=doc_id, page_content=doc["text"], metadata=dict(doc["metadata"])
+            )
+            for doc_id, doc, _ in results
+        ]
 
-    return enriched_texts
+    async def _aget_relevant_documents(
+        self,
+        query: str,
+        *,
+        run_manager: CallbackManagerForRetrieverRun,
+    ) -> list[Document]:
+        return self._get_relevant_documents(query, run_manager=run_manager)
 
 
 async def query_doc_with_hybrid_search(
     collection_name: str,
-    collection_result: GetResult,
+    bm25_index: Optional[BM25Index],
     query: str,
     embedding_function,
     k: int,
@@ -215,44 +216,26 @@ async def query_doc_with_hybrid_search(
     r: float,
     hybrid_bm25_weight: float,
     enable_enriched_texts: bool = False,
+    query_embedding: Optional[list[float]] = None,
 ) -> dict:
     try:
-        # First check if collection_result has the required attributes
-        if (
-            not collection_result
-            or not hasattr(collection_result, "documents")
-            or not hasattr(collection_result, "metadatas")
-        ):
-            log.warning(f"query_doc_with_hybrid_search:no_docs {collection_name}")
-            return {"documents": [], "metadatas": [], "distances": []}
-
-        # Now safely check the documents content after confirming attributes exist
-        if (
-            not collection_result.documents
-            or len(collection_result.documents) == 0
-            or not collection_result.documents[0]
-        ):
+        if not bm25_index:
             log.warning(f"query_doc_with_hybrid_search:no_docs {collection_name}")
             return {"documents": [], "metadatas": [], "distances": []}
 
         log.debug(f"query_doc_with_hybrid_search:doc {collection_name}")
 
-        bm25_texts = (
-            get_enriched_texts(collection_result)
-            if enable_enriched_texts
-            else collection_result.documents[0]
-        )
-
-        bm25_retriever = BM25Retriever.from_texts(
-            texts=bm25_texts,
-            metadatas=collection_result.metadatas[0],
+        bm25_retriever = BM25IndexRetriever(
+            bm25_index=bm25_index,
+            top_k=k,
+            enable_enriched_texts=enable_enriched_texts,
         )
-        bm25_retriever.k = k
 
         vector_search_retriever = VectorSearchRetriever(
             collection_name=collection_name,
             embedding_function=embedding_function,
             top_k=k,
+            query_embedding=query_embedding,
         )
 
         if hybrid_bm25_weight <= 0:
@@ -274,6 +257,8 @@ async def query_doc_with_hybrid_search(
             top_n=k_reranker,
             reranking_function=reranking_function,
             r_score=r,
+            collection_name=collection_name,
+            query_embedding=query_embedding,
         )
 
         compression_retriever = ContextualCompressionRetriever(
@@ -466,30 +451,45 @@ async def query_collection_with_hybrid_search(
 ) -> dict:
     results = []
     error = False
-    # Fetch collection data once per collection sequentially
-    # Avoid fetching the same data multiple times later
-    collection_results = {}
+    # Load the persisted BM25 index once per collection
+    # Avoid loading the same index multiple times later
+    bm25_indexes = {}
     for collection_name in collection_names:
         try:
-            log.debug(
-                f"query_collection_with_hybrid_search:VECTOR_DB_CLIENT.get:collection {collection_name}"
-            )
-            collection_results[collection_name] = VECTOR_DB_CLIENT.get(
-                collection_name=collection_name
+            bm25_indexes[collection_name] = await asyncio.to_thread(
+                get_bm25_index, collection_name
             )
         except Exception as e:
-            log.exception(f"Failed to fetch collection {collection_name}: {e}")
-            collection_results[collection_name] = None
+            log.exception(f"Failed to load BM25 index for {collection_name}: {e}")
+            bm25_indexes[collection_name] = None
 
     log.info(
         f"Starting hybrid search for {len(queries)} queries in {len(collection_names)} collections..."
     )
 
+    # Embed every query once for all collections, the vector search and the
+    # reranking fallback both use it
+    query_embeddings = {}
+    if hybrid_bm25_weight < 1 or reranking_function is None:
+        unique_queries = list(dict.fromkeys(queries))
+        embeddings = await asyncio.gather(
+            *[
+                embedding_function(query, RAG_EMBEDDING_QUERY_PREFIX)
+                for query in unique_queries
+            ],
+            return_exceptions=True,
+        )
+        for query, embedding in zip(unique_queries, embeddings):
+            if isinstance(embedding, Exception):
+                log.warning(f"Failed to embed query for hybrid search: {embedding}")
+            else:
+                query_embeddings[query] = embedding
+
     async def process_query(collection_name, query):
         try:
             result = await query_doc_with_hybrid_search(
                 collection_name=collection_name,
-                collection_result=collection_results[collection_name],
+                bm25_index=bm25_indexes[collection_name],
                 query=query,
                 embedding_function=embedding_function,
                 k=k,
@@ -498,6 +498,7 @@ async def query_collection_with_hybrid_search(
                 r=r,
                 hybrid_bm25_weight=hybrid_bm25_weight,
                 enable_enriched_texts=enable_enriched_texts,
+                query_embedding=query_embeddings.get(query),
             )
             return result, None
         except Exception as e:
@@ -505,11 +506,11 @@ async def query_collection_with_hybrid_search(
             return None, e
 
     # Prepare tasks for all collections and queries
-    # Avoid running any tasks for collections that failed to fetch data (have assigned None)
+    # Avoid running any tasks for collections that failed to load (have assigned None)
     tasks = [
         (collection_name, query)
         for collection_name in collection_names
-        if collection_results[collection_name] is not None
+        if bm25_indexes[collection_name] is not None
         for query in queries
     ]
 
@@ -555,17 +556,13 @@ def generate_openai_batch_embeddings(
         if ENABLE_FORWARD_USER_INFO_HEADERS and user:
             headers = include_user_info_headers(headers, user)
 
-        r = requests.post(
-            f"{url}/embeddings",
-            headers=headers,
-            json=json_data,
+        data = EMBEDDING_CLIENT.post_sync(
+            f"{url}/embeddings", headers=headers, json=json_data
         )
-        r.raise_for_status()
-        data = r.json()
         if "data" in data:
             return [elem["embedding"] for elem in data["data"]]
         else:
-            raise "Something went wrong :/"
+            raise Exception("Something went wrong :/")
     except Exception as e:
         log.exception(f"Error generating openai batch embeddings: {e}")
         return None
@@ -594,16 +591,13 @@ async def agenerate_openai_batch_embeddings(
         if ENABLE_FORWARD_USER_INFO_HEADERS and user:
             headers = include_user_info_headers(headers, user)
 
-        async with aiohttp.ClientSession(trust_env=True) as session:
-            async with session.post(
-                f"{url}/embeddings", headers=headers, json=form_data
-            ) as r:
-                r.raise_for_status()
-                data = await r.json()
-                if "data" in data:
-                    return [item["embedding"] for item in data["data"]]
-                else:
-                    raise Exception("Something went wrong :/")
+        data = await EMBEDDING_CLIENT.post(
+            f"{url}/embeddings", headers=headers, json=form_data
+        )
+        if "data" in data:
+            return [item["embedding"] for item in data["data"]]
+        else:
+            raise Exception("Something went wrong :/")
     except Exception as e:
         log.exception(f"Error generating openai batch embeddings: {e}")
         return None
@@ -628,30 +622,19 @@ def generate_azure_openai_batch_embeddings(
 
         url = f"{url}/openai/deployments/{model}/embeddings?api-version={version}"
 
-        for _ in range(5):
-            headers = {
-                "Content-Type": "application/json",
-                "api-key": key,
-            }
-            if ENABLE_FORWARD_USER_INFO_HEADERS and user:
-                headers = include_user_info_headers(headers, user)
+        headers = {
+            "Content-Type": "application/json",
+            "api-key": key,
+        }
+        if ENABLE_FORWARD_USER_INFO_HEADERS and user:
+            headers = include_user_info_headers(headers, user)
 
-            r = requests.post(
-                url,
-                headers=headers,
-                json=json_data,
-            )
-            if r.status_code == 429:
-                retry = float(r.headers.get("Retry-After", "1"))
-                time.sleep(retry)
-                continue
-            r.raise_for_status()
-            data = r.json()
-            if "data" in data:
-                return [elem["embedding"] for elem in data["data"]]
-            else:
-                raise Exception("Something went wrong :/")
-        return None
+        # 429 responses are retried by the client, honouring Retry-After
+        data = EMBEDDING_CLIENT.post_sync(url, headers=headers, json=json_data)
+        if "data" in data:
+            return [elem["embedding"] for elem in data["data"]]
+        else:
+            raise Exception("Something went wrong :/")
     except Exception as e:
         log.exception(f"Error generating azure openai batch embeddings: {e}")
         return None
@@ -683,14 +666,11 @@ async def agenerate_azure_openai_batch_embeddings(
         if ENABLE_FORWARD_USER_INFO_HEADERS and user:
             headers = include_user_info_headers(headers, user)
 
-        async with aiohttp.ClientSession(trust_env=True) as session:
-            async with session.post(full_url, headers=headers, json=form_data) as r:
-                r.raise_for_status()
-                data = await r.json()
-                if "data" in data:
-                    return [item["embedding"] for item in data["data"]]
-                else:
-                    raise Exception("Something went wrong :/")
+        data = await EMBEDDING_CLIENT.post(full_url, headers=headers, json=form_data)
+        if "data" in data:
+            return [item["embedding"] for item in data["data"]]
+        else:
+            raise Exception("Something went wrong :/")
     except Exception as e:
         log.exception(f"Error generating azure openai batch embeddings: {e}")
         return None
@@ -719,18 +699,14 @@ def generate_ollama_batch_embeddings(
         if ENABLE_FORWARD_USER_INFO_HEADERS and user:
             headers = include_user_info_headers(headers, user)
 
-        r = requests.post(
-            f"{url}/api/embed",
-            headers=headers,
-            json=json_data,
+        data = EMBEDDING_CLIENT.post_sync(
+            f"{url}/api/embed", headers=headers, json=json_data
         )
-        r.raise_for_status()
-        data = r.json()
 
         if "embeddings" in data:
             return data["embeddings"]
         else:
-            raise "Something went wrong :/"
+            raise Exception("Something went wrong :/")
     except Exception as e:
         log.exception(f"Error generating ollama batch embeddings: {e}")
         return None
@@ -759,16 +735,13 @@ async def agenerate_ollama_batch_embeddings(
         if ENABLE_FORWARD_USER_INFO_HEADERS and user:
             headers = include_user_info_headers(headers, user)
 
-        async with aiohttp.ClientSession(trust_env=True) as session:
-            async with session.post(
-                f"{url}/api/embed", headers=headers, json=form_data
-            ) as r:
-                r.raise_for_status()
-                data = await r.json()
-                if "embeddings" in data:
-                    return data["embeddings"]
-                else:
-                    raise Exception("Something went wrong :/")
+        data = await EMBEDDING_CLIENT.post(
+            f"{url}/api/embed", headers=headers, json=form_data
+        )
+        if "embeddings" in data:
+            return data["embeddings"]
+        else:
+            raise Exception("Something went wrong :/")
     except Exception as e:
         log.exception(f"Error generating ollama batch embeddings: {e}")
         return None
@@ -783,6 +756,32 @@ def get_embedding_function(
     embedding_batch_size,
     azure_api_version=None,
     enable_async=True,
+) -> Awaitable:
+    return EMBEDDING_CACHE.wrap(
+        embedding_engine,
+        embedding_model,
+        _get_embedding_function(
+            embedding_engine,
+            embedding_model,
+            embedding_function,
+            url,
+            key,
+            embedding_batch_size,
+            azure_api_version=azure_api_version,
+            enable_async=enable_async,
+        ),
+    )
+
+
+def _get_embedding_function(
+    embedding_engine,
+    embedding_model,
+    embedding_function,
+    url,
+    key,
+    embedding_batch_size,
+    azure_api_version=None,
+    enable_async=True,
 ) -> Awaitable:
     if embedding_engine == "":
         # Sentence transformers: CPU-bound sync operation
@@ -822,7 +821,8 @@ def get_embedding_function(
                     log.debug(
                         f"generate_multiple_async: Processing {len(batches)} batches in parallel"
                     )
-                    # Execute all batches in parallel
+                    # Execute all batches in parallel, the embedding client
+                    # caps how many of them are in flight at once
                     tasks = [
                         embedding_function(batch, prefix=prefix, user=user)
                         for batch in batches
@@ -908,13 +908,22 @@ def get_reranking_function(reranking_engine, reranking_model, reranking_function
     if reranking_function is None:
         return None
     if reranking_engine == "external":
-        return lambda query, documents, user=None: reranking_function.predict(
-            [(query, doc.page_content) for doc in documents], user=user
-        )
+        # Remote calls are per request (user headers), only kept off the event loop
+        async def rerank(query, documents, user=None):
+            return await asyncio.to_thread(
+                reranking_function.predict,
+                [(query, doc.page_content) for doc in documents],
+                user=user,
+            )
+
     else:
-        return lambda query, documents, user=None: reranking_function.predict(
-            [(query, doc.page_content) for doc in documents]
-        )
+
+        async def rerank(query, documents, user=None):
+            return await RERANKING_SERVICE.score(
+                reranking_function, [(query, doc.page_content) for doc in documents]
+            )
+
+    return rerank
 
 
 async def get_sources_from_items(
@@ -1238,15 +1247,33 @@ def get_model_path(model: str, update_model: bool = False):
 import operator
 from typing import Optional, Sequence
 
+import numpy as np
 from langchain_core.callbacks import Callbacks
 from langchain_core.documents import BaseDocumentCompressor, Document
 
 
+def get_cosine_similarities(
+    query_embedding: list[float], document_embeddings: list[list[float]]
+) -> list[float]:
+    query = np.asarray(query_embedding, dtype=np.float32)
+    matrix = np.asarray(document_embeddings, dtype=np.float32)
+
+    # Stored vectors may be zero padded to the vector DB's dimension
+    dim = min(query.shape[0], matrix.shape[1])
+    query, matrix = query[:dim], matrix[:, :dim]
+
+    norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)
+    norms[norms == 0] = 1.0
+    return (matrix @ query / norms).tolist()
+
+
 class RerankCompressor(BaseDocumentCompressor):
     embedding_function: Any
     top_n: int
     reranking_function: Any
     r_score: float
+    collection_name: Optional[str] = None
+    query_embedding: Optional[list[float]] = None
 
     class Config:
         extra = "forbid"
@@ -1271,6 +1298,31 @@ class RerankCompressor(BaseDocumentCompressor):
         """
         return []
 
+    async def get_document_embeddings(
+        self, documents: Sequence[Document]
+    ) -> list[list[float]]:
+        # Reuse the vectors stored with the chunks, only embed what is missing
+        stored = {}
+        ids = [doc.id for doc in documents if doc.id]
+        if self.collection_name and ids:
+            stored = (
+                await asyncio.to_thread(
+                    VECTOR_DB_CLIENT.get_vectors, self.collection_name, ids
+                )
+                or {}
+            )
+
+        missing = [doc for doc in documents if doc.id not in stored]
+        if missing:
+            log.debug(f"RerankCompressor: embedding {len(missing)} documents")
+            embeddings = await self.embedding_function(
+                [doc.page_content for doc in missing], RAG_EMBEDDING_CONTENT_PREFIX
+            )
+            for doc, embedding in zip(missing, embeddings):
+                stored[doc.id or id(doc)] = embedding
+
+        return [stored[doc.id or id(doc)] for doc in documents]
+
     async def acompress_documents(
         self,
         documents: Sequence[Document],
@@ -1281,17 +1333,13 @@ class RerankCompressor(BaseDocumentCompressor):
 
         scores = None
         if reranking:
-            scores = self.reranking_function(query, documents)
+            scores = await self.reranking_function(query, documents)
         else:
-            from sentence_transformers import util
-
-            query_embedding = await self.embedding_function(
+            query_embedding = self.query_embedding or await self.embedding_function(
                 query, RAG_EMBEDDING_QUERY_PREFIX
             )
-            document_embedding = await self.embedding_function(
-                [doc.page_content for doc in documents], RAG_EMBEDDING_CONTENT_PREFIX
-            )
-            scores = util.cos_sim(query_embedding, document_embedding)[0]
+            document_embeddings = await self.get_document_embeddings(documents)
+            scores = get_cosine_similarities(query_embedding, document_embeddings)
 
         if scores is not None:
             docs_with_scores = list(
@@ -0,0 +1,98 @@
+import logging
+import threading
+import time
+from typing import Optional
+
+from open_webui.env import SRC_LOG_LEVELS
+from open_webui.models.collection_aliases import CollectionAliases
+from open_webui.retrieval.vector.main import GetResult, SearchResult, VectorDBBase
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+
+# Seconds other instances may keep using a collection after its alias moved
+ALIAS_CACHE_TTL = 5
+
+
+class AliasedVectorDBClient(VectorDBBase):
+    """
+    Resolves collection aliases before delegating to the actual vector DB
+    client. A collection can be rebuilt under a different name and then
+    swapped in by pointing its alias at the new collection, which takes
+    effect for every instance within ALIAS_CACHE_TTL seconds.
+    """
+
+    def __init__(self, client: VectorDBBase):
+        self.client = client
+
+        self._aliases: dict[str, str] = {}
+        self._aliases_loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        # Backend specific attributes
+        return getattr(self.client, name)
+
+    def _resolve(self, collection_name: str) -> str:
+        now = time.monotonic()
+        if now - self._aliases_loaded_at > ALIAS_CACHE_TTL:
+            with self._lock:
+                if now - self._aliases_loaded_at > ALIAS_CACHE_TTL:
+                    try:
+                        self._aliases = CollectionAliases.get_aliases()
+                    except Exception as e:
+                        log.warning(f"Failed to load collection aliases: {e}")
+                    self._aliases_loaded_at = now
+        return self._aliases.get(collection_name, collection_name)
+
+    def swap_collection(self, collection_name: str, target: str) -> str:
+        """
+        Point `collection_name` at `target` and return the collection that
+        held its vectors before. The caller deletes that one once other
+        instances have stopped using it.
+        """
+        previous = CollectionAliases.set_alias(collection_name, target)
+        with self._lock:
+            self._aliases[collection_name] = target
+        return previous
+
+    def has_collection(self, collection_name: str) -> bool:
+        return self.client.has_collection(self._resolve(collection_name))
+
+    def delete_collection(self, collection_name: str) -> None:
+        target = self._resolve(collection_name)
+        self.client.delete_collection(target)
+
+        if target != collection_name:
+            CollectionAliases.delete_alias(collection_name)
+            with self._lock:
+                self._aliases.pop(collection_name, None)
+
+    # Arguments are passed through as given so backend defaults still apply
+    def insert(self, collection_name: str, *args, **kwargs) -> None:
+        return self.client.insert(self._resolve(collection_name), *args, **kwargs)
+
+    def upsert(self, collection_name: str, *args, **kwargs) -> None:
+        return self.client.upsert(self._resolve(collection_name), *args, **kwargs)
+
+    def search(self, collection_name: str, *args, **kwargs) -> Optional[SearchResult]:
+        return self.client.search(self._resolve(collection_name), *args, **kwargs)
+
+    def query(self, collection_name: str, *args, **kwargs) -> Optional[GetResult]:
+        return self.client.query(self._resolve(collection_name), *args, **kwargs)
+
+    def get(self, collection_name: str, *args, **kwargs) -> Optional[GetResult]:
+        return self.client.get(self._resolve(collection_name), *args, **kwargs)
+
+    def get_vectors(self, collection_name: str, *args, **kwargs):
+        return self.client.get_vectors(self._resolve(collection_name), *args, **kwargs)
+
+    def delete(self, collection_name: str, *args, **kwargs) -> None:
+        return self.client.delete(self._resolve(collection_name), *args, **kwargs)
+
+    def reset(self) -> None:
+        self.client.reset()
+        CollectionAliases.delete_all_aliases()
+        with self._lock:
+            self._aliases = {}
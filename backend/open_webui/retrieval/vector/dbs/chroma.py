@@ -137,6 +137,21 @@ class ChromaClient(VectorDBBase):
             )
         return None
 
+    def get_vectors(
+        self, collection_name: str, ids: list[str]
+    ) -> Optional[dict[str, list[float]]]:
+        # Get the stored embeddings of the items with the given ids.
+        try:
+            collection = self.client.get_collection(name=collection_name)
+            result = collection.get(ids=ids, include=["embeddings"])
+            return {
+                id: [float(value) for value in embedding]
+                for id, embedding in zip(result["ids"], result["embeddings"])
+            }
+        except Exception as e:
+            log.debug(f"Failed to get vectors from {collection_name}: {e}")
+            return None
+
     def insert(self, collection_name: str, items: list[VectorItem]):
         # Insert the items into the collection, if the collection does not exist, it will be created.
         collection = self.client.get_or_create_collection(
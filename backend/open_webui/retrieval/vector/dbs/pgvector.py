@@ -21,7 +21,7 @@ from sqlalchemy.sql import true
 from sqlalchemy.pool import NullPool, QueuePool
 
 from sqlalchemy.orm import declarative_base, scoped_session, sessionmaker
-from sqlalchemy.dialects.postgresql import JSONB, array
+from sqlalchemy.dialects.postgresql import JSONB, array, insert as pg_insert
 from pgvector.sqlalchemy import Vector, HALFVEC
 from sqlalchemy.ext.mutable import MutableDict
 from sqlalchemy.exc import NoSuchTableError
@@ -49,6 +49,7 @@ from open_webui.config import (
     PGVECTOR_HNSW_EF_CONSTRUCTION,
     PGVECTOR_IVFFLAT_LISTS,
     PGVECTOR_USE_HALFVEC,
+    PGVECTOR_INSERT_BATCH_SIZE,
 )
 
 from open_webui.env import SRC_LOG_LEVELS
@@ -92,7 +93,7 @@ class PgvectorClient(VectorDBBase):
 
         # if no pgvector uri, use the existing database connection
         if not PGVECTOR_DB_URL:
-            from open_webui.internal.db import Session
+            from open_webui.internal.db import Session, engine
 
             self.session = Session
         else:
@@ -119,6 +120,10 @@ class PgvectorClient(VectorDBBase):
             )
             self.session = scoped_session(SessionLocal)
 
+        # Bulk writes check out their own pooled connection instead of
+        # sharing the long-lived scoped session
+        self.engine = engine
+
         try:
             # Ensure the pgvector extension is available
             # Use a conditional check to avoid permission issues on Azure PostgreSQL
@@ -303,125 +308,79 @@ class PgvectorClient(VectorDBBase):
             vector = vector[:VECTOR_LENGTH]
         return vector
 
+    def _chunk_values(self, collection_name: str, item: VectorItem) -> Dict[str, Any]:
+        values = {
+            "id": item["id"],
+            "vector": self.adjust_vector_length(item["vector"]),
+            "collection_name": collection_name,
+        }
+        if PGVECTOR_PGCRYPTO:
+            # Encrypted in the statement, metadata as its JSON text representation
+            values["text"] = pgcrypto_encrypt(item["text"], PGVECTOR_PGCRYPTO_KEY)
+            values["vmetadata"] = pgcrypto_encrypt(
+                json.dumps(item["metadata"]), PGVECTOR_PGCRYPTO_KEY
+            )
+        else:
+            values["text"] = item["text"]
+            values["vmetadata"] = process_metadata(item["metadata"])
+        return values
+
+    def _bulk_write(
+        self, collection_name: str, items: List[VectorItem], upsert: bool
+    ) -> None:
+        """
+        Write chunks with one multi-row INSERT per PGVECTOR_INSERT_BATCH_SIZE
+        items, all in a single transaction on a short-lived pooled connection.
+        """
+        if upsert:
+            # ON CONFLICT DO UPDATE cannot touch the same row twice in one
+            # statement, keep the last item per id like sequential upserts
+            items = list({item["id"]: item for item in items}.values())
+
+        table = DocumentChunk.__table__
+        with self.engine.begin() as connection:
+            for i in range(0, len(items), PGVECTOR_INSERT_BATCH_SIZE):
+                batch = items[i : i + PGVECTOR_INSERT_BATCH_SIZE]
+                stmt = pg_insert(table).values(
+                    [self._chunk_values(collection_name, item) for item in batch]
+                )
+                if upsert:
+                    stmt = stmt.on_conflict_do_update(
+                        index_elements=[table.c.id],
+                        set_={
+                            "vector": stmt.excluded.vector,
+                            "collection_name": stmt.excluded.collection_name,
+                            "text": stmt.excluded.text,
+                            "vmetadata": stmt.excluded.vmetadata,
+                        },
+                    )
+                elif PGVECTOR_PGCRYPTO:
+                    stmt = stmt.on_conflict_do_nothing(index_elements=[table.c.id])
+                connection.execute(stmt)
+
     def insert(self, collection_name: str, items: List[VectorItem]) -> None:
         try:
+            self._bulk_write(collection_name, items, upsert=False)
             if PGVECTOR_PGCRYPTO:
-                for item in items:
-                    vector = self.adjust_vector_length(item["vector"])
-                    # Use raw SQL for BYTEA/pgcrypto
-                    # Ensure metadata is converted to its JSON text representation
-                    json_metadata = json.dumps(item["metadata"])
-                    self.session.execute(
-                        text(
-                            """
-                            INSERT INTO document_chunk
-                            (id, vector, collection_name, text, vmetadata)
-                            VALUES (
-                                :id, :vector, :collection_name,
-                                pgp_sym_encrypt(:text, :key),
-                                pgp_sym_encrypt(:metadata_text, :key)
-                            )
-                            ON CONFLICT (id) DO NOTHING
-                        """
-                        ),
-                        {
-                            "id": item["id"],
-                            "vector": vector,
-                            "collection_name": collection_name,
-                            "text": item["text"],
-                            "metadata_text": json_metadata,
-                            "key": PGVECTOR_PGCRYPTO_KEY,
-                        },
-                    )
-                self.session.commit()
                 log.info(f"Encrypted & inserted {len(items)} into '{collection_name}'")
-
             else:
-                new_items = []
-                for item in items:
-                    vector = self.adjust_vector_length(item["vector"])
-                    new_chunk = DocumentChunk(
-                        id=item["id"],
-                        vector=vector,
-                        collection_name=collection_name,
-                        text=item["text"],
-                        vmetadata=process_metadata(item["metadata"]),
-                    )
-                    new_items.append(new_chunk)
-                self.session.bulk_save_objects(new_items)
-                self.session.commit()
                 log.info(
-                    f"Inserted {len(new_items)} items into collection '{collection_name}'."
+                    f"Inserted {len(items)} items into collection '{collection_name}'."
                 )
         except Exception as e:
-            self.session.rollback()
             log.exception(f"Error during insert: {e}")
             raise
 
     def upsert(self, collection_name: str, items: List[VectorItem]) -> None:
         try:
+            self._bulk_write(collection_name, items, upsert=True)
             if PGVECTOR_PGCRYPTO:
-                for item in items:
-                    vector = self.adjust_vector_length(item["vector"])
-                    json_metadata = json.dumps(item["metadata"])
-                    self.session.execute(
-                        text(
-                            """
-                            INSERT INTO document_chunk
-                            (id, vector, collection_name, text, vmetadata)
-                            VALUES (
-                                :id, :vector, :collection_name,
-                                pgp_sym_encrypt(:text, :key),
-                                pgp_sym_encrypt(:metadata_text, :key)
-                            )
-                            ON CONFLICT (id) DO UPDATE SET
-                              vector = EXCLUDED.vector,
-                              collection_name = EXCLUDED.collection_name,
-                              text = EXCLUDED.text,
-                              vmetadata = EXCLUDED.vmetadata
-                        """
-                        ),
-                        {
-                            "id": item["id"],
-                            "vector": vector,
-                            "collection_name": collection_name,
-                            "text": item["text"],
-                            "metadata_text": json_metadata,
-                            "key": PGVECTOR_PGCRYPTO_KEY,
-                        },
-                    )
-                self.session.commit()
                 log.info(f"Encrypted & upserted {len(items)} into '{collection_name}'")
             else:
-                for item in items:
-                    vector = self.adjust_vector_length(item["vector"])
-                    existing = (
-                        self.session.query(DocumentChunk)
-                        .filter(DocumentChunk.id == item["id"])
-                        .first()
-                    )
-                    if existing:
-                        existing.vector = vector
-                        existing.text = item["text"]
-                        existing.vmetadata = process_metadata(item["metadata"])
-                        existing.collection_name = (
-                            collection_name  # Update collection_name if necessary
-                        )
-                    else:
-                        new_chunk = DocumentChunk(
-                            id=item["id"],
-                            vector=vector,
-                            collection_name=collection_name,
-                            text=item["text"],
-                            vmetadata=process_metadata(item["metadata"]),
-                        )
-                        self.session.add(new_chunk)
-                self.session.commit()
                 log.info(
                     f"Upserted {len(items)} items into collection '{collection_name}'."
                 )
         except Exception as e:
-            self.session.rollback()
             log.exception(f"Error during upsert: {e}")
             raise
 
@@ -640,6 +599,28 @@ class PgvectorClient(VectorDBBase):
             log.exception(f"Error during get: {e}")
             return None
 
+    def get_vectors(
+        self, collection_name: str, ids: List[str]
+    ) -> Optional[Dict[str, List[float]]]:
+        try:
+            results = self.session.execute(
+                select(DocumentChunk.id, DocumentChunk.vector).where(
+                    DocumentChunk.collection_name == collection_name,
+                    DocumentChunk.id.in_(ids),
+                )
+            ).all()
+            self.session.rollback()  # read-only transaction
+            # Vectors are zero padded to VECTOR_LENGTH, which keeps cosine similarity
+            return {
+                row.id: [float(value) for value in row.vector]
+                for row in results
+                if row.vector is not None
+            }
+        except Exception as e:
+            self.session.rollback()
+            log.exception(f"Error during get_vectors: {e}")
+            return None
+
     def delete(
         self,
         collection_name: str,
@@ -1,4 +1,5 @@
 from open_webui.retrieval.vector.main import VectorDBBase
+from open_webui.retrieval.vector.alias import AliasedVectorDBClient
 from open_webui.retrieval.vector.type import VectorType
 from open_webui.config import (
     VECTOR_DB,
@@ -75,4 +76,4 @@ class Vector:
                 raise ValueError(f"Unsupported vector type: {vector_type}")
 
 
-VECTOR_DB_CLIENT = Vector.get_vector(VECTOR_DB)
+VECTOR_DB_CLIENT = AliasedVectorDBClient(Vector.get_vector(VECTOR_DB))
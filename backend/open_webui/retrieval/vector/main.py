@@ -70,6 +70,12 @@ class VectorDBBase(ABC):
         """Retrieve all vectors from a collection."""
         pass
 
+    def get_vectors(
+        self, collection_name: str, ids: List[str]
+    ) -> Optional[Dict[str, List[float]]]:
+        """Retrieve the stored vectors of items by ID. Backends that cannot return vectors return None."""
+        return None
+
     @abstractmethod
     def delete(
         self,
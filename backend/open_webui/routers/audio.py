@@ -11,7 +11,7 @@ import base64
 from functools import lru_cache
 from pathlib import Path
 from pydub import AudioSegment, effects
-from pydub.silence import split_on_silence
+from pydub.silence import detect_silence, split_on_silence
 from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 from transformers import pipeline
@@ -19,6 +19,7 @@ import torch
 from tqdm import tqdm
 import concurrent.futures
 import gc
+import anyio
 
 from fnmatch import fnmatch
 import aiohttp
@@ -49,10 +50,16 @@ from open_webui.config import (
     WHISPER_MODEL_DIR,
     CACHE_DIR,
     WHISPER_LANGUAGE,
+    WHISPER_WORKER_POOL_SIZE,
+    WHISPER_CHUNK_MAX_SECONDS,
+    WHISPER_MAX_CONCURRENT_JOBS,
+    WHISPER_CHUNK_TIMEOUT,
     ELEVENLABS_API_BASE_URL,
 )
 
 from open_webui.constants import ERROR_MESSAGES
+from open_webui.socket.main import emit_to_users
+from open_webui.utils.whisper_worker_pool import TranscriptionQueue
 from open_webui.env import (
     ENV,
     AIOHTTP_CLIENT_SESSION_SSL,
@@ -85,6 +92,13 @@ log.setLevel(SRC_LOG_LEVELS["AUDIO"])
 SPEECH_CACHE_DIR = CACHE_DIR / "audio" / "speech"
 SPEECH_CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
+# 긴 녹음(회의록) 전사 대기열
+TRANSCRIPTION_QUEUE = TranscriptionQueue(
+    pool_size=WHISPER_WORKER_POOL_SIZE,
+    max_jobs=WHISPER_MAX_CONCURRENT_JOBS,
+    chunk_timeout=WHISPER_CHUNK_TIMEOUT,
+)
+
 
 ##########################################
 #
@@ -189,6 +203,16 @@ def convert_audio_to_mp3(file_path):
         return None
 
 
+def get_faster_whisper_kwargs(model: str, auto_update: bool = False) -> dict:
+    return {
+        "model_size_or_path": model,
+        "device": DEVICE_TYPE if DEVICE_TYPE and DEVICE_TYPE == "cuda" else "cpu",
+        "compute_type": "int8",
+        "download_root": WHISPER_MODEL_DIR,
+        "local_files_only": not auto_update,
+    }
+
+
 def set_faster_whisper_model(model: str, auto_update: bool = False):
     whisper_model = None
     if model:
@@ -199,13 +223,7 @@ def set_faster_whisper_model(model: str, auto_update: bool = False):
             os.makedirs(WHISPER_MODEL_DIR, exist_ok=True)
             log.info(f"Whisper 모델 디렉토리 생성: {WHISPER_MODEL_DIR}")
 
-        faster_whisper_kwargs = {
-            "model_size_or_path": model,
-            "device": DEVICE_TYPE if DEVICE_TYPE and DEVICE_TYPE == "cuda" else "cpu",
-            "compute_type": "int8",
-            "download_root": WHISPER_MODEL_DIR,
-            "local_files_only": not auto_update,
-        }
+        faster_whisper_kwargs = get_faster_whisper_kwargs(model, auto_update)
 
         try:
             log.info(f"Faster-Whisper 모델 로딩 시도: {model}")
@@ -751,6 +769,56 @@ def split_audio(audio_path, min_silence_len=500, silence_thresh=-40, max_chunk_m
         log.error(f"오디오 분할 실패: {str(e)}")
         raise
 
+# 무음 구간 중간을 잘라 원본 시간축을 유지하는 청크 분할 (병렬 전사용)
+def split_audio_at_silence(
+    audio_path,
+    max_chunk_ms=WHISPER_CHUNK_MAX_SECONDS * 1000,
+    min_silence_len=700,
+    silence_thresh=None,
+):
+    """
+    오디오를 max_chunk_ms 이하의 연속된 청크로 나누고 (청크 경로, 시작 초) 목록을 반환.
+    split_audio 와 달리 무음을 버리지 않으므로 청크 시작 시간으로 원본 시각을 복원할 수 있음.
+    """
+    try:
+        audio = AudioSegment.from_wav(audio_path).set_channels(1).set_frame_rate(16000)
+        if silence_thresh is None:
+            # 녹음 평균 음량 기준 상대 임계값
+            silence_thresh = audio.dBFS - 16 if audio.dBFS != float("-inf") else -40
+
+        cuts = [0]
+        while len(audio) - cuts[-1] > max_chunk_ms:
+            start = cuts[-1]
+            # 청크 후반부에서 가장 뒤쪽 무음 구간의 중간을 자름
+            window_start = start + max_chunk_ms // 2
+            window = audio[window_start : start + max_chunk_ms]
+            silences = detect_silence(
+                window,
+                min_silence_len=min_silence_len,
+                silence_thresh=silence_thresh,
+                seek_step=50,
+            )
+            if silences:
+                silence_start, silence_end = silences[-1]
+                cuts.append(window_start + (silence_start + silence_end) // 2)
+            else:
+                # 무음이 없으면 최대 길이에서 자름
+                cuts.append(start + max_chunk_ms)
+        cuts.append(len(audio))
+
+        chunks = []
+        for i, (start, end) in enumerate(zip(cuts, cuts[1:])):
+            chunk_path = f"{os.path.splitext(audio_path)[0]}_chunk_{i}.wav"
+            audio[start:end].export(chunk_path, format="wav")
+            chunks.append((chunk_path, start / 1000))
+
+        log.info(f"총 {len(chunks)}개의 청크로 분할 완료 (무음 경계 기준)")
+        return chunks
+
+    except Exception as e:
+        log.error(f"오디오 분할 실패: {str(e)}")
+        raise
+
 # 한 청크 Whisper STT 수행
 def process_chunk(chunk_path, pipe):
     try:
@@ -777,7 +845,12 @@ def convert_seconds_to_hms(seconds):
         return f"{minutes:02d}:{seconds:02d}"
 
 # 전체 진행 함수
-def transcribe_long_audio(request: Request, file_path, model_name='large-v3'):
+def transcribe_long_audio(request: Request, file_path, model_name='large-v3', on_event=None):
+    """
+    긴 녹음을 무음 경계로 나눠 Whisper 워커 풀에서 병렬 전사한 뒤 순서대로 병합.
+    on_event 는 대기열 순번과 청크별 부분 전사 결과를 받음 (호출 스레드에서 실행).
+    """
+    chunks = []
     try:
         # 오디오 WAV로 변환
         wav_path = convert_to_wav(file_path)
@@ -786,37 +859,25 @@ def transcribe_long_audio(request: Request, file_path, model_name='large-v3'):
         device = 0 if torch.cuda.is_available() else -1
         log.info(f"Faster-Whisper 실행 중 (Device: {'GPU' if device == 0 else 'CPU'})")
 
-        # Faster-Whisper 모델 로딩
-        log.info("Faster-Whisper 모델 로딩 중...")
-
         # 설정에서 모델 가져오기 (기본값: large-v3 모델)
         whisper_model_name = request.app.state.config.WHISPER_MODEL or "large-v3"
         log.info(f"사용할 모델: {whisper_model_name}")
 
-        # 기존 모델이 있으면 사용, 없으면 새로 생성
-        if request.app.state.faster_whisper_model is None:
-            try:
-                request.app.state.faster_whisper_model = set_faster_whisper_model(
-                    whisper_model_name,
-                    WHISPER_MODEL_AUTO_UPDATE
-                )
-            except Exception as e:
-                log.warning(f"설정된 모델 로딩 실패, 기본 모델로 시도: {str(e)}")
-                # 기본 모델로 재시도
-                request.app.state.faster_whisper_model = set_faster_whisper_model(
-                    "large-v3",
-                    True  # 자동 업데이트 활성화
-                )
+        if not os.path.exists(WHISPER_MODEL_DIR):
+            os.makedirs(WHISPER_MODEL_DIR, exist_ok=True)
 
-        whisper = request.app.state.faster_whisper_model
+        # 설정된 모델 로딩 실패 시 기본 모델로 재시도 (자동 업데이트 활성화)
+        model_candidates = [
+            get_faster_whisper_kwargs(whisper_model_name, WHISPER_MODEL_AUTO_UPDATE),
+            get_faster_whisper_kwargs("large-v3", True),
+        ]
 
-        if whisper is None:
-            raise RuntimeError("Faster-Whisper 모델을 로드할 수 없습니다.")
+        # 무음 경계 기준 청크 분할
+        chunks = split_audio_at_silence(wav_path)
 
-        # 회의록에 최적화된 VAD 설정으로 전체 파일 처리
+        # 회의록에 최적화된 VAD 설정으로 청크별 처리
         log.info("회의록 최적화 설정으로 Faster-Whisper 처리 중...")
-        segments, info = whisper.transcribe(
-            wav_path,
+        options = dict(
             beam_size=5,
             vad_filter=True,  # VAD 활성화
             vad_parameters=dict(
@@ -833,7 +894,12 @@ def transcribe_long_audio(request: Request, file_path, model_name='large-v3'):
             initial_prompt="이것은 한국어 회의 녹음입니다. 정확하고 자연스러운 문장으로 전사해주세요."
         )
 
-        log.info(f"언어 감지: {info.language} (확률: {info.language_probability:.2f})")
+        segments, info = TRANSCRIPTION_QUEUE.run(
+            chunks, model_candidates, options, on_event=on_event
+        )
+
+        if info:
+            log.info(f"언어 감지: {info['language']} (확률: {info['language_probability']:.2f})")
 
         # 세그먼트 후처리 및 병합
         merged_segments = merge_short_segments(segments)
@@ -873,6 +939,13 @@ def transcribe_long_audio(request: Request, file_path, model_name='large-v3'):
     except Exception as e:
         log.error(f"Faster-Whisper STT 처리 실패: {str(e)}")
         raise
+    finally:
+        # 임시 청크 파일 정리
+        for chunk_path, _ in chunks:
+            try:
+                os.remove(chunk_path)
+            except OSError:
+                pass
 
 def transcription_handler(request, file_path, metadata):
     filename = os.path.basename(file_path)
@@ -1346,7 +1419,22 @@ def transcribe(request: Request, file_path: str, metadata: Optional[dict] = None
     log.info(f"transcribe: {file_path} {metadata}")
     log.info(f"filedata: {filedata}")
 
-    result = transcribe_long_audio(request, file_path)
+    def on_event(event):
+        # 대기열 순번, 진행률, 청크별 부분 전사 결과를 업로드한 사용자에게 전달
+        if not filedata:
+            return
+        try:
+            anyio.from_thread.run(
+                emit_to_users,
+                "transcription",
+                {"file_id": filedata[0], **event},
+                [filedata[3]["OpenWebUI-User-Id"]],
+            )
+        except Exception as e:
+            log.debug(f"전사 진행 상황 전송 실패: {e}")
+
+    result = transcribe_long_audio(request, file_path, on_event=on_event)
+    on_event({"status": "completed", "text": result['plain_text']})
     plain_text = result['plain_text']
     docx_doc = result['docx_document']
     hwpx_doc = result['hwpx_document']
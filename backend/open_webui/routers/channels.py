@@ -58,7 +58,7 @@ from open_webui.utils.access_control import (
     get_permitted_group_and_user_ids,
     has_permission,
 )
-from open_webui.utils.webhook import post_webhook
+from open_webui.utils.webhook import WEBHOOK_DISPATCHER
 from open_webui.utils.channels import extract_mentions, replace_mentions
 
 log = logging.getLogger(__name__)
@@ -697,27 +697,23 @@ async def get_channel_messages(
         )  # Ensure user is a member of the channel
 
     message_list = Messages.get_messages_by_channel_id(id, skip, limit)
-    users = {}
+    message_ids = [message.id for message in message_list]
+
+    users = Messages.get_users_by_message_ids(message_ids)
+    reply_stats = Messages.get_thread_reply_stats_by_message_ids(message_ids)
+    reactions = Messages.get_reactions_by_message_ids(message_ids)
 
     messages = []
     for message in message_list:
-        if message.user_id not in users:
-            user = Users.get_user_by_id(message.user_id)
-            users[message.user_id] = user
-
-        thread_replies = Messages.get_thread_replies_by_message_id(message.id)
-        latest_thread_reply_at = (
-            thread_replies[0].created_at if thread_replies else None
-        )
-
+        stats = reply_stats.get(message.id, {})
         messages.append(
             MessageUserResponse(
                 **{
                     **message.model_dump(),
-                    "reply_count": len(thread_replies),
-                    "latest_reply_at": latest_thread_reply_at,
-                    "reactions": Messages.get_reactions_by_message_id(message.id),
-                    "user": UserNameResponse(**users[message.user_id].model_dump()),
+                    "reply_count": stats.get("reply_count", 0),
+                    "latest_reply_at": stats.get("latest_reply_at"),
+                    "reactions": reactions.get(message.id, []),
+                    "user": users.get(message.id),
                 }
             )
         )
@@ -760,20 +756,19 @@ async def get_pinned_channel_messages(
     limit = PAGE_ITEM_COUNT_PINNED
 
     message_list = Messages.get_pinned_messages_by_channel_id(id, skip, limit)
-    users = {}
+    message_ids = [message.id for message in message_list]
+
+    users = Messages.get_users_by_message_ids(message_ids)
+    reactions = Messages.get_reactions_by_message_ids(message_ids)
 
     messages = []
     for message in message_list:
-        if message.user_id not in users:
-            user = Users.get_user_by_id(message.user_id)
-            users[message.user_id] = user
-
         messages.append(
             MessageWithReactionsResponse(
                 **{
                     **message.model_dump(),
-                    "reactions": Messages.get_reactions_by_message_id(message.id),
-                    "user": UserNameResponse(**users[message.user_id].model_dump()),
+                    "reactions": reactions.get(message.id, []),
+                    "user": users.get(message.id),
                 }
             )
         )
@@ -788,27 +783,31 @@ async def get_pinned_channel_messages(
 
 async def send_notification(name, webui_url, channel, message, active_user_ids):
     users = get_users_with_access("read", channel.access_control)
+    member_ids = Channels.get_member_user_ids_by_channel_id(channel.id)
 
+    webhook_urls = set()
     for user in users:
-        if (user.id not in active_user_ids) and Channels.is_user_channel_member(
-            channel.id, user.id
-        ):
+        if (user.id not in active_user_ids) and (user.id in member_ids):
             if user.settings:
                 webhook_url = user.settings.ui.get("notifications", {}).get(
                     "webhook_url", None
                 )
                 if webhook_url:
-                    await post_webhook(
-                        name,
-                        webhook_url,
-                        f"#{channel.name} - {webui_url}/channels/{channel.id}\n\n{message.content}",
-                        {
-                            "action": "channel",
-                            "message": message.content,
-                            "title": channel.name,
-                            "url": f"{webui_url}/channels/{channel.id}",
-                        },
-                    )
+                    webhook_urls.add(webhook_url)
+
+    # Delivered by the dispatcher's workers, once per distinct URL
+    for webhook_url in webhook_urls:
+        WEBHOOK_DISPATCHER.enqueue(
+            name,
+            webhook_url,
+            f"#{channel.name} - {webui_url}/channels/{channel.id}\n\n{message.content}",
+            {
+                "action": "channel",
+                "message": message.content,
+                "title": channel.name,
+                "url": f"{webui_url}/channels/{channel.id}",
+            },
+        )
 
     return True
 
@@ -1078,7 +1077,7 @@ async def post_new_message(
 
     try:
         message, channel = await new_message_handler(request, id, form_data, user)
-        active_user_ids = get_user_ids_from_room(f"channel:{channel.id}")
+        active_user_ids = await get_user_ids_from_room(f"channel:{channel.id}")
 
         async def background_handler():
             await model_response_handler(request, channel, message, user)
@@ -1250,22 +1249,21 @@ async def get_channel_thread_messages(
             )
 
     message_list = Messages.get_messages_by_parent_id(id, message_id, skip, limit)
-    users = {}
+    message_ids = [message.id for message in message_list]
+
+    users = Messages.get_users_by_message_ids(message_ids)
+    reactions = Messages.get_reactions_by_message_ids(message_ids)
 
     messages = []
     for message in message_list:
-        if message.user_id not in users:
-            user = Users.get_user_by_id(message.user_id)
-            users[message.user_id] = user
-
         messages.append(
             MessageUserResponse(
                 **{
                     **message.model_dump(),
                     "reply_count": 0,
                     "latest_reply_at": None,
-                    "reactions": Messages.get_reactions_by_message_id(message.id),
-                    "user": UserNameResponse(**users[message.user_id].model_dump()),
+                    "reactions": reactions.get(message.id, []),
+                    "user": users.get(message.id),
                 }
             )
         )
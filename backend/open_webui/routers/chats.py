@@ -4,6 +4,7 @@ from typing import Optional
 
 
 from open_webui.socket.main import get_event_emitter
+from open_webui.utils.chat_buffer import CHAT_WRITE_BUFFER
 from open_webui.models.chats import (
     ChatForm,
     ChatImportForm,
@@ -552,6 +553,7 @@ async def send_chat_message_event_by_id(
     try:
         if event_emitter:
             await event_emitter(form_data.model_dump())
+            await CHAT_WRITE_BUFFER.flush(id)
         else:
             return False
         return True
@@ -25,6 +25,8 @@ from fastapi.responses import FileResponse, StreamingResponse
 from open_webui.constants import ERROR_MESSAGES
 from open_webui.env import SRC_LOG_LEVELS
 from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.retrieval.bm25 import BM25_INDEX
+from open_webui.retrieval.extraction_cache import EXTRACTION_CACHE
 
 from open_webui.models.users import Users
 from open_webui.models.files import (
@@ -365,7 +367,9 @@ async def delete_all_files(user=Depends(get_admin_user)):
     if result:
         try:
             Storage.delete_all_files()
+            EXTRACTION_CACHE.reset()
             VECTOR_DB_CLIENT.reset()
+            BM25_INDEX.reset()
         except Exception as e:
             log.exception(e)
             log.error("Error deleting files")
@@ -441,6 +445,10 @@ async def get_file_process_status(
                                 event = {"status": status}
                                 if status == "failed":
                                     event["error"] = data.get("error")
+                                elif data.get("progress"):
+                                    event["progress"] = data.get("progress")
+                                if data.get("stage"):
+                                    event["stage"] = data.get("stage")
 
                                 yield f"data: {json.dumps(event)}\n\n"
                                 if status in ("completed", "failed"):
@@ -753,6 +761,7 @@ async def delete_file_by_id(id: str, user=Depends(get_verified_user)):
             try:
                 Storage.delete_file(file.path)
                 VECTOR_DB_CLIENT.delete(collection_name=f"file-{id}")
+                BM25_INDEX.delete_collection(f"file-{id}")
             except Exception as e:
                 log.exception(e)
                 log.error("Error deleting files")
@@ -18,6 +18,8 @@ from open_webui.utils.plugin import (
     load_function_module_by_id,
     replace_imports,
     get_function_module_from_cache,
+    register_loaded_module,
+    unregister_module,
 )
 from open_webui.config import CACHE_DIR
 from open_webui.constants import ERROR_MESSAGES
@@ -206,6 +208,8 @@ async def create_new_function(
             FUNCTIONS[form_data.id] = function_module
 
             function = Functions.insert_new_function(user.id, function_type, form_data)
+            if function:
+                register_loaded_module("function", form_data.id, form_data.content)
 
             function_cache_dir = CACHE_DIR / "functions" / form_data.id
             function_cache_dir.mkdir(parents=True, exist_ok=True)
@@ -328,6 +332,8 @@ async def update_function_by_id(
         log.debug(updated)
 
         function = Functions.update_function_by_id(id, updated)
+        if function:
+            register_loaded_module("function", id, form_data.content)
 
         if function_type == "filter" and getattr(function_module, "toggle", None):
             Functions.update_function_metadata_by_id(id, {"toggle": True})
@@ -362,6 +368,7 @@ async def delete_function_by_id(
         FUNCTIONS = request.app.state.FUNCTIONS
         if id in FUNCTIONS:
             del FUNCTIONS[id]
+        unregister_module("function", id)
 
     return result
 
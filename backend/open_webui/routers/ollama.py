@@ -51,6 +51,7 @@ from open_webui.utils.payload import (
 )
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.utils.access_control import has_access
+from open_webui.utils.http_client import get_upstream_session
 
 
 from open_webui.config import (
@@ -61,7 +62,6 @@ from open_webui.env import (
     SRC_LOG_LEVELS,
     MODELS_CACHE_TTL,
     AIOHTTP_CLIENT_SESSION_SSL,
-    AIOHTTP_CLIENT_TIMEOUT,
     AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST,
     BYPASS_MODEL_ACCESS_CONTROL,
 )
@@ -81,35 +81,88 @@ log.setLevel(SRC_LOG_LEVELS["OLLAMA"])
 async def send_get_request(url, key=None, user: UserModel = None):
     timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST)
     try:
-        async with aiohttp.ClientSession(timeout=timeout, trust_env=True) as session:
-            headers = {
-                "Content-Type": "application/json",
-                **({"Authorization": f"Bearer {key}"} if key else {}),
-            }
+        headers = {
+            "Content-Type": "application/json",
+            **({"Authorization": f"Bearer {key}"} if key else {}),
+        }
 
-            if ENABLE_FORWARD_USER_INFO_HEADERS and user:
-                headers = include_user_info_headers(headers, user)
+        if ENABLE_FORWARD_USER_INFO_HEADERS and user:
+            headers = include_user_info_headers(headers, user)
 
-            async with session.get(
-                url,
-                headers=headers,
-                ssl=AIOHTTP_CLIENT_SESSION_SSL,
-            ) as response:
-                return await response.json()
+        async with get_upstream_session(url).get(
+            url,
+            headers=headers,
+            ssl=AIOHTTP_CLIENT_SESSION_SSL,
+            timeout=timeout,
+        ) as response:
+            return await response.json()
     except Exception as e:
         # Handle connection error here
         log.error(f"Connection error: {e}")
         return None
 
 
-async def cleanup_response(
-    response: Optional[aiohttp.ClientResponse],
-    session: Optional[aiohttp.ClientSession],
-):
+async def cleanup_response(response: Optional[aiohttp.ClientResponse]):
+    # The session is shared, only the connection goes back to its pool
     if response:
-        response.close()
-    if session:
-        await session.close()
+        response.release()
+
+
+async def send_request(
+    method: str,
+    url: str,
+    key: Optional[str] = None,
+    user: UserModel = None,
+    **kwargs,
+):
+    """
+    Non-streaming request to an Ollama upstream. Returns the decoded JSON
+    body, or raises an HTTPException carrying the upstream error.
+    """
+    r = None
+    try:
+        headers = {
+            "Content-Type": "application/json",
+            **({"Authorization": f"Bearer {key}"} if key else {}),
+        }
+
+        if ENABLE_FORWARD_USER_INFO_HEADERS and user:
+            headers = include_user_info_headers(headers, user)
+
+        async with get_upstream_session(url).request(
+            method,
+            url,
+            headers=headers,
+            ssl=AIOHTTP_CLIENT_SESSION_SSL,
+            **kwargs,
+        ) as r:
+            try:
+                res = await r.json(content_type=None)
+            except Exception as e:
+                if r.ok:
+                    raise e
+                res = None
+
+            if not r.ok:
+                detail = None
+                if isinstance(res, dict) and "error" in res:
+                    detail = f"Ollama: {res['error']}"
+
+                raise HTTPException(
+                    status_code=r.status,
+                    detail=detail if detail else "Open WebUI: Server Connection Error",
+                )
+
+            return res
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        log.exception(e)
+
+        raise HTTPException(
+            status_code=r.status if r else 500,
+            detail="Open WebUI: Server Connection Error",
+        )
 
 
 async def send_post_request(
@@ -124,10 +177,6 @@ async def send_post_request(
 
     r = None
     try:
-        session = aiohttp.ClientSession(
-            trust_env=True, timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
-        )
-
         headers = {
             "Content-Type": "application/json",
             **({"Authorization": f"Bearer {key}"} if key else {}),
@@ -138,7 +187,7 @@ async def send_post_request(
             if metadata and metadata.get("chat_id"):
                 headers["X-OpenWebUI-Chat-Id"] = metadata.get("chat_id")
 
-        r = await session.post(
+        r = await get_upstream_session(url).post(
             url,
             data=payload,
             headers=headers,
@@ -148,7 +197,7 @@ async def send_post_request(
         if r.ok is False:
             try:
                 res = await r.json()
-                await cleanup_response(r, session)
+                await cleanup_response(r)
                 if "error" in res:
                     raise HTTPException(status_code=r.status, detail=res["error"])
             except HTTPException as e:
@@ -171,9 +220,7 @@ async def send_post_request(
                 r.content,
                 status_code=r.status,
                 headers=response_headers,
-                background=BackgroundTask(
-                    cleanup_response, response=r, session=session
-                ),
+                background=BackgroundTask(cleanup_response, response=r),
             )
         else:
             res = await r.json()
@@ -190,7 +237,7 @@ async def send_post_request(
         )
     finally:
         if not stream:
-            await cleanup_response(r, session)
+            await cleanup_response(r)
 
 
 def get_api_key(idx, url, configs):
@@ -449,39 +496,7 @@ async def get_ollama_tags(
         url = request.app.state.config.OLLAMA_BASE_URLS[url_idx]
         key = get_api_key(url_idx, url, request.app.state.config.OLLAMA_API_CONFIGS)
 
-        r = None
-        try:
-            headers = {
-                **({"Authorization": f"Bearer {key}"} if key else {}),
-            }
-
-            if ENABLE_FORWARD_USER_INFO_HEADERS and user:
-                headers = include_user_info_headers(headers, user)
-
-            r = requests.request(
-                method="GET",
-                url=f"{url}/api/tags",
-                headers=headers,
-            )
-            r.raise_for_status()
-
-            models = r.json()
-        except Exception as e:
-            log.exception(e)
-
-            detail = None
-            if r is not None:
-                try:
-                    res = r.json()
-                    if "error" in res:
-                        detail = f"Ollama: {res['error']}"
-                except Exception:
-                    detail = f"Ollama: {e}"
-
-            raise HTTPException(
-                status_code=r.status_code if r else 500,
-                detail=detail if detail else "Open WebUI: Server Connection Error",
-            )
+        models = await send_request("GET", f"{url}/api/tags", key=key, user=user)
 
     if user.role == "user" and not BYPASS_MODEL_ACCESS_CONTROL:
         models["models"] = await get_filtered_models(models, user)
@@ -598,28 +613,7 @@ async def get_ollama_versions(request: Request, url_idx: Optional[int] = None):
         else:
             url = request.app.state.config.OLLAMA_BASE_URLS[url_idx]
 
-            r = None
-            try:
-                r = requests.request(method="GET", url=f"{url}/api/version")
-                r.raise_for_status()
-
-                return r.json()
-            except Exception as e:
-                log.exception(e)
-
-                detail = None
-                if r is not None:
-                    try:
-                        res = r.json()
-                        if "error" in res:
-                            detail = f"Ollama: {res['error']}"
-                    except Exception:
-                        detail = f"Ollama: {e}"
-
-                raise HTTPException(
-                    status_code=r.status_code if r else 500,
-                    detail=detail if detail else "Open WebUI: Server Connection Error",
-                )
+            return await send_request("GET", f"{url}/api/version")
     else:
         return {"version": False}
 
@@ -814,41 +808,14 @@ async def copy_model(
     url = request.app.state.config.OLLAMA_BASE_URLS[url_idx]
     key = get_api_key(url_idx, url, request.app.state.config.OLLAMA_API_CONFIGS)
 
-    try:
-        headers = {
-            "Content-Type": "application/json",
-            **({"Authorization": f"Bearer {key}"} if key else {}),
-        }
-
-        if ENABLE_FORWARD_USER_INFO_HEADERS and user:
-            headers = include_user_info_headers(headers, user)
-
-        r = requests.request(
-            method="POST",
-            url=f"{url}/api/copy",
-            headers=headers,
-            data=form_data.model_dump_json(exclude_none=True).encode(),
-        )
-        r.raise_for_status()
-
-        log.debug(f"r.text: {r.text}")
-        return True
-    except Exception as e:
-        log.exception(e)
-
-        detail = None
-        if r is not None:
-            try:
-                res = r.json()
-                if "error" in res:
-                    detail = f"Ollama: {res['error']}"
-            except Exception:
-                detail = f"Ollama: {e}"
-
-        raise HTTPException(
-            status_code=r.status_code if r else 500,
-            detail=detail if detail else "Open WebUI: Server Connection Error",
-        )
+    await send_request(
+        "POST",
+        f"{url}/api/copy",
+        key=key,
+        user=user,
+        data=form_data.model_dump_json(exclude_none=True).encode(),
+    )
+    return True
 
 
 @router.delete("/api/delete")
@@ -879,42 +846,10 @@ async def delete_model(
     url = request.app.state.config.OLLAMA_BASE_URLS[url_idx]
     key = get_api_key(url_idx, url, request.app.state.config.OLLAMA_API_CONFIGS)
 
-    r = None
-    try:
-        headers = {
-            "Content-Type": "application/json",
-            **({"Authorization": f"Bearer {key}"} if key else {}),
-        }
-
-        if ENABLE_FORWARD_USER_INFO_HEADERS and user:
-            headers = include_user_info_headers(headers, user)
-
-        r = requests.request(
-            method="DELETE",
-            url=f"{url}/api/delete",
-            headers=headers,
-            json=form_data,
-        )
-        r.raise_for_status()
-
-        log.debug(f"r.text: {r.text}")
-        return True
-    except Exception as e:
-        log.exception(e)
-
-        detail = None
-        if r is not None:
-            try:
-                res = r.json()
-                if "error" in res:
-                    detail = f"Ollama: {res['error']}"
-            except Exception:
-                detail = f"Ollama: {e}"
-
-        raise HTTPException(
-            status_code=r.status_code if r else 500,
-            detail=detail if detail else "Open WebUI: Server Connection Error",
-        )
+    await send_request(
+        "DELETE", f"{url}/api/delete", key=key, user=user, json=form_data
+    )
+    return True
 
 
 @router.post("/api/show")
@@ -940,37 +875,9 @@ async def show_model_info(
     url = request.app.state.config.OLLAMA_BASE_URLS[url_idx]
     key = get_api_key(url_idx, url, request.app.state.config.OLLAMA_API_CONFIGS)
 
-    try:
-        headers = {
-            "Content-Type": "application/json",
-            **({"Authorization": f"Bearer {key}"} if key else {}),
-        }
-
-        if ENABLE_FORWARD_USER_INFO_HEADERS and user:
-            headers = include_user_info_headers(headers, user)
-
-        r = requests.request(
-            method="POST", url=f"{url}/api/show", headers=headers, json=form_data
-        )
-        r.raise_for_status()
-
-        return r.json()
-    except Exception as e:
-        log.exception(e)
-
-        detail = None
-        if r is not None:
-            try:
-                res = r.json()
-                if "error" in res:
-                    detail = f"Ollama: {res['error']}"
-            except Exception:
-                detail = f"Ollama: {e}"
-
-        raise HTTPException(
-            status_code=r.status_code if r else 500,
-            detail=detail if detail else "Open WebUI: Server Connection Error",
-        )
+    return await send_request(
+        "POST", f"{url}/api/show", key=key, user=user, json=form_data
+    )
 
 
 class GenerateEmbedForm(BaseModel):
@@ -1023,41 +930,13 @@ async def embed(
     if prefix_id:
         form_data.model = form_data.model.replace(f"{prefix_id}.", "")
 
-    try:
-        headers = {
-            "Content-Type": "application/json",
-            **({"Authorization": f"Bearer {key}"} if key else {}),
-        }
-
-        if ENABLE_FORWARD_USER_INFO_HEADERS and user:
-            headers = include_user_info_headers(headers, user)
-
-        r = requests.request(
-            method="POST",
-            url=f"{url}/api/embed",
-            headers=headers,
-            data=form_data.model_dump_json(exclude_none=True).encode(),
-        )
-        r.raise_for_status()
-
-        data = r.json()
-        return data
-    except Exception as e:
-        log.exception(e)
-
-        detail = None
-        if r is not None:
-            try:
-                res = r.json()
-                if "error" in res:
-                    detail = f"Ollama: {res['error']}"
-            except Exception:
-                detail = f"Ollama: {e}"
-
-        raise HTTPException(
-            status_code=r.status_code if r else 500,
-            detail=detail if detail else "Open WebUI: Server Connection Error",
-        )
+    return await send_request(
+        "POST",
+        f"{url}/api/embed",
+        key=key,
+        user=user,
+        data=form_data.model_dump_json(exclude_none=True).encode(),
+    )
 
 
 class GenerateEmbeddingsForm(BaseModel):
@@ -1105,41 +984,13 @@ async def embeddings(
     if prefix_id:
         form_data.model = form_data.model.replace(f"{prefix_id}.", "")
 
-    try:
-        headers = {
-            "Content-Type": "application/json",
-            **({"Authorization": f"Bearer {key}"} if key else {}),
-        }
-
-        if ENABLE_FORWARD_USER_INFO_HEADERS and user:
-            headers = include_user_info_headers(headers, user)
-
-        r = requests.request(
-            method="POST",
-            url=f"{url}/api/embeddings",
-            headers=headers,
-            data=form_data.model_dump_json(exclude_none=True).encode(),
-        )
-        r.raise_for_status()
-
-        data = r.json()
-        return data
-    except Exception as e:
-        log.exception(e)
-
-        detail = None
-        if r is not None:
-            try:
-                res = r.json()
-                if "error" in res:
-                    detail = f"Ollama: {res['error']}"
-            except Exception:
-                detail = f"Ollama: {e}"
-
-        raise HTTPException(
-            status_code=r.status_code if r else 500,
-            detail=detail if detail else "Open WebUI: Server Connection Error",
-        )
+    return await send_request(
+        "POST",
+        f"{url}/api/embeddings",
+        key=key,
+        user=user,
+        data=form_data.model_dump_json(exclude_none=True).encode(),
+    )
 
 
 class GenerateCompletionForm(BaseModel):
@@ -1544,36 +1395,17 @@ async def get_openai_models(
 
     else:
         url = request.app.state.config.OLLAMA_BASE_URLS[url_idx]
-        try:
-            r = requests.request(method="GET", url=f"{url}/api/tags")
-            r.raise_for_status()
+        model_list = await send_request("GET", f"{url}/api/tags")
 
-            model_list = r.json()
-
-            models = [
-                {
-                    "id": model["model"],
-                    "object": "model",
-                    "created": int(time.time()),
-                    "owned_by": "openai",
-                }
-                for model in models["models"]
-            ]
-        except Exception as e:
-            log.exception(e)
-            error_detail = "Open WebUI: Server Connection Error"
-            if r is not None:
-                try:
-                    res = r.json()
-                    if "error" in res:
-                        error_detail = f"Ollama: {res['error']}"
-                except Exception:
-                    error_detail = f"Ollama: {e}"
-
-            raise HTTPException(
-                status_code=r.status_code if r else 500,
-                detail=error_detail,
-            )
+        models = [
+            {
+                "id": model["model"],
+                "object": "model",
+                "created": int(time.time()),
+                "owned_by": "openai",
+            }
+            for model in model_list["models"]
+        ]
 
     if user.role == "user" and not BYPASS_MODEL_ACCESS_CONTROL:
         # Filter models based on user access control
@@ -6,7 +6,6 @@ import shutil
 import asyncio
 
 import re
-import uuid
 from datetime import datetime
 from pathlib import Path
 from typing import Iterator, List, Optional, Sequence, Union
@@ -38,6 +37,14 @@ from open_webui.storage.provider import Storage
 
 
 from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.retrieval.bm25 import BM25_INDEX
+from open_webui.retrieval.embedding_cache import EMBEDDING_CACHE
+from open_webui.retrieval.reranking import RERANKING_SERVICE
+from open_webui.retrieval.pipeline import (
+    INGESTION_PIPELINE,
+    IngestionJob,
+    PreparedDocs,
+)
 
 # Document loaders
 from open_webui.retrieval.loaders.main import Loader
@@ -72,6 +79,7 @@ from open_webui.retrieval.web.firecrawl import search_firecrawl
 from open_webui.retrieval.web.external import search_external
 
 from open_webui.retrieval.utils import (
+    get_bm25_index,
     get_content_from_url,
     get_embedding_function,
     get_reranking_function,
@@ -276,6 +284,28 @@ async def get_embedding_config(request: Request, user=Depends(get_admin_user)):
     }
 
 
+@router.get("/embedding/cache")
+async def get_embedding_cache_stats(user=Depends(get_admin_user)):
+    return {"status": True, **EMBEDDING_CACHE.get_stats()}
+
+
+@router.post("/embedding/cache/reset")
+async def reset_embedding_cache(user=Depends(get_admin_user)):
+    EMBEDDING_CACHE.reset()
+    return {"status": True}
+
+
+@router.get("/reranking/stats")
+async def get_reranking_stats(user=Depends(get_admin_user)):
+    return {"status": True, **RERANKING_SERVICE.get_stats()}
+
+
+@router.post("/reranking/stats/reset")
+async def reset_reranking_stats(user=Depends(get_admin_user)):
+    RERANKING_SERVICE.reset_stats()
+    return {"status": True}
+
+
 class OpenAIConfigForm(BaseModel):
     url: str
     key: str
@@ -1230,7 +1260,7 @@ async def update_rag_config(
 ####################################
 
 
-def save_docs_to_vector_db(
+def prepare_docs_for_vector_db(
     request: Request,
     docs,
     collection_name,
@@ -1238,8 +1268,12 @@ def save_docs_to_vector_db(
     overwrite: bool = False,
     split: bool = True,
     add: bool = False,
-    user=None,
-) -> bool:
+) -> Optional[PreparedDocs]:
+    """
+    Split documents and build the texts and metadatas to embed. Returns None
+    when the collection already exists and should be left untouched.
+    """
+
     def _get_docs_info(docs: list[Document]) -> str:
         docs_info = set()
 
@@ -1359,81 +1393,124 @@ def save_docs_to_vector_db(
         for doc in docs
     ]
 
-    try:
-        if VECTOR_DB_CLIENT.has_collection(collection_name=collection_name):
-            log.info(f"collection {collection_name} already exists")
-
-            if overwrite:
-                VECTOR_DB_CLIENT.delete_collection(collection_name=collection_name)
-                log.info(f"deleting existing collection {collection_name}")
-            elif add is False:
-                log.info(
-                    f"collection {collection_name} already exists, overwrite is False and add is False"
-                )
-                return True
+    collection_exists = VECTOR_DB_CLIENT.has_collection(collection_name=collection_name)
+    if collection_exists:
+        log.info(f"collection {collection_name} already exists")
 
-        log.info(f"generating embeddings for {collection_name}")
-        embedding_function = get_embedding_function(
-            request.app.state.config.RAG_EMBEDDING_ENGINE,
-            request.app.state.config.RAG_EMBEDDING_MODEL,
-            request.app.state.ef,
-            (
-                request.app.state.config.RAG_OPENAI_API_BASE_URL
-                if request.app.state.config.RAG_EMBEDDING_ENGINE == "openai"
-                else (
-                    request.app.state.config.RAG_OLLAMA_BASE_URL
-                    if request.app.state.config.RAG_EMBEDDING_ENGINE == "ollama"
-                    else request.app.state.config.RAG_AZURE_OPENAI_BASE_URL
-                )
-            ),
-            (
-                request.app.state.config.RAG_OPENAI_API_KEY
-                if request.app.state.config.RAG_EMBEDDING_ENGINE == "openai"
-                else (
-                    request.app.state.config.RAG_OLLAMA_API_KEY
-                    if request.app.state.config.RAG_EMBEDDING_ENGINE == "ollama"
-                    else request.app.state.config.RAG_AZURE_OPENAI_API_KEY
-                )
-            ),
-            request.app.state.config.RAG_EMBEDDING_BATCH_SIZE,
-            azure_api_version=(
-                request.app.state.config.RAG_AZURE_OPENAI_API_VERSION
-                if request.app.state.config.RAG_EMBEDDING_ENGINE == "azure_openai"
-                else None
+        if overwrite:
+            VECTOR_DB_CLIENT.delete_collection(collection_name=collection_name)
+            BM25_INDEX.delete_collection(collection_name)
+            log.info(f"deleting existing collection {collection_name}")
+        elif add is False:
+            log.info(
+                f"collection {collection_name} already exists, overwrite is False and add is False"
+            )
+            return None
+
+    log.info(f"generating embeddings for {collection_name}")
+    return PreparedDocs(texts, metadatas, create=(not collection_exists or overwrite))
+
+
+def get_ingestion_embedding_function(request: Request, user=None):
+    embedding_function = get_embedding_function(
+        request.app.state.config.RAG_EMBEDDING_ENGINE,
+        request.app.state.config.RAG_EMBEDDING_MODEL,
+        request.app.state.ef,
+        (
+            request.app.state.config.RAG_OPENAI_API_BASE_URL
+            if request.app.state.config.RAG_EMBEDDING_ENGINE == "openai"
+            else (
+                request.app.state.config.RAG_OLLAMA_BASE_URL
+                if request.app.state.config.RAG_EMBEDDING_ENGINE == "ollama"
+                else request.app.state.config.RAG_AZURE_OPENAI_BASE_URL
+            )
+        ),
+        (
+            request.app.state.config.RAG_OPENAI_API_KEY
+            if request.app.state.config.RAG_EMBEDDING_ENGINE == "openai"
+            else (
+                request.app.state.config.RAG_OLLAMA_API_KEY
+                if request.app.state.config.RAG_EMBEDDING_ENGINE == "ollama"
+                else request.app.state.config.RAG_AZURE_OPENAI_API_KEY
+            )
+        ),
+        request.app.state.config.RAG_EMBEDDING_BATCH_SIZE,
+        azure_api_version=(
+            request.app.state.config.RAG_AZURE_OPENAI_API_VERSION
+            if request.app.state.config.RAG_EMBEDDING_ENGINE == "azure_openai"
+            else None
+        ),
+    )
+
+    async def embed(texts: list[str]):
+        return await embedding_function(
+            list(map(lambda x: x.replace("\n", " "), texts)),
+            prefix=RAG_EMBEDDING_CONTENT_PREFIX,
+            user=user,
+        )
+
+    return embed
+
+
+def save_docs_to_vector_db(
+    request: Request,
+    docs,
+    collection_name,
+    metadata: Optional[dict] = None,
+    overwrite: bool = False,
+    split: bool = True,
+    add: bool = False,
+    user=None,
+) -> bool:
+    return INGESTION_PIPELINE.run(
+        IngestionJob(
+            collection_name,
+            load=lambda: docs,
+            prepare=lambda docs: prepare_docs_for_vector_db(
+                request,
+                docs,
+                collection_name,
+                metadata=metadata,
+                overwrite=overwrite,
+                split=split,
+                add=add,
             ),
+            embed=get_ingestion_embedding_function(request, user=user),
+            overwrite=overwrite,
         )
+    )
 
-        # Run async embedding in sync context
-        embeddings = asyncio.run(
-            embedding_function(
-                list(map(lambda x: x.replace("\n", " "), texts)),
-                prefix=RAG_EMBEDDING_CONTENT_PREFIX,
-                user=user,
+
+def get_processed_file_docs(file) -> list[Document]:
+    """
+    Documents of a file that was already processed, taken from its own
+    collection when it has one, otherwise from its extracted content.
+    """
+    result = VECTOR_DB_CLIENT.query(
+        collection_name=f"file-{file.id}", filter={"file_id": file.id}
+    )
+
+    if result is not None and len(result.ids[0]) > 0:
+        return [
+            Document(
+                page_content=result.documents[0][idx],
+                metadata=result.metadatas[0][idx],
             )
-        )
-        log.info(f"embeddings generated {len(embeddings)} for {len(texts)} items")
-
-        items = [
-            {
-                "id": str(uuid.uuid4()),
-                "text": text,
-                "vector": embeddings[idx],
-                "metadata": metadatas[idx],
-            }
-            for idx, text in enumerate(texts)
+            for idx, id in enumerate(result.ids[0])
         ]
 
-        log.info(f"adding to collection {collection_name}")
-        VECTOR_DB_CLIENT.insert(
-            collection_name=collection_name,
-            items=items,
+    return [
+        Document(
+            page_content=file.data.get("content", ""),
+            metadata={
+                **file.meta,
+                "name": file.filename,
+                "created_by": file.user_id,
+                "file_id": file.id,
+                "source": file.filename,
+            },
         )
-
-        log.info(f"added {len(items)} items to collection {collection_name}")
-        return True
-    except Exception as e:
-        log.exception(e)
-        raise e
+    ]
 
 
 class ProcessFileForm(BaseModel):
@@ -1457,13 +1534,13 @@ def process_file(
         file = Files.get_file_by_id_and_user_id(form_data.file_id, user.id)
 
     if file:
-        try:
-
-            collection_name = form_data.collection_name
+        collection_name = form_data.collection_name
+        if collection_name is None:
+            collection_name = f"file-{file.id}"
 
-            if collection_name is None:
-                collection_name = f"file-{file.id}"
+        processed = {}
 
+        def load_docs():
             if form_data.content:
                 # Update the content in the file
                 # Usage: /files/{file_id}/data/content/update, /files/ (audio file upload pipeline)
@@ -1473,6 +1550,7 @@ def process_file(
                     VECTOR_DB_CLIENT.delete_collection(
                         collection_name=f"file-{file.id}"
                     )
+                    BM25_INDEX.delete_collection(f"file-{file.id}")
                 except:
                     # Audio file upload pipeline
                     pass
@@ -1495,32 +1573,7 @@ def process_file(
                 # Check if the file has already been processed and save the content
                 # Usage: /knowledge/{id}/file/add, /knowledge/{id}/file/update
 
-                result = VECTOR_DB_CLIENT.query(
-                    collection_name=f"file-{file.id}", filter={"file_id": file.id}
-                )
-
-                if result is not None and len(result.ids[0]) > 0:
-                    docs = [
-                        Document(
-                            page_content=result.documents[0][idx],
-                            metadata=result.metadatas[0][idx],
-                        )
-                        for idx, id in enumerate(result.ids[0])
-                    ]
-                else:
-                    docs = [
-                        Document(
-                            page_content=file.data.get("content", ""),
-                            metadata={
-                                **file.meta,
-                                "name": file.filename,
-                                "created_by": file.user_id,
-                                "file_id": file.id,
-                                "source": file.filename,
-                            },
-                        )
-                    ]
-
+                docs = get_processed_file_docs(file)
                 text_content = file.data.get("content", "")
             else:
                 # Process the file and save the content
@@ -1558,6 +1611,10 @@ def process_file(
                         MINERU_API_URL=request.app.state.config.MINERU_API_URL,
                         MINERU_API_KEY=request.app.state.config.MINERU_API_KEY,
                         MINERU_PARAMS=request.app.state.config.MINERU_PARAMS,
+                        progress_callback=lambda completed, total: Files.update_file_data_by_id(
+                            file.id,
+                            {"progress": {"completed": completed, "total": total}},
+                        ),
                     )
                     docs = loader.load(
                         file.filename, file.meta.get("content_type"), file_path
@@ -1599,54 +1656,67 @@ def process_file(
             hash = calculate_sha256_string(text_content)
             Files.update_file_hash_by_id(file.id, hash)
 
+            processed["content"] = text_content
+            processed["hash"] = hash
+            return docs
+
+        def prepare_docs(docs):
+            if request.app.state.config.BYPASS_EMBEDDING_AND_RETRIEVAL:
+                return None
+
+            return prepare_docs_for_vector_db(
+                request,
+                docs,
+                collection_name,
+                metadata={
+                    "file_id": file.id,
+                    "name": file.filename,
+                    "hash": processed["hash"],
+                },
+                add=(True if form_data.collection_name else False),
+            )
+
+        try:
+            INGESTION_PIPELINE.run(
+                IngestionJob(
+                    collection_name,
+                    load=load_docs,
+                    prepare=prepare_docs,
+                    embed=get_ingestion_embedding_function(request, user=user),
+                    on_status=lambda stage: Files.update_file_data_by_id(
+                        file.id, {"stage": stage}
+                    ),
+                    name=file.filename,
+                )
+            )
+
             if request.app.state.config.BYPASS_EMBEDDING_AND_RETRIEVAL:
                 Files.update_file_data_by_id(file.id, {"status": "completed"})
                 return {
                     "status": True,
                     "collection_name": None,
                     "filename": file.filename,
-                    "content": text_content,
+                    "content": processed["content"],
                 }
-            else:
-                try:
-                    result = save_docs_to_vector_db(
-                        request,
-                        docs=docs,
-                        collection_name=collection_name,
-                        metadata={
-                            "file_id": file.id,
-                            "name": file.filename,
-                            "hash": hash,
-                        },
-                        add=(True if form_data.collection_name else False),
-                        user=user,
-                    )
-                    log.info(f"added {len(docs)} items to collection {collection_name}")
-
-                    if result:
-                        Files.update_file_metadata_by_id(
-                            file.id,
-                            {
-                                "collection_name": collection_name,
-                            },
-                        )
-
-                        Files.update_file_data_by_id(
-                            file.id,
-                            {"status": "completed"},
-                        )
 
-                        return {
-                            "status": True,
-                            "collection_name": collection_name,
-                            "filename": file.filename,
-                            "content": text_content,
-                        }
-                    else:
-                        raise Exception("Error saving document to vector database")
-                except Exception as e:
-                    raise e
+            log.info(f"added {file.filename} to collection {collection_name}")
+            Files.update_file_metadata_by_id(
+                file.id,
+                {
+                    "collection_name": collection_name,
+                },
+            )
+            Files.update_file_data_by_id(
+                file.id,
+                {"status": "completed"},
+            )
 
+            return {
+                "status": True,
+                "collection_name": collection_name,
+                "filename": file.filename,
+                "content": processed["content"],
+            }
         except Exception as e:
             log.exception(e)
             Files.update_file_data_by_id(
@@ -2207,13 +2277,11 @@ async def query_doc_handler(
         if request.app.state.config.ENABLE_RAG_HYBRID_SEARCH and (
             form_data.hybrid is None or form_data.hybrid
         ):
-            collection_results = {}
-            collection_results[form_data.collection_name] = VECTOR_DB_CLIENT.get(
-                collection_name=form_data.collection_name
-            )
             return await query_doc_with_hybrid_search(
                 collection_name=form_data.collection_name,
-                collection_result=collection_results[form_data.collection_name],
+                bm25_index=await asyncio.to_thread(
+                    get_bm25_index, form_data.collection_name
+                ),
                 query=form_data.query,
                 embedding_function=lambda query, prefix: request.app.state.EMBEDDING_FUNCTION(
                     query, prefix=prefix, user=user
@@ -2240,7 +2308,6 @@ async def query_doc_handler(
                     if form_data.hybrid_bm25_weight
                     else request.app.state.config.HYBRID_BM25_WEIGHT
                 ),
-                user=user,
             )
         else:
             query_embedding = await request.app.state.EMBEDDING_FUNCTION(
@@ -2356,6 +2423,7 @@ def delete_entries_from_collection(form_data: DeleteForm, user=Depends(get_admin
                 collection_name=form_data.collection_name,
                 metadata={"hash": hash},
             )
+            BM25_INDEX.delete(form_data.collection_name, filter={"hash": hash})
             return {"status": True}
         else:
             return {"status": False}
@@ -2367,6 +2435,7 @@ def delete_entries_from_collection(form_data: DeleteForm, user=Depends(get_admin
 @router.post("/reset/db")
 def reset_vector_db(user=Depends(get_admin_user)):
     VECTOR_DB_CLIENT.reset()
+    BM25_INDEX.reset()
     Knowledges.delete_all_knowledge()
 
 
@@ -2435,9 +2504,9 @@ async def process_files_batch(
     file_results: List[BatchProcessFilesResult] = []
     file_errors: List[BatchProcessFilesResult] = []
     file_updates: List[FileUpdateForm] = []
+    jobs: List[IngestionJob] = []
 
-    # Prepare all documents first
-    all_docs: List[Document] = []
+    embed = get_ingestion_embedding_function(request, user=user)
 
     for file in form_data.files:
         try:
@@ -2455,8 +2524,18 @@ async def process_files_batch(
                 )
             ]
 
-            all_docs.extend(docs)
-
+            # Each file is its own job, the pipeline batches the inserts
+            jobs.append(
+                IngestionJob(
+                    collection_name,
+                    load=lambda docs=docs: docs,
+                    prepare=lambda docs: prepare_docs_for_vector_db(
+                        request, docs, collection_name, add=True
+                    ),
+                    embed=embed,
+                    name=file.filename,
+                )
+            )
             file_updates.append(
                 FileUpdateForm(
                     hash=calculate_sha256_string(text_content),
@@ -2473,31 +2552,24 @@ async def process_files_batch(
                 BatchProcessFilesResult(file_id=file.id, status="failed", error=str(e))
             )
 
-    # Save all documents in one batch
-    if all_docs:
-        try:
-            await run_in_threadpool(
-                save_docs_to_vector_db,
-                request,
-                all_docs,
-                collection_name,
-                add=True,
-                user=user,
-            )
-
-            # Update all files with collection name
-            for file_update, file_result in zip(file_updates, file_results):
-                Files.update_file_by_id(id=file_result.file_id, form_data=file_update)
-                file_result.status = "completed"
+    results = await asyncio.gather(
+        *[INGESTION_PIPELINE.arun(job) for job in jobs], return_exceptions=True
+    )
 
-        except Exception as e:
+    for file_update, file_result, result in zip(file_updates, file_results, results):
+        if isinstance(result, Exception):
             log.error(
-                f"process_files_batch: Error saving documents to vector DB: {str(e)}"
+                f"process_files_batch: Error saving file {file_result.file_id} to vector DB: {str(result)}"
             )
-            for file_result in file_results:
-                file_result.status = "failed"
-                file_errors.append(
-                    BatchProcessFilesResult(file_id=file_result.file_id, error=str(e))
+            file_result.status = "failed"
+            file_result.error = str(result)
+            file_errors.append(
+                BatchProcessFilesResult(
+                    file_id=file_result.file_id, status="failed", error=str(result)
                 )
+            )
+        else:
+            Files.update_file_by_id(id=file_result.file_id, form_data=file_update)
+            file_result.status = "completed"
 
     return BatchProcessFilesResponse(results=file_results, errors=file_errors)
@@ -4,7 +4,7 @@ from typing import Optional
 import time
 import re
 import aiohttp
-from open_webui.models.groups import Groups
+from open_webui.utils.principal_cache import get_user_group_ids
 from pydantic import BaseModel, HttpUrl
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 
@@ -21,6 +21,8 @@ from open_webui.utils.plugin import (
     load_tool_module_by_id,
     replace_imports,
     get_tool_module_from_cache,
+    register_loaded_module,
+    unregister_module,
 )
 from open_webui.utils.tools import get_tool_specs
 from open_webui.utils.auth import get_admin_user, get_verified_user
@@ -142,7 +144,7 @@ async def get_tools(request: Request, user=Depends(get_verified_user)):
         # Admin can see all tools
         return tools
     else:
-        user_group_ids = {group.id for group in Groups.get_groups_by_member_id(user.id)}
+        user_group_ids = get_user_group_ids(user.id)
         tools = [
             tool
             for tool in tools
@@ -308,6 +310,8 @@ async def create_new_tools(
 
             specs = get_tool_specs(TOOLS[form_data.id])
             tools = Tools.insert_new_tool(user.id, form_data, specs)
+            if tools:
+                register_loaded_module("tool", form_data.id, form_data.content)
 
             tool_cache_dir = CACHE_DIR / "tools" / form_data.id
             tool_cache_dir.mkdir(parents=True, exist_ok=True)
@@ -402,6 +406,8 @@ async def update_tools_by_id(
 
         log.debug(updated)
         tools = Tools.update_tool_by_id(id, updated)
+        if tools:
+            register_loaded_module("tool", id, form_data.content)
 
         if tools:
             return tools
@@ -449,6 +455,7 @@ async def delete_tools_by_id(
         TOOLS = request.app.state.TOOLS
         if id in TOOLS:
             del TOOLS[id]
+        unregister_module("tool", id)
 
     return result
 
@@ -4,6 +4,7 @@ from open_webui.utils.redis import get_redis_connection
 from open_webui.env import REDIS_KEY_PREFIX
 from typing import Optional, List, Tuple
 import pycrdt as Y
+from redis.exceptions import WatchError
 
 
 class RedisLock:
@@ -117,91 +118,403 @@ class RedisDict:
         return self[key]
 
 
+class AsyncRedisDict:
+    """
+    Async counterpart of RedisDict for use from Socket.IO handlers. Without a
+    redis client the values are kept in a local dict. Multi-key helpers take a
+    single round trip.
+    """
+
+    def __init__(self, name: str, redis=None):
+        self.name = name
+        self._redis = redis
+        self._data = {}
+
+    async def get(self, key, default=None):
+        if self._redis:
+            value = await self._redis.hget(self.name, key)
+            return json.loads(value) if value is not None else default
+        else:
+            return self._data.get(key, default)
+
+    async def get_many(self, keys: list) -> dict:
+        if not keys:
+            return {}
+
+        if self._redis:
+            values = await self._redis.hmget(self.name, keys)
+            return {
+                key: json.loads(value)
+                for key, value in zip(keys, values)
+                if value is not None
+            }
+        else:
+            return {key: self._data[key] for key in keys if key in self._data}
+
+    async def set(self, key, value):
+        await self.set_many({key: value})
+
+    async def set_many(self, mapping: dict):
+        if not mapping:
+            return
+
+        if self._redis:
+            await self._redis.hset(
+                self.name, mapping={k: json.dumps(v) for k, v in mapping.items()}
+            )
+        else:
+            self._data.update(mapping)
+
+    async def delete(self, *keys) -> int:
+        if not keys:
+            return 0
+
+        if self._redis:
+            return await self._redis.hdel(self.name, *keys)
+        else:
+            return len([self._data.pop(key) for key in keys if key in self._data])
+
+    async def contains(self, key) -> bool:
+        if self._redis:
+            return await self._redis.hexists(self.name, key)
+        else:
+            return key in self._data
+
+    async def keys(self) -> list:
+        if self._redis:
+            return await self._redis.hkeys(self.name)
+        else:
+            return list(self._data.keys())
+
+    async def items(self) -> list:
+        if self._redis:
+            values = await self._redis.hgetall(self.name)
+            return [(k, json.loads(v)) for k, v in values.items()]
+        else:
+            return list(self._data.items())
+
+    async def clear(self):
+        if self._redis:
+            await self._redis.delete(self.name)
+        else:
+            self._data.clear()
+
+
+class UsagePool:
+    """
+    Tracks which sessions are using which model. Each model has a sorted set
+    of session ids scored by the time of their last usage event, and a set
+    indexes the models, so expiring stale sessions is one ZREMRANGEBYSCORE
+    per model.
+    """
+
+    def __init__(
+        self,
+        redis=None,
+        redis_key_prefix: str = f"{REDIS_KEY_PREFIX}:usage",
+    ):
+        self._usage = {}
+        self._redis = redis
+        self._redis_key_prefix = redis_key_prefix
+
+    def _model_key(self, model_id: str) -> str:
+        return f"{self._redis_key_prefix}:models:{model_id}"
+
+    async def update(self, model_id: str, sid: str, timestamp: float):
+        if self._redis:
+            pipe = self._redis.pipeline()
+            pipe.zadd(self._model_key(model_id), {sid: timestamp})
+            pipe.sadd(f"{self._redis_key_prefix}:model_ids", model_id)
+            await pipe.execute()
+        else:
+            self._usage.setdefault(model_id, {})[sid] = timestamp
+
+    async def get_model_ids(self) -> List[str]:
+        if self._redis:
+            return list(
+                await self._redis.smembers(f"{self._redis_key_prefix}:model_ids")
+            )
+        else:
+            return list(self._usage.keys())
+
+    async def _remove_if_unused(self, model_id: str) -> bool:
+        """Unindex a model unless a session started using it meanwhile"""
+        async with self._redis.pipeline(transaction=True) as pipe:
+            try:
+                await pipe.watch(self._model_key(model_id))
+                if await pipe.zcard(self._model_key(model_id)) > 0:
+                    return False
+
+                pipe.multi()
+                pipe.srem(f"{self._redis_key_prefix}:model_ids", model_id)
+                await pipe.execute()
+                return True
+            except WatchError:
+                return False
+
+    async def remove_expired(self, before: float) -> List[str]:
+        """Drop sessions last seen before `before`, returns models left unused"""
+        model_ids = await self.get_model_ids()
+        if not model_ids:
+            return []
+
+        if self._redis:
+            pipe = self._redis.pipeline()
+            for model_id in model_ids:
+                pipe.zremrangebyscore(self._model_key(model_id), "-inf", f"({before}")
+                pipe.zcard(self._model_key(model_id))
+            results = await pipe.execute()
+
+            return [
+                model_id
+                for model_id, count in zip(model_ids, results[1::2])
+                if count == 0 and await self._remove_if_unused(model_id)
+            ]
+        else:
+            unused = []
+            for model_id in model_ids:
+                sessions = self._usage[model_id]
+                for sid in [sid for sid, ts in sessions.items() if ts < before]:
+                    del sessions[sid]
+                if not sessions:
+                    del self._usage[model_id]
+                    unused.append(model_id)
+            return unused
+
+
 class YdocManager:
+    """
+    Stores the Yjs updates of collaborative documents. Each document keeps a
+    merged snapshot plus a tail of the updates received since, both as raw
+    bytes. Once the tail reaches `compaction_update_count` updates or
+    `compaction_size` bytes it is merged into the snapshot, and a join
+    merges whatever tail is left into the snapshot it serves, so opening a
+    document costs one snapshot read instead of replaying its whole history.
+
+    The redis client must be created with `decode_responses=False`. The
+    documents each session has joined are indexed so a disconnect only
+    touches those documents.
+    """
+
     def __init__(
         self,
         redis=None,
         redis_key_prefix: str = f"{REDIS_KEY_PREFIX}:ydoc:documents",
+        redis_user_key_prefix: str = f"{REDIS_KEY_PREFIX}:ydoc:users",
+        compaction_update_count: int = 100,
+        compaction_size: int = 262144,
     ):
+        self._snapshots = {}
         self._updates = {}
         self._users = {}
+        self._user_documents = {}
         self._redis = redis
         self._redis_key_prefix = redis_key_prefix
+        self._redis_user_key_prefix = redis_user_key_prefix
+        self.compaction_update_count = max(compaction_update_count, 1)
+        self.compaction_size = max(compaction_size, 1)
+
+    def _key(self, document_id: str, name: str) -> str:
+        return f"{self._redis_key_prefix}:{document_id}:{name}"
+
+    def _user_key(self, user_id: str) -> str:
+        return f"{self._redis_user_key_prefix}:{user_id}:documents"
+
+    @staticmethod
+    def _decode(value) -> str:
+        return value.decode() if isinstance(value, bytes) else value
+
+    def _should_compact(self, count: int, size: int) -> bool:
+        return count >= self.compaction_update_count or size >= self.compaction_size
 
     async def append_to_updates(self, document_id: str, update: bytes):
         document_id = document_id.replace(":", "_")
+        update = bytes(update)
+
         if self._redis:
-            redis_key = f"{self._redis_key_prefix}:{document_id}:updates"
-            await self._redis.rpush(redis_key, json.dumps(list(update)))
+            pipe = self._redis.pipeline()
+            pipe.rpush(self._key(document_id, "log"), update)
+            pipe.incrby(self._key(document_id, "log_size"), len(update))
+            count, size = await pipe.execute()
         else:
-            if document_id not in self._updates:
-                self._updates[document_id] = []
-            self._updates[document_id].append(update)
+            self._updates.setdefault(document_id, []).append(update)
+            updates = self._updates[document_id]
+            count, size = len(updates), sum(len(u) for u in updates)
 
-    async def get_updates(self, document_id: str) -> List[bytes]:
-        document_id = document_id.replace(":", "_")
+        if self._should_compact(count, size):
+            await self.compact(document_id)
 
+    async def _read(self, document_id: str) -> Tuple[Optional[bytes], List[bytes]]:
         if self._redis:
-            redis_key = f"{self._redis_key_prefix}:{document_id}:updates"
-            updates = await self._redis.lrange(redis_key, 0, -1)
-            return [bytes(json.loads(update)) for update in updates]
+            pipe = self._redis.pipeline()
+            pipe.get(self._key(document_id, "snapshot"))
+            pipe.lrange(self._key(document_id, "log"), 0, -1)
+            snapshot, updates = await pipe.execute()
+            return snapshot, updates
         else:
-            return self._updates.get(document_id, [])
+            return (
+                self._snapshots.get(document_id),
+                list(self._updates.get(document_id, [])),
+            )
+
+    async def _lock(self, document_id: str) -> Optional[str]:
+        """Take the compaction lock, returns None when it is held elsewhere"""
+        token = str(uuid.uuid4())
+        if self._redis:
+            if not await self._redis.set(
+                self._key(document_id, "compacting"), token, nx=True, ex=30
+            ):
+                return None
+        # In memory nothing yields between the read and the write
+        return token
+
+    async def _unlock(self, document_id: str, token: str):
+        if self._redis:
+            lock_key = self._key(document_id, "compacting")
+            # The lock may have expired and been taken by another replica
+            if self._decode(await self._redis.get(lock_key)) == token:
+                await self._redis.delete(lock_key)
+
+    async def _write_snapshot(
+        self, document_id: str, snapshot: bytes, updates: List[bytes]
+    ):
+        """
+        Store `snapshot`, which covers the first `len(updates)` updates. Must
+        hold the compaction lock since those updates were read.
+        """
+        if self._redis:
+            # Readers in between see some updates in both the snapshot and
+            # the tail, which Yjs applies idempotently
+            pipe = self._redis.pipeline()
+            pipe.set(self._key(document_id, "snapshot"), snapshot)
+            pipe.ltrim(self._key(document_id, "log"), len(updates), -1)
+            pipe.decrby(
+                self._key(document_id, "log_size"), sum(len(u) for u in updates)
+            )
+            await pipe.execute()
+        else:
+            self._snapshots[document_id] = snapshot
+            self._updates[document_id] = self._updates.get(document_id, [])[
+                len(updates) :
+            ]
+
+    async def compact(self, document_id: str):
+        """Merge the update tail into the snapshot"""
+        document_id = document_id.replace(":", "_")
+
+        token = await self._lock(document_id)
+        if token is None:
+            return  # Another replica is compacting
+
+        try:
+            snapshot, updates = await self._read(document_id)
+            if not updates:
+                return
+
+            merged = Y.merge_updates(*([snapshot] if snapshot else []), *updates)
+            await self._write_snapshot(document_id, merged, updates)
+        finally:
+            await self._unlock(document_id, token)
+
+    async def get_state(self, document_id: str) -> bytes:
+        """The whole document encoded as a single update"""
+        document_id = document_id.replace(":", "_")
+
+        # Without the lock the merge is served but not stored
+        token = await self._lock(document_id)
+        try:
+            snapshot, updates = await self._read(document_id)
+            if not updates:
+                return snapshot if snapshot else Y.Doc().get_update()
+
+            merged = Y.merge_updates(*([snapshot] if snapshot else []), *updates)
+            if token is not None:
+                # Keep the merge so the next join is served as stored
+                await self._write_snapshot(document_id, merged, updates)
+            return merged
+        finally:
+            if token is not None:
+                await self._unlock(document_id, token)
+
+    async def get_updates(self, document_id: str) -> List[bytes]:
+        document_id = document_id.replace(":", "_")
+
+        snapshot, updates = await self._read(document_id)
+        return ([snapshot] if snapshot else []) + updates
 
     async def document_exists(self, document_id: str) -> bool:
         document_id = document_id.replace(":", "_")
 
         if self._redis:
-            redis_key = f"{self._redis_key_prefix}:{document_id}:updates"
-            return await self._redis.exists(redis_key) > 0
+            return (
+                await self._redis.exists(
+                    self._key(document_id, "snapshot"), self._key(document_id, "log")
+                )
+                > 0
+            )
         else:
-            return document_id in self._updates
+            return document_id in self._snapshots or document_id in self._updates
 
     async def get_users(self, document_id: str) -> List[str]:
         document_id = document_id.replace(":", "_")
 
         if self._redis:
-            redis_key = f"{self._redis_key_prefix}:{document_id}:users"
-            users = await self._redis.smembers(redis_key)
-            return list(users)
+            users = await self._redis.smembers(self._key(document_id, "users"))
+            return [self._decode(user) for user in users]
         else:
-            return self._users.get(document_id, [])
+            return list(self._users.get(document_id, []))
 
     async def add_user(self, document_id: str, user_id: str):
         document_id = document_id.replace(":", "_")
 
         if self._redis:
-            redis_key = f"{self._redis_key_prefix}:{document_id}:users"
-            await self._redis.sadd(redis_key, user_id)
+            pipe = self._redis.pipeline()
+            pipe.sadd(self._key(document_id, "users"), user_id)
+            pipe.sadd(self._user_key(user_id), document_id)
+            await pipe.execute()
         else:
-            if document_id not in self._users:
-                self._users[document_id] = set()
-            self._users[document_id].add(user_id)
+            self._users.setdefault(document_id, set()).add(user_id)
+            self._user_documents.setdefault(user_id, set()).add(document_id)
 
     async def remove_user(self, document_id: str, user_id: str):
         document_id = document_id.replace(":", "_")
 
         if self._redis:
-            redis_key = f"{self._redis_key_prefix}:{document_id}:users"
-            await self._redis.srem(redis_key, user_id)
+            pipe = self._redis.pipeline()
+            pipe.srem(self._key(document_id, "users"), user_id)
+            pipe.srem(self._user_key(user_id), document_id)
+            await pipe.execute()
         else:
             if document_id in self._users and user_id in self._users[document_id]:
                 self._users[document_id].remove(user_id)
+            if user_id in self._user_documents:
+                self._user_documents[user_id].discard(document_id)
+                if not self._user_documents[user_id]:
+                    del self._user_documents[user_id]
 
     async def remove_user_from_all_documents(self, user_id: str):
         if self._redis:
-            keys = await self._redis.keys(f"{self._redis_key_prefix}:*")
-            for key in keys:
-                if key.endswith(":users"):
-                    await self._redis.srem(key, user_id)
-
-                    document_id = key.split(":")[-2]
-                    if len(await self.get_users(document_id)) == 0:
-                        await self.clear_document(document_id)
+            document_ids = [
+                self._decode(document_id)
+                for document_id in await self._redis.smembers(self._user_key(user_id))
+            ]
+            await self._redis.delete(self._user_key(user_id))
+            if not document_ids:
+                return
+
+            pipe = self._redis.pipeline()
+            for document_id in document_ids:
+                pipe.srem(self._key(document_id, "users"), user_id)
+                pipe.scard(self._key(document_id, "users"))
+            results = await pipe.execute()
+
+            for document_id, count in zip(document_ids, results[1::2]):
+                if count == 0:
+                    await self.clear_document(document_id)
 
         else:
-            for document_id in list(self._users.keys()):
-                if user_id in self._users[document_id]:
+            for document_id in self._user_documents.pop(user_id, set()):
+                if user_id in self._users.get(document_id, set()):
                     self._users[document_id].remove(user_id)
                     if not self._users[document_id]:
                         del self._users[document_id]
@@ -212,12 +525,23 @@ class YdocManager:
         document_id = document_id.replace(":", "_")
 
         if self._redis:
-            redis_key = f"{self._redis_key_prefix}:{document_id}:updates"
-            await self._redis.delete(redis_key)
-            redis_users_key = f"{self._redis_key_prefix}:{document_id}:users"
-            await self._redis.delete(redis_users_key)
+            users = await self._redis.smembers(self._key(document_id, "users"))
+
+            pipe = self._redis.pipeline()
+            for user_id in users:
+                pipe.srem(self._user_key(self._decode(user_id)), document_id)
+            pipe.delete(
+                self._key(document_id, "snapshot"),
+                self._key(document_id, "log"),
+                self._key(document_id, "log_size"),
+                self._key(document_id, "users"),
+                # JSON encoded update list written by earlier versions
+                self._key(document_id, "updates"),
+            )
+            await pipe.execute()
         else:
-            if document_id in self._updates:
-                del self._updates[document_id]
-            if document_id in self._users:
-                del self._users[document_id]
+            for user_id in self._users.pop(document_id, set()):
+                if user_id in self._user_documents:
+                    self._user_documents[user_id].discard(document_id)
+            self._snapshots.pop(document_id, None)
+            self._updates.pop(document_id, None)
@@ -0,0 +1,29 @@
+import time
+
+import pytest
+
+
+@pytest.fixture
+def wait_for():
+    """Polls `condition` until it holds, failing the test after `timeout`"""
+
+    def wait(condition, timeout=5):
+        deadline = time.monotonic() + timeout
+        while not condition():
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+
+    return wait
+
+
+@pytest.fixture
+def make_redis():
+    """Clients of one in-memory Redis server, shared within a test"""
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.FakeServer()
+
+    def make(async_mode: bool = False, decode_responses: bool = True):
+        client_class = fakeredis.FakeAsyncRedis if async_mode else fakeredis.FakeRedis
+        return client_class(server=server, decode_responses=decode_responses)
+
+    return make
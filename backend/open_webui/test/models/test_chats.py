@@ -0,0 +1,67 @@
+import uuid
+
+import pytest
+
+from open_webui.internal.db import engine, get_db
+from open_webui.models.chats import ChatForm, Chats, ChatSearch
+
+pytestmark = pytest.mark.skipif(
+    engine.dialect.name != "sqlite", reason="uses the SQLite FTS5 search index"
+)
+
+
+def test_search_finds_korean_word_inside_compound():
+    user_id = str(uuid.uuid4())
+    chat = Chats.insert_new_chat(
+        user_id,
+        ChatForm(
+            chat={
+                "title": "메모",
+                "history": {
+                    "currentId": "m1",
+                    "messages": {
+                        "m1": {"id": "m1", "role": "user", "content": "안녕하세요"}
+                    },
+                },
+            }
+        ),
+    )
+
+    try:
+        assert Chats.get_chats_by_user_id_and_search_text(user_id, "회의") == []
+
+        Chats.upsert_chat_message_by_id_and_message_id(
+            chat.id,
+            "m2",
+            {"id": "m2", "role": "assistant", "content": "3층 회의실에서 만나요"},
+        )
+
+        for search_text in ("회의", "회의실", "회"):
+            results = Chats.get_chats_by_user_id_and_search_text(user_id, search_text)
+            assert [result.id for result in results] == [chat.id]
+
+        assert Chats.get_chats_by_user_id_and_search_text(user_id, "회의록") == []
+    finally:
+        Chats.delete_chat_by_id(chat.id)
+
+
+def test_search_rows_carry_the_chat_owner():
+    user_id = str(uuid.uuid4())
+    chat = Chats.insert_new_chat(user_id, ChatForm(chat={"title": "회의 메모"}))
+
+    try:
+        Chats.upsert_chat_message_by_id_and_message_id(
+            chat.id, "m1", {"id": "m1", "role": "user", "content": "회의실 예약"}
+        )
+
+        with get_db() as db:
+            owners = {
+                row.message_id: row.user_id
+                for row in db.query(ChatSearch).filter_by(chat_id=chat.id)
+            }
+        assert owners == {"": user_id, "m1": user_id}
+
+        other_user_id = str(uuid.uuid4())
+        assert Chats.get_chats_by_user_id_and_search_text(other_user_id, "회의") == []
+    finally:
+        Chats.delete_chat_by_id(chat.id)
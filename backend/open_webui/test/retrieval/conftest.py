@@ -0,0 +1,113 @@
+import asyncio
+import threading
+
+import pytest
+
+from open_webui.retrieval import pipeline
+from open_webui.retrieval.pipeline import IngestionPipeline
+
+
+class FakeVectorDB:
+    def __init__(self):
+        self.items = {}
+        self.upserts = []
+        self.fail_batches = False
+        # Holds every write until set
+        self.gate: threading.Event = None
+        self.lock = threading.Lock()
+
+    def upsert(self, collection_name, items):
+        with self.lock:
+            self.upserts.append((collection_name, len(items)))
+        if self.gate is not None:
+            self.gate.wait(timeout=5)
+
+        with self.lock:
+            if self.fail_batches and len({i["metadata"]["name"] for i in items}) > 1:
+                raise RuntimeError("batch rejected")
+            if any(i["metadata"]["name"] == "bad" for i in items):
+                raise RuntimeError("bad item")
+            for item in items:
+                self.items[item["id"]] = (collection_name, item)
+
+    def delete(self, collection_name, ids=None, filter=None):
+        with self.lock:
+            for id in ids or []:
+                self.items.pop(id, None)
+
+    def hashes(self, collection_name):
+        with self.lock:
+            return {
+                item["metadata"].get("hash")
+                for name, item in self.items.values()
+                if name == collection_name
+            }
+
+
+class FakeBM25:
+    def add(self, collection_name, items, create=False):
+        pass
+
+    def delete(self, collection_name, ids=None, filter=None):
+        pass
+
+
+@pytest.fixture
+def db(monkeypatch):
+    db = FakeVectorDB()
+    monkeypatch.setattr(pipeline, "VECTOR_DB_CLIENT", db)
+    monkeypatch.setattr(pipeline, "BM25_INDEX", FakeBM25())
+    return db
+
+
+class Embedder:
+    """Async embedding function that records how many calls overlap"""
+
+    def __init__(self, delay=0.05, gate: threading.Event = None):
+        self.delay = delay
+        self.gate = gate
+        self.active = 0
+        self.max_active = 0
+
+    async def __call__(self, texts):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            while self.gate is not None and not self.gate.is_set():
+                await asyncio.sleep(0.01)
+            return [[0.0] for _ in texts]
+        finally:
+            self.active -= 1
+
+
+@pytest.fixture
+def pipelines():
+    created = []
+
+    def make_pipeline(**kwargs) -> IngestionPipeline:
+        ingestion = IngestionPipeline(**kwargs)
+        created.append(ingestion)
+        return ingestion
+
+    yield make_pipeline
+
+    for ingestion in created:
+        loop = ingestion._loop
+        if loop is None:
+            continue
+
+        async def stop():
+            for task in ingestion._tasks:
+                task.cancel()
+            await asyncio.gather(*ingestion._tasks, return_exceptions=True)
+
+        asyncio.run_coroutine_threadsafe(stop(), loop).result(timeout=5)
+        loop.call_soon_threadsafe(loop.stop)
+        ingestion._thread.join(timeout=5)
+        loop.close()
+
+
+@pytest.fixture
+def make_embedder():
+    return Embedder
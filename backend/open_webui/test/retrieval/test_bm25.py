@@ -0,0 +1,103 @@
+import os
+import threading
+import time
+from types import SimpleNamespace
+
+from open_webui.retrieval.bm25 import BM25IndexManager
+
+
+def make_items(start, count, file_id="f1"):
+    return [
+        {
+            "id": f"id-{i}",
+            "text": f"chunk {i} about apples",
+            "metadata": {"file_id": file_id},
+        }
+        for i in range(start, start + count)
+    ]
+
+
+def test_writes_append_deltas_instead_of_rewriting(tmp_path):
+    manager = BM25IndexManager(str(tmp_path))
+    manager.add("kb", make_items(0, 3), create=True)
+    base_path = manager._get_path("kb")
+    base_mtime = os.stat(base_path).st_mtime_ns
+
+    manager.add("kb", make_items(3, 3))
+    manager.delete("kb", ids=["id-0"])
+
+    assert os.stat(base_path).st_mtime_ns == base_mtime
+    assert os.path.getsize(manager._get_path("kb", "log")) > 0
+    assert len(manager.get("kb")) == 5
+
+
+def test_other_manager_replays_the_log(tmp_path):
+    writer = BM25IndexManager(str(tmp_path))
+    reader = BM25IndexManager(str(tmp_path))
+
+    writer.add("kb", make_items(0, 2), create=True)
+    assert len(reader.get("kb")) == 2
+
+    writer.add("kb", make_items(2, 2, file_id="f2"))
+    writer.delete("kb", filter={"file_id": "f1"})
+    index = reader.get("kb")
+    assert sorted(index.docs) == ["id-2", "id-3"]
+    assert index.search("apples", 10)
+
+
+def test_log_is_folded_into_base(tmp_path):
+    manager = BM25IndexManager(str(tmp_path))
+    manager.add("kb", make_items(0, 1), create=True)
+    items = make_items(1, 1)
+    items[0]["text"] = "word " * 300_000
+    manager.add("kb", items)
+
+    assert not os.path.exists(manager._get_path("kb", "log"))
+    assert len(BM25IndexManager(str(tmp_path)).get("kb")) == 2
+
+
+def test_rename_moves_base_and_log(tmp_path):
+    manager = BM25IndexManager(str(tmp_path))
+    manager.add("shadow", make_items(0, 2), create=True)
+    manager.add("shadow", make_items(2, 1))
+    manager.add("kb", make_items(10, 5), create=True)
+
+    manager.rename_collection("shadow", "kb")
+
+    assert manager.get("shadow") is None
+    assert sorted(BM25IndexManager(str(tmp_path)).get("kb").docs) == [
+        "id-0",
+        "id-1",
+        "id-2",
+    ]
+
+
+def test_delete_during_lazy_build_is_not_lost(tmp_path):
+    manager = BM25IndexManager(str(tmp_path))
+    items = make_items(0, 2) + make_items(2, 2, file_id="f2")
+    fetching = threading.Event()
+    vectors = {item["id"]: item for item in items}
+
+    def fetch():
+        snapshot = list(vectors.values())
+        fetching.set()
+        # Let the vector DB delete and its BM25 delete run mid-build
+        time.sleep(0.2)
+        return SimpleNamespace(
+            ids=[[item["id"] for item in snapshot]],
+            documents=[[item["text"] for item in snapshot]],
+            metadatas=[[item["metadata"] for item in snapshot]],
+        )
+
+    def delete_file():
+        fetching.wait(timeout=5)
+        for id in ["id-2", "id-3"]:
+            vectors.pop(id)
+        manager.delete("kb", filter={"file_id": "f2"})
+
+    deleter = threading.Thread(target=delete_file)
+    deleter.start()
+    manager.get_or_build("kb", fetch)
+    deleter.join(timeout=5)
+
+    assert len(BM25IndexManager(str(tmp_path)).get("kb")) == 2
@@ -0,0 +1,41 @@
+import pytest
+
+from open_webui.retrieval.embedding_cache import EmbeddingCache
+
+
+def test_memory_tier_returns_copies():
+    cache = EmbeddingCache(size=2)
+    vector = [0.1, 0.2, 0.3]
+    cache.set_many({"a": vector})
+
+    vector[0] = 9.0
+    first = cache.get_many(["a"])["a"]
+    first[1] = 9.0
+
+    assert cache.get_many(["a"]) == {"a": [0.1, 0.2, 0.3]}
+    assert isinstance(cache._memory["a"], bytes)
+
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = EmbeddingCache(size=2)
+    cache.set_many({"a": [1.0], "b": [2.0]})
+    cache.get_many(["a"])
+    cache.set_many({"c": [3.0]})
+
+    assert cache.get_many(["a", "b", "c"]) == {"a": [1.0], "c": [3.0]}
+
+
+@pytest.mark.asyncio
+async def test_wrap_embeds_only_misses():
+    calls = []
+
+    async def embed(texts, prefix=None, user=None):
+        calls.append(texts)
+        return [[float(len(text))] for text in texts]
+
+    cached = EmbeddingCache(size=10).wrap("engine", "model", embed)
+
+    assert await cached(["a", "bb"]) == [[1.0], [2.0]]
+    assert await cached(["bb", "ccc"]) == [[2.0], [3.0]]
+    assert await cached("a") == [1.0]
+    assert calls == [["a", "bb"], ["ccc"]]
@@ -0,0 +1,107 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from open_webui.retrieval.pipeline import PreparedDocs
+from open_webui.utils import knowledge_reindex
+
+
+class FakeReindexJobs:
+    def __init__(self, file_ids):
+        self.file_ids = list(file_ids)
+        self.pending = list(file_ids)
+        self.statuses = {}
+
+    def update_job_by_id(self, id, **fields):
+        pass
+
+    def get_pending_file_ids(self, job_id, knowledge_id):
+        pending, self.pending = self.pending, []
+        return pending
+
+    def get_file_ids(self, job_id, knowledge_id):
+        return self.file_ids
+
+    def update_item_status(self, job_id, knowledge_id, file_id, status, error=None):
+        self.statuses[file_id] = status
+
+
+class FakeAliases:
+    def __init__(self):
+        self.swaps = []
+
+    def swap_collection(self, alias, collection_name):
+        self.swaps.append((alias, collection_name))
+        return alias
+
+    def has_collection(self, collection_name):
+        return True
+
+
+class FakeBM25Aliases:
+    def rename_collection(self, collection_name, new_name):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_reindex_embeds_files_of_one_knowledge_base_concurrently(
+    monkeypatch, db, pipelines, make_embedder
+):
+    file_ids = [f"file-{i}" for i in range(4)]
+    files = {
+        file_id: SimpleNamespace(id=file_id, filename=f"{file_id}.txt", hash=None)
+        for file_id in file_ids
+    }
+    jobs = FakeReindexJobs(file_ids)
+    aliases = FakeAliases()
+
+    monkeypatch.setattr(knowledge_reindex, "KnowledgeReindexJobs", jobs)
+    monkeypatch.setattr(
+        knowledge_reindex,
+        "Knowledges",
+        SimpleNamespace(
+            get_knowledge_by_id=lambda id: SimpleNamespace(id=id),
+            get_files_by_id=lambda id: list(files.values()),
+        ),
+    )
+    monkeypatch.setattr(
+        knowledge_reindex, "Files", SimpleNamespace(get_file_by_id=files.get)
+    )
+    monkeypatch.setattr(knowledge_reindex, "VECTOR_DB_CLIENT", aliases)
+    monkeypatch.setattr(knowledge_reindex, "BM25_INDEX", FakeBM25Aliases())
+    monkeypatch.setattr(knowledge_reindex, "get_processed_file_docs", lambda file: [])
+    monkeypatch.setattr(
+        knowledge_reindex,
+        "prepare_docs_for_vector_db",
+        lambda request, docs, collection_name, metadata, add: PreparedDocs(
+            ["text"], [metadata]
+        ),
+    )
+    monkeypatch.setattr(
+        knowledge_reindex, "INGESTION_PIPELINE", pipelines(embed_workers=4)
+    )
+
+    gate = threading.Event()
+    embed = make_embedder(gate=gate)
+    job = SimpleNamespace(id="job", data={"knowledge": {}, "cleanup": []})
+    state = {"status": "pending", "collection": "kb-job"}
+
+    task = asyncio.create_task(
+        knowledge_reindex._reindex_knowledge(
+            None, job, "kb", state, embed, asyncio.Semaphore(4)
+        )
+    )
+    try:
+        async with asyncio.timeout(5):
+            while embed.max_active < 2:
+                await asyncio.sleep(0.01)
+    finally:
+        gate.set()
+    await asyncio.wait_for(task, timeout=5)
+
+    assert embed.max_active > 1
+    assert jobs.statuses == {file_id: "completed" for file_id in file_ids}
+    assert aliases.swaps == [("kb", "kb-job")]
+    assert state["status"] == "swapped"
@@ -0,0 +1,119 @@
+import threading
+
+import pytest
+
+from open_webui.constants import ERROR_MESSAGES
+from open_webui.retrieval.pipeline import IngestionJob, PreparedDocs
+
+
+def make_job(db, collection_name, name, embed, content_hash=None, **kwargs):
+    def prepare(docs):
+        if content_hash and content_hash in db.hashes(collection_name):
+            raise ValueError(ERROR_MESSAGES.DUPLICATE_CONTENT)
+        metadata = {"name": name, **({"hash": content_hash} if content_hash else {})}
+        return PreparedDocs(["a", "b"], [metadata, metadata])
+
+    return IngestionJob(
+        collection_name,
+        load=lambda: [],
+        prepare=prepare,
+        embed=embed,
+        name=name,
+        **kwargs,
+    )
+
+
+def test_same_collection_embeds_in_parallel_and_batches_writes(
+    db, pipelines, make_embedder, wait_for
+):
+    db.gate = threading.Event()
+    gate = threading.Event()
+    embed = make_embedder(gate=gate)
+    ingestion = pipelines(embed_workers=4, queue_size=8)
+
+    # Files that finish while a write is running join the next one
+    first = ingestion.submit(make_job(db, "kb", "first", make_embedder()))
+    wait_for(lambda: len(db.upserts) == 1)
+
+    futures = [
+        ingestion.submit(make_job(db, "kb", f"file-{i}", embed)) for i in range(4)
+    ]
+    wait_for(lambda: embed.max_active == 4)
+    gate.set()
+    wait_for(lambda: ingestion._upsert_queue.qsize() == 4)
+    db.gate.set()
+
+    for future in [first, *futures]:
+        assert future.result(timeout=5) is True
+    assert db.upserts == [("kb", 2), ("kb", 8)]
+
+
+def test_prepared_hash_is_reserved_until_written(db, pipelines, make_embedder):
+    gate = threading.Event()
+    ingestion = pipelines()
+
+    first = ingestion.submit(
+        make_job(db, "kb", "first", make_embedder(gate=gate), content_hash="h")
+    )
+    second = ingestion.submit(make_job(db, "kb", "second", make_embedder(), "h"))
+
+    with pytest.raises(ValueError, match="Duplicate content"):
+        second.result(timeout=5)
+    gate.set()
+    assert first.result(timeout=5) is True
+
+    third = ingestion.submit(make_job(db, "kb", "third", make_embedder(), "h"))
+    with pytest.raises(ValueError, match="Duplicate content"):
+        third.result(timeout=5)
+
+
+def test_waiting_overwrite_does_not_block_other_collections(
+    db, pipelines, make_embedder
+):
+    gate = threading.Event()
+    ingestion = pipelines(load_workers=1)
+
+    pending = ingestion.submit(make_job(db, "kb", "pending", make_embedder(gate=gate)))
+    overwrite = ingestion.submit(
+        make_job(db, "kb", "overwrite", make_embedder(), overwrite=True)
+    )
+    others = [
+        ingestion.submit(make_job(db, f"other-{i}", "other", make_embedder()))
+        for i in range(3)
+    ]
+
+    for future in others:
+        assert future.result(timeout=5) is True
+    assert not pending.done() and not overwrite.done()
+
+    gate.set()
+    assert pending.result(timeout=5) is True
+    assert overwrite.result(timeout=5) is True
+
+
+def test_failed_batch_falls_back_to_per_file_writes(
+    db, pipelines, make_embedder, wait_for
+):
+    db.fail_batches = True
+    db.gate = threading.Event()
+    ingestion = pipelines(embed_workers=3)
+
+    first = ingestion.submit(make_job(db, "kb", "first", make_embedder()))
+    wait_for(lambda: len(db.upserts) == 1)
+
+    futures = {
+        name: ingestion.submit(make_job(db, "kb", name, make_embedder()))
+        for name in ("good-1", "bad", "good-2")
+    }
+    wait_for(lambda: ingestion._upsert_queue.qsize() == 3)
+    db.gate.set()
+
+    assert first.result(timeout=5) is True
+    assert futures["good-1"].result(timeout=5) is True
+    assert futures["good-2"].result(timeout=5) is True
+    with pytest.raises(RuntimeError, match="bad item"):
+        futures["bad"].result(timeout=5)
+
+    names = {item["metadata"]["name"] for _, item in db.items.values()}
+    assert names == {"first", "good-1", "good-2"}
+    assert db.upserts[1] == ("kb", 6)
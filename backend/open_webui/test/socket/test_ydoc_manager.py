@@ -0,0 +1,91 @@
+import asyncio
+
+import pycrdt as Y
+import pytest
+
+from open_webui.socket.utils import YdocManager
+
+
+def make_update(doc: Y.Doc, text: str) -> bytes:
+    before = doc.get_state()
+    doc["text"] += text
+    return doc.get_update(before)
+
+
+def read_text(state: bytes) -> str:
+    doc = Y.Doc()
+    doc["text"] = Y.Text()
+    doc.apply_update(state)
+    return str(doc["text"])
+
+
+@pytest.mark.asyncio
+async def test_concurrent_compactions_keep_appended_updates(make_redis):
+    redis = make_redis(async_mode=True, decode_responses=False)
+    manager = YdocManager(redis=redis, redis_key_prefix="test:ydoc")
+
+    doc = Y.Doc()
+    doc["text"] = Y.Text()
+    for text in ("a", "b", "c"):
+        await manager.append_to_updates("doc", make_update(doc, text))
+
+    # Hold the first compaction between its read and its write
+    read = asyncio.Event()
+    proceed = asyncio.Event()
+    original_read = manager._read
+
+    async def paused_read(document_id):
+        result = await original_read(document_id)
+        read.set()
+        await proceed.wait()
+        return result
+
+    manager._read = paused_read
+
+    first = asyncio.create_task(manager.compact("doc"))
+    await read.wait()
+    second = asyncio.create_task(manager.compact("doc"))
+
+    manager._read = original_read
+    late = make_update(doc, "d")
+    await manager.append_to_updates("doc", late)
+
+    proceed.set()
+    await asyncio.gather(first, second)
+
+    assert await redis.lrange("test:ydoc:doc:log", 0, -1) == [late]
+    assert int(await redis.get("test:ydoc:doc:log_size")) == len(late)
+    assert read_text(await manager.get_state("doc")) == "abcd"
+
+
+@pytest.mark.asyncio
+async def test_get_state_does_not_store_without_the_lock(make_redis):
+    redis = make_redis(async_mode=True, decode_responses=False)
+    manager = YdocManager(redis=redis, redis_key_prefix="test:ydoc")
+
+    doc = Y.Doc()
+    doc["text"] = Y.Text()
+    await manager.append_to_updates("doc", make_update(doc, "a"))
+    await manager.append_to_updates("doc", make_update(doc, "b"))
+
+    await redis.set("test:ydoc:doc:compacting", b"other")
+    assert read_text(await manager.get_state("doc")) == "ab"
+    assert await redis.llen("test:ydoc:doc:log") == 2
+    assert await redis.get("test:ydoc:doc:snapshot") is None
+
+    await redis.delete("test:ydoc:doc:compacting")
+    assert read_text(await manager.get_state("doc")) == "ab"
+    assert await redis.llen("test:ydoc:doc:log") == 0
+
+
+@pytest.mark.asyncio
+async def test_in_memory_compaction():
+    manager = YdocManager(compaction_update_count=2)
+
+    doc = Y.Doc()
+    doc["text"] = Y.Text()
+    for text in ("a", "b", "c"):
+        await manager.append_to_updates("doc", make_update(doc, text))
+
+    assert len(manager._updates["doc"]) == 1
+    assert read_text(await manager.get_state("doc")) == "abc"
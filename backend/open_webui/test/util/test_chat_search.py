@@ -0,0 +1,30 @@
+from open_webui.utils.chat_search import get_search_query_terms, get_search_terms
+
+
+def test_latin_words_are_kept_whole():
+    assert get_search_terms("Hello, World_2!") == ["hello", "world", "2"]
+    assert get_search_query_terms("Hello wor") == [("hello", True), ("wor", True)]
+
+
+def test_korean_is_split_into_bigrams():
+    assert get_search_terms("회의실") == ["회의", "의실", "실"]
+    assert get_search_query_terms("회의") == [("회의", False)]
+    assert get_search_query_terms("회의실") == [("회의", False), ("의실", False)]
+    assert get_search_query_terms("회") == [("회", True)]
+
+
+def test_query_terms_are_stored_terms():
+    terms = set(get_search_terms("내일 회의실 예약"))
+    for term, is_prefix in get_search_query_terms("회의"):
+        assert term in terms
+
+
+def test_mixed_latin_and_hangul():
+    assert get_search_terms("API키를") == ["api", "키를", "를"]
+    assert get_search_query_terms("API키") == [("api", True), ("키", True)]
+
+
+def test_punctuation_only_has_no_terms():
+    assert get_search_terms("!?... ---") == []
+    assert get_search_query_terms("!?_") == []
+    assert get_search_terms(None) == []
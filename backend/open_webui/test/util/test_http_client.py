@@ -0,0 +1,58 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from open_webui.utils.http_client import UpstreamSessionPool
+
+
+def make_config(**api_config):
+    return SimpleNamespace(
+        version=1,
+        OPENAI_API_BASE_URLS=["https://api.example.com/v1"],
+        OPENAI_API_CONFIGS={"0": api_config},
+        OLLAMA_BASE_URLS=[],
+        OLLAMA_API_CONFIGS={},
+    )
+
+
+@pytest.mark.asyncio
+async def test_connection_timeouts_get_their_own_session():
+    pool = UpstreamSessionPool(timeout=300)
+    pool.configure(make_config(timeout="30"))
+
+    try:
+        session = pool.get_session("https://api.example.com/v1/chat/completions")
+        default = pool.get_session("https://api.example.com/other")
+
+        assert session is not default
+        assert session.timeout.total == 30
+        assert default.timeout.total == 300
+        assert pool.get_session("https://api.example.com/v1/models") is session
+    finally:
+        await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_superseded_sessions_are_closed():
+    pool = UpstreamSessionPool(timeout=300)
+    config = make_config(timeout="30")
+    pool.configure(config)
+
+    try:
+        url = "https://api.example.com/v1/chat/completions"
+        old = pool.get_session(url)
+        default = pool.get_session("https://api.example.com/other")
+
+        config.OPENAI_API_CONFIGS = {"0": {"timeout": "60"}}
+        config.version += 1
+        new = pool.get_session(url)
+
+        assert new is not old
+        assert new.timeout.total == 60
+        async with asyncio.timeout(5):
+            while not old.closed:
+                await asyncio.sleep(0.01)
+        assert not default.closed
+    finally:
+        await pool.close()
@@ -0,0 +1,58 @@
+import time
+from types import SimpleNamespace
+
+from open_webui.utils.model_list_cache import ModelListCache, get_model_list_cache_key
+
+
+def make_cache(redis=None, **kwargs) -> ModelListCache:
+    cache = ModelListCache(**kwargs)
+    cache._redis = redis
+    cache._redis_checked = True
+    return cache
+
+
+def test_cache_key_is_shared_only_when_unfiltered():
+    user = SimpleNamespace(id="u1", role="user")
+
+    assert get_model_list_cache_key(user, set(), False) == "*"
+    assert get_model_list_cache_key(user, set(), False, per_user=True).startswith("u1:")
+    assert get_model_list_cache_key(
+        user, {"g1", "g2"}, True
+    ) == get_model_list_cache_key(user, {"g2", "g1"}, True)
+
+
+def test_response_is_dropped_on_version_change_and_expiry():
+    cache = make_cache(ttl=60)
+    version = (cache.get_version(), 0)
+
+    etag = cache.set_response("*", version, b"[]")
+    assert cache.get_response("*", version) == (b"[]", etag)
+
+    cache.invalidate()
+    assert cache.get_response("*", (cache.get_version(), 0)) is None
+
+    cache.ttl = 0.01
+    version = (cache.get_version(), 0)
+    cache.set_response("*", version, b"[]")
+    time.sleep(0.02)
+    assert cache.get_response("*", version) is None
+
+
+def test_invalidation_reaches_other_replicas(wait_for, make_redis):
+    first = make_cache(make_redis())
+    second = make_cache(make_redis())
+
+    # Not cached until the listener is subscribed
+    assert second.get_version() is None
+
+    first.start_listener()
+    second.start_listener()
+    wait_for(lambda: first.get_version() is not None)
+    wait_for(lambda: second.get_version() is not None)
+
+    version = (second.get_version(), 0)
+    second.set_models(version, [{"id": "m"}])
+
+    first.invalidate()
+    wait_for(lambda: second.get_models(version) is None)
+    assert second.get_version() != version[0]
@@ -0,0 +1,115 @@
+import threading
+
+import redis
+
+from open_webui.utils.plugin_registry import PluginModuleRegistry
+
+
+def make_registry(redis=None) -> PluginModuleRegistry:
+    registry = PluginModuleRegistry(redis_key_prefix="test")
+    registry._redis = redis
+    return registry
+
+
+def test_register_marks_entry_current_until_invalidated():
+    registry = make_registry()
+
+    generation = registry.get_generation("tool", "t1")
+    registry.register("tool", "t1", "hash", generation)
+    registry.set_valves("tool", "t1", {"key": "value"}, generation)
+    assert registry.is_current("tool", "t1")
+    assert registry.get_hash("tool", "t1") == "hash"
+    assert registry.get_valves("tool", "t1") == {"key": "value"}
+
+    registry.invalidate("tool", "t1")
+    assert not registry.is_current("tool", "t1")
+    assert registry.get_valves("tool", "t1") is None
+    # The hash is kept so an unchanged module is not executed again
+    assert registry.get_hash("tool", "t1") == "hash"
+
+
+def test_load_racing_with_invalidation_is_not_current():
+    registry = make_registry()
+
+    generation = registry.get_generation("function", "f1")
+    registry.invalidate("function", "f1")
+    registry.register("function", "f1", "stale", generation)
+    registry.set_valves("function", "f1", {}, generation)
+    assert not registry.is_current("function", "f1")
+    assert registry.get_valves("function", "f1") is None
+
+    generation = registry.get_generation("function", "f1")
+    registry.invalidate()
+    registry.register("function", "f1", "stale", generation)
+    assert not registry.is_current("function", "f1")
+
+
+def test_remove_drops_the_entry():
+    registry = make_registry()
+
+    registry.register("tool", "t1", "hash", registry.get_generation("tool", "t1"))
+    registry.remove("tool", "t1")
+    assert not registry.is_current("tool", "t1")
+    assert registry.get_hash("tool", "t1") is None
+
+
+def test_invalidation_reaches_other_replicas(wait_for, make_redis):
+    first = make_registry(make_redis())
+    second = make_registry(make_redis())
+    second.start_listener()
+    wait_for(lambda: first._redis.pubsub_numsub("test:plugins:invalidate")[0][1])
+
+    second.register("tool", "t1", "hash", second.get_generation("tool", "t1"))
+    assert second.is_current("tool", "t1")
+
+    first.invalidate("tool", "t1")
+    wait_for(lambda: not second.is_current("tool", "t1"))
+
+
+class DroppingRedis:
+    """Redis client whose first subscription fails once `drop` is set"""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.drop = threading.Event()
+        self.subscriptions = 0
+
+    def pubsub(self, **kwargs):
+        pubsub = self.redis.pubsub(**kwargs)
+        self.subscriptions += 1
+        if self.subscriptions > 1:
+            return pubsub
+
+        def listen():
+            self.drop.wait(timeout=5)
+            raise redis.exceptions.ConnectionError("connection dropped")
+
+        pubsub.listen = listen
+        return pubsub
+
+    def publish(self, channel, message):
+        return self.redis.publish(channel, message)
+
+
+def test_entries_are_not_current_while_unsubscribed(wait_for, make_redis):
+    client = DroppingRedis(make_redis())
+    registry = make_registry(client)
+
+    generation = registry.get_generation("tool", "t1")
+    registry.register("tool", "t1", "hash", generation)
+    registry.set_valves("tool", "t1", {}, generation)
+    assert not registry.is_current("tool", "t1")
+    assert registry.get_valves("tool", "t1") is None
+
+    registry.start_listener()
+    wait_for(lambda: registry._subscribed)
+    registry.register("tool", "t1", "hash", registry.get_generation("tool", "t1"))
+    assert registry.is_current("tool", "t1")
+
+    client.drop.set()
+    wait_for(lambda: not registry._subscribed)
+    assert not registry.is_current("tool", "t1")
+
+    # Resubscribing drops whatever was invalidated meanwhile
+    wait_for(lambda: registry._subscribed)
+    assert not registry.is_current("tool", "t1")
@@ -0,0 +1,112 @@
+import contextvars
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from open_webui.models.groups import Groups
+from open_webui.models.users import UserModel, Users
+from open_webui.utils.principal_cache import PrincipalCache, begin_request_scope
+
+
+@pytest.fixture
+def lookups(monkeypatch):
+    calls = {"user": 0, "groups": 0}
+
+    def get_user_by_id(user_id):
+        calls["user"] += 1
+        if user_id == "missing":
+            return None
+        return UserModel(
+            id=user_id,
+            name="User",
+            email=f"{user_id}@example.com",
+            role="user",
+            profile_image_url="",
+            info={"location": "Seoul"},
+            settings={"ui": {"theme": "dark"}},
+            last_active_at=0,
+            updated_at=0,
+            created_at=0,
+        )
+
+    def get_groups_by_member_id(user_id):
+        calls["groups"] += 1
+        return [SimpleNamespace(id="g1"), SimpleNamespace(id="g2")]
+
+    monkeypatch.setattr(Users, "get_user_by_id", get_user_by_id)
+    monkeypatch.setattr(Groups, "get_groups_by_member_id", get_groups_by_member_id)
+    return calls
+
+
+def test_entries_are_reused_until_invalidated(lookups):
+    cache = PrincipalCache(ttl=60)
+
+    assert cache.get_user("u1").id == "u1"
+    assert cache.get_group_ids("u1") == {"g1", "g2"}
+    cache.get_user("u1")
+    cache.get_group_ids("u1")
+    assert lookups == {"user": 1, "groups": 1}
+
+    cache.invalidate("u1")
+    cache.get_user("u1")
+    assert lookups["user"] == 2
+
+    cache.invalidate()
+    cache.get_group_ids("u1")
+    assert lookups["groups"] == 2
+
+
+def test_entries_expire(lookups):
+    cache = PrincipalCache(ttl=0.01)
+
+    cache.get_user("u1")
+    time.sleep(0.02)
+    cache.get_user("u1")
+    assert lookups["user"] == 2
+
+
+def test_callers_get_copies(lookups):
+    cache = PrincipalCache(ttl=60)
+
+    user = cache.get_user("u1")
+    user.role = "admin"
+    assert cache.get_user("u1").role == "user"
+
+    cache.get_group_ids("u1").add("g3")
+    assert cache.get_group_ids("u1") == {"g1", "g2"}
+
+
+def test_nested_fields_are_copied(lookups):
+    cache = PrincipalCache(ttl=60)
+
+    user = cache.get_user("u1")
+    user.info["location"] = "Busan"
+    user.settings.ui["theme"] = "light"
+
+    cached = cache.get_user("u1")
+    assert cached.info == {"location": "Seoul"}
+    assert cached.settings.ui == {"theme": "dark"}
+
+
+def test_missing_users_are_not_cached(lookups):
+    cache = PrincipalCache(ttl=60)
+
+    assert cache.get_user("missing") is None
+    assert cache.get_user("missing") is None
+    assert lookups["user"] == 2
+
+
+def test_request_scope_memoizes_without_ttl(lookups):
+    cache = PrincipalCache(ttl=0)
+
+    def handle_request():
+        begin_request_scope()
+        cache.get_user("u1")
+        cache.get_user("u1")
+
+    contextvars.copy_context().run(handle_request)
+    assert lookups["user"] == 1
+
+    contextvars.copy_context().run(handle_request)
+    assert lookups["user"] == 2
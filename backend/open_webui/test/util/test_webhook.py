@@ -0,0 +1,110 @@
+import asyncio
+
+import pytest
+
+from open_webui.utils.webhook import WebhookDispatcher
+
+
+def make_dispatcher(results, **kwargs) -> tuple[WebhookDispatcher, list]:
+    """Dispatcher whose posts return `results` in order, (delivered, retryable)"""
+    dispatcher = WebhookDispatcher(**kwargs)
+    posted = []
+
+    async def post(delivery):
+        posted.append(delivery["url"])
+        return results.pop(0) if results else (True, False)
+
+    dispatcher._post = post
+    return dispatcher, posted
+
+
+async def wait_for(condition, timeout=5):
+    async def poll():
+        while not condition():
+            await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(poll(), timeout)
+
+
+@pytest.mark.asyncio
+async def test_delivers_queued_webhooks():
+    dispatcher, posted = make_dispatcher([], workers=2)
+    try:
+        for _ in range(3):
+            assert dispatcher.enqueue("Open WebUI", "http://hook", "hi", {})
+        await dispatcher._queue.join()
+        assert posted == ["http://hook"] * 3
+        assert not dispatcher.dead_letters
+    finally:
+        await dispatcher.close()
+
+
+@pytest.mark.asyncio
+async def test_retries_then_dead_letters():
+    dispatcher, posted = make_dispatcher(
+        [(False, True), (True, False), (False, True), (False, True)], max_retries=1
+    )
+    try:
+        dispatcher.enqueue("Open WebUI", "http://retry", "hi", {})
+        await wait_for(lambda: len(posted) == 2)
+        assert not dispatcher.dead_letters
+
+        dispatcher.enqueue("Open WebUI", "http://retry", "hi", {})
+        await wait_for(lambda: dispatcher.dead_letters)
+        assert len(posted) == 4
+        assert dispatcher.dead_letters[0]["reason"] == "retries exhausted"
+    finally:
+        await dispatcher.close()
+
+
+@pytest.mark.asyncio
+async def test_client_errors_are_not_retried():
+    dispatcher, posted = make_dispatcher([(False, False)])
+    try:
+        dispatcher.enqueue("Open WebUI", "http://bad", "hi", {})
+        await wait_for(lambda: dispatcher.dead_letters)
+        assert posted == ["http://bad"]
+        assert dispatcher.dead_letters[0]["reason"] == "rejected"
+    finally:
+        await dispatcher.close()
+
+
+@pytest.mark.asyncio
+async def test_circuit_opens_and_probes_after_cooldown():
+    dispatcher, posted = make_dispatcher(
+        [(False, False), (False, False)], failure_threshold=2, cooldown=0.1
+    )
+    try:
+        for _ in range(3):
+            dispatcher.enqueue("Open WebUI", "http://down", "hi", {})
+        await dispatcher._queue.join()
+        assert len(posted) == 2
+        assert [d["reason"] for d in dispatcher.dead_letters] == [
+            "rejected",
+            "rejected",
+            "circuit open",
+        ]
+
+        await asyncio.sleep(0.1)
+        dispatcher.enqueue("Open WebUI", "http://down", "hi", {})
+        await dispatcher._queue.join()
+        assert len(posted) == 3
+        assert "http://down" not in dispatcher._circuits
+    finally:
+        await dispatcher.close()
+
+
+@pytest.mark.asyncio
+async def test_full_queue_dead_letters():
+    dispatcher, posted = make_dispatcher([], workers=1, queue_size=1)
+    try:
+        dispatcher._ensure_started()
+        # Keep the worker from draining the queue
+        for task in dispatcher._tasks:
+            task.cancel()
+
+        assert dispatcher.enqueue("Open WebUI", "http://hook", "hi", {})
+        assert not dispatcher.enqueue("Open WebUI", "http://hook", "hi", {})
+        assert dispatcher.dead_letters[0]["reason"] == "queue full"
+    finally:
+        await dispatcher.close()
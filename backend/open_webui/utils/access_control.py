@@ -1,6 +1,7 @@
 from typing import Optional, Set, Union, List, Dict, Any
 from open_webui.models.users import Users, UserModel
 from open_webui.models.groups import Groups
+from open_webui.utils.principal_cache import get_user_group_ids
 
 
 from open_webui.config import DEFAULT_USER_PERMISSIONS
@@ -135,8 +136,7 @@ def has_access(
             return True
 
     if user_group_ids is None:
-        user_groups = Groups.get_groups_by_member_id(user_id)
-        user_group_ids = {group.id for group in user_groups}
+        user_group_ids = get_user_group_ids(user_id)
 
     permitted_ids = get_permitted_group_and_user_ids(type, access_control)
     if permitted_ids is None:
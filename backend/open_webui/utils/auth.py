@@ -24,6 +24,7 @@ from opentelemetry import trace
 
 from open_webui.utils.access_control import has_permission
 from open_webui.models.users import Users
+from open_webui.utils.principal_cache import PRINCIPAL_CACHE, begin_request_scope
 
 from open_webui.constants import ERROR_MESSAGES
 
@@ -285,6 +286,9 @@ async def get_current_user(
     if token is None:
         raise HTTPException(status_code=401, detail="Not authenticated")
 
+    # Resolve the user and its groups once for the rest of the request
+    begin_request_scope()
+
     # auth by api key
     if token.startswith("sk-"):
         user = get_current_user_by_api_key(request, token)
@@ -316,7 +320,7 @@ async def get_current_user(
                     detail="Invalid token",
                 )
 
-            user = Users.get_user_by_id(data["id"])
+            user = PRINCIPAL_CACHE.get_user(data["id"])
             if user is None:
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
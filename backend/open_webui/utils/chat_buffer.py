@@ -0,0 +1,160 @@
+import asyncio
+import logging
+from typing import Optional
+
+from open_webui.models.chats import Chats
+from open_webui.env import (
+    SRC_LOG_LEVELS,
+    CHAT_SAVE_FLUSH_INTERVAL,
+    CHAT_SAVE_FLUSH_MAX_UPDATES,
+)
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MODELS"])
+
+
+class ChatWriteBuffer:
+    """
+    Write-behind buffer for chat message updates produced while a response is
+    streaming. Message deltas and status entries are collected in memory per
+    chat and written to the chat_message rows once the flush interval elapses,
+    the pending update count reaches its limit, or `flush` is called at the
+    end of the stream.
+
+    Reads through the buffer see pending updates, so read-modify-write event
+    handlers (content appends, embeds, files, sources) stay consistent.
+    """
+
+    def __init__(self, flush_interval: float = 1.0, max_pending_updates: int = 100):
+        self.flush_interval = flush_interval
+        self.max_pending_updates = max_pending_updates
+
+        self._chats: dict[str, dict] = {}
+        self._flush_tasks: dict[str, asyncio.Task] = {}
+
+    def _get_entry(self, id: str) -> dict:
+        if id not in self._chats:
+            self._chats[id] = {"messages": {}, "current_id": None, "updates": 0}
+        return self._chats[id]
+
+    def _get_message_entry(self, id: str, message_id: str) -> dict:
+        messages = self._get_entry(id)["messages"]
+        if message_id not in messages:
+            messages[message_id] = {"base": None, "delta": {}, "statuses": []}
+        return messages[message_id]
+
+    async def _updated(self, id: str):
+        entry = self._chats.get(id)
+        if entry is None:
+            return
+
+        entry["updates"] += 1
+        if (
+            self.flush_interval <= 0
+            or entry["updates"] >= self.max_pending_updates
+        ):
+            await self.flush(id)
+        elif id not in self._flush_tasks:
+            self._flush_tasks[id] = asyncio.create_task(self._delayed_flush(id))
+
+    async def _delayed_flush(self, id: str):
+        try:
+            await asyncio.sleep(self.flush_interval)
+        except asyncio.CancelledError:
+            return
+
+        self._flush_tasks.pop(id, None)
+        try:
+            await self.flush(id)
+        except Exception as e:
+            log.exception(f"Error flushing buffered writes for chat {id}: {e}")
+
+    def get_message_by_id_and_message_id(
+        self, id: str, message_id: str
+    ) -> Optional[dict]:
+        entry = self._chats.get(id)
+        message_entry = entry["messages"].get(message_id) if entry else None
+
+        if message_entry is None or message_entry["base"] is None:
+            message = Chats.get_message_by_id_and_message_id(id, message_id)
+            if message is None:
+                return None
+            if message_entry is None:
+                return message
+            message_entry["base"] = message
+
+        message = {**message_entry["base"], **message_entry["delta"]}
+        if message_entry["statuses"]:
+            message["statusHistory"] = [
+                *message.get("statusHistory", []),
+                *message_entry["statuses"],
+            ]
+        return message
+
+    async def upsert_message_to_chat_by_id_and_message_id(
+        self, id: str, message_id: str, message: dict
+    ):
+        entry = self._get_entry(id)
+        message_entry = self._get_message_entry(id, message_id)
+        message_entry["delta"] = {**message_entry["delta"], **message}
+        entry["current_id"] = message_id
+
+        await self._updated(id)
+
+    async def add_message_status_to_chat_by_id_and_message_id(
+        self, id: str, message_id: str, status: dict
+    ):
+        message_entry = self._get_message_entry(id, message_id)
+        message_entry["statuses"].append(status)
+
+        await self._updated(id)
+
+    async def flush(self, id: str):
+        task = self._flush_tasks.pop(id, None)
+        if task and task is not asyncio.current_task():
+            task.cancel()
+
+        entry = self._chats.pop(id, None)
+        if not entry or not entry["messages"]:
+            return
+
+        # Write the current message last so it ends up as history.currentId
+        message_ids = sorted(
+            entry["messages"].keys(), key=lambda mid: mid == entry["current_id"]
+        )
+
+        for message_id in message_ids:
+            message_entry = entry["messages"][message_id]
+            if not message_entry["delta"]:
+                for status in message_entry["statuses"]:
+                    Chats.add_chat_message_status_by_id_and_message_id(
+                        id, message_id, status
+                    )
+                continue
+
+            message = dict(message_entry["delta"])
+            if message_entry["statuses"]:
+                if "statusHistory" not in message:
+                    existing = Chats.get_message_by_id_and_message_id(id, message_id)
+                    message["statusHistory"] = (existing or {}).get(
+                        "statusHistory", []
+                    )
+                message["statusHistory"] = [
+                    *message["statusHistory"],
+                    *message_entry["statuses"],
+                ]
+
+            Chats.upsert_chat_message_by_id_and_message_id(id, message_id, message)
+
+    async def flush_all(self):
+        for id in list(self._chats.keys()):
+            try:
+                await self.flush(id)
+            except Exception as e:
+                log.exception(f"Error flushing buffered writes for chat {id}: {e}")
+
+
+CHAT_WRITE_BUFFER = ChatWriteBuffer(
+    flush_interval=CHAT_SAVE_FLUSH_INTERVAL,
+    max_pending_updates=CHAT_SAVE_FLUSH_MAX_UPDATES,
+)
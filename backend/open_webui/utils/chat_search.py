@@ -0,0 +1,57 @@
+import re
+
+# Words are runs of letters and digits, underscores split words like other
+# punctuation so the terms survive the FTS5 and tsvector parsers unchanged
+WORD_PATTERN = re.compile(r"[^\W_]+")
+
+# Hangul, kana and CJK ideographs are written without spaces between words
+# (or with particles attached), so they are indexed as character bigrams
+CJK_PATTERN = re.compile(
+    r"([\u1100-\u11ff\u3040-\u30ff\u3130-\u318f\u3400-\u4dbf"
+    r"\u4e00-\u9fff\uac00-\ud7a3\uf900-\ufaff]+)"
+)
+
+
+def _split_word(word: str) -> list[tuple[str, bool]]:
+    return [
+        (part, bool(CJK_PATTERN.fullmatch(part)))
+        for part in CJK_PATTERN.split(word)
+        if part
+    ]
+
+
+def get_search_terms(text: str) -> list[str]:
+    """
+    Terms stored in the chat search index for a title or message. Latin
+    words are kept whole, CJK runs become overlapping bigrams plus their
+    last character, so every character starts at least one term.
+    """
+    terms = {}
+    for word in WORD_PATTERN.findall((text or "").lower()):
+        for part, is_cjk in _split_word(word):
+            if not is_cjk:
+                terms[part] = None
+                continue
+
+            for i in range(len(part) - 1):
+                terms[part[i : i + 2]] = None
+            terms[part[-1]] = None
+
+    return list(terms)
+
+
+def get_search_query_terms(search_text: str) -> list[tuple[str, bool]]:
+    """
+    (term, is_prefix) pairs that all have to match. Latin words and single
+    CJK characters match as prefixes, longer CJK runs by all their bigrams.
+    """
+    terms = {}
+    for word in WORD_PATTERN.findall((search_text or "").lower()):
+        for part, is_cjk in _split_word(word):
+            if is_cjk and len(part) > 1:
+                for i in range(len(part) - 1):
+                    terms.setdefault(part[i : i + 2], False)
+            else:
+                terms[part] = True
+
+    return list(terms.items())
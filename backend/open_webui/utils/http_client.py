@@ -0,0 +1,207 @@
+import asyncio
+import logging
+import weakref
+from typing import Optional
+from urllib.parse import urlparse
+
+import aiohttp
+
+from open_webui.env import (
+    AIOHTTP_CLIENT_TIMEOUT,
+    AIOHTTP_CLIENT_UPSTREAM_CONNECT_TIMEOUT,
+    AIOHTTP_CLIENT_UPSTREAM_KEEPALIVE_TIMEOUT,
+    AIOHTTP_CLIENT_UPSTREAM_POOL_SIZE,
+    SRC_LOG_LEVELS,
+)
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MAIN"])
+
+
+def get_origin(url: str) -> str:
+    parsed_url = urlparse(url)
+    return f"{parsed_url.scheme}://{parsed_url.netloc}".lower()
+
+
+def get_seconds(value) -> Optional[float]:
+    try:
+        return float(value) if value not in (None, "") else None
+    except (TypeError, ValueError):
+        return None
+
+
+class UpstreamSessionPool:
+    """
+    Long-lived aiohttp sessions for the OpenAI and Ollama upstreams, one per
+    base URL origin, so proxied requests reuse keep-alive connections and
+    cached DNS lookups instead of opening a new connection every time.
+
+    Each session caps its open connections at `limit` and carries the
+    default timeouts for that upstream; calls that need a shorter deadline
+    (model lists) pass their own per request. Sessions never keep cookies,
+    since they are shared by every user. A session belongs to the event
+    loop it was created on, so code running on another loop gets its own.
+
+    Once `configure` is given the app config, a connection entry in
+    OPENAI_API_CONFIGS or OLLAMA_API_CONFIGS can override the defaults with
+    `timeout` and `connect_timeout` (seconds). URLs under that base URL then
+    get a session of their own carrying those timeouts. Sessions whose
+    timeouts no longer match the config are closed once their requests end.
+    """
+
+    def __init__(
+        self,
+        limit: int = 100,
+        keepalive_timeout: float = 15,
+        timeout: Optional[int] = AIOHTTP_CLIENT_TIMEOUT,
+        connect_timeout: Optional[int] = None,
+    ):
+        self.limit = max(limit, 1)
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+
+        self._sessions: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, dict[tuple, aiohttp.ClientSession]
+        ] = weakref.WeakKeyDictionary()
+
+        self._config = None
+        self._config_version = None
+        # base url -> (timeout, connect_timeout) set by its connection config
+        self._overrides: dict[str, tuple[Optional[float], Optional[float]]] = {}
+        # Keeps the tasks closing superseded sessions referenced
+        self._closing: set[asyncio.Task] = set()
+
+    def configure(self, config):
+        """Follow the per-connection timeouts of the app config"""
+        self._config = config
+        self._config_version = None
+
+    def _refresh_overrides(self):
+        # The config version moves on every write, here or on another replica
+        version = self._config.version
+        if version == self._config_version:
+            return
+        self._config_version = version
+
+        overrides = {}
+        for base_urls, api_configs in (
+            (self._config.OPENAI_API_BASE_URLS, self._config.OPENAI_API_CONFIGS),
+            (self._config.OLLAMA_BASE_URLS, self._config.OLLAMA_API_CONFIGS),
+        ):
+            for idx, base_url in enumerate(base_urls):
+                api_config = api_configs.get(
+                    str(idx), api_configs.get(base_url, {})  # Legacy support
+                )
+                timeouts = (
+                    get_seconds(api_config.get("timeout")),
+                    get_seconds(api_config.get("connect_timeout")),
+                )
+                if timeouts != (None, None):
+                    overrides[base_url.rstrip("/")] = timeouts
+
+        if overrides != self._overrides:
+            self._overrides = overrides
+            self._retire_superseded()
+
+    def _is_current(self, key: tuple) -> bool:
+        origin, timeouts = key
+        return timeouts == (None, None) or any(
+            get_origin(base_url) == origin and override == timeouts
+            for base_url, override in self._overrides.items()
+        )
+
+    def _retire_superseded(self):
+        for loop, sessions in list(self._sessions.items()):
+            for key in [key for key in sessions if not self._is_current(key)]:
+                session = sessions.pop(key)
+                if not loop.is_closed():
+                    loop.call_soon_threadsafe(self._close_when_idle, session)
+
+    def _close_when_idle(self, session: aiohttp.ClientSession):
+        async def close():
+            # Requests still running on the session keep it open until they end
+            connector = session.connector
+            while (
+                connector is not None and not connector.closed and connector._acquired
+            ):
+                await asyncio.sleep(1)
+            await session.close()
+
+        task = asyncio.ensure_future(close())
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    def get_timeouts(self, url: str) -> tuple[Optional[float], Optional[float]]:
+        """(total, connect) timeouts for `url`, None where the default applies"""
+        if self._config is not None:
+            self._refresh_overrides()
+
+        base_url = max(
+            (base_url for base_url in self._overrides if url.startswith(base_url)),
+            key=len,
+            default=None,
+        )
+        return self._overrides[base_url] if base_url else (None, None)
+
+    def _create_session(
+        self,
+        timeout: Optional[float] = None,
+        connect_timeout: Optional[float] = None,
+    ) -> aiohttp.ClientSession:
+        return aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=300,
+            ),
+            timeout=aiohttp.ClientTimeout(
+                total=self.timeout if timeout is None else timeout,
+                sock_connect=(
+                    self.connect_timeout if connect_timeout is None else connect_timeout
+                ),
+            ),
+            cookie_jar=aiohttp.DummyCookieJar(),
+            trust_env=True,
+        )
+
+    def get_session(self, url: str) -> aiohttp.ClientSession:
+        """Session for the upstream serving `url`, must be called on a running loop"""
+        loop = asyncio.get_running_loop()
+        sessions = self._sessions.setdefault(loop, {})
+
+        timeouts = self.get_timeouts(url)
+        key = (get_origin(url), timeouts)
+        session = sessions.get(key)
+        if session is None or session.closed:
+            session = self._create_session(*timeouts)
+            sessions[key] = session
+        return session
+
+    def warm(self, urls: list[str]):
+        """Create the sessions for the configured upstreams ahead of traffic"""
+        for url in urls:
+            if url:
+                self.get_session(url)
+
+    async def close(self):
+        loop = asyncio.get_running_loop()
+        sessions = self._sessions.pop(loop, {})
+        for session in sessions.values():
+            try:
+                await session.close()
+            except Exception as e:
+                log.debug(f"Failed to close upstream session: {e}")
+
+
+UPSTREAM_SESSIONS = UpstreamSessionPool(
+    limit=AIOHTTP_CLIENT_UPSTREAM_POOL_SIZE,
+    keepalive_timeout=AIOHTTP_CLIENT_UPSTREAM_KEEPALIVE_TIMEOUT,
+    timeout=AIOHTTP_CLIENT_TIMEOUT,
+    connect_timeout=AIOHTTP_CLIENT_UPSTREAM_CONNECT_TIMEOUT,
+)
+
+
+def get_upstream_session(url: str) -> aiohttp.ClientSession:
+    return UPSTREAM_SESSIONS.get_session(url)
@@ -0,0 +1,454 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+from uuid import uuid4
+
+from fastapi import Request
+from starlette.datastructures import Headers
+
+from open_webui.config import KNOWLEDGE_REINDEX_WORKERS
+from open_webui.env import INSTANCE_ID, SRC_LOG_LEVELS
+from open_webui.models.files import Files
+from open_webui.models.knowledge import Knowledges
+from open_webui.models.knowledge_reindex import (
+    KnowledgeReindexJobModel,
+    KnowledgeReindexJobs,
+)
+from open_webui.retrieval.bm25 import BM25_INDEX
+from open_webui.retrieval.pipeline import INGESTION_PIPELINE, IngestionJob
+from open_webui.retrieval.vector.alias import ALIAS_CACHE_TTL
+from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.routers.retrieval import (
+    get_ingestion_embedding_function,
+    get_processed_file_docs,
+    prepare_docs_for_vector_db,
+)
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+
+HEARTBEAT_INTERVAL = 10
+
+# A running job whose owner has not sent a heartbeat for this long is resumed
+# by another instance
+STALE_AFTER = 60
+
+RESUME_CHECK_INTERVAL = 30
+
+# Owner recorded on claimed jobs. INSTANCE_ID can be shared by every worker
+# process of a deployment, so each process adds its own suffix
+REINDEX_OWNER = f"{INSTANCE_ID}:{uuid4().hex[:8]}"
+
+# Jobs running in this process
+_running_jobs: set[str] = set()
+
+# Keeps the background tasks referenced until they finish
+_tasks: set[asyncio.Task] = set()
+
+
+####################################
+#
+# A reindex job rebuilds every knowledge base into a shadow collection and
+# then points the knowledge base's collection alias at it, so searches keep
+# hitting the old vectors until the new ones are complete. Progress is
+# checkpointed per file in knowledge_reindex_item, per knowledge base in
+# the job's data:
+#
+#   {
+#       "knowledge": {
+#           <knowledge_id>: {
+#               "status": "pending" | "building" | "swapped" | "skipped",
+#               "collection": <shadow collection name>,
+#           },
+#       },
+#       "cleanup": [{"collection": <replaced collection>, "swapped_at": <ts>}],
+#       "run_started_at": <ts>,
+#       "run_started_done": <files done when this run started>,
+#   }
+#
+####################################
+
+
+def get_shadow_collection_name(knowledge_id: str, job_id: str) -> str:
+    return f"{knowledge_id}-{job_id[:8]}"
+
+
+def get_reindex_request(app) -> Request:
+    # Creating a mock request object to pass to the retrieval helpers
+    return Request(
+        {
+            "type": "http",
+            "asgi.version": "3.0",
+            "asgi.spec_version": "2.0",
+            "method": "POST",
+            "path": "/internal/knowledge/reindex",
+            "query_string": b"",
+            "headers": Headers({}).raw,
+            "client": ("127.0.0.1", 12345),
+            "server": ("127.0.0.1", 80),
+            "scheme": "http",
+            "app": app,
+        }
+    )
+
+
+def create_knowledge_reindex_job(user_id: str) -> KnowledgeReindexJobModel:
+    job = KnowledgeReindexJobs.get_running_job()
+    if job:
+        log.info(f"Knowledge reindex job {job.id} is already running")
+        return job
+
+    knowledge = {}
+    items = []
+    for knowledge_base in Knowledges.get_knowledge_bases():
+        knowledge[knowledge_base.id] = {"status": "pending"}
+        items.extend(
+            (knowledge_base.id, file.id)
+            for file in Knowledges.get_files_by_id(knowledge_base.id)
+        )
+
+    job = KnowledgeReindexJobs.insert_new_job(
+        user_id, {"knowledge": knowledge, "cleanup": []}, items
+    )
+    log.info(
+        f"Created knowledge reindex job {job.id} for {len(knowledge)} knowledge bases and {len(items)} files"
+    )
+    return job
+
+
+def get_knowledge_reindex_status(job: KnowledgeReindexJobModel) -> dict:
+    counts = KnowledgeReindexJobs.get_item_counts(job.id)
+    total = sum(counts.values())
+    completed = counts.get("completed", 0)
+    failed = counts.get("failed", 0)
+    done = completed + failed
+
+    data = job.data or {}
+    eta = None
+    if job.status == "running" and data.get("run_started_at"):
+        elapsed = time.time() - data["run_started_at"]
+        processed = done - data.get("run_started_done", 0)
+        if elapsed > 0 and processed > 0:
+            eta = int((total - done) / (processed / elapsed))
+
+    return {
+        "id": job.id,
+        "status": job.status,
+        "total": total,
+        "completed": completed,
+        "failed": failed,
+        "pending": counts.get("pending", 0),
+        "progress": (done / total) if total else 1.0,
+        "eta": eta,
+        "knowledge": data.get("knowledge", {}),
+        "errors": [
+            {
+                "knowledge_id": item.knowledge_id,
+                "file_id": item.file_id,
+                "error": item.error,
+            }
+            for item in KnowledgeReindexJobs.get_failed_items(job.id, limit=20)
+        ],
+        "created_at": job.created_at,
+        "updated_at": job.updated_at,
+        "completed_at": job.completed_at,
+    }
+
+
+async def _heartbeat(job_id: str, run: asyncio.Task):
+    while True:
+        await asyncio.sleep(HEARTBEAT_INTERVAL)
+        try:
+            owned = await asyncio.to_thread(
+                KnowledgeReindexJobs.heartbeat_job_by_id, job_id, REINDEX_OWNER
+            )
+        except Exception as e:
+            log.debug(f"Failed to record heartbeat of {job_id}: {e}")
+            continue
+
+        if not owned:
+            # Another instance resumed the job, stop writing to its collections
+            log.warning(f"Lost ownership of knowledge reindex job {job_id}")
+            run.cancel()
+            return
+
+
+async def _reindex_file(
+    request: Request,
+    job_id: str,
+    knowledge_id: str,
+    collection_name: str,
+    file_id: str,
+    embed,
+    semaphore: asyncio.Semaphore,
+):
+    async with semaphore:
+        file = await asyncio.to_thread(Files.get_file_by_id, file_id)
+        if file is None:
+            await asyncio.to_thread(
+                KnowledgeReindexJobs.update_item_status,
+                job_id,
+                knowledge_id,
+                file_id,
+                "failed",
+                "File not found",
+            )
+            return
+
+        try:
+            await INGESTION_PIPELINE.arun(
+                IngestionJob(
+                    collection_name,
+                    load=lambda: get_processed_file_docs(file),
+                    prepare=lambda docs: prepare_docs_for_vector_db(
+                        request,
+                        docs,
+                        collection_name,
+                        metadata={
+                            "file_id": file.id,
+                            "name": file.filename,
+                            **({"hash": file.hash} if file.hash else {}),
+                        },
+                        add=True,
+                    ),
+                    embed=embed,
+                    name=file.filename,
+                )
+            )
+            status, error = "completed", None
+        except Exception as e:
+            log.error(f"Error reindexing file {file.filename} (ID: {file.id}): {e}")
+            status, error = "failed", str(e)
+
+        await asyncio.to_thread(
+            KnowledgeReindexJobs.update_item_status,
+            job_id,
+            knowledge_id,
+            file_id,
+            status,
+            error,
+        )
+
+
+def _delete_files_from_collection(collection_name: str, file_ids: list[str]):
+    for file_id in file_ids:
+        try:
+            VECTOR_DB_CLIENT.delete(
+                collection_name=collection_name, filter={"file_id": file_id}
+            )
+            BM25_INDEX.delete(collection_name, filter={"file_id": file_id})
+        except Exception as e:
+            log.debug(f"Failed to delete {file_id} from {collection_name}: {e}")
+
+
+async def _reindex_knowledge(
+    request: Request,
+    job: KnowledgeReindexJobModel,
+    knowledge_id: str,
+    state: dict,
+    embed,
+    semaphore: asyncio.Semaphore,
+):
+    collection_name = state["collection"]
+
+    knowledge = await asyncio.to_thread(Knowledges.get_knowledge_by_id, knowledge_id)
+    if knowledge is None:
+        # Deleted while the job was running
+        if await asyncio.to_thread(
+            VECTOR_DB_CLIENT.has_collection, collection_name=collection_name
+        ):
+            await asyncio.to_thread(
+                VECTOR_DB_CLIENT.delete_collection, collection_name=collection_name
+            )
+        await asyncio.to_thread(BM25_INDEX.delete_collection, collection_name)
+        state["status"] = "skipped"
+        return
+
+    resumed = state["status"] == "building"
+    state["status"] = "building"
+    await asyncio.to_thread(
+        KnowledgeReindexJobs.update_job_by_id, job.id, data=job.data
+    )
+
+    while True:
+        file_ids = await asyncio.to_thread(
+            KnowledgeReindexJobs.get_pending_file_ids, job.id, knowledge_id
+        )
+
+        if resumed:
+            # Drop whatever an interrupted run wrote for unfinished files
+            await asyncio.to_thread(
+                _delete_files_from_collection, collection_name, file_ids
+            )
+            resumed = False
+
+        await asyncio.gather(
+            *[
+                _reindex_file(
+                    request,
+                    job.id,
+                    knowledge_id,
+                    collection_name,
+                    file_id,
+                    embed,
+                    semaphore,
+                )
+                for file_id in file_ids
+            ]
+        )
+
+        # Files added to or removed from the knowledge base while it was being
+        # rebuilt only reached the old collection
+        current = {
+            file.id
+            for file in await asyncio.to_thread(
+                Knowledges.get_files_by_id, knowledge_id
+            )
+        }
+        known = set(
+            await asyncio.to_thread(
+                KnowledgeReindexJobs.get_file_ids, job.id, knowledge_id
+            )
+        )
+
+        removed = list(known - current)
+        if removed:
+            await asyncio.to_thread(
+                _delete_files_from_collection, collection_name, removed
+            )
+            await asyncio.to_thread(
+                KnowledgeReindexJobs.delete_items, job.id, knowledge_id, removed
+            )
+
+        added = [(knowledge_id, file_id) for file_id in current - known]
+        if not added:
+            break
+        await asyncio.to_thread(KnowledgeReindexJobs.add_items, job.id, added)
+
+    # Not atomic: until the BM25 index is renamed, and on other instances until
+    # their alias cache expires, hybrid search pairs the vectors of one build
+    # with the BM25 index of the other. Both hold the same files, so results
+    # stay complete during the window.
+    previous = await asyncio.to_thread(
+        VECTOR_DB_CLIENT.swap_collection, knowledge_id, collection_name
+    )
+    await asyncio.to_thread(BM25_INDEX.rename_collection, collection_name, knowledge_id)
+    log.info(f"Swapped in {collection_name} for knowledge base {knowledge_id}")
+
+    if previous != collection_name:
+        job.data["cleanup"].append(
+            {"collection": previous, "swapped_at": int(time.time())}
+        )
+    state["status"] = "swapped"
+
+
+async def _cleanup(job: KnowledgeReindexJobModel):
+    cleanup = job.data.get("cleanup", [])
+    if not cleanup:
+        return
+
+    # Other instances resolve aliases from a short lived cache
+    wait = max(entry["swapped_at"] for entry in cleanup) + ALIAS_CACHE_TTL * 3
+    await asyncio.sleep(max(wait - time.time(), 0))
+
+    for entry in cleanup:
+        try:
+            # Bypass alias resolution, the old collection may carry the
+            # knowledge base's own name
+            await asyncio.to_thread(
+                VECTOR_DB_CLIENT.client.delete_collection, entry["collection"]
+            )
+        except Exception as e:
+            log.debug(f"Failed to delete collection {entry['collection']}: {e}")
+
+    job.data["cleanup"] = []
+
+
+async def _run_knowledge_reindex(app, job_id: str):
+    job = await asyncio.to_thread(KnowledgeReindexJobs.get_job_by_id, job_id)
+    request = get_reindex_request(app)
+
+    counts = await asyncio.to_thread(KnowledgeReindexJobs.get_item_counts, job_id)
+    job.data.setdefault("cleanup", [])
+    job.data["run_started_at"] = int(time.time())
+    job.data["run_started_done"] = counts.get("completed", 0) + counts.get("failed", 0)
+
+    embed = get_ingestion_embedding_function(request)
+    semaphore = asyncio.Semaphore(max(KNOWLEDGE_REINDEX_WORKERS, 1))
+
+    for knowledge_id, state in job.data["knowledge"].items():
+        if state["status"] in ("swapped", "skipped"):
+            continue
+
+        state.setdefault("collection", get_shadow_collection_name(knowledge_id, job_id))
+        try:
+            await _reindex_knowledge(
+                request, job, knowledge_id, state, embed, semaphore
+            )
+        except Exception as e:
+            log.exception(f"Error reindexing knowledge base {knowledge_id}: {e}")
+            state["status"] = "skipped"
+            state["error"] = str(e)
+
+        await asyncio.to_thread(
+            KnowledgeReindexJobs.update_job_by_id, job_id, data=job.data
+        )
+
+    await _cleanup(job)
+    await asyncio.to_thread(
+        KnowledgeReindexJobs.update_job_by_id,
+        job_id,
+        status="completed",
+        data=job.data,
+        completed_at=int(time.time()),
+    )
+    log.info(f"Knowledge reindex job {job_id} completed")
+
+
+async def run_knowledge_reindex(app, job_id: str):
+    if job_id in _running_jobs:
+        return
+    _running_jobs.add(job_id)
+
+    if not await asyncio.to_thread(
+        KnowledgeReindexJobs.claim_job_by_id, job_id, REINDEX_OWNER, STALE_AFTER
+    ):
+        _running_jobs.discard(job_id)
+        return
+
+    heartbeat = asyncio.create_task(_heartbeat(job_id, asyncio.current_task()))
+    try:
+        await _run_knowledge_reindex(app, job_id)
+    except Exception as e:
+        log.exception(f"Knowledge reindex job {job_id} failed: {e}")
+        await asyncio.to_thread(
+            KnowledgeReindexJobs.update_job_by_id, job_id, status="failed"
+        )
+    finally:
+        heartbeat.cancel()
+        _running_jobs.discard(job_id)
+
+
+def start_knowledge_reindex(app, job_id: str) -> asyncio.Task:
+    """Run a job in the background of this process"""
+    task = asyncio.create_task(run_knowledge_reindex(app, job_id))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+    return task
+
+
+async def periodic_knowledge_reindex_resume(app):
+    """Resume running jobs that lost their instance, e.g. after a restart"""
+    while True:
+        try:
+            job: Optional[KnowledgeReindexJobModel] = await asyncio.to_thread(
+                KnowledgeReindexJobs.get_running_job
+            )
+            if job and job.id not in _running_jobs:
+                start_knowledge_reindex(app, job.id)
+        except Exception as e:
+            log.debug(f"Failed to check for knowledge reindex jobs: {e}")
+
+        await asyncio.sleep(RESUME_CHECK_INTERVAL)
@@ -1,4 +1,8 @@
 import asyncio
+import hashlib
+import json
+import logging
+import time
 from typing import Optional
 from contextlib import AsyncExitStack
 
@@ -9,6 +13,16 @@ from mcp.client.auth import OAuthClientProvider, TokenStorage
 from mcp.client.streamable_http import streamablehttp_client
 from mcp.shared.auth import OAuthClientInformationFull, OAuthClientMetadata, OAuthToken
 
+from open_webui.env import (
+    MCP_CLIENT_HEALTH_CHECK_INTERVAL,
+    MCP_CLIENT_IDLE_TIMEOUT,
+    MCP_TOOL_SPECS_CACHE_TTL,
+    SRC_LOG_LEVELS,
+)
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MAIN"])
+
 
 class MCPClient:
     def __init__(self):
@@ -104,7 +118,10 @@ class MCPClient:
 
     async def disconnect(self):
         # Clean up and close the session
-        await self.exit_stack.aclose()
+        if self.exit_stack:
+            exit_stack, self.exit_stack = self.exit_stack, None
+            self.session = None
+            await exit_stack.aclose()
 
     async def __aenter__(self):
         await self.exit_stack.__aenter__()
@@ -113,3 +130,259 @@ class MCPClient:
     async def __aexit__(self, exc_type, exc_value, traceback):
         await self.exit_stack.__aexit__(exc_type, exc_value, traceback)
         await self.disconnect()
+
+
+class PooledMCPClient:
+    """
+    An MCPClient kept open by its own task. The transport and session
+    contexts are entered and exited on that task, so the connection can be
+    shared by requests running on other tasks and closed from any of them.
+    """
+
+    def __init__(self, key: str, url: str, headers: Optional[dict] = None):
+        self.key = key
+        self.url = url
+        self.headers = headers
+        self.client = MCPClient()
+
+        self.in_use = 0
+        self.last_used = time.monotonic()
+        self.retired = False
+
+        self._ready: Optional[asyncio.Future] = None
+        self._closing = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def closed(self) -> bool:
+        return self._task is None or self._task.done()
+
+    async def start(self):
+        self._ready = asyncio.get_running_loop().create_future()
+        self._task = asyncio.create_task(self._run())
+        await self._ready
+
+    async def _run(self):
+        try:
+            await self.client.connect(self.url, headers=self.headers)
+        except BaseException as e:
+            if not self._ready.done():
+                self._ready.set_exception(e)
+            return
+
+        self._ready.set_result(None)
+        try:
+            # The transport cancels this wait if the connection breaks
+            await self._closing.wait()
+        finally:
+            try:
+                await self.client.disconnect()
+            except BaseException as e:
+                log.debug(f"Error closing MCP client for {self.url}: {e}")
+
+    async def check_health(self, timeout: float = 5) -> bool:
+        if self.closed:
+            return False
+
+        try:
+            with anyio.fail_after(timeout):
+                await self.client.session.send_ping()
+            return True
+        except Exception as e:
+            log.debug(f"MCP health check failed for {self.url}: {e}")
+            return False
+
+    async def close(self):
+        self._closing.set()
+        if self._task and not self._task.done():
+            try:
+                await asyncio.wait_for(asyncio.shield(self._task), timeout=10)
+            except BaseException as e:
+                log.debug(f"Timed out closing MCP client for {self.url}: {e}")
+                self._task.cancel()
+
+
+class MCPClientPool:
+    """
+    Long-lived MCP client sessions shared across chat requests, keyed by
+    server and auth identity (the headers sent on connect).
+
+    A session idle for longer than `health_check_interval` is pinged before
+    it is handed out and replaced when the ping fails or its transport has
+    gone away. Sessions unused for `idle_timeout` seconds are closed. Tool
+    specs are cached per key for `tool_specs_ttl` seconds; expired specs are
+    still served while a background refresh fetches new ones.
+    """
+
+    def __init__(
+        self,
+        idle_timeout: int = 300,
+        health_check_interval: int = 30,
+        tool_specs_ttl: int = 300,
+    ):
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self.tool_specs_ttl = tool_specs_ttl
+
+        self._entries: dict[str, PooledMCPClient] = {}
+        self._clients: dict[int, PooledMCPClient] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+        # key -> (expires_at, tool_specs)
+        self._tool_specs: dict[str, tuple[float, list]] = {}
+        self._refresh_tasks: dict[str, asyncio.Task] = {}
+
+        self._reaper_task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def get_key(server_id: str, url: str, headers: Optional[dict] = None) -> str:
+        identity = hashlib.sha256(
+            json.dumps(headers or {}, sort_keys=True).encode()
+        ).hexdigest()
+        return f"{server_id}:{url}:{identity}"
+
+    async def get_client(
+        self, server_id: str, url: str, headers: Optional[dict] = None
+    ) -> MCPClient:
+        """Connected client for the server, hand it back with `release`"""
+        key = self.get_key(server_id, url, headers)
+
+        async with self._locks.setdefault(key, asyncio.Lock()):
+            entry = self._entries.get(key)
+            if entry and (
+                entry.closed
+                or (
+                    time.monotonic() - entry.last_used > self.health_check_interval
+                    and not await entry.check_health()
+                )
+            ):
+                log.info(f"Reconnecting MCP server {server_id}")
+                await self._retire(entry)
+                entry = None
+
+            if entry is None:
+                entry = PooledMCPClient(key, url, headers)
+                await entry.start()
+                self._entries[key] = entry
+                self._clients[id(entry.client)] = entry
+
+            entry.in_use += 1
+            entry.last_used = time.monotonic()
+
+        self._start_reaper()
+        return entry.client
+
+    async def release(self, client: MCPClient):
+        entry = self._clients.get(id(client))
+        if entry is None:
+            # Not pooled
+            await client.disconnect()
+            return
+
+        entry.in_use = max(entry.in_use - 1, 0)
+        entry.last_used = time.monotonic()
+
+        if entry.in_use == 0 and (entry.retired or self.idle_timeout <= 0):
+            await self._retire(entry)
+
+    async def get_tool_specs(self, client: MCPClient) -> list:
+        entry = self._clients.get(id(client))
+        if entry is None:
+            return await client.list_tool_specs()
+
+        cached = self._tool_specs.get(entry.key)
+        if cached:
+            expires_at, tool_specs = cached
+            if expires_at <= time.monotonic():
+                self._schedule_refresh(entry)
+            return tool_specs
+
+        try:
+            return await self._fetch_tool_specs(entry)
+        except Exception:
+            # Reconnect on the next request
+            entry.retired = True
+            raise
+
+    async def _fetch_tool_specs(self, entry: PooledMCPClient) -> list:
+        tool_specs = await entry.client.list_tool_specs()
+        if self.tool_specs_ttl > 0:
+            self._tool_specs[entry.key] = (
+                time.monotonic() + self.tool_specs_ttl,
+                tool_specs,
+            )
+        return tool_specs
+
+    def _schedule_refresh(self, entry: PooledMCPClient):
+        task = self._refresh_tasks.get(entry.key)
+        if task and not task.done():
+            return
+
+        async def refresh():
+            try:
+                await self._fetch_tool_specs(entry)
+            except Exception as e:
+                log.warning(f"Failed to refresh MCP tool specs for {entry.url}: {e}")
+                entry.retired = True
+            finally:
+                self._refresh_tasks.pop(entry.key, None)
+                await self.release(entry.client)
+
+        # Held like a request would, so the session is not closed under it
+        entry.in_use += 1
+        self._refresh_tasks[entry.key] = asyncio.create_task(refresh())
+
+    async def _retire(self, entry: PooledMCPClient):
+        entry.retired = True
+        if self._entries.get(entry.key) is entry:
+            del self._entries[entry.key]
+
+        if entry.in_use == 0:
+            self._clients.pop(id(entry.client), None)
+            await entry.close()
+
+    def _start_reaper(self):
+        if self._reaper_task is None or self._reaper_task.done():
+            self._reaper_task = asyncio.create_task(self._reap())
+
+    async def _reap(self):
+        interval = max(min(self.health_check_interval, 30), 1)
+        while self._entries:
+            await asyncio.sleep(interval)
+
+            now = time.monotonic()
+            for entry in list(self._entries.values()):
+                if entry.in_use == 0 and (
+                    entry.closed or now - entry.last_used > self.idle_timeout
+                ):
+                    await self._retire(entry)
+
+            for key, (expires_at, _) in list(self._tool_specs.items()):
+                if key not in self._entries and expires_at <= now:
+                    del self._tool_specs[key]
+
+            for key in list(self._locks.keys()):
+                if key not in self._entries and not self._locks[key].locked():
+                    del self._locks[key]
+
+    async def close(self):
+        if self._reaper_task:
+            self._reaper_task.cancel()
+
+        for task in list(self._refresh_tasks.values()):
+            task.cancel()
+
+        entries = list(self._clients.values())
+        self._entries.clear()
+        self._clients.clear()
+        self._tool_specs.clear()
+
+        for entry in entries:
+            await entry.close()
+
+
+MCP_CLIENT_POOL = MCPClientPool(
+    idle_timeout=MCP_CLIENT_IDLE_TIMEOUT,
+    health_check_interval=MCP_CLIENT_HEALTH_CHECK_INTERVAL,
+    tool_specs_ttl=MCP_TOOL_SPECS_CACHE_TTL,
+)
@@ -29,6 +29,7 @@ from open_webui.models.oauth_sessions import OAuthSessions
 from open_webui.models.chats import Chats
 from open_webui.models.folders import Folders
 from open_webui.models.users import Users
+from open_webui.utils.chat_buffer import CHAT_WRITE_BUFFER
 from open_webui.socket.main import (
     get_event_call,
     get_event_emitter,
@@ -99,7 +100,7 @@ from open_webui.utils.filter import (
 )
 from open_webui.utils.code_interpreter import execute_code_jupyter
 from open_webui.utils.payload import apply_system_prompt_to_body
-from open_webui.utils.mcp.client import MCPClient
+from open_webui.utils.mcp.client import MCP_CLIENT_POOL
 
 
 from open_webui.config import (
@@ -1394,8 +1395,8 @@ async def process_chat_payload(request, form_data, user, metadata, model):
                         for key, value in connection_headers.items():
                             headers[key] = value
 
-                    mcp_clients[server_id] = MCPClient()
-                    await mcp_clients[server_id].connect(
+                    mcp_clients[server_id] = await MCP_CLIENT_POOL.get_client(
+                        server_id,
                         url=mcp_server_connection.get("url", ""),
                         headers=headers if headers else None,
                     )
@@ -1407,7 +1408,9 @@ async def process_chat_payload(request, form_data, user, metadata, model):
                     if isinstance(function_name_filter_list, str):
                         function_name_filter_list = function_name_filter_list.split(",")
 
-                    tool_specs = await mcp_clients[server_id].list_tool_specs()
+                    tool_specs = await MCP_CLIENT_POOL.get_tool_specs(
+                        mcp_clients[server_id]
+                    )
                     for tool_spec in tool_specs:
 
                         def make_tool_function(client, function_name):
@@ -1676,7 +1679,7 @@ async def process_chat_response(
                             )
 
                             if not metadata.get("chat_id", "").startswith("local:"):
-                                Chats.upsert_message_to_chat_by_id_and_message_id(
+                                Chats.upsert_chat_message_by_id_and_message_id(
                                     metadata["chat_id"],
                                     metadata["message_id"],
                                     {
@@ -1846,7 +1849,7 @@ async def process_chat_response(
                         else:
                             error = str(error)
 
-                        Chats.upsert_message_to_chat_by_id_and_message_id(
+                        Chats.upsert_chat_message_by_id_and_message_id(
                             metadata["chat_id"],
                             metadata["message_id"],
                             {
@@ -1862,7 +1865,7 @@ async def process_chat_response(
                             )
 
                     if "selected_model_id" in response_data:
-                        Chats.upsert_message_to_chat_by_id_and_message_id(
+                        Chats.upsert_chat_message_by_id_and_message_id(
                             metadata["chat_id"],
                             metadata["message_id"],
                             {
@@ -1896,7 +1899,7 @@ async def process_chat_response(
                             )
 
                             # Save message in the database
-                            Chats.upsert_message_to_chat_by_id_and_message_id(
+                            Chats.upsert_chat_message_by_id_and_message_id(
                                 metadata["chat_id"],
                                 metadata["message_id"],
                                 {
@@ -2371,7 +2374,7 @@ async def process_chat_response(
 
                 return content, content_blocks, end_flag
 
-            message = Chats.get_message_by_id_and_message_id(
+            message = CHAT_WRITE_BUFFER.get_message_by_id_and_message_id(
                 metadata["chat_id"], metadata["message_id"]
             )
 
@@ -2427,7 +2430,7 @@ async def process_chat_response(
                     )
 
                     # Save message in the database
-                    Chats.upsert_message_to_chat_by_id_and_message_id(
+                    await CHAT_WRITE_BUFFER.upsert_message_to_chat_by_id_and_message_id(
                         metadata["chat_id"],
                         metadata["message_id"],
                         {
@@ -2503,7 +2506,7 @@ async def process_chat_response(
 
                                 if "selected_model_id" in data:
                                     model_id = data["selected_model_id"]
-                                    Chats.upsert_message_to_chat_by_id_and_message_id(
+                                    await CHAT_WRITE_BUFFER.upsert_message_to_chat_by_id_and_message_id(
                                         metadata["chat_id"],
                                         metadata["message_id"],
                                         {
@@ -2610,13 +2613,25 @@ async def process_chat_response(
                                         delta.get("images", []), request, metadata, user
                                     )
                                     if image_urls:
-                                        message_files = Chats.add_message_files_by_id_and_message_id(
+                                        # Through the buffer, a pending files
+                                        # delta would overwrite a direct write
+                                        current_message = (
+                                            CHAT_WRITE_BUFFER.get_message_by_id_and_message_id(
+                                                metadata["chat_id"],
+                                                metadata["message_id"],
+                                            )
+                                            or {}
+                                        )
+                                        message_files = current_message.get(
+                                            "files", []
+                                        ) + [
+                                            {"type": "image", "url": url}
+                                            for url in image_urls
+                                        ]
+                                        await CHAT_WRITE_BUFFER.upsert_message_to_chat_by_id_and_message_id(
                                             metadata["chat_id"],
                                             metadata["message_id"],
-                                            [
-                                                {"type": "image", "url": url}
-                                                for url in image_urls
-                                            ],
+                                            {"files": message_files},
                                         )
 
                                         await event_emitter(
@@ -2736,7 +2751,7 @@ async def process_chat_response(
 
                                         if ENABLE_REALTIME_CHAT_SAVE:
                                             # Save message in the database
-                                            Chats.upsert_message_to_chat_by_id_and_message_id(
+                                            await CHAT_WRITE_BUFFER.upsert_message_to_chat_by_id_and_message_id(
                                                 metadata["chat_id"],
                                                 metadata["message_id"],
                                                 {
@@ -3192,13 +3207,14 @@ async def process_chat_response(
 
                 if not ENABLE_REALTIME_CHAT_SAVE:
                     # Save message in the database
-                    Chats.upsert_message_to_chat_by_id_and_message_id(
+                    await CHAT_WRITE_BUFFER.upsert_message_to_chat_by_id_and_message_id(
                         metadata["chat_id"],
                         metadata["message_id"],
                         {
                             "content": serialize_content_blocks(content_blocks),
                         },
                     )
+                await CHAT_WRITE_BUFFER.flush(metadata["chat_id"])
 
                 # Send a webhook notification if the user is not active
                 if not Users.is_user_active(user.id):
@@ -3230,13 +3246,14 @@ async def process_chat_response(
 
                 if not ENABLE_REALTIME_CHAT_SAVE:
                     # Save message in the database
-                    Chats.upsert_message_to_chat_by_id_and_message_id(
+                    await CHAT_WRITE_BUFFER.upsert_message_to_chat_by_id_and_message_id(
                         metadata["chat_id"],
                         metadata["message_id"],
                         {
                             "content": serialize_content_blocks(content_blocks),
                         },
                     )
+                await CHAT_WRITE_BUFFER.flush(metadata["chat_id"])
 
             if response.background is not None:
                 await response.background()
@@ -0,0 +1,170 @@
+import hashlib
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Optional
+
+from open_webui.env import MODEL_LIST_CACHE_TTL, REDIS_KEY_PREFIX, SRC_LOG_LEVELS
+from open_webui.utils.redis import get_redis_client, start_invalidation_listener
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MODELS"])
+
+
+class ModelListCache:
+    """
+    Caches the `/api/models` response. The merged model list is built once
+    per version and shared, the serialized filtered list is kept per user
+    and group set along with its ETag.
+
+    Model, function and group writes bump a local version counter and, with
+    Redis, publish an invalidation so every replica bumps its own, which
+    keeps reading the version free of I/O. While the listener is not
+    subscribed the version is unknown and nothing is cached. Config writes
+    are picked up through the config version. Entries also expire after
+    `ttl` seconds so upstream model changes show up.
+    """
+
+    def __init__(self, ttl: float = 60, max_entries: int = 1000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+        self._models: Optional[tuple[tuple, float, list]] = None
+        self._responses: OrderedDict[str, tuple[tuple, float, bytes, str]] = (
+            OrderedDict()
+        )
+        self._version = 0
+        self._lock = threading.Lock()
+
+        self._redis = None
+        self._redis_checked = False
+        self._channel = f"{REDIS_KEY_PREFIX}:models:list:invalidate"
+        self._instance_id = str(uuid.uuid4())
+        self._listener: Optional[threading.Thread] = None
+        self._subscribed = False
+
+    def _get_redis(self):
+        if not self._redis_checked:
+            self._redis = get_redis_client()
+            self._redis_checked = True
+        return self._redis
+
+    def start_listener(self):
+        """Subscribe to invalidations from other replicas, needs Redis"""
+        if self._listener is not None:
+            return
+
+        redis = self._get_redis()
+        if redis is None:
+            return
+
+        self._listener = start_invalidation_listener(
+            redis,
+            self._channel,
+            on_message=self._handle_invalidation,
+            on_subscribe=self._on_subscribe,
+            on_disconnect=self._on_disconnect,
+            name="model-list-invalidation-listener",
+        )
+
+    def _on_subscribe(self):
+        # Invalidations published while unsubscribed were missed
+        self._invalidate_local()
+        self._subscribed = True
+
+    def _on_disconnect(self):
+        self._subscribed = False
+
+    def _handle_invalidation(self, data: str):
+        if data != self._instance_id:
+            self._invalidate_local()
+
+    def get_version(self) -> Optional[int]:
+        """Current model list version, None when it is not known"""
+        if self._get_redis() and not self._subscribed:
+            return None
+        return self._version
+
+    def _invalidate_local(self):
+        with self._lock:
+            self._version += 1
+            self._models = None
+            self._responses.clear()
+
+    def invalidate(self):
+        self._invalidate_local()
+
+        redis = self._get_redis()
+        if redis:
+            try:
+                redis.publish(self._channel, self._instance_id)
+            except Exception as e:
+                log.warning(f"Failed to publish model list invalidation: {e}")
+
+    def get_models(self, version: tuple) -> Optional[list]:
+        with self._lock:
+            if self._models is None:
+                return None
+
+            entry_version, expires_at, models = self._models
+            if entry_version != version or expires_at <= time.monotonic():
+                self._models = None
+                return None
+            return models
+
+    def set_models(self, version: tuple, models: list):
+        if self.ttl <= 0:
+            return
+
+        with self._lock:
+            self._models = (version, time.monotonic() + self.ttl, models)
+
+    def get_response(self, key: str, version: tuple) -> Optional[tuple[bytes, str]]:
+        """(body, etag) cached for `key` at `version`"""
+        with self._lock:
+            entry = self._responses.get(key)
+            if entry is None:
+                return None
+
+            entry_version, expires_at, body, etag = entry
+            if entry_version != version or expires_at <= time.monotonic():
+                del self._responses[key]
+                return None
+
+            self._responses.move_to_end(key)
+            return body, etag
+
+    def set_response(self, key: str, version: tuple, body: bytes) -> str:
+        etag = f'W/"{hashlib.sha1(body).hexdigest()}"'
+        if self.ttl <= 0:
+            return etag
+
+        with self._lock:
+            self._responses[key] = (version, time.monotonic() + self.ttl, body, etag)
+            self._responses.move_to_end(key)
+            while len(self._responses) > self.max_entries:
+                self._responses.popitem(last=False)
+        return etag
+
+
+MODEL_LIST_CACHE = ModelListCache(ttl=MODEL_LIST_CACHE_TTL)
+
+
+def get_model_list_cache_key(
+    user, group_ids: set[str], filtered: bool, per_user: bool = False
+) -> str:
+    """
+    Response cache key. Unfiltered users share one entry unless `per_user`
+    is set, for upstreams that list models based on the forwarded user.
+    """
+    if not filtered and not per_user:
+        return "*"
+
+    group_hash = hashlib.sha1(",".join(sorted(group_ids)).encode()).hexdigest()
+    return f"{user.id}:{user.role}:{group_hash}"
+
+
+def invalidate_model_list_cache():
+    MODEL_LIST_CACHE.invalidate()
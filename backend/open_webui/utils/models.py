@@ -13,7 +13,7 @@ from open_webui.functions import get_function_models
 
 from open_webui.models.functions import Functions
 from open_webui.models.models import Models
-from open_webui.models.groups import Groups
+from open_webui.utils.principal_cache import get_user_group_ids
 
 
 from open_webui.utils.plugin import (
@@ -361,14 +361,18 @@ def check_model_access(user, model):
             raise Exception("Model not found")
 
 
-def get_filtered_models(models, user):
-    # Filter out models that the user does not have access to
-    if (
+def is_model_access_filtered(user) -> bool:
+    return (
         user.role == "user"
         or (user.role == "admin" and not BYPASS_ADMIN_ACCESS_CONTROL)
-    ) and not BYPASS_MODEL_ACCESS_CONTROL:
+    ) and not BYPASS_MODEL_ACCESS_CONTROL
+
+
+def get_filtered_models(models, user):
+    # Filter out models that the user does not have access to
+    if is_model_access_filtered(user):
         filtered_models = []
-        user_group_ids = {group.id for group in Groups.get_groups_by_member_id(user.id)}
+        user_group_ids = get_user_group_ids(user.id)
         for model in models:
             if model.get("arena"):
                 if has_access(
@@ -1,3 +1,4 @@
+import hashlib
 import os
 import re
 import subprocess
@@ -10,6 +11,7 @@ import logging
 from open_webui.env import SRC_LOG_LEVELS, PIP_OPTIONS, PIP_PACKAGE_INDEX_OPTIONS
 from open_webui.models.functions import Functions
 from open_webui.models.tools import Tools
+from open_webui.utils.plugin_registry import PLUGIN_MODULES
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MAIN"])
@@ -166,104 +168,115 @@ def load_function_module_by_id(function_id: str, content: str | None = None):
         os.unlink(temp_file.name)
 
 
-def get_tool_module_from_cache(request, tool_id, load_from_db=True):
-    if load_from_db:
-        # Always load from the database by default
-        tool = Tools.get_tool_by_id(tool_id)
-        if not tool:
-            raise Exception(f"Tool not found: {tool_id}")
-        content = tool.content
+def get_content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
 
-        new_content = replace_imports(content)
-        if new_content != content:
-            content = new_content
-            # Update the tool content in the database
-            Tools.update_tool_by_id(tool_id, {"content": content})
-
-        if (
-            hasattr(request.app.state, "TOOL_CONTENTS")
-            and tool_id in request.app.state.TOOL_CONTENTS
-        ) and (
-            hasattr(request.app.state, "TOOLS") and tool_id in request.app.state.TOOLS
-        ):
-            if request.app.state.TOOL_CONTENTS[tool_id] == content:
-                return request.app.state.TOOLS[tool_id], None
-
-        tool_module, frontmatter = load_tool_module_by_id(tool_id, content)
-    else:
-        if hasattr(request.app.state, "TOOLS") and tool_id in request.app.state.TOOLS:
-            return request.app.state.TOOLS[tool_id], None
-
-        tool_module, frontmatter = load_tool_module_by_id(tool_id)
 
+def get_tool_module_from_cache(request, tool_id, load_from_db=True):
     if not hasattr(request.app.state, "TOOLS"):
         request.app.state.TOOLS = {}
 
-    if not hasattr(request.app.state, "TOOL_CONTENTS"):
-        request.app.state.TOOL_CONTENTS = {}
+    # Modules still matching their row are used without reading it
+    if tool_id in request.app.state.TOOLS and (
+        not load_from_db or PLUGIN_MODULES.is_current("tool", tool_id)
+    ):
+        return request.app.state.TOOLS[tool_id], None
 
-    request.app.state.TOOLS[tool_id] = tool_module
-    request.app.state.TOOL_CONTENTS[tool_id] = content
+    generation = PLUGIN_MODULES.get_generation("tool", tool_id)
 
-    return tool_module, frontmatter
+    tool = Tools.get_tool_by_id(tool_id)
+    if not tool:
+        raise Exception(f"Tool not found: {tool_id}")
+    content = tool.content
 
+    new_content = replace_imports(content)
+    if new_content != content:
+        content = new_content
+        # Update the tool content in the database
+        Tools.update_tool_by_id(tool_id, {"content": content})
+        generation = PLUGIN_MODULES.get_generation("tool", tool_id)
 
-def get_function_module_from_cache(request, function_id, load_from_db=True):
-    if load_from_db:
-        # Always load from the database by default
-        # This is useful for hooks like "inlet" or "outlet" where the content might change
-        # and we want to ensure the latest content is used.
+    content_hash = get_content_hash(content)
+    if (
+        tool_id in request.app.state.TOOLS
+        and PLUGIN_MODULES.get_hash("tool", tool_id) == content_hash
+    ):
+        PLUGIN_MODULES.register("tool", tool_id, content_hash, generation)
+        return request.app.state.TOOLS[tool_id], None
 
-        function = Functions.get_function_by_id(function_id)
-        if not function:
-            raise Exception(f"Function not found: {function_id}")
-        content = function.content
+    tool_module, frontmatter = load_tool_module_by_id(tool_id, content)
 
-        new_content = replace_imports(content)
-        if new_content != content:
-            content = new_content
-            # Update the function content in the database
-            Functions.update_function_by_id(function_id, {"content": content})
-
-        if (
-            hasattr(request.app.state, "FUNCTION_CONTENTS")
-            and function_id in request.app.state.FUNCTION_CONTENTS
-        ) and (
-            hasattr(request.app.state, "FUNCTIONS")
-            and function_id in request.app.state.FUNCTIONS
-        ):
-            if request.app.state.FUNCTION_CONTENTS[function_id] == content:
-                return request.app.state.FUNCTIONS[function_id], None, None
-
-        function_module, function_type, frontmatter = load_function_module_by_id(
-            function_id, content
-        )
-    else:
-        # Load from cache (e.g. "stream" hook)
-        # This is useful for performance reasons
+    request.app.state.TOOLS[tool_id] = tool_module
+    PLUGIN_MODULES.register("tool", tool_id, content_hash, generation)
 
-        if (
-            hasattr(request.app.state, "FUNCTIONS")
-            and function_id in request.app.state.FUNCTIONS
-        ):
-            return request.app.state.FUNCTIONS[function_id], None, None
+    return tool_module, frontmatter
 
-        function_module, function_type, frontmatter = load_function_module_by_id(
-            function_id
-        )
 
+def get_function_module_from_cache(request, function_id, load_from_db=True):
     if not hasattr(request.app.state, "FUNCTIONS"):
         request.app.state.FUNCTIONS = {}
 
-    if not hasattr(request.app.state, "FUNCTION_CONTENTS"):
-        request.app.state.FUNCTION_CONTENTS = {}
+    # Hooks like "inlet" or "outlet" need the latest content, which the
+    # registry vouches for until the function is written to. The "stream"
+    # hook takes whatever module is loaded.
+    if function_id in request.app.state.FUNCTIONS and (
+        not load_from_db or PLUGIN_MODULES.is_current("function", function_id)
+    ):
+        return request.app.state.FUNCTIONS[function_id], None, None
+
+    generation = PLUGIN_MODULES.get_generation("function", function_id)
+
+    function = Functions.get_function_by_id(function_id)
+    if not function:
+        raise Exception(f"Function not found: {function_id}")
+    content = function.content
+
+    new_content = replace_imports(content)
+    if new_content != content:
+        content = new_content
+        # Update the function content in the database
+        Functions.update_function_by_id(function_id, {"content": content})
+        generation = PLUGIN_MODULES.get_generation("function", function_id)
+
+    content_hash = get_content_hash(content)
+    if (
+        function_id in request.app.state.FUNCTIONS
+        and PLUGIN_MODULES.get_hash("function", function_id) == content_hash
+    ):
+        PLUGIN_MODULES.register("function", function_id, content_hash, generation)
+        return request.app.state.FUNCTIONS[function_id], None, None
+
+    function_module, function_type, frontmatter = load_function_module_by_id(
+        function_id, content
+    )
 
     request.app.state.FUNCTIONS[function_id] = function_module
-    request.app.state.FUNCTION_CONTENTS[function_id] = content
+    PLUGIN_MODULES.register("function", function_id, content_hash, generation)
 
     return function_module, function_type, frontmatter
 
 
+def register_loaded_module(kind: str, id: str, content: str):
+    """Mark a module just loaded from `content` and written to its row as current"""
+    PLUGIN_MODULES.register(
+        kind, id, get_content_hash(content), PLUGIN_MODULES.get_generation(kind, id)
+    )
+
+
+def unregister_module(kind: str, id: str):
+    PLUGIN_MODULES.remove(kind, id)
+
+
+def get_function_valves(function_id: str) -> dict:
+    """Function valves, read from the database only after they change"""
+    valves = PLUGIN_MODULES.get_valves("function", function_id)
+    if valves is None:
+        generation = PLUGIN_MODULES.get_generation("function", function_id)
+        valves = Functions.get_function_valves_by_id(function_id) or {}
+        PLUGIN_MODULES.set_valves("function", function_id, valves, generation)
+    return valves
+
+
 def install_frontmatter_requirements(requirements: str):
     if requirements:
         try:
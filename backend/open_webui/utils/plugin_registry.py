@@ -0,0 +1,156 @@
+import json
+import logging
+import threading
+import uuid
+from typing import Any, Optional
+
+from open_webui.env import REDIS_KEY_PREFIX, SRC_LOG_LEVELS
+from open_webui.utils.redis import get_redis_client, start_invalidation_listener
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MAIN"])
+
+
+class PluginModuleRegistry:
+    """
+    Tracks whether the tool and function modules held in memory still match
+    their database rows, so callers can use them without reading the row.
+
+    Each entry remembers the content hash its module was loaded from and the
+    valves last read for it. Writes to a tool or function invalidate its
+    entry; with Redis the invalidation is also published to the other
+    replicas. An invalidated entry is checked against the row again on next
+    use and only re-executed if the content hash changed.
+    """
+
+    def __init__(self, redis_key_prefix: str = REDIS_KEY_PREFIX):
+        self._channel = f"{redis_key_prefix}:plugins:invalidate"
+        self._instance_id = str(uuid.uuid4())
+
+        # (kind, id) -> content hash of the loaded module
+        self._hashes: dict[tuple[str, str], str] = {}
+        # (kind, id) -> valves
+        self._valves: dict[tuple[str, str], dict] = {}
+        # Entries known to match their row
+        self._current: set[tuple[str, str]] = set()
+        # Bumped on every invalidation of an entry (or of all of them), so a
+        # load racing with one is not marked current
+        self._generations: dict[tuple[str, str], int] = {}
+        self._epoch = 0
+
+        self._lock = threading.Lock()
+        self._redis = None
+        self._listener: Optional[threading.Thread] = None
+        self._subscribed = False
+
+    def start_listener(self):
+        """Subscribe to invalidations from other replicas, needs Redis"""
+        if self._listener is not None:
+            return
+
+        redis = self._get_redis()
+        if redis is None:
+            return
+
+        self._listener = start_invalidation_listener(
+            redis,
+            self._channel,
+            on_message=self._handle_invalidation,
+            on_subscribe=self._on_subscribe,
+            on_disconnect=self._on_disconnect,
+            name="plugin-invalidation-listener",
+        )
+
+    def _get_redis(self):
+        if self._redis is None:
+            self._redis = get_redis_client()
+        return self._redis
+
+    def _on_subscribe(self):
+        # Invalidations published while unsubscribed were missed
+        self._invalidate_local(None, None)
+        self._subscribed = True
+
+    def _on_disconnect(self):
+        self._subscribed = False
+
+    def _handle_invalidation(self, data: str):
+        try:
+            invalidation = json.loads(data)
+        except json.JSONDecodeError:
+            log.error(f"Invalid plugin invalidation message: {data}")
+            return
+
+        if invalidation.get("instance_id") != self._instance_id:
+            self._invalidate_local(invalidation.get("kind"), invalidation.get("id"))
+
+    def _invalidate_local(self, kind: Optional[str], id: Optional[str]):
+        with self._lock:
+            if kind is None:
+                self._epoch += 1
+                self._current.clear()
+                self._valves.clear()
+            else:
+                key = (kind, id)
+                self._current.discard(key)
+                self._valves.pop(key, None)
+                self._generations[key] = self._generations.get(key, 0) + 1
+
+    def invalidate(self, kind: Optional[str] = None, id: Optional[str] = None):
+        """Invalidate one entry, or every entry when no kind is given"""
+        self._invalidate_local(kind, id)
+
+        redis = self._get_redis()
+        if redis:
+            try:
+                redis.publish(
+                    self._channel,
+                    json.dumps(
+                        {"kind": kind, "id": id, "instance_id": self._instance_id}
+                    ),
+                )
+            except Exception as e:
+                log.warning(f"Failed to publish plugin invalidation: {e}")
+
+    def get_generation(self, kind: str, id: str) -> tuple[int, int]:
+        """Token to pass to `register` after reading the row"""
+        with self._lock:
+            return self._generations.get((kind, id), 0), self._epoch
+
+    def _is_connected(self) -> bool:
+        # With Redis, entries are only known to be current while subscribed
+        return self._redis is None or self._subscribed
+
+    def is_current(self, kind: str, id: str) -> bool:
+        return self._is_connected() and (kind, id) in self._current
+
+    def get_hash(self, kind: str, id: str) -> Optional[str]:
+        return self._hashes.get((kind, id))
+
+    def register(self, kind: str, id: str, content_hash: str, generation: tuple):
+        key = (kind, id)
+        with self._lock:
+            self._hashes[key] = content_hash
+            if generation == (self._generations.get(key, 0), self._epoch):
+                self._current.add(key)
+
+    def get_valves(self, kind: str, id: str) -> Optional[dict]:
+        if not self._is_connected():
+            return None
+        return self._valves.get((kind, id))
+
+    def set_valves(self, kind: str, id: str, valves: Any, generation: tuple):
+        key = (kind, id)
+        with self._lock:
+            if generation == (self._generations.get(key, 0), self._epoch):
+                self._valves[key] = valves
+
+    def remove(self, kind: str, id: str):
+        with self._lock:
+            key = (kind, id)
+            self._hashes.pop(key, None)
+            self._valves.pop(key, None)
+            self._current.discard(key)
+
+
+PLUGIN_MODULES = PluginModuleRegistry()
@@ -0,0 +1,106 @@
+import threading
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from open_webui.env import PRINCIPAL_CACHE_TTL
+
+
+# Principals already resolved during the current request, keyed by user id
+_request_principals: ContextVar[Optional[dict]] = ContextVar(
+    "request_principals", default=None
+)
+
+
+class Principal:
+    def __init__(self, user=None, group_ids: Optional[frozenset[str]] = None):
+        self.user = user
+        self.group_ids = group_ids
+
+
+class PrincipalCache:
+    """
+    Caches the user row and group id set that authentication and access
+    checks resolve for every request. Entries live for `ttl` seconds and are
+    dropped explicitly whenever a user or a group membership changes. With
+    several workers, other processes only pick up a change once their entry
+    expires, so the TTL bounds how stale a role or membership can be.
+    """
+
+    def __init__(self, ttl: float = 5):
+        self.ttl = ttl
+        self._entries: dict[str, tuple[float, Principal]] = {}
+        self._lock = threading.Lock()
+
+    def _get_entry(self, user_id: str) -> Principal:
+        principals = _request_principals.get()
+        if principals is not None and user_id in principals:
+            return principals[user_id]
+
+        principal = None
+        if self.ttl > 0:
+            with self._lock:
+                entry = self._entries.get(user_id)
+                if entry is not None and entry[0] > time.monotonic():
+                    principal = entry[1]
+
+        if principal is None:
+            principal = Principal()
+            if self.ttl > 0:
+                with self._lock:
+                    self._entries[user_id] = (time.monotonic() + self.ttl, principal)
+
+        if principals is not None:
+            principals[user_id] = principal
+        return principal
+
+    def get_user(self, user_id: str):
+        from open_webui.models.users import Users
+
+        principal = self._get_entry(user_id)
+        if principal.user is None:
+            principal.user = Users.get_user_by_id(user_id)
+            if principal.user is None:
+                self.invalidate(user_id)
+                return None
+
+        # Callers get their own copy, the cached row is shared between requests
+        return principal.user.model_copy(deep=True)
+
+    def get_group_ids(self, user_id: str) -> set[str]:
+        from open_webui.models.groups import Groups
+
+        principal = self._get_entry(user_id)
+        if principal.group_ids is None:
+            principal.group_ids = frozenset(
+                group.id for group in Groups.get_groups_by_member_id(user_id)
+            )
+        return set(principal.group_ids)
+
+    def invalidate(self, user_id: Optional[str] = None):
+        """Drop one user, or everyone when no user id is given"""
+        with self._lock:
+            if user_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(user_id, None)
+
+        principals = _request_principals.get()
+        if principals is not None:
+            if user_id is None:
+                principals.clear()
+            else:
+                principals.pop(user_id, None)
+
+
+PRINCIPAL_CACHE = PrincipalCache(ttl=PRINCIPAL_CACHE_TTL)
+
+
+def begin_request_scope():
+    """Start memoizing principals for the current request"""
+    if _request_principals.get() is None:
+        _request_principals.set({})
+
+
+def get_user_group_ids(user_id: str) -> set[str]:
+    return PRINCIPAL_CACHE.get_group_ids(user_id)
@@ -1,4 +1,7 @@
 import inspect
+import threading
+import time
+from typing import Callable, Optional
 from urllib.parse import urlparse
 
 import logging
@@ -228,3 +231,46 @@ def get_sentinel_url_from_env(redis_url, sentinel_hosts_env, sentinel_port_env):
         f"{host}:{sentinel_port_env}" for host in sentinel_hosts_env.split(",")
     )
     return f"redis+sentinel://{auth_part}{hosts_part}/{redis_config['db']}/{redis_config['service']}"
+
+
+def start_invalidation_listener(
+    redis_client,
+    channel: str,
+    on_message: Callable[[str], None],
+    on_subscribe: Callable[[], None],
+    on_disconnect: Optional[Callable[[], None]] = None,
+    name: str = "invalidation-listener",
+) -> threading.Thread:
+    """
+    Pass every message published on `channel` to `on_message` from a daemon
+    thread, resubscribing after errors. Messages published while
+    unsubscribed are missed, so `on_subscribe` runs on every (re)subscribe to
+    drop whatever could have been invalidated meanwhile, and `on_disconnect`
+    when the subscription is lost.
+    """
+
+    def listen():
+        while True:
+            pubsub = None
+            try:
+                pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(channel)
+                on_subscribe()
+
+                for message in pubsub.listen():
+                    if message and message.get("type") == "message":
+                        on_message(message["data"])
+            except Exception as e:
+                log.warning(f"Listener on {channel} disconnected: {e}")
+                if on_disconnect:
+                    on_disconnect()
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
+                time.sleep(1)
+
+    thread = threading.Thread(target=listen, name=name, daemon=True)
+    thread.start()
+    return thread
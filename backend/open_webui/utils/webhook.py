@@ -1,54 +1,71 @@
+import asyncio
 import json
 import logging
+import time
+from collections import deque
+from typing import Optional
+
 import aiohttp
 
 from open_webui.config import WEBUI_FAVICON_URL
-from open_webui.env import SRC_LOG_LEVELS, VERSION
+from open_webui.env import (
+    SRC_LOG_LEVELS,
+    VERSION,
+    WEBHOOK_CIRCUIT_BREAKER_COOLDOWN,
+    WEBHOOK_CIRCUIT_BREAKER_THRESHOLD,
+    WEBHOOK_DISPATCH_MAX_RETRIES,
+    WEBHOOK_DISPATCH_QUEUE_SIZE,
+    WEBHOOK_DISPATCH_WORKERS,
+)
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["WEBHOOK"])
 
 
+def get_webhook_payload(name: str, url: str, message: str, event_data: dict) -> dict:
+    payload = {}
+
+    # Slack and Google Chat Webhooks
+    if "https://hooks.slack.com" in url or "https://chat.googleapis.com" in url:
+        payload["text"] = message
+    # Discord Webhooks
+    elif "https://discord.com/api/webhooks" in url:
+        payload["content"] = (
+            message if len(message) < 2000 else f"{message[: 2000 - 20]}... (truncated)"
+        )
+    # Microsoft Teams Webhooks
+    elif "webhook.office.com" in url:
+        action = event_data.get("action", "undefined")
+        facts = [
+            {"name": name, "value": value}
+            for name, value in json.loads(event_data.get("user", {})).items()
+        ]
+        payload = {
+            "@type": "MessageCard",
+            "@context": "http://schema.org/extensions",
+            "themeColor": "0076D7",
+            "summary": message,
+            "sections": [
+                {
+                    "activityTitle": message,
+                    "activitySubtitle": f"{name} ({VERSION}) - {action}",
+                    "activityImage": WEBUI_FAVICON_URL,
+                    "facts": facts,
+                    "markdown": True,
+                }
+            ],
+        }
+    # Default Payload
+    else:
+        payload = {**event_data}
+
+    return payload
+
+
 async def post_webhook(name: str, url: str, message: str, event_data: dict) -> bool:
     try:
         log.debug(f"post_webhook: {url}, {message}, {event_data}")
-        payload = {}
-
-        # Slack and Google Chat Webhooks
-        if "https://hooks.slack.com" in url or "https://chat.googleapis.com" in url:
-            payload["text"] = message
-        # Discord Webhooks
-        elif "https://discord.com/api/webhooks" in url:
-            payload["content"] = (
-                message
-                if len(message) < 2000
-                else f"{message[: 2000 - 20]}... (truncated)"
-            )
-        # Microsoft Teams Webhooks
-        elif "webhook.office.com" in url:
-            action = event_data.get("action", "undefined")
-            facts = [
-                {"name": name, "value": value}
-                for name, value in json.loads(event_data.get("user", {})).items()
-            ]
-            payload = {
-                "@type": "MessageCard",
-                "@context": "http://schema.org/extensions",
-                "themeColor": "0076D7",
-                "summary": message,
-                "sections": [
-                    {
-                        "activityTitle": message,
-                        "activitySubtitle": f"{name} ({VERSION}) - {action}",
-                        "activityImage": WEBUI_FAVICON_URL,
-                        "facts": facts,
-                        "markdown": True,
-                    }
-                ],
-            }
-        # Default Payload
-        else:
-            payload = {**event_data}
+        payload = get_webhook_payload(name, url, message, event_data)
 
         log.debug(f"payload: {payload}")
         async with aiohttp.ClientSession(trust_env=True) as session:
@@ -61,3 +78,192 @@ async def post_webhook(name: str, url: str, message: str, event_data: dict) -> b
     except Exception as e:
         log.exception(e)
         return False
+
+
+class WebhookDispatcher:
+    """
+    Delivers webhooks in the background so senders only enqueue them.
+
+    A fixed number of workers post the queued deliveries over one shared
+    session. Failed deliveries are retried with exponential backoff and
+    dead-lettered once `max_retries` is used up, or right away for client
+    errors that a retry will not fix. Each webhook URL has a circuit
+    breaker: after `failure_threshold` consecutive failures its deliveries
+    are dead-lettered without being sent until `cooldown` seconds pass,
+    then a single delivery is let through to probe it.
+    """
+
+    def __init__(
+        self,
+        workers: int = 10,
+        queue_size: int = 10000,
+        max_retries: int = 3,
+        failure_threshold: int = 5,
+        cooldown: float = 60,
+        timeout: float = 10,
+        dead_letter_size: int = 1000,
+    ):
+        self.workers = max(workers, 1)
+        self.queue_size = queue_size
+        self.max_retries = max_retries
+        self.failure_threshold = max(failure_threshold, 1)
+        self.cooldown = cooldown
+        self.timeout = timeout
+
+        # Most recent deliveries that could not be made
+        self.dead_letters: deque[dict] = deque(maxlen=dead_letter_size)
+
+        # url -> {"failures": int, "opened_at": Optional[float], "probing": bool}
+        self._circuits: dict[str, dict] = {}
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: list[asyncio.Task] = []
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _ensure_started(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize=max(self.queue_size, 0))
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.workers),
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            cookie_jar=aiohttp.DummyCookieJar(),
+            trust_env=True,
+        )
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    def enqueue(self, name: str, url: str, message: str, event_data: dict) -> bool:
+        """Queue a webhook, must be called on a running loop"""
+        self._ensure_started()
+
+        try:
+            payload = get_webhook_payload(name, url, message, event_data)
+        except Exception as e:
+            log.exception(f"Failed to build webhook payload for {url}: {e}")
+            return False
+
+        delivery = {"url": url, "payload": payload, "attempt": 0}
+
+        try:
+            self._queue.put_nowait(delivery)
+            return True
+        except asyncio.QueueFull:
+            self._dead_letter(delivery, "queue full")
+            return False
+
+    def _dead_letter(self, delivery: dict, reason: str):
+        log.warning(
+            f"Dropping webhook to {delivery['url']} after "
+            f"{delivery['attempt']} attempt(s): {reason}"
+        )
+        self.dead_letters.append({**delivery, "reason": reason, "at": time.time()})
+
+    def _allow(self, url: str) -> bool:
+        circuit = self._circuits.get(url)
+        if circuit is None or circuit["opened_at"] is None:
+            return True
+
+        if circuit["probing"]:
+            return False
+
+        if time.monotonic() - circuit["opened_at"] >= self.cooldown:
+            circuit["probing"] = True
+            return True
+        return False
+
+    def _record(self, url: str, success: bool):
+        if success:
+            self._circuits.pop(url, None)
+            return
+
+        circuit = self._circuits.setdefault(
+            url, {"failures": 0, "opened_at": None, "probing": False}
+        )
+        circuit["failures"] += 1
+        circuit["probing"] = False
+        if circuit["failures"] >= self.failure_threshold:
+            if circuit["opened_at"] is None:
+                log.warning(f"Webhook circuit opened for {url}")
+            circuit["opened_at"] = time.monotonic()
+
+    async def _post(self, delivery: dict) -> tuple[bool, bool]:
+        """(delivered, retryable)"""
+        try:
+            async with self._session.post(
+                delivery["url"], json=delivery["payload"]
+            ) as r:
+                await r.read()
+                if r.status < 400:
+                    return True, False
+                log.debug(f"Webhook to {delivery['url']} returned {r.status}")
+                return False, r.status >= 500 or r.status in (408, 429)
+        except Exception as e:
+            log.debug(f"Webhook to {delivery['url']} failed: {e}")
+            return False, True
+
+    def _retry_later(self, delivery: dict):
+        if self._queue is None:
+            self._dead_letter(delivery, "dispatcher closed")
+            return
+
+        try:
+            self._queue.put_nowait(delivery)
+        except asyncio.QueueFull:
+            self._dead_letter(delivery, "queue full")
+
+    async def _deliver(self, delivery: dict):
+        url = delivery["url"]
+        if not self._allow(url):
+            self._dead_letter(delivery, "circuit open")
+            return
+
+        delivery["attempt"] += 1
+        delivered, retryable = await self._post(delivery)
+        self._record(url, delivered)
+        if delivered:
+            return
+
+        if not retryable:
+            self._dead_letter(delivery, "rejected")
+        elif delivery["attempt"] > self.max_retries:
+            self._dead_letter(delivery, "retries exhausted")
+        else:
+            # Requeue after a backoff instead of holding the worker
+            delay = min(2 ** (delivery["attempt"] - 1), 30)
+            self._loop.call_later(delay, self._retry_later, delivery)
+
+    async def _worker(self):
+        while True:
+            delivery = await self._queue.get()
+            try:
+                await self._deliver(delivery)
+            except Exception as e:
+                log.exception(f"Webhook delivery failed: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def close(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+        self._loop = None
+        self._queue = None
+
+
+WEBHOOK_DISPATCHER = WebhookDispatcher(
+    workers=WEBHOOK_DISPATCH_WORKERS,
+    queue_size=WEBHOOK_DISPATCH_QUEUE_SIZE,
+    max_retries=WEBHOOK_DISPATCH_MAX_RETRIES,
+    failure_threshold=WEBHOOK_CIRCUIT_BREAKER_THRESHOLD,
+    cooldown=WEBHOOK_CIRCUIT_BREAKER_COOLDOWN,
+)
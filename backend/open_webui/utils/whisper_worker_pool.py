@@ -0,0 +1,255 @@
+"""
+Faster-Whisper 전사 워커 풀 및 작업 대기열
+
+모델을 한 번 로드해 둔 장기 실행 프로세스 여러 개에 오디오 청크를 나눠 보내고,
+청크별 결과를 원래 순서대로 합칩니다. 요청 스레드는 전사가 끝날 때까지
+대기하면서 대기열 순번과 청크 단위 진행 상황을 콜백으로 받습니다.
+
+워커 프로세스는 spawn 으로 띄우므로 이 모듈은 표준 라이브러리 외의 의존성을
+두지 않습니다 (faster_whisper 는 워커 안에서만 import). 프로세스 풀 자체는
+HWP 워커 풀과 함께 utils/worker_process_pool.py 를 사용합니다.
+"""
+
+import json
+import logging
+import os
+import threading
+import uuid
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Optional
+
+from open_webui.utils.worker_process_pool import WorkerProcessPool, serve_worker
+
+log = logging.getLogger(__name__)
+
+
+WhisperSegment = namedtuple("WhisperSegment", ["start", "end", "text"])
+
+
+class WhisperTranscriptionError(Exception):
+    """워커가 청크 처리에 실패한 경우"""
+
+
+def _load_model(model_candidates: list[dict]):
+    from faster_whisper import WhisperModel
+
+    errors = []
+    for kwargs in model_candidates:
+        try:
+            return WhisperModel(**kwargs)
+        except Exception as e:
+            errors.append(f"{kwargs.get('model_size_or_path')}: {e}")
+
+        # 로컬 파일이 없으면 다운로드 허용 후 재시도
+        if kwargs.get("local_files_only"):
+            try:
+                return WhisperModel(**{**kwargs, "local_files_only": False})
+            except Exception as e:
+                errors.append(f"{kwargs.get('model_size_or_path')}: {e}")
+
+    raise RuntimeError(f"Faster-Whisper 모델 로딩 실패 ({'; '.join(errors)})")
+
+
+def _transcribe(model, message) -> dict:
+    chunk_path, options = message
+    segments, info = model.transcribe(chunk_path, **options)
+    # segments 는 제너레이터라 여기서 실제 전사가 수행됨
+    return {
+        "segments": [
+            WhisperSegment(segment.start, segment.end, segment.text)
+            for segment in segments
+        ],
+        "language": info.language,
+        "language_probability": info.language_probability,
+    }
+
+
+def _worker_main(conn, model_candidates: list[dict]):
+    """워커 프로세스 본체 - 모델을 한 번 로드하고 파이프로 들어오는 청크를 처리"""
+    serve_worker(conn, lambda: _load_model(model_candidates), _transcribe)
+
+
+class WhisperWorkerPool(WorkerProcessPool):
+    """
+    Faster-Whisper 워커 프로세스 풀
+
+    pool_size 개의 슬롯을 대기열로 관리합니다. 워커는 처음 필요할 때 띄우고,
+    시간 초과나 비정상 종료 시 해당 슬롯을 비워 다음 요청에서 새로 띄웁니다.
+    model_candidates 는 WhisperModel 인자 목록으로, 앞에서부터 로딩을 시도합니다.
+    """
+
+    name = "Whisper"
+    error_class = WhisperTranscriptionError
+
+    def __init__(
+        self,
+        model_candidates: list[dict],
+        pool_size: int = 2,
+        timeout: Optional[float] = 1800,
+    ):
+        self.model_candidates = model_candidates
+        super().__init__(
+            _worker_main, (model_candidates,), pool_size=pool_size, timeout=timeout
+        )
+
+    def transcribe(
+        self, chunk_path: str, options: dict, timeout: Optional[float] = None
+    ) -> dict:
+        """청크 하나를 워커에서 전사 (유휴 워커가 없으면 대기)"""
+        return self.request((os.path.abspath(chunk_path), options), chunk_path, timeout)
+
+
+class TranscriptionQueue:
+    """
+    녹음 전사 작업 대기열
+
+    동시에 max_jobs 개의 녹음만 전사하고 나머지는 순서대로 대기합니다.
+    각 녹음의 청크는 공용 스레드 풀을 거쳐 워커 풀로 들어가므로 여러 녹음이
+    워커를 나눠 씁니다. 모델 설정이 바뀌면 새 워커 풀을 만들고, 이전 풀은
+    사용 중인 작업이 끝난 뒤 종료합니다.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = 2,
+        max_jobs: int = 2,
+        chunk_timeout: Optional[float] = 1800,
+    ):
+        self.pool_size = max(pool_size, 1)
+        self.max_jobs = max(max_jobs, 1)
+        self.chunk_timeout = chunk_timeout
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.pool_size, thread_name_prefix="whisper"
+        )
+        self._job_slots = threading.Semaphore(self.max_jobs)
+        self._waiting: list[str] = []
+
+        # 모델 설정별 워커 풀과 사용 중인 작업 수
+        self._pools: dict[str, list] = {}
+        self._pool_key: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def _acquire_pool(self, model_candidates: list[dict]) -> tuple[str, WhisperWorkerPool]:
+        key = json.dumps(model_candidates, sort_keys=True, default=str)
+        with self._lock:
+            if key != self._pool_key:
+                previous = self._pools.get(self._pool_key)
+                if previous is not None and previous[1] == 0:
+                    previous[0].close()
+                    del self._pools[self._pool_key]
+                self._pool_key = key
+
+            if key not in self._pools:
+                self._pools[key] = [
+                    WhisperWorkerPool(
+                        model_candidates,
+                        pool_size=self.pool_size,
+                        timeout=self.chunk_timeout,
+                    ),
+                    0,
+                ]
+
+            self._pools[key][1] += 1
+            return key, self._pools[key][0]
+
+    def _release_pool(self, key: str):
+        with self._lock:
+            entry = self._pools.get(key)
+            if entry is None:
+                return
+
+            entry[1] -= 1
+            if entry[1] == 0 and key != self._pool_key:
+                entry[0].close()
+                del self._pools[key]
+
+    def _wait_for_slot(self, on_event: Callable[[dict], None]):
+        token = str(uuid.uuid4())
+        with self._lock:
+            self._waiting.append(token)
+
+        try:
+            while not self._job_slots.acquire(timeout=5):
+                with self._lock:
+                    position = self._waiting.index(token) + 1
+                on_event({"status": "queued", "position": position})
+        finally:
+            with self._lock:
+                self._waiting.remove(token)
+
+    def run(
+        self,
+        chunks: list[tuple[str, float]],
+        model_candidates: list[dict],
+        options: dict,
+        on_event: Optional[Callable[[dict], None]] = None,
+    ) -> tuple[list[WhisperSegment], Optional[dict]]:
+        """
+        (청크 경로, 시작 오프셋 초) 목록을 전사해 원래 순서의 세그먼트와
+        첫 청크의 언어 감지 결과를 반환합니다. on_event 는 호출한 스레드에서
+        대기열 순번과 청크 완료마다 호출됩니다.
+        """
+        on_event = on_event or (lambda event: None)
+        self._wait_for_slot(on_event)
+
+        key = None
+        futures = {}
+        try:
+            key, pool = self._acquire_pool(model_candidates)
+            futures = {
+                self._executor.submit(pool.transcribe, chunk_path, options): (
+                    index,
+                    offset,
+                )
+                for index, (chunk_path, offset) in enumerate(chunks)
+            }
+
+            results: list[Optional[list[WhisperSegment]]] = [None] * len(chunks)
+            language = None
+            for done, future in enumerate(as_completed(futures), start=1):
+                index, offset = futures[future]
+                result = future.result()
+
+                # 청크 내부 시간을 원본 녹음 기준으로 보정
+                segments = [
+                    WhisperSegment(
+                        segment.start + offset, segment.end + offset, segment.text
+                    )
+                    for segment in result["segments"]
+                ]
+                results[index] = segments
+                if index == 0:
+                    language = {
+                        "language": result["language"],
+                        "language_probability": result["language_probability"],
+                    }
+
+                on_event(
+                    {
+                        "status": "transcribing",
+                        "done": done,
+                        "total": len(chunks),
+                        "chunk": index,
+                        "segments": [segment._asdict() for segment in segments],
+                    }
+                )
+
+            return [segment for segments in results for segment in segments], language
+        except Exception:
+            for future in futures:
+                future.cancel()
+            raise
+        finally:
+            if key is not None:
+                self._release_pool(key)
+            self._job_slots.release()
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        with self._lock:
+            pools = [entry[0] for entry in self._pools.values()]
+            self._pools.clear()
+        for pool in pools:
+            pool.close()
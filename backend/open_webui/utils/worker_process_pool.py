@@ -0,0 +1,189 @@
+"""
+spawn 으로 띄운 장기 실행 워커 프로세스 풀
+
+HWP 추출(retrieval/loaders/hwp_worker_pool.py)과 Whisper 전사
+(utils/whisper_worker_pool.py) 워커 풀이 함께 쓰는 공통 부분입니다.
+요청 스레드는 대기열에서 유휴 워커를 받아 파이프로 메시지를 보내고,
+제한 시간을 넘기거나 비정상 종료한 워커는 종료 후 다음 요청에서 새로 띄웁니다.
+
+python-hwplib 이미지에도 복사해서 쓰므로 표준 라이브러리 외의 의존성을 두지
+않습니다.
+"""
+
+import atexit
+import logging
+import multiprocessing
+import queue
+import threading
+from typing import Any, Callable, Optional
+
+log = logging.getLogger(__name__)
+
+
+def serve_worker(conn, setup: Callable[[], Any], handle: Callable[[Any, Any], Any]):
+    """
+    워커 프로세스 본체 - setup() 을 한 번 실행하고 파이프로 들어오는 메시지를
+    handle(setup 결과, 메시지) 로 처리해 ("ok", 결과) 또는 ("error", 메시지) 로
+    응답합니다. None 을 받거나 파이프가 닫히면 종료합니다.
+    """
+    state = None
+    startup_error = None
+    try:
+        state = setup()
+    except Exception as e:
+        startup_error = str(e)
+
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            break
+
+        if message is None:
+            break
+
+        if startup_error:
+            conn.send(("error", startup_error))
+            continue
+
+        try:
+            conn.send(("ok", handle(state, message)))
+        except Exception as e:
+            conn.send(("error", str(e)))
+
+
+class _Worker:
+    def __init__(self, context, target: Callable, args: tuple):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=target,
+            args=(child_conn, *args),
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+
+    def is_alive(self) -> bool:
+        return self.process.is_alive()
+
+    def stop(self, kill: bool = False):
+        try:
+            if kill:
+                self.process.kill()
+            else:
+                self.conn.send(None)
+                self.process.join(timeout=5)
+                if self.process.is_alive():
+                    self.process.kill()
+            self.process.join(timeout=5)
+        except Exception:
+            pass
+        finally:
+            self.conn.close()
+
+
+class WorkerProcessPool:
+    """
+    워커 프로세스 풀
+
+    pool_size 개의 슬롯을 대기열로 관리합니다. 워커는 처음 필요할 때
+    target(conn, *args) 로 띄우고, 시간 초과나 비정상 종료 시 해당 슬롯을 비워
+    다음 요청에서 새로 띄웁니다. 하위 클래스는 name 과 예외 클래스를 지정합니다.
+    """
+
+    name = "Worker"
+    error_class: type[Exception] = RuntimeError
+    timeout_class: Optional[type[Exception]] = None
+
+    def __init__(
+        self,
+        target: Callable,
+        args: tuple = (),
+        pool_size: int = 2,
+        timeout: Optional[float] = None,
+    ):
+        self.target = target
+        self.args = args
+        self.pool_size = max(pool_size, 1)
+        self.timeout = timeout
+
+        # JVM 이나 CUDA 를 초기화한 프로세스를 fork 하지 않도록 spawn 사용
+        self._context = multiprocessing.get_context("spawn")
+        self._slots: queue.Queue[Optional[_Worker]] = queue.Queue()
+        self._workers: set[_Worker] = set()
+        self._lock = threading.Lock()
+        self._closed = False
+
+        for _ in range(self.pool_size):
+            self._slots.put(None)
+
+        atexit.register(self.close)
+
+    def _acquire(self) -> _Worker:
+        worker = self._slots.get()
+        if worker is not None and worker.is_alive():
+            return worker
+
+        if worker is not None:
+            log.warning(
+                f"{self.name} 워커(pid={worker.process.pid})가 종료되어 재시작합니다."
+            )
+            self._discard(worker, kill=True)
+
+        try:
+            worker = _Worker(self._context, self.target, self.args)
+        except Exception:
+            self._slots.put(None)
+            raise
+
+        with self._lock:
+            self._workers.add(worker)
+        log.info(f"{self.name} 워커 시작 (pid={worker.process.pid})")
+        return worker
+
+    def _discard(self, worker: _Worker, kill: bool = False):
+        with self._lock:
+            self._workers.discard(worker)
+        worker.stop(kill=kill)
+
+    def request(self, message, label: str, timeout: Optional[float] = None):
+        """메시지 하나를 워커에서 처리 (유휴 워커가 없으면 대기)"""
+        if self._closed:
+            raise self.error_class(f"{self.name} 워커 풀이 종료되었습니다.")
+
+        timeout = self.timeout if timeout is None else timeout
+        worker = self._acquire()
+        healthy = False
+
+        try:
+            worker.conn.send(message)
+            if not worker.conn.poll(timeout):
+                raise (self.timeout_class or self.error_class)(
+                    f"{self.name} 처리 시간 초과 ({timeout}초): {label}"
+                )
+
+            status, result = worker.conn.recv()
+            healthy = True
+        except (EOFError, OSError) as e:
+            raise self.error_class(
+                f"{self.name} 워커가 비정상 종료되었습니다: {label}"
+            ) from e
+        finally:
+            if healthy:
+                self._slots.put(worker)
+            else:
+                # 처리 중이던 워커는 상태를 알 수 없으므로 교체
+                self._discard(worker, kill=True)
+                self._slots.put(None)
+
+        if status != "ok":
+            raise self.error_class(result)
+        return result
+
+    def close(self):
+        self._closed = True
+        with self._lock:
+            workers = list(self._workers)
+            self._workers.clear()
+        for worker in workers:
+            worker.stop()
@@ -1,63 +1,71 @@
 from flask import Flask, request, jsonify
-import subprocess
 import os
+import tempfile
+import threading
+
+try:
+    from open_webui.retrieval.loaders.hwp_worker_pool import (
+        HWPExtractionError,
+        HWPWorkerPool,
+    )
+except ImportError:
+    # docker 이미지에서는 hwp_worker_pool.py 를 같은 디렉터리에 복사해서 사용
+    from hwp_worker_pool import HWPExtractionError, HWPWorkerPool
 
 app = Flask(__name__)
 
-# hwp loader 
-def process_hwp(file_path, hwp_jar_path, work_dir):
-    try:
-        if work_dir == '/app/python-hwplib':
-            result = subprocess.run(
-                ["python3", "hwp_loader.py", 
-                "--hwp_jar_path", hwp_jar_path,
-                "--file_path", file_path],
-                capture_output=True, 
-                text=True,
-                encoding='utf-8'
-            )
-            return result.stdout
-        else:
-            result = subprocess.run(
-                ["python", "hwp_loader.py", 
-                "--hwp_jar_path", hwp_jar_path,
-                "--file_path", file_path],
-                capture_output=True, 
-                text=True,
-                encoding='utf-8'
+HWP_JAR_PATH = os.getenv("HWP_JAR_PATH", "./hwplib-1.1.8.jar")
+HWPX_JAR_PATH = os.getenv("HWPX_JAR_PATH", "")
+HWP_WORKER_POOL_SIZE = int(os.getenv("HWP_WORKER_POOL_SIZE", "2"))
+HWP_WORKER_TIMEOUT = int(os.getenv("HWP_WORKER_TIMEOUT", "120"))
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    # 워커는 spawn 으로 이 모듈을 다시 import 하므로 첫 요청 때 풀을 생성
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = HWPWorkerPool(
+                os.path.abspath(HWP_JAR_PATH),
+                os.path.abspath(HWPX_JAR_PATH) if HWPX_JAR_PATH else "",
+                pool_size=HWP_WORKER_POOL_SIZE,
+                timeout=HWP_WORKER_TIMEOUT,
             )
-            return result.stdout  
-    except Exception as e:
-        return str(e)
+        return _pool
+
 
 @app.route('/extract-text', methods=['POST'])
 def extract_text():
     # 파일 업로드 처리
     if 'file' not in request.files:
         return jsonify({"error": "No file uploaded"}), 400
-    
+
     file = request.files['file']
     if file.filename == '':
         return jsonify({"error": "Empty filename"}), 400
-    
-    work_dir = os.getcwd() 
-    
-    # 업로드 파일 저장
+
+    # 업로드 파일 임시 저장
     file_name = file.filename
-    file.save(file_name)
-    
+    suffix = os.path.splitext(file_name)[1] or ".hwp"
+    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
+        file.save(tmp)
+        tmp_path = tmp.name
+
     # HWP 텍스트 추출 실행
-    hwp_jar_path = "./hwplib-1.1.8.jar"
-    text = process_hwp(file_name, hwp_jar_path, work_dir)
-    
-    # 임시 파일 삭제 docker 에서만
-    if work_dir == '/app/python-hwplib':
-        os.remove(file_name)
-    
+    try:
+        text = get_pool().extract(tmp_path)
+    except HWPExtractionError as e:
+        return jsonify({"filename": file_name, "error": str(e)}), 500
+    finally:
+        os.remove(tmp_path)
+
     return jsonify({
         "filename": file_name,
         "text": text
     })
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=7860)
\ No newline at end of file
+    app.run(host='0.0.0.0', port=7860, threaded=True)